@@ -8,12 +8,28 @@ exec "$(dirname "$0")/../scripts/ami-run" "$0" "$@"
 This script scans all Claude Code transcript files and calculates token counts
 to help determine if full transcripts can fit within the 200K token context limit
 for the completion moderator.
+
+Transcripts are fanned out across a process pool; each worker streams its transcript
+once and tokenizes the formatted messages in one encode_batch call (message blocks
+tokenize independently, so the per-message counts sum to the full context count).
+Per-file results stream to JSONL or CSV, and the summary reports percentiles, a
+histogram and the largest transcripts.
+
+Usage:
+    analyze_transcript_tokens.py [TRANSCRIPT_DIR] [--workers N] [--output results.jsonl|results.csv] [--top N]
 """
 
+import argparse
+import csv
+import json
+import os
 import statistics
 import sys
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import TypedDict
+from typing import IO, TypedDict
 
 
 def _ensure_repo_on_path() -> Path:
@@ -30,9 +46,9 @@ def _ensure_repo_on_path() -> Path:
 _ensure_repo_on_path()
 
 # Import after adding repo to path
-import tiktoken
-
-from scripts.agents.transcript import format_messages_for_prompt, get_last_n_messages
+from scripts.agents.tokenizer import get_encoding
+from scripts.agents.transcript import EXHIBIT_FOOTER, EXHIBIT_HEADER, format_message_block, iter_messages
+from scripts.agents.workflows.core import MAX_MODERATOR_MESSAGE_COUNT
 
 # Token count thresholds for analysis
 TOKEN_THRESHOLD_200K = 200_000
@@ -40,6 +56,19 @@ TOKEN_THRESHOLD_100K = 100_000
 TOKEN_THRESHOLD_50K = 50_000
 TOKEN_THRESHOLD_25K = 25_000
 
+# Histogram buckets (upper bounds, tokens)
+HISTOGRAM_BUCKETS = (TOKEN_THRESHOLD_25K, TOKEN_THRESHOLD_50K, TOKEN_THRESHOLD_100K, TOKEN_THRESHOLD_200K)
+HISTOGRAM_BAR_WIDTH = 40
+
+REPORT_PERCENTILES = (50, 75, 90, 95, 99)
+DEFAULT_TOP_N = 10
+DEFAULT_TRANSCRIPT_DIR = Path.home() / ".claude" / "projects" / "-home-ami-Projects-AMI-ORCHESTRATOR"
+
+# Transcripts handed to a worker per round trip
+POOL_CHUNKSIZE = 8
+
+RESULT_FIELDS = ("name", "tokens", "messages", "moderator_tokens", "error")
+
 
 class TranscriptAnalysis(TypedDict):
     """Result of analyzing a single transcript file."""
@@ -47,22 +76,14 @@ class TranscriptAnalysis(TypedDict):
     name: str
     tokens: int
     messages: int
+    moderator_tokens: int  # Last MAX_MODERATOR_MESSAGE_COUNT messages (moderator window before token truncation)
 
 
-def count_tokens(text: str) -> int:
-    """Count tokens in text using tiktoken (GPT-4 tokenizer).
-
-    Args:
-        text: Text to count tokens for
-
-    Returns:
-        Token count
-
-    Raises:
-        Exception: If tokenization fails
-    """
-    encoding = tiktoken.encoding_for_model("gpt-4")
-    return len(encoding.encode(text))
+@lru_cache(maxsize=1)
+def _wrapper_tokens() -> int:
+    """Token count of the EXHIBIT header and footer."""
+    encoding = get_encoding()
+    return len(encoding.encode(EXHIBIT_HEADER)) + len(encoding.encode(EXHIBIT_FOOTER))
 
 
 def analyze_transcript(transcript_path: Path) -> TranscriptAnalysis:
@@ -77,30 +98,151 @@ def analyze_transcript(transcript_path: Path) -> TranscriptAnalysis:
     Raises:
         Exception: If transcript parsing or tokenization fails
     """
-    # Count total lines in transcript
-    line_count = len(transcript_path.read_text().splitlines())
+    blocks = [format_message_block(msg) for msg in iter_messages(transcript_path)]
 
-    # Get all messages from transcript
-    messages = get_last_n_messages(transcript_path, line_count) if line_count > 0 else []
-
-    if not messages:
+    if not blocks:
         return TranscriptAnalysis(
             name=transcript_path.name,
             tokens=0,
             messages=0,
+            moderator_tokens=0,
         )
 
-    # Format as prompt
-    formatted_text = format_messages_for_prompt(messages)
-
-    # Count tokens
-    token_count = count_tokens(formatted_text)
+    # Same total as tokenizing format_messages_for_prompt(messages) in one piece
+    block_tokens = [len(tokens) for tokens in get_encoding().encode_batch(blocks, num_threads=1)]
+    wrapper_tokens = _wrapper_tokens()
 
     return TranscriptAnalysis(
         name=transcript_path.name,
-        tokens=token_count,
-        messages=len(messages),
+        tokens=wrapper_tokens + sum(block_tokens),
+        messages=len(blocks),
+        moderator_tokens=wrapper_tokens + sum(block_tokens[-MAX_MODERATOR_MESSAGE_COUNT:]),
+    )
+
+
+def _analyze_or_error(transcript_path: Path) -> tuple[Path, TranscriptAnalysis | None, str | None]:
+    """Analyze one transcript in a worker, returning the error instead of raising."""
+    try:
+        return transcript_path, analyze_transcript(transcript_path), None
+    except Exception as e:
+        return transcript_path, None, str(e)
+
+
+def analyze_corpus(transcript_files: list[Path], workers: int) -> Iterator[tuple[Path, TranscriptAnalysis | None, str | None]]:
+    """Analyze transcripts across a process pool, yielding results as they arrive.
+
+    Args:
+        transcript_files: Transcripts to analyze
+        workers: Worker process count (1 analyzes in-process)
+
+    Yields:
+        Tuple of (transcript_path, analysis, error) in input order
+    """
+    if workers <= 1:
+        yield from map(_analyze_or_error, transcript_files)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_analyze_or_error, transcript_files, chunksize=POOL_CHUNKSIZE)
+
+
+class ResultWriter:
+    """Stream per-file results to a JSONL or CSV file."""
+
+    def __init__(self, output_file: IO[str], output_format: str) -> None:
+        """Initialize writer.
+
+        Args:
+            output_file: Open text file to write to
+            output_format: "jsonl" or "csv"
+        """
+        self.output_format = output_format
+        self._file = output_file
+        self._csv = csv.DictWriter(output_file, fieldnames=RESULT_FIELDS) if output_format == "csv" else None
+        if self._csv:
+            self._csv.writeheader()
+
+    def write(self, transcript_path: Path, analysis: TranscriptAnalysis | None, error: str | None) -> None:
+        """Write one result row.
+
+        Args:
+            transcript_path: Analyzed transcript
+            analysis: Analysis result (None on failure)
+            error: Failure message (None on success)
+        """
+        row: dict[str, str | int | None] = {"name": transcript_path.name, "tokens": None, "messages": None, "moderator_tokens": None, "error": error}
+        if analysis:
+            row.update(tokens=analysis["tokens"], messages=analysis["messages"], moderator_tokens=analysis["moderator_tokens"])
+        if self._csv:
+            self._csv.writerow(row)
+        else:
+            self._file.write(json.dumps(row) + "\n")
+        self._file.flush()
+
+
+def percentiles(values: list[int], points: Iterable[int] = REPORT_PERCENTILES) -> dict[int, float]:
+    """Compute percentiles (inclusive method) of token counts.
+
+    Args:
+        values: Token counts
+        points: Percentiles to report (1-99)
+
+    Returns:
+        Mapping of percentile to value
+    """
+    if len(values) == 1:
+        return dict.fromkeys(points, float(values[0]))
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {point: cuts[point - 1] for point in points}
+
+
+def histogram(values: list[int], buckets: tuple[int, ...] = HISTOGRAM_BUCKETS) -> list[tuple[str, int]]:
+    """Count token counts per bucket.
+
+    Args:
+        values: Token counts
+        buckets: Ascending bucket upper bounds (a final open bucket is added)
+
+    Returns:
+        List of (label, count)
+    """
+    counts = [0] * (len(buckets) + 1)
+    for value in values:
+        counts[next((i for i, bound in enumerate(buckets) if value <= bound), len(buckets))] += 1
+    labels = [f"<= {bound:,}" for bound in buckets] + [f"> {buckets[-1]:,}"]
+    return list(zip(labels, counts, strict=True))
+
+
+def format_report(results: list[TranscriptAnalysis], failed_count: int, top_n: int) -> str:
+    """Format corpus statistics.
+
+    Args:
+        results: Successful analyses
+        failed_count: Number of transcripts that failed
+        top_n: Number of largest transcripts to list
+
+    Returns:
+        Report text
+    """
+    lines = [f"Transcripts analyzed: {len(results)} ({failed_count} failed)", ""]
+
+    sections = (
+        ("Full transcript tokens", [result["tokens"] for result in results]),
+        (f"Moderator window tokens (last {MAX_MODERATOR_MESSAGE_COUNT} messages)", [result["moderator_tokens"] for result in results]),
     )
+    for title, values in sections:
+        lines.append(f"{title}:")
+        lines.append(f"  min {min(values):,}  mean {statistics.mean(values):,.0f}  max {max(values):,}")
+        lines.append("  " + "  ".join(f"p{point} {value:,.0f}" for point, value in percentiles(values).items()))
+        for label, count in histogram(values):
+            bar = "#" * round(HISTOGRAM_BAR_WIDTH * count / len(values))
+            lines.append(f"  {label:>12} {count:>7} {count / len(values):6.1%} {bar}".rstrip())
+        lines.append("")
+
+    lines.append(f"Top {top_n} largest transcripts:")
+    lines.append(f"  {'#':>3}  {'tokens':>10}  {'moderator':>10}  {'messages':>8}  name")
+    for rank, result in enumerate(sorted(results, key=lambda r: r["tokens"], reverse=True)[:top_n], 1):
+        lines.append(f"  {rank:>3}  {result['tokens']:>10,}  {result['moderator_tokens']:>10,}  {result['messages']:>8,}  {result['name'][:50]}")
+    return "\n".join(lines) + "\n"
 
 
 def main() -> int:
@@ -109,68 +251,50 @@ def main() -> int:
     Returns:
         Exit code (0 for success, 1 for error)
     """
-    # Find transcript directory
-    transcript_dir = Path.home() / ".claude" / "projects" / "-home-ami-Projects-AMI-ORCHESTRATOR"
+    parser = argparse.ArgumentParser(description="Analyze token counts of Claude Code transcripts")
+    parser.add_argument("transcript_dir", nargs="?", type=Path, default=DEFAULT_TRANSCRIPT_DIR, help="Directory containing transcript JSONL files")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (default: CPU count)")
+    parser.add_argument("--output", type=Path, help="Stream per-file results to this .jsonl or .csv file")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP_N, help="Number of largest transcripts to list")
+    args = parser.parse_args()
 
-    if not transcript_dir.exists():
+    # Find transcript directory
+    if not args.transcript_dir.exists():
+        sys.stderr.write(f"Transcript directory not found: {args.transcript_dir}\n")
         return 1
 
     # Find all transcript files
-    transcript_files = list(transcript_dir.glob("*.jsonl"))
-    transcript_files = [f for f in transcript_files if not f.name.endswith(".scanner_state")]
+    transcript_files = sorted(args.transcript_dir.glob("*.jsonl"))
 
     if not transcript_files:
+        sys.stderr.write(f"No transcripts in {args.transcript_dir}\n")
         return 1
 
-    # Analyze each transcript
+    # Load the tokenizer before forking so workers share it
+    get_encoding()
+
     results: list[TranscriptAnalysis] = []
     failed_count = 0
-
-    for idx, transcript_path in enumerate(transcript_files, 1):
-        try:
-            result = analyze_transcript(transcript_path)
-            results.append(result)
+    output_file = args.output.open("w", newline="") if args.output else None
+    try:
+        writer = ResultWriter(output_file, "csv" if args.output.suffix == ".csv" else "jsonl") if output_file else None
+        for idx, (transcript_path, analysis, error) in enumerate(analyze_corpus(transcript_files, args.workers), 1):
+            if writer:
+                writer.write(transcript_path, analysis, error)
+            if analysis:
+                results.append(analysis)
+            else:
+                failed_count += 1
             if idx % 100 == 0:
-                pass
-        except Exception:
-            failed_count += 1
+                sys.stderr.write(f"Analyzed {idx}/{len(transcript_files)}\n")
+    finally:
+        if output_file:
+            output_file.close()
 
     if not results:
         return 1
 
-    if failed_count > 0:
-        pass
-
-    # Calculate statistics
-    token_counts = [r["tokens"] for r in results]
-
-    min(token_counts)
-    max_tokens = max(token_counts)
-    statistics.mean(token_counts)
-    statistics.median(token_counts)
-
-    # Distribution
-    sum(1 for t in token_counts if t > TOKEN_THRESHOLD_200K)
-    sum(1 for t in token_counts if t > TOKEN_THRESHOLD_100K)
-    sum(1 for t in token_counts if t > TOKEN_THRESHOLD_50K)
-    sum(1 for t in token_counts if t > TOKEN_THRESHOLD_25K)
-
-    # Top 10 largest
-    sorted_results = sorted(results, key=lambda r: r["tokens"], reverse=True)
-    top_10 = sorted_results[:10]
-
-    # Output statistics
-    for _i, result in enumerate(top_10, 1):
-        result["name"][:50]
-        result["tokens"]
-        result["messages"]
-
-    # Context window analysis
-    if max_tokens <= TOKEN_THRESHOLD_200K:
-        pass
-    else:
-        pass
-
+    sys.stdout.write(format_report(results, failed_count, args.top))
     return 0
 
 
@@ -5,19 +5,20 @@ Security CRITICAL: CACHING IS STRICTLY FORBIDDEN to ensure real-time analysis fo
 Supports parallel processing and pattern consolidation.
 """
 
+import asyncio
 import time
-from concurrent.futures import ProcessPoolExecutor
+from collections.abc import Generator
 from datetime import datetime
-from functools import partial
 from pathlib import Path
 from typing import Any
 
 from loguru import logger
 
-from scripts.agents.audit_utils.processing import consolidate_patterns, parse_audit_output, save_report
+from scripts.agents.audit_utils.processing import consolidate_patterns, consolidation_run, parse_audit_output, save_report
 from scripts.agents.cli.config import AgentConfigPresets
 from scripts.agents.cli.factory import get_agent_cli
 from scripts.agents.common import GenericExecutor, detect_language
+from scripts.agents.core.base_executor import DEFAULT_ASYNC_CONCURRENCY, AgentOutput, AgentRun
 from scripts.agents.core.models import ExecutionStatus, UnifiedExecutionResult
 
 # Resource limits
@@ -29,14 +30,14 @@ class AuditEngine(GenericExecutor[UnifiedExecutionResult]):
     """Orchestrates multi-file code audits.
 
     Features:
-    - Parallel processing with ProcessPoolExecutor
+    - Parallel processing on an event loop (audit_directory_async)
     - Language detection
     - Include/exclude pattern scanning
     - Special __init__.py handling (skip empty files)
     - Progress tracking
     - Report generation with mirrored directory structure
     - Pattern consolidation for FAIL/ERROR files
-    - SECURITY CRITICAL: Real-time analysis only (no caching)
+    - SECURITY CRITICAL: Real-time analysis only (no caching; audit is in verdict_memo.NEVER_MEMOIZED)
     """
 
     def __init__(self) -> None:
@@ -111,8 +112,10 @@ class AuditEngine(GenericExecutor[UnifiedExecutionResult]):
 
         return True
 
-    def execute_single_item(self, item_path: Path, _root_dir: Path | None = None, user_instruction: str | None = None) -> UnifiedExecutionResult:
-        """Execute a single item with audit process.
+    def item_steps(
+        self, item_path: Path, _root_dir: Path | None = None, user_instruction: str | None = None
+    ) -> Generator[AgentRun, AgentOutput, UnifiedExecutionResult]:
+        """Steps of a single item with audit process.
 
         Args:
             item_path: Path to the item to audit
@@ -120,11 +123,10 @@ class AuditEngine(GenericExecutor[UnifiedExecutionResult]):
             user_instruction: Optional prepended instruction for the worker
 
         Returns:
-            Audit result for the item
+            Generator yielding the audit run, returning the audit result
         """
-        # Delegate to the original _audit_file with file_path
         # _root_dir is intentionally unused in audit process
-        return self._audit_file(item_path, user_instruction)
+        return self._audit_steps(item_path, user_instruction)
 
     def audit_directory(
         self,
@@ -138,30 +140,104 @@ class AuditEngine(GenericExecutor[UnifiedExecutionResult]):
 
         Args:
             directory: Root directory to audit
-            parallel: Enable parallel processing
-            max_workers: Max worker processes (default 4, max 8)
+            parallel: Enable parallel processing (asyncio engine, see audit_directory_async)
+            max_workers: Max files audited at once (default 4, max 8)
             retry_errors: If True, only audit files with ERROR status from previous run
             user_instruction: Optional prepended instruction for the audit workers
 
         Returns:
             List of file audit results
         """
-        max_workers = min(max_workers, MAX_WORKERS)
+        if parallel:
+            return asyncio.run(self.audit_directory_async(directory, retry_errors, user_instruction, concurrency=min(max_workers, MAX_WORKERS)))
+
+        files, output_dir = self._prepare_audit(directory, retry_errors, parallel=False)
+        if files is None:
+            return []
+
+        # Progress tracking
+        start_time = time.time()
+        results = []
+        for i, file_path in enumerate(files, 1):
+            result = self._audit_file(file_path, user_instruction=user_instruction)
+            results.append(result)
+            self._record_result(result, i, len(files), start_time, directory, output_dir)
+
+        self._log_audit_completed(results)
+        return results
+
+    async def audit_directory_async(
+        self,
+        directory: Path,
+        retry_errors: bool = False,
+        user_instruction: str | None = None,
+        concurrency: int | None = None,
+    ) -> list[UnifiedExecutionResult]:
+        """Audit all files in directory concurrently on the running event loop.
+
+        Audit processes are driven by the event loop instead of worker processes or threads, so
+        concurrency can be far higher than a process pool allows. audit_directory(parallel=True)
+        runs here with max_workers as the concurrency.
+
+        Args:
+            directory: Root directory to audit
+            retry_errors: If True, only audit files with ERROR status from previous run
+            user_instruction: Optional prepended instruction for the audit workers
+            concurrency: Files audited at once (defaults to executor.async_concurrency)
+
+        Returns:
+            List of file audit results, in file order
+        """
+        files, output_dir = self._prepare_audit(directory, retry_errors, parallel=True)
+        if files is None:
+            return []
+
+        semaphore = asyncio.Semaphore(concurrency or int(self.config.get("executor.async_concurrency", DEFAULT_ASYNC_CONCURRENCY)))
+
+        async def audit(file_path: Path) -> UnifiedExecutionResult:
+            async with semaphore:
+                return await self.run_steps_async(self._audit_steps(file_path, user_instruction))
+
+        start_time = time.time()
+        tasks = [asyncio.create_task(audit(file_path)) for file_path in files]
+        for i, finished in enumerate(asyncio.as_completed(tasks), 1):
+            result = await finished
+            self._record_result(result, i, len(files), start_time, directory, output_dir, consolidate=False)
+
+            # One consolidation at a time (all edit CONSOLIDATED.md) while the audits keep running
+            run = consolidation_run(result, directory, output_dir, output_dir / "CONSOLIDATED.md") if result.status in ("failed", "timeout") else None
+            if run is not None:
+                output, _ = await self.cli.run_print_async(**run._asdict())
+                self.logger.info("consolidation_result", result=output.strip())
+
+        results = [task.result() for task in tasks]
+        self._log_audit_completed(results)
+        return results
+
+    def _prepare_audit(self, directory: Path, retry_errors: bool, parallel: bool) -> tuple[list[Path] | None, Path]:
+        """Find the files to audit and log the start.
+
+        Args:
+            directory: Root directory to audit
+            retry_errors: If True, only files with ERROR status from previous run
+            parallel: Whether files are audited in parallel (logged)
+
+        Returns:
+            Tuple of (files, or None if retry_errors found none; report output directory)
+        """
+        # Create output directory with timestamp
+        timestamp = datetime.now().strftime("%d.%m.%Y")
+        output_dir = directory / "docs" / "audit" / timestamp
 
         # If retry_errors mode, filter to only ERROR files
         if retry_errors:
             files = self._find_error_files(directory)
             if not files:
                 self.logger.info("no_error_files_found", directory=str(directory))
-                return []
+                return None, output_dir
         else:
             files = self._find_item_files(directory)
 
-        # Create output directory with timestamp
-        timestamp = datetime.now().strftime("%d.%m.%Y")
-        output_dir = directory / "docs" / "audit" / timestamp
-        consolidated_file = output_dir / "CONSOLIDATED.md"
-
         self.logger.info(
             "audit_started",
             directory=str(directory),
@@ -169,65 +245,46 @@ class AuditEngine(GenericExecutor[UnifiedExecutionResult]):
             parallel=parallel,
             output_dir=str(output_dir),
         )
+        return files, output_dir
 
-        # Progress tracking
-        start_time = time.time()
-        results = []
-
-        if parallel:
-            audit_func = partial(self._audit_file, user_instruction=user_instruction)
-            with ProcessPoolExecutor(max_workers=max_workers) as executor:
-                for i, result in enumerate(executor.map(audit_func, files), 1):
-                    results.append(result)
-
-                    # Print progress to stderr so it's visible in logs
-                    elapsed = time.time() - start_time
-                    avg_time = elapsed / i
-                    remaining = (len(files) - i) * avg_time
-                    self.logger.info(
-                        "audit_progress",
-                        current=i,
-                        total=len(files),
-                        percent=i * 100 // len(files),
-                        elapsed_sec=round(elapsed, 1),
-                        remaining_sec=round(remaining, 1),
-                        current_file=str(result.item_path),
-                        status=result.status,
-                    )
-
-                    # Save report (mirror directory structure) using imported utility
-                    save_report(result, directory, output_dir)
+    def _record_result(
+        self, result: UnifiedExecutionResult, current: int, total: int, start_time: float, directory: Path, output_dir: Path, consolidate: bool = True
+    ) -> None:
+        """Log progress and write the reports of a finished file.
 
-                    # Consolidate patterns (only for failed statuses) using imported utility
-                    if result.status in ("failed", "timeout"):
-                        consolidate_patterns(result, directory, output_dir, consolidated_file)
-        else:
-            for i, file_path in enumerate(files, 1):
-                result = self._audit_file(file_path, user_instruction=user_instruction)
-                results.append(result)
-
-                # Print progress to stderr so it's visible in logs
-                elapsed = time.time() - start_time
-                avg_time = elapsed / i
-                remaining = (len(files) - i) * avg_time
-                self.logger.info(
-                    "audit_progress",
-                    current=i,
-                    total=len(files),
-                    percent=i * 100 // len(files),
-                    elapsed_sec=round(elapsed, 1),
-                    remaining_sec=round(remaining, 1),
-                    current_file=str(result.item_path),
-                    status=result.status,
-                )
+        Args:
+            result: Audit result of the file
+            current: Number of files finished so far
+            total: Number of files audited
+            start_time: Time when the audit started
+            directory: Root directory being audited
+            output_dir: Report output directory
+            consolidate: Consolidate patterns of failed files here (blocking agent run)
+        """
+        # Print progress to stderr so it's visible in logs
+        elapsed = time.time() - start_time
+        avg_time = elapsed / current
+        remaining = (total - current) * avg_time
+        self.logger.info(
+            "audit_progress",
+            current=current,
+            total=total,
+            percent=current * 100 // total,
+            elapsed_sec=round(elapsed, 1),
+            remaining_sec=round(remaining, 1),
+            current_file=str(result.item_path),
+            status=result.status,
+        )
 
-                # Save report using imported utility
-                save_report(result, directory, output_dir)
+        # Save report (mirror directory structure) using imported utility
+        save_report(result, directory, output_dir)
 
-                # Consolidate patterns (only for failed statuses) using imported utility
-                if result.status in ("failed", "timeout"):
-                    consolidate_patterns(result, directory, output_dir, consolidated_file)
+        # Consolidate patterns (only for failed statuses) using imported utility
+        if consolidate and result.status in ("failed", "timeout"):
+            consolidate_patterns(result, directory, output_dir, output_dir / "CONSOLIDATED.md")
 
+    def _log_audit_completed(self, results: list[UnifiedExecutionResult]) -> None:
+        """Log the summary of an audit run."""
         self.logger.info(
             "audit_completed",
             total=len(results),
@@ -236,8 +293,6 @@ class AuditEngine(GenericExecutor[UnifiedExecutionResult]):
             errors=sum(1 for r in results if r.status == "timeout"),
         )
 
-        return results
-
     def _find_error_files(self, directory: Path) -> list[Path]:
         """Find files with ERROR status from most recent audit.
 
@@ -313,6 +368,18 @@ class AuditEngine(GenericExecutor[UnifiedExecutionResult]):
         Returns:
             Audit result with status and violations
         """
+        return self.run_steps(self._audit_steps(file_path, user_instruction))
+
+    def _audit_steps(self, file_path: Path, user_instruction: str | None = None) -> Generator[AgentRun, AgentOutput, UnifiedExecutionResult]:
+        """Steps of auditing a single file using LLM-based analysis.
+
+        Args:
+            file_path: Path to file to audit
+            user_instruction: Optional prepended instruction for the audit worker
+
+        Returns:
+            Generator yielding the audit run, returning the audit result with status and violations
+        """
         start = time.time()
 
         try:
@@ -335,7 +402,7 @@ class AuditEngine(GenericExecutor[UnifiedExecutionResult]):
             code = file_path.read_text()
 
             # Run LLM-based audit (matches current claude-audit.sh behavior)
-            output, _ = self.cli.run_print(
+            output, _ = yield AgentRun(
                 instruction_file=self.prompts_dir / self.config.get("prompts.audit"),
                 stdin=f"{user_instruction + chr(10) if user_instruction else ''}## CODE TO ANALYZE\n\n```\n{code}\n```",
                 agent_config=AgentConfigPresets.audit(self.session_id),
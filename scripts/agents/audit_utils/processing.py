@@ -10,6 +10,7 @@ from loguru import logger
 from scripts.agents.cli.config import AgentConfigPresets
 from scripts.agents.cli.factory import get_agent_cli
 from scripts.agents.config import get_config
+from scripts.agents.core.base_executor import AgentRun
 
 
 def parse_audit_output(
@@ -117,21 +118,22 @@ def save_report(result: Any, root_dir: Path, output_dir: Path) -> None:  # Any:
             f.write("\n")
 
 
-def consolidate_patterns(
+def consolidation_run(
     result: Any,
     root_dir: Path,
     output_dir: Path,
     consolidated_file: Path,
-) -> None:
-    """Consolidate patterns from failed audit into CONSOLIDATED.md.
-
-    Only called for FAIL/ERROR files to extract patterns.
+) -> AgentRun | None:
+    """Build the agent run consolidating patterns from a failed audit into CONSOLIDATED.md.
 
     Args:
         result: Failed audit result
         root_dir: Root directory being audited
         output_dir: Output directory
         consolidated_file: Path to CONSOLIDATED.md
+
+    Returns:
+        Consolidation run, or None if the file has no audit report
     """
 
     # Get audit report path
@@ -144,15 +146,13 @@ def consolidate_patterns(
 
     # Read audit report
     if not report_path.exists():
-        return
+        return None
 
     audit_content = report_path.read_text()
 
     # Read current consolidated (if exists)
     consolidated_content = consolidated_file.read_text() if consolidated_file.exists() else "# CONSOLIDATED AUDIT PATTERNS\n\nNo patterns consolidated yet.\n"
 
-    # Run consolidation via agent CLI
-    cli = get_agent_cli()
     config = get_config()
     prompts_dir = config.root / config.get("prompts.dir")
     consolidate_instruction = prompts_dir / config.get("prompts.consolidate")
@@ -182,14 +182,39 @@ File path: `{report_path}`
 **REMEMBER**: Use Read/Write/Edit tools to update `{consolidated_file}`. Output ONLY 'UPDATED' or 'NO_CHANGES' when done.
 """
 
-    # run_print() raises AgentExecutionError on non-zero exit
-    # If we reach this line, execution was successful
     consolidate_config = AgentConfigPresets.consolidate(session_id=result.item_path.name)
     consolidate_config.enable_streaming = True
-    output, _ = cli.run_print(
+    return AgentRun(
         instruction_file=consolidate_instruction,
         stdin=context,
         agent_config=consolidate_config,
     )
 
+
+def consolidate_patterns(
+    result: Any,
+    root_dir: Path,
+    output_dir: Path,
+    consolidated_file: Path,
+) -> None:
+    """Consolidate patterns from failed audit into CONSOLIDATED.md.
+
+    Only called for FAIL/ERROR files to extract patterns.
+
+    Args:
+        result: Failed audit result
+        root_dir: Root directory being audited
+        output_dir: Output directory
+        consolidated_file: Path to CONSOLIDATED.md
+    """
+    run = consolidation_run(result, root_dir, output_dir, consolidated_file)
+    if run is None:
+        return
+
+    # Run consolidation via agent CLI
+    # run_print() raises AgentExecutionError on non-zero exit
+    # If we reach this line, execution was successful
+    cli = get_agent_cli()
+    output, _ = cli.run_print(**run._asdict())
+
     logger.info("consolidation_result", result=output.strip())
@@ -0,0 +1,288 @@
+"""asyncio execution of agent CLI processes.
+
+The threaded path (cli.streaming) holds a blocked thread per running agent. Here one event loop
+drives any number of agent processes (executors run items in parallel mode this way): each is
+started with asyncio.create_subprocess_exec, its stdout is read in chunks and split into lines
+incrementally (LineSplitter), stderr is collected by a separate task, and the whole run is
+bounded by asyncio.timeout. Lines go through the same DecisionRecognizer and lifecycle events
+(see cli.lifecycle) as the threaded path, so stop_on_decision and AgentConfig.on_event behave
+the same. The warm pool and moderator sessions only serve the threaded path.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import codecs
+import contextlib
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from scripts.agents.cli.decision_stream import DecisionRecognizer
+from scripts.agents.cli.env_utils import get_unprivileged_env
+from scripts.agents.cli.exceptions import AgentCommandNotFoundError, AgentExecutionError, AgentTimeoutError
+from scripts.agents.cli.lifecycle import DECISION, EXIT, FIRST_BYTE, FIRST_TOKEN, SPAWNED, LifecyclePublisher
+from scripts.agents.cli.process_utils import REAP_GRACE_SECONDS
+from scripts.agents.cli.streaming import validate_command
+from scripts.agents.cli.streaming_loops import AgentConfigProtocol
+from scripts.agents.config import get_config
+
+# Bytes requested per stdout read
+READ_CHUNK_SIZE = 64 * 1024
+
+# Processes finishing their teardown in the background (referenced until done)
+_background_tasks: set[asyncio.Task[None]] = set()
+
+
+class LineSplitter:
+    """Incremental splitter of a byte stream into text lines (newline kept, as when iterating a file).
+
+    Chunks may end anywhere - inside a line or inside a multi-byte character.
+    """
+
+    def __init__(self, encoding: str = "utf-8") -> None:
+        """Initialize splitter.
+
+        Args:
+            encoding: Encoding of the stream (undecodable bytes are replaced)
+        """
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._pending: list[str] = []  # Text of the incomplete last line
+
+    def feed(self, chunk: bytes) -> list[str]:
+        """Add a chunk.
+
+        Args:
+            chunk: Bytes read from the stream
+
+        Returns:
+            Lines completed by the chunk
+        """
+        text = self._decoder.decode(chunk)
+        end = text.rfind("\n") + 1
+        if not end:
+            if text:
+                self._pending.append(text)
+            return []
+        self._pending.append(text[:end])
+        complete = "".join(self._pending)
+        self._pending = [text[end:]] if end < len(text) else []
+        return [line + "\n" for line in complete[:-1].split("\n")]
+
+    def flush(self) -> list[str]:
+        """End of stream.
+
+        Returns:
+            The unterminated last line, if any
+        """
+        rest = "".join(self._pending) + self._decoder.decode(b"", final=True)
+        self._pending = []
+        return [rest] if rest else []
+
+
+async def _write_stdin(process: asyncio.subprocess.Process, stdin_data: str) -> None:
+    """Feed stdin and close it (runs as a task so stdout is read concurrently)."""
+    if process.stdin is None:
+        return
+    try:
+        process.stdin.write(stdin_data.encode("utf-8"))
+        await process.stdin.drain()
+        process.stdin.close()
+    except (BrokenPipeError, ConnectionResetError):
+        # Process exited early - its exit status is reported by the reader
+        pass
+
+
+async def _read_stderr(process: asyncio.subprocess.Process) -> str:
+    """Complete stderr of a process (runs as a task from the start so the pipe never fills)."""
+    if process.stderr is None:
+        return ""
+    return (await process.stderr.read()).decode("utf-8", errors="replace")
+
+
+async def _discard(stream: asyncio.StreamReader | None) -> None:
+    """Read a pipe to EOF, dropping the data."""
+    if stream is None:
+        return
+    while await stream.read(READ_CHUNK_SIZE):
+        pass
+
+
+async def _wait_or_stop(process: asyncio.subprocess.Process, grace: float) -> None:
+    """Wait for a process to exit, terminating (then killing) it after grace seconds."""
+    try:
+        await asyncio.wait_for(process.wait(), grace)
+    except TimeoutError:
+        with contextlib.suppress(ProcessLookupError):
+            process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), grace)
+        except TimeoutError:
+            with contextlib.suppress(ProcessLookupError):
+                process.kill()
+            await process.wait()
+
+
+async def _reap(process: asyncio.subprocess.Process, lifecycle: LifecyclePublisher, stderr_task: asyncio.Task[str], grace: float) -> None:
+    """Let a process finish its teardown, then make sure it is gone (see process_utils.reap_in_background).
+
+    Both pipes are drained meanwhile: the process never blocks on a full pipe, and asyncio
+    reports the exit only once the pipes are closed.
+    """
+    drain = asyncio.create_task(_discard(process.stdout))
+    try:
+        await _wait_or_stop(process, grace)
+    except asyncio.CancelledError:
+        # Event loop shutting down - do not leave the process behind
+        with contextlib.suppress(ProcessLookupError):
+            process.kill()
+        raise
+    finally:
+        drain.cancel()
+    lifecycle.publish(EXIT, str(process.returncode))
+    await stderr_task
+
+
+def _reap_in_background(process: asyncio.subprocess.Process, lifecycle: LifecyclePublisher, stderr_task: asyncio.Task[str], kill: bool = False) -> None:
+    """Reap a process no longer needed without awaiting it.
+
+    Args:
+        process: Agent process
+        lifecycle: Publisher of the process's exit event
+        stderr_task: Task reading the process's stderr
+        kill: Kill the process right away (timeouts, cancelled runs)
+    """
+    if kill:
+        with contextlib.suppress(ProcessLookupError):
+            process.kill()
+    task = asyncio.get_running_loop().create_task(_reap(process, lifecycle, stderr_task, 0.0 if kill else REAP_GRACE_SECONDS))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _read_answer(
+    process: asyncio.subprocess.Process,
+    agent_config: AgentConfigProtocol,
+    lifecycle: LifecyclePublisher,
+    recognizer: DecisionRecognizer,
+) -> list[str]:
+    """Read stdout lines, publishing lifecycle events, up to EOF or (agent_config.stop_on_decision) a decision."""
+    splitter = LineSplitter()
+    output_lines: list[str] = []
+    if process.stdout is None:
+        return output_lines
+    while True:
+        chunk = await process.stdout.read(READ_CHUNK_SIZE)
+        for line in splitter.feed(chunk) if chunk else splitter.flush():
+            lifecycle.publish(FIRST_BYTE)
+            output_lines.append(line)
+            decided = recognizer.feed(line)
+            if recognizer.saw_text:
+                lifecycle.publish(FIRST_TOKEN)
+            if decided:
+                lifecycle.publish(DECISION, recognizer.decision)
+                if agent_config.stop_on_decision:
+                    return output_lines
+        if not chunk:
+            return output_lines
+
+
+async def execute_async(
+    cmd: list[str],
+    stdin_data: str | None,
+    cwd: Path | None,
+    agent_config: AgentConfigProtocol,
+    config: Any = None,
+) -> tuple[str, dict[str, Any] | None]:
+    """Execute a CLI command on the running event loop.
+
+    Output is returned as read (like a stdin-fed threaded run). With stop_on_decision the run
+    returns as soon as the output holds a moderator decision and the process is reaped in the
+    background. Without stdin data the process reads from /dev/null - concurrent agents never
+    share the terminal.
+
+    Args:
+        cmd: Command to execute
+        stdin_data: Data to send to stdin, or None
+        cwd: Working directory
+        agent_config: Agent configuration (timeout covers the whole run)
+        config: Configuration object for environment settings
+
+    Returns:
+        Tuple of (output, metadata)
+
+    Raises:
+        AgentCommandNotFoundError: If the command does not exist
+        AgentTimeoutError: If the run takes longer than agent_config.timeout
+        AgentExecutionError: If the process exits with an error before a decision
+    """
+    validate_command(cmd)
+    env = get_unprivileged_env(config if config is not None else get_config())
+    if env is None:
+        env = os.environ.copy()
+
+    start_time = time.time()
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE if stdin_data is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd,
+            env=env,
+        )
+    except FileNotFoundError:
+        raise AgentCommandNotFoundError(cmd[0]) from None
+
+    lifecycle = LifecyclePublisher(process, agent_config.on_event)
+    lifecycle.publish(SPAWNED)
+    stderr_task = asyncio.create_task(_read_stderr(process))
+    stdin_task = asyncio.create_task(_write_stdin(process, stdin_data)) if stdin_data is not None else None
+    recognizer = DecisionRecognizer()
+    returncode: int | None = None
+    try:
+        async with asyncio.timeout(agent_config.timeout):
+            output_lines = await _read_answer(process, agent_config, lifecycle, recognizer)
+            if recognizer.decision is None:
+                returncode = await process.wait()
+                lifecycle.publish(EXIT, str(returncode))
+                stderr = await asyncio.shield(stderr_task)
+    except TimeoutError:
+        _reap_in_background(process, lifecycle, stderr_task, kill=True)
+        raise AgentTimeoutError(agent_config.timeout or 0, cmd, time.time() - start_time) from None
+    except BaseException:
+        _reap_in_background(process, lifecycle, stderr_task, kill=True)
+        raise
+    finally:
+        if stdin_task is not None:
+            stdin_task.cancel()
+
+    output = "".join(output_lines)
+    duration = time.time() - start_time
+    if returncode is None:
+        # Decided early - the process finishes its teardown in the background
+        returncode = process.returncode
+        _reap_in_background(process, lifecycle, stderr_task)
+    elif returncode != 0:
+        raise AgentExecutionError(returncode, output, stderr, cmd)
+
+    logger.info(
+        "agent_completed",
+        session_id=agent_config.session_id,
+        duration=duration,
+        exit_code=returncode,
+        early_decision=recognizer.decision,
+        lifecycle=lifecycle.timings,
+        engine="asyncio",
+    )
+    metadata: dict[str, Any] = {
+        "session_id": agent_config.session_id,
+        "duration": duration,
+        "exit_code": returncode,
+        "early_decision": recognizer.decision,
+        "lifecycle": dict(lifecycle.timings),
+    }
+    return output, metadata
@@ -11,6 +11,7 @@ if TYPE_CHECKING:
     from scripts.agents.cli.config import AgentConfig
 
 from base.backend.utils.uuid_utils import uuid7
+from scripts.agents.cli.async_streaming import execute_async
 from scripts.agents.cli.streaming import (
     execute_streaming,
 )
@@ -93,6 +94,26 @@ class CLIProvider(ABC):
             Tuple of (output text, metadata dict or None)
         """
 
+    def _build_warm_command(
+        self,
+        cwd: Path | None,
+        config: AgentConfig,
+    ) -> list[str] | None:
+        """Build the command of a pre-started process reading requests as stream-json input.
+
+        Providers supporting the warm pool and moderator sessions (see cli.warm_pool,
+        cli.moderator_session) return the command without the prompt; requests are written to
+        stdin once the process is taken.
+
+        Args:
+            cwd: Working directory for agent execution
+            config: Agent configuration
+
+        Returns:
+            List of command arguments, or None if runs with this config cannot be pooled
+        """
+        return None
+
     @abstractmethod
     def _get_default_config(self) -> AgentConfig:
         """Get default agent configuration.
@@ -201,7 +222,52 @@ class CLIProvider(ABC):
         Raises:
             AgentError: If agent execution fails
         """
-        # Handle instruction vs instruction_file
+        instruction_content, cwd = self._resolve_instruction(instruction, cwd, instruction_file)
+        config = agent_config or self._get_default_config()
+        return self._execute_with_timeout(instruction_content, cwd, config, stdin_data=stdin, audit_log_path=audit_log_path)
+
+    async def run_print_async(
+        self,
+        instruction: str | Path | None = None,
+        cwd: Path | None = None,
+        agent_config: AgentConfig | None = None,
+        instruction_file: Path | None = None,
+        stdin: str | None = None,
+    ) -> tuple[str, dict[str, Any] | None]:
+        """Run agent in print mode on the running event loop (see cli.async_streaming).
+
+        Args:
+            instruction: Natural language instruction for the agent (or use instruction_file)
+            cwd: Working directory for agent execution (defaults to current)
+            agent_config: Configuration for agent execution
+            instruction_file: Path to instruction file (alternative to instruction string)
+            stdin: Data to provide to stdin
+
+        Returns:
+            Tuple of (output, metadata) where metadata includes session info
+
+        Raises:
+            AgentError: If agent execution fails
+        """
+        instruction_content, cwd = self._resolve_instruction(instruction, cwd, instruction_file)
+        config = agent_config or self._get_default_config()
+        cmd = self._build_command(instruction_content, cwd, config)
+        return await execute_async(cmd, stdin, cwd, config, get_config())
+
+    def _resolve_instruction(self, instruction: str | Path | None, cwd: Path | None, instruction_file: Path | None) -> tuple[str, Path | None]:
+        """Get the instruction text of a print-mode run.
+
+        Args:
+            instruction: Natural language instruction for the agent (or use instruction_file)
+            cwd: Working directory for agent execution
+            instruction_file: Path to instruction file (alternative to instruction string)
+
+        Returns:
+            Tuple of (instruction text, working directory - the instruction file's directory if not given)
+
+        Raises:
+            ValueError: If neither or both instruction sources are given, or instruction is a Path
+        """
         if instruction_file is not None:
             if instruction is not None:
                 raise ValueError("Cannot specify both instruction and instruction_file")
@@ -211,11 +277,8 @@ class CLIProvider(ABC):
         elif isinstance(instruction, Path):
             # Security restriction: Path should only be passed as instruction_file parameter
             raise ValueError("Path objects should be passed as instruction_file parameter, not instruction parameter")
+        elif instruction is None:
+            raise ValueError("instruction cannot be None when instruction_file is not provided")
         else:
-            # instruction is a string (not None since first condition handled instruction_file case)
-            if instruction is None:
-                raise ValueError("instruction cannot be None when instruction_file is not provided")
             instruction_content = instruction
-
-        config = agent_config or self._get_default_config()
-        return self._execute_with_timeout(instruction_content, cwd, config, stdin_data=stdin, audit_log_path=audit_log_path)
+        return instruction_content, cwd
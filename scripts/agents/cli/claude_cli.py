@@ -14,15 +14,18 @@ from typing import Any
 from uuid import UUID
 
 from base.backend.utils.uuid_utils import uuid7
+from scripts.agents.cli.async_streaming import execute_async
 from scripts.agents.cli.base_provider import CLIProvider as BaseProvider
 from scripts.agents.cli.config import AgentConfig
 from scripts.agents.cli.config_service import ConfigService
 from scripts.agents.cli.hooks_utils import create_settings_file_from_hooks_config
 from scripts.agents.cli.interface import AgentCLI
 from scripts.agents.cli.provider_type import ProviderType
-from scripts.agents.cli.streaming_utils import load_instruction_with_replacements
 from scripts.agents.config import get_config
 
+# Flags of every stream-json run (print and warm commands)
+STREAM_JSON_OUTPUT_FLAGS = ("--verbose", "--output-format", "stream-json")
+
 
 class ClaudeAgentCLI(BaseProvider, AgentCLI):
     """Implementation of AgentCLI using Claude Code CLI."""
@@ -118,19 +121,7 @@ class ClaudeAgentCLI(BaseProvider, AgentCLI):
         Raises:
             AgentError: If agent execution fails
         """
-        # Handle instruction vs instruction_file
-        if instruction_file is not None:
-            if instruction is not None:
-                raise ValueError("Cannot specify both instruction and instruction_file")
-            instruction_content = load_instruction_with_replacements(instruction_file)
-            if cwd is None:
-                cwd = instruction_file.parent
-        elif isinstance(instruction, Path):
-            # Security restriction: Path should only be passed as instruction_file parameter
-            raise ValueError("Path objects should be passed as instruction_file parameter, not instruction parameter")
-        else:
-            # instruction should be a string or None
-            instruction_content = instruction if instruction is not None else ""
+        instruction_content, cwd = self._resolve_instruction(instruction, cwd, instruction_file)
 
         config = agent_config or self._get_default_config()
 
@@ -152,6 +143,69 @@ class ClaudeAgentCLI(BaseProvider, AgentCLI):
         # Hooks not enabled, use normal flow
         return self._execute_with_timeout(instruction_content, cwd, config, stdin_data=stdin, audit_log_path=audit_log_path)
 
+    async def run_print_async(
+        self,
+        instruction: str | Path | None = None,
+        cwd: Path | None = None,
+        agent_config: AgentConfig | None = None,
+        instruction_file: Path | None = None,
+        stdin: str | None = None,
+    ) -> tuple[str, dict[str, Any] | None]:
+        """Run agent in print mode on the running event loop, with a settings file per run when hooks are enabled.
+
+        Args:
+            instruction: Natural language instruction for the agent (or use instruction_file)
+            cwd: Working directory for agent execution (defaults to current)
+            agent_config: Configuration for agent execution
+            instruction_file: Path to instruction file (alternative to instruction string)
+            stdin: Data to provide to stdin
+
+        Returns:
+            Tuple of (output, metadata) where metadata includes session info
+
+        Raises:
+            AgentError: If agent execution fails
+        """
+        instruction_content, cwd = self._resolve_instruction(instruction, cwd, instruction_file)
+        config = agent_config or self._get_default_config()
+        settings_file = create_settings_file_from_hooks_config(get_config()) if config.enable_hooks else None
+
+        # Set and cleared without an await in between: concurrent runs never see each other's settings file
+        self._temp_settings_file = settings_file
+        try:
+            cmd = self._build_command(instruction_content, cwd, config)
+        finally:
+            self._temp_settings_file = None
+
+        try:
+            return await execute_async(cmd, stdin, cwd, config, get_config())
+        finally:
+            if settings_file is not None:
+                settings_file.unlink(missing_ok=True)
+
+    def _base_command(self, config: AgentConfig) -> list[str]:
+        """Build the start of every Claude CLI command: configured command, model and tool restrictions.
+
+        Shared by _build_command() and _build_warm_command(), so a pooled process runs with the
+        same model and tools as a fresh one.
+
+        Args:
+            config: Agent configuration
+
+        Returns:
+            List of command arguments
+        """
+        # Get the configured Claude command from config service
+        config_service: ConfigService = ConfigService()
+        cmd = [config_service.get_provider_command(ProviderType.CLAUDE), "--model", config.model]
+
+        # Handle allowed/disallowed tools (Claude CLI uses --allowed-tools or --disallowed-tools)
+        if config.allowed_tools is not None:
+            disallowed = self.compute_disallowed_tools(config.allowed_tools)
+            if disallowed:
+                cmd.extend(["--disallowed-tools", *disallowed])
+        return cmd
+
     def _build_command(
         self,
         instruction: str,
@@ -168,14 +222,8 @@ class ClaudeAgentCLI(BaseProvider, AgentCLI):
         Returns:
             List of command arguments
         """
-        # Get the configured Claude command from config service
-        config_service: ConfigService = ConfigService()
-        claude_cmd = config_service.get_provider_command(ProviderType.CLAUDE)
-
-        cmd = [claude_cmd]  # Use the configured command
-
-        # Add model flag
-        cmd.extend(["--model", config.model])
+        # Configured command, model and tool restrictions
+        cmd = self._base_command(config)
 
         # Note: Claude CLI may not support --session flag directly
         # Add session ID if provided and properly formatted as UUID (Claude CLI uses --session-id)
@@ -191,16 +239,6 @@ class ClaudeAgentCLI(BaseProvider, AgentCLI):
                 # This allows for test scenarios with non-UUID session IDs
                 pass
 
-        # Handle allowed/disallowed tools (Claude CLI uses --allowed-tools or --disallowed-tools)
-        if config.allowed_tools is not None:
-            # Add disallowed tools flags
-            disallowed = self.compute_disallowed_tools(config.allowed_tools)
-            if disallowed:
-                cmd.extend(["--disallowed-tools"] + disallowed)
-        else:
-            # All tools allowed by default
-            pass
-
         # Add settings file if it was created for hooks
         if self._temp_settings_file and config.enable_hooks:
             cmd.extend(["--settings", str(self._temp_settings_file)])
@@ -211,7 +249,7 @@ class ClaudeAgentCLI(BaseProvider, AgentCLI):
 
         # Add streaming flag if enabled
         if config.enable_streaming:
-            cmd.extend(["--verbose", "--output-format", "stream-json"])
+            cmd.extend(STREAM_JSON_OUTPUT_FLAGS)
 
         # Add MCP servers if provided
         if config.mcp_servers:
@@ -231,6 +269,32 @@ class ClaudeAgentCLI(BaseProvider, AgentCLI):
 
         return cmd
 
+    def _build_warm_command(
+        self,
+        cwd: Path | None,
+        config: AgentConfig,
+    ) -> list[str] | None:
+        """Build the command of a pre-started Claude CLI process reading stream-json input.
+
+        Only hooks-off streaming runs are pooled: hook settings files are created per run, and
+        the session ID is left to the CLI since the process starts before its caller is known.
+
+        Args:
+            cwd: Working directory for agent execution
+            config: Agent configuration
+
+        Returns:
+            List of command arguments, or None if the config cannot be pooled
+        """
+        if config.enable_hooks or not config.enable_streaming or config.mcp_servers:
+            return None
+
+        cmd = self._base_command(config)
+        cmd.extend([*STREAM_JSON_OUTPUT_FLAGS, "--input-format", "stream-json", "--print"])
+        if cwd:
+            cmd.extend(["--add-dir", str(cwd)])
+        return cmd
+
     def _parse_stream_message(
         self,
         line: str,
@@ -2,6 +2,7 @@
 
 from typing import Any
 
+from scripts.agents.cli.lifecycle import EventListener
 from scripts.agents.cli.provider_type import ProviderType as CLIProvider
 
 
@@ -25,6 +26,8 @@ class AgentConfig:
         timeout: int | None = 180,  # None = no timeout (interactive)
         mcp_servers: dict[str, Any] | None = None,
         capture_content: bool = False,  # When True, content is captured instead of printed directly
+        stop_on_decision: bool = False,  # Return as soon as stream-json output holds an ALLOW/BLOCK decision
+        on_event: EventListener | None = None,  # Receives process lifecycle events (stop_on_decision runs, see cli.lifecycle)
     ):
         self.model = model
         self.session_id = session_id
@@ -35,6 +38,8 @@ class AgentConfig:
         self.timeout = timeout
         self.mcp_servers = mcp_servers
         self.capture_content = capture_content
+        self.stop_on_decision = stop_on_decision
+        self.on_event = on_event
 
 
 class AgentConfigPresets:
@@ -0,0 +1,92 @@
+"""Early-exit detection of moderator decisions in stream-json output.
+
+A moderator's ALLOW/BLOCK is usually complete well before its CLI process exits - the final
+result event and session teardown follow the last assistant message. DecisionRecognizer parses
+stream-json events as they arrive and reports once the final assistant message holds a
+well-formed decision, so the caller can stop reading and reap the process in the background.
+
+Recognized decisions (on their own line, code fences allowed around them):
+    ALLOW
+    ALLOW: <explanation>
+    BLOCK: <reason>
+"""
+
+import json
+import re
+from typing import Any
+
+# Upper-case decision at the start of a line; BLOCK needs a reason to be complete.
+# Anything looser (lower-case, inline mentions) waits for the process to exit as before.
+DECISION_LINE = re.compile(r"^[ \t]*(ALLOW\b|BLOCK:[ \t]*\S)", re.MULTILINE)
+
+# Assistant turns ending with a tool call are not final
+_TOOL_STOP_REASON = "tool_use"
+
+
+def _message_text(message: dict[str, Any]) -> str:
+    """Concatenated text blocks of an assistant message."""
+    content = message.get("content")
+    if not isinstance(content, list):
+        return ""
+    return "".join(str(item.get("text", "")) for item in content if isinstance(item, dict) and item.get("type") == "text")
+
+
+def _is_final(message: dict[str, Any]) -> bool:
+    """Whether an assistant message ends the turn (no tool call)."""
+    if message.get("stop_reason") == _TOOL_STOP_REASON:
+        return False
+    content = message.get("content")
+    return not (isinstance(content, list) and any(isinstance(item, dict) and item.get("type") == "tool_use" for item in content))
+
+
+def _parse_event(line: str) -> dict[str, Any] | None:
+    """Parse a stream-json line that may hold an assistant or result event."""
+    if '"assistant"' not in line and '"result"' not in line:
+        return None
+    try:
+        event = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    return event if isinstance(event, dict) else None
+
+
+class DecisionRecognizer:
+    """Incremental recognizer of the decision in a moderator's stream-json output."""
+
+    def __init__(self) -> None:
+        """Initialize recognizer."""
+        self.decision: str | None = None
+        self.saw_text = False  # Any assistant text seen (first token of the answer)
+        self.turn_complete = False  # Result event seen (the CLI finished answering)
+
+    def feed(self, line: str) -> bool:
+        """Parse one stream-json line.
+
+        Args:
+            line: Raw stdout line of the CLI
+
+        Returns:
+            True once a complete decision has been seen (later lines cannot change it)
+        """
+        # After the decision only the result event still matters
+        if self.decision is None or not self.turn_complete:
+            event = _parse_event(line)
+            if event is not None:
+                self._observe(event)
+        return self.decision is not None
+
+    def _observe(self, event: dict[str, Any]) -> None:
+        """Update state from one stream-json event."""
+        if event.get("type") == "result":
+            self.turn_complete = True
+            return
+        message = event.get("message")
+        if self.decision is not None or event.get("type") != "assistant" or not isinstance(message, dict):
+            return
+
+        text = _message_text(message)
+        if text:
+            self.saw_text = True
+        match = DECISION_LINE.search(text) if text and _is_final(message) else None
+        if match is not None:
+            self.decision = match.group(1).split(":", 1)[0]
@@ -0,0 +1,42 @@
+"""Hook entry point for Claude Code hooks.
+
+Runs one hook validator on the hook input read from stdin. main.py serves every CLI mode and
+imports every executor and the text editor; this entry point imports only the validator
+registry, so hooks run without the resident hook server do not pay for the rest of the CLI.
+
+Emitted into Claude settings by create_settings_file_from_hooks_config (and run in-process by
+hook_client.py when the hook server is unavailable):
+    ami-run scripts/agents/cli/hook_main.py --hook command-guard < hook_input.json
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Standard /base imports pattern to find orchestrator root (also makes scripts.agents importable)
+sys.path.insert(0, str(next(p for p in Path(__file__).resolve().parents if (p / "base").exists())))
+from base.scripts.env.paths import setup_imports
+from dotenv import load_dotenv
+
+from scripts.agents.cli.hook_mode import mode_hook
+from scripts.agents.workflows.registry import HOOK_VALIDATORS
+
+
+def main() -> int:
+    """Run the hook validator named by --hook.
+
+    Returns:
+        Exit code (0=success, 1=failure)
+    """
+    orchestrator_root, _module_root = setup_imports()
+    # Config is read on first use, so the .env values still reach it
+    load_dotenv(orchestrator_root / ".env")
+
+    parser = argparse.ArgumentParser(description="AMI hook validator entry point")
+    parser.add_argument("--hook", metavar="VALIDATOR", required=True, help=f"Hook validator name ({', '.join(HOOK_VALIDATORS)})")
+    args = parser.parse_args()
+    return mode_hook(args.hook)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+"""Hook validator mode for the CLI entry points.
+
+Kept apart from mode_handlers so hook_main.py runs hooks without importing the executors and
+the text editor; the registry imports only the selected validator.
+"""
+
+from scripts.agents.workflows.registry import get_hook_validator
+
+
+def mode_hook(validator_name: str) -> int:
+    """Hook validator mode - Validate hook input from stdin.
+
+    Args:
+        validator_name: Name of validator (malicious-behavior, command-guard, research-validator,
+                        code-quality-core, code-quality-python, response-scanner, shebang-check,
+                        todo-validator, pretooluse-pipeline)
+
+    Returns:
+        Exit code (0=success, 1=failure)
+    """
+    validator_class = get_hook_validator(validator_name)
+
+    if not validator_class:
+        return 1
+
+    validator = validator_class()
+    result: int = validator.run()
+    return result
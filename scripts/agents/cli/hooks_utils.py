@@ -110,9 +110,14 @@ def _convert_hook_info_to_hook_container(hook_info: dict[Any, Any], config: Conf
 
         # Create command field to tell Claude Code to execute external hook
         # Use full path to ami-run wrapper to ensure proper environment
-        # Execute the main.py directly to avoid hybrid script issues
+        # Execute the hook entry point directly to avoid hybrid script issues, or the thin
+        # hook_client.py which forwards to the resident hook server (falls back to hook_main.py)
         ami_run_path = config.root / "scripts" / "ami-run"
-        script_path = config.root / "scripts" / "agents" / "cli" / "main.py"
+        hooks_settings = config.get("hooks", {})
+        if isinstance(hooks_settings, dict) and hooks_settings.get("server", False):
+            script_path = config.root / "scripts" / "agents" / "hook_client.py"
+        else:
+            script_path = config.root / "scripts" / "agents" / "cli" / "hook_main.py"
         converted_hook["command"] = f"{ami_run_path} {script_path} --hook {command_name}"
 
     else:
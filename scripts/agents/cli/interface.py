@@ -60,3 +60,28 @@ class AgentCLI(ABC):
         Raises:
             AgentError: If agent execution fails
         """
+
+    @abstractmethod
+    async def run_print_async(
+        self,
+        instruction: str | Path | None = None,
+        cwd: Path | None = None,
+        agent_config: "AgentConfig | None" = None,
+        instruction_file: Path | None = None,
+        stdin: str | None = None,
+    ) -> tuple[str, dict[str, Any] | None]:
+        """Run agent in print mode without blocking the event loop.
+
+        Args:
+            instruction: Natural language instruction for the agent (or use instruction_file)
+            cwd: Working directory for agent execution (defaults to current)
+            agent_config: Configuration for agent execution
+            instruction_file: Path to instruction file (alternative to instruction string)
+            stdin: Data to provide to stdin
+
+        Returns:
+            Tuple of (output, metadata) where metadata includes session info
+
+        Raises:
+            AgentError: If agent execution fails
+        """
@@ -0,0 +1,86 @@
+"""Lifecycle events of agent CLI processes.
+
+Runs that read stream-json output as it arrives (AgentConfig.stop_on_decision) publish each
+milestone of the process once, in order, to AgentConfig.on_event:
+
+    spawned      - process started (the event carries the process handle)
+    first_byte   - first stdout line (CLI initialized)
+    first_token  - first assistant text
+    decision     - complete ALLOW/BLOCK recognized (detail: ALLOW or BLOCK)
+    exit         - process exited (detail: exit code)
+
+Elapsed times are measured from the spawn, so listeners can react to hangs immediately and
+record latency distributions without reading any log file.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import threading
+import time
+from collections.abc import Callable
+from typing import NamedTuple
+
+from loguru import logger
+
+SPAWNED = "spawned"
+FIRST_BYTE = "first_byte"
+FIRST_TOKEN = "first_token"
+DECISION = "decision"
+EXIT = "exit"
+
+LIFECYCLE_EVENTS = (SPAWNED, FIRST_BYTE, FIRST_TOKEN, DECISION, EXIT)
+
+# Threaded runs publish their Popen handle, asyncio runs (cli.async_streaming) their asyncio process
+AgentProcess = subprocess.Popen[str] | asyncio.subprocess.Process
+
+
+class AgentEvent(NamedTuple):
+    """One lifecycle milestone of an agent process."""
+
+    name: str
+    elapsed: float  # Seconds since spawn
+    process: AgentProcess
+    detail: str | None = None
+
+
+EventListener = Callable[[AgentEvent], None]
+
+
+class LifecyclePublisher:
+    """Publishes the lifecycle events of one process, each at most once."""
+
+    def __init__(self, process: AgentProcess, listener: EventListener | None) -> None:
+        """Initialize publisher (the spawn time is now).
+
+        Args:
+            process: Agent process
+            listener: Callback receiving events, or None to only keep timings
+        """
+        self.process = process
+        self.listener = listener
+        self.started = time.monotonic()
+        self.timings: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, name: str, detail: str | None = None) -> None:
+        """Publish an event unless it was already published.
+
+        Listener errors are logged and never reach the process handling.
+
+        Args:
+            name: Event name (one of LIFECYCLE_EVENTS)
+            detail: Optional detail (decision, exit code)
+        """
+        with self._lock:
+            if name in self.timings:
+                return
+            elapsed = time.monotonic() - self.started
+            self.timings[name] = round(elapsed, 3)
+        if self.listener is None:
+            return
+        try:
+            self.listener(AgentEvent(name, elapsed, self.process, detail))
+        except Exception as e:
+            logger.warning("agent_lifecycle_listener_error", lifecycle_event=name, error=str(e))
@@ -62,10 +62,10 @@ load_dotenv(ORCHESTRATOR_ROOT / ".env")
 # Ensure scripts.automation is importable
 sys.path.insert(0, str(ORCHESTRATOR_ROOT))
 
+from scripts.agents.cli.hook_mode import mode_hook
 from scripts.agents.cli.mode_handlers import (
     mode_audit,
     mode_docs,
-    mode_hook,
     mode_interactive_editor,
     mode_print,
     mode_query,
@@ -92,7 +92,7 @@ def main() -> int:
         metavar="VALIDATOR",
         help=(
             "Hook validator mode (malicious-behavior, command-guard, research-validator, "
-            "code-quality-core, code-quality-python, response-scanner, shebang-check, todo-validator)"
+            "code-quality-core, code-quality-python, response-scanner, shebang-check, todo-validator, pretooluse-pipeline)"
         ),
     )
 
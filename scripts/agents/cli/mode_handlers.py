@@ -17,24 +17,6 @@ from scripts.agents.tasks import TaskExecutor
 from scripts.agents.utils.helpers import (
     validate_path_and_return_code,
 )
-from scripts.agents.workflows.quality_validators import (
-    CoreQualityValidator,
-    PythonQualityValidator,
-    ShebangValidator,
-)
-from scripts.agents.workflows.research_validators import (
-    ResearchValidator,
-)
-from scripts.agents.workflows.response_validators import (
-    ResponseScanner,
-)
-from scripts.agents.workflows.security_validators import (
-    CommandValidator,
-    MaliciousBehaviorValidator,
-)
-from scripts.agents.workflows.todo_validators import (
-    TodoValidatorHook,
-)
 from scripts.cli_components.text_editor import TextEditor
 
 
@@ -123,38 +105,6 @@ def mode_print(instruction_path: str) -> int:
         return 1
 
 
-def mode_hook(validator_name: str) -> int:
-    """Hook validator mode - Validate hook input from stdin.
-
-    Args:
-        validator_name: Name of validator (malicious-behavior, command-guard, research-validator,
-                        code-quality-core, code-quality-python, response-scanner, shebang-check,
-                        todo-validator)
-
-    Returns:
-        Exit code (0=success, 1=failure)
-    """
-    validators = {
-        "malicious-behavior": MaliciousBehaviorValidator,
-        "command-guard": CommandValidator,
-        "research-validator": ResearchValidator,
-        "code-quality-core": CoreQualityValidator,
-        "code-quality-python": PythonQualityValidator,
-        "response-scanner": ResponseScanner,
-        "shebang-check": ShebangValidator,
-        "todo-validator": TodoValidatorHook,
-    }
-
-    validator_class = validators.get(validator_name)
-
-    if not validator_class:
-        return 1
-
-    validator = validator_class()
-    result: int = validator.run()
-    return result
-
-
 def mode_audit(directory_path: str, retry_errors: bool = False, user_instruction: str | None = None) -> int:
     """Batch audit mode - Audit directory for code quality issues.
 
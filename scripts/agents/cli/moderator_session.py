@@ -0,0 +1,333 @@
+"""Long-lived moderator CLI sessions answering successive requests over stream-json stdin.
+
+High-frequency validators (code-quality diff audits, the todo validator) used to spawn a CLI
+process per Edit. A ModeratorSession keeps one process per validator running in stream-json
+input mode and writes each request as a user message; the answer is the stream-json output up
+to the result event that ends the turn, as with a fresh run.
+
+Isolation between requests: after every answer the conversation is reset with /clear before
+the next request is accepted, and the process is replaced after max_requests requests. A
+session whose request or reset fails is discarded; SessionSupervisor restarts it in the
+background and stops restarting for a cooldown after repeated failures, so callers fall back
+to a fresh process per request (see moderator_session_daemon).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import queue
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from scripts.agents.cli.base_provider import CLIProvider
+from scripts.agents.cli.config import AgentConfig
+from scripts.agents.cli.exceptions import AgentError, AgentTimeoutError
+from scripts.agents.cli.process_utils import reap_in_background, start_streaming_process
+from scripts.agents.cli.streaming import ProcessStreams
+from scripts.agents.cli.warm_pool import user_message
+
+# Slash command starting a fresh conversation in the running CLI
+CLEAR_COMMAND = "/clear"
+
+# Defaults for agent.moderator.sessions in automation.yaml
+DEFAULT_MAX_REQUESTS = 50
+DEFAULT_MAX_FAILURES = 3
+DEFAULT_COOLDOWN_SECONDS = 300.0
+
+# Seconds a /clear may take before the session is restarted instead
+RESET_TIMEOUT_SECONDS = 30.0
+
+
+class ModeratorSessionError(AgentError):
+    """Moderator session failed (exited, error result, reset failed or cooling down)."""
+
+
+class ModeratorSession:
+    """One long-lived CLI process answering moderator requests one at a time."""
+
+    def __init__(self, cli: CLIProvider, cmd: list[str], cwd: Path | None, agent_config: AgentConfig, max_requests: int = DEFAULT_MAX_REQUESTS) -> None:
+        """Initialize session (the process starts with the first request or start()).
+
+        Args:
+            cli: Provider whose _parse_stream_message() reads the output
+            cmd: Stream-json input command of the provider (see CLIProvider._build_warm_command)
+            cwd: Working directory
+            agent_config: Moderator config (timeout per request)
+            max_requests: Requests answered before the process is replaced
+        """
+        self.cli = cli
+        self.cmd = cmd
+        self.cwd = cwd
+        self.agent_config = agent_config
+        self.max_requests = max_requests
+        self.requests = 0  # Answered by the current process
+        self.restarts = 0
+        self.last_used = time.monotonic()
+        self.lock = threading.Lock()
+        self._process: subprocess.Popen[str] | None = None
+        self._streams: ProcessStreams | None = None
+        self._dirty = False  # Answered a request since the last reset
+
+    @property
+    def alive(self) -> bool:
+        """Whether the session process is running."""
+        return self._process is not None and self._process.poll() is None
+
+    def _start(self) -> None:
+        """Start a fresh process (caller holds the lock)."""
+        self._stop()
+        # Empty stdin data only requests a stdin pipe; requests are written later
+        self._process = start_streaming_process(self.cmd, "", self.cwd)
+        self._streams = ProcessStreams(self._process)
+        self.requests = 0
+        self._dirty = False
+
+    def _stop(self) -> None:
+        """Stop the process, if any (caller holds the lock)."""
+        process, self._process, self._streams = self._process, None, None
+        if process is None:
+            return
+        with contextlib.suppress(OSError):
+            process.kill()
+        reap_in_background(process)
+
+    def start(self) -> None:
+        """Start (or restart) the process ahead of the next request."""
+        with self.lock:
+            self._start()
+
+    def close(self) -> None:
+        """Stop the process."""
+        with self.lock:
+            self._stop()
+
+    def _send(self, text: str) -> None:
+        """Write one user message (caller holds the lock).
+
+        Raises:
+            ModeratorSessionError: If the process no longer reads its input
+        """
+        if self._process is None or self._process.stdin is None:
+            raise ModeratorSessionError("Moderator session not running")
+        try:
+            self._process.stdin.write(user_message(text, None))
+            self._process.stdin.flush()
+        except (BrokenPipeError, ValueError) as e:
+            raise ModeratorSessionError(f"Moderator session closed its input: {e}") from e
+
+    def _read_turn(self, timeout: float | None) -> list[str]:
+        """Read output lines up to the result event ending the current turn (caller holds the lock).
+
+        Raises:
+            AgentTimeoutError: If the turn does not end within timeout
+            ModeratorSessionError: If the process exits or the turn ends with an error result
+        """
+        if self._streams is None:
+            raise ModeratorSessionError("Moderator session not running")
+        started = time.monotonic()
+        lines: list[str] = []
+        while True:
+            remaining = timeout - (time.monotonic() - started) if timeout else None
+            if remaining is not None and remaining <= 0:
+                raise AgentTimeoutError(int(timeout or 0), self.cmd, time.monotonic() - started)
+            try:
+                line = self._streams.stdout_lines.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if line is None:
+                raise ModeratorSessionError(f"Moderator session exited with code {self._process.wait() if self._process else None}")
+            lines.append(line)
+            _, metadata = self.cli._parse_stream_message(line.rstrip("\n"), self.cmd, len(lines), self.agent_config)
+            if metadata is not None and metadata.get("type") == "result":
+                if metadata.get("is_error"):
+                    raise ModeratorSessionError(f"Moderator session turn failed: {metadata.get('result') or metadata.get('subtype')}")
+                return lines
+
+    def _reset(self) -> None:
+        """Clear the conversation, or replace the process once it reached max_requests (caller holds the lock).
+
+        Raises:
+            AgentError: If the reset fails (the session must be restarted)
+        """
+        if not self._dirty:
+            return
+        if self.requests >= self.max_requests or not self.alive:
+            self._start()
+            return
+        self._send(CLEAR_COMMAND)
+        self._read_turn(RESET_TIMEOUT_SECONDS)
+        self._dirty = False
+
+    def reset_if_idle(self) -> None:
+        """Reset after an answer unless the next request already did (runs in a thread)."""
+        with self.lock:
+            try:
+                self._reset()
+            except AgentError as e:
+                logger.warning("moderator_session_reset_failed", command=self.cmd[0], error=str(e))
+                self._stop()
+
+    def ask(self, request: str) -> tuple[str, dict[str, Any]]:
+        """Answer one request in a clean conversation.
+
+        Args:
+            request: Request text (context followed by the moderator instruction)
+
+        Returns:
+            Tuple of (stream-json output of the turn, metadata)
+
+        Raises:
+            AgentTimeoutError: If the answer takes longer than agent_config.timeout
+            ModeratorSessionError: If the session fails (the caller restarts it)
+        """
+        with self.lock:
+            self.last_used = time.monotonic()
+            started = time.time()
+            if not self.alive:
+                self._start()
+            self._reset()
+            self._send(request)
+            self._dirty = True
+            lines = self._read_turn(self.agent_config.timeout)
+            self.requests += 1
+            metadata: dict[str, Any] = {
+                "duration": time.time() - started,
+                "moderator_session": {"requests": self.requests, "restarts": self.restarts},
+            }
+        # Reset right away so the next request finds a clean conversation
+        threading.Thread(target=self.reset_if_idle, name="moderator-session-reset", daemon=True).start()
+        return "".join(lines), metadata
+
+
+class SessionSupervisor:
+    """Moderator sessions per validator, restarted on failure."""
+
+    def __init__(
+        self,
+        max_requests: int = DEFAULT_MAX_REQUESTS,
+        max_failures: int = DEFAULT_MAX_FAILURES,
+        cooldown: float = DEFAULT_COOLDOWN_SECONDS,
+    ) -> None:
+        """Initialize supervisor.
+
+        Args:
+            max_requests: Requests per session process before it is replaced
+            max_failures: Consecutive failures after which a session is not restarted for cooldown
+            cooldown: Seconds a repeatedly failing session stays down
+        """
+        self.max_requests = max_requests
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.sessions: dict[tuple[str, ...], ModeratorSession] = {}
+        self._failures: dict[tuple[str, ...], int] = {}
+        self._down_until: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def _session(self, key: tuple[str, ...], cli: CLIProvider, cmd: list[str], cwd: Path | None, agent_config: AgentConfig) -> ModeratorSession:
+        """Get (or create) the session of a key.
+
+        Raises:
+            ModeratorSessionError: If the session is cooling down after repeated failures
+        """
+        with self._lock:
+            if time.monotonic() < self._down_until.get(key, 0.0):
+                raise ModeratorSessionError(f"Moderator session {key[0]} is cooling down after repeated failures")
+            session = self.sessions.get(key)
+            if session is None:
+                session = ModeratorSession(cli, cmd, cwd, agent_config, self.max_requests)
+                self.sessions[key] = session
+                logger.info("moderator_session_created", moderator=key[0], command=cmd[0])
+            # Each request brings its own timeout
+            session.agent_config = agent_config
+            return session
+
+    def moderate(self, moderator_name: str, cli: CLIProvider, cwd: Path | None, agent_config: AgentConfig, request: str) -> tuple[str, dict[str, Any]]:
+        """Answer a request in the moderator's session.
+
+        Args:
+            moderator_name: Moderator name (one session per moderator and command)
+            cli: Provider of the moderator
+            cwd: Working directory
+            agent_config: Moderator config (hooks disabled, stream-json output)
+            request: Request text
+
+        Returns:
+            Tuple of (output, metadata)
+
+        Raises:
+            ModeratorSessionError: If the provider has no session support or the session failed
+            AgentError: If the session failed otherwise (e.g. timeout)
+        """
+        cmd = cli._build_warm_command(cwd, agent_config)
+        if cmd is None:
+            raise ModeratorSessionError(f"No moderator session support for this config: {moderator_name}")
+        key = (moderator_name, str(cwd or ""), *cmd)
+        session = self._session(key, cli, cmd, cwd, agent_config)
+        try:
+            result = session.ask(request)
+        except AgentError as e:
+            self._on_failure(key, session, e)
+            raise
+        with self._lock:
+            self._failures.pop(key, None)
+        return result
+
+    def _on_failure(self, key: tuple[str, ...], session: ModeratorSession, error: AgentError) -> None:
+        """Restart a failed session in the background, or take it down after repeated failures."""
+        with self._lock:
+            failures = self._failures.get(key, 0) + 1
+            self._failures[key] = failures
+            down = failures >= self.max_failures
+            if down:
+                self._down_until[key] = time.monotonic() + self.cooldown
+                self._failures.pop(key, None)
+        session.restarts += 1
+        logger.warning("moderator_session_failed", moderator=key[0], failures=failures, cooling_down=down, error_type=type(error).__name__, error=str(error))
+        if down:
+            session.close()
+            return
+
+        def restart() -> None:
+            try:
+                session.start()
+            except AgentError as e:
+                logger.warning("moderator_session_restart_failed", moderator=key[0], error=str(e))
+
+        threading.Thread(target=restart, name="moderator-session-restart", daemon=True).start()
+
+    def close_idle(self, idle_timeout: float) -> None:
+        """Stop sessions without requests for idle_timeout seconds.
+
+        Args:
+            idle_timeout: Seconds without requests
+        """
+        now = time.monotonic()
+        with self._lock:
+            idle = [key for key, session in self.sessions.items() if now - session.last_used > idle_timeout]
+            sessions = [self.sessions.pop(key) for key in idle]
+        for key, session in zip(idle, sessions, strict=True):
+            session.close()
+            logger.info("moderator_session_closed", moderator=key[0], reason="idle")
+
+    def close(self) -> None:
+        """Stop all sessions."""
+        with self._lock:
+            sessions = list(self.sessions.values())
+            self.sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per-moderator session state.
+
+        Returns:
+            {moderator: {"alive": bool, "requests": n, "restarts": n}}
+        """
+        with self._lock:
+            sessions = list(self.sessions.items())
+        return {key[0]: {"alive": session.alive, "requests": session.requests, "restarts": session.restarts} for key, session in sessions}
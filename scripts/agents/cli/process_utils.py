@@ -1,9 +1,12 @@
 """Process-related utility functions for streaming."""
 
+import contextlib
 import os
 import select
 import subprocess
+import threading
 import time
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
@@ -17,6 +20,9 @@ from scripts.agents.cli.exceptions import (
 )
 from scripts.agents.config import get_config
 
+# Seconds a process returned from early may spend on teardown before it is terminated
+REAP_GRACE_SECONDS = 5.0
+
 
 def start_streaming_process(
     cmd: list[str],
@@ -220,3 +226,39 @@ def handle_process_completion(
         "exit_code": process.returncode,
     }
     return stdout, metadata
+
+
+def reap_in_background(
+    process: subprocess.Popen[str], grace: float = REAP_GRACE_SECONDS, on_exit: Callable[[int | None], None] | None = None
+) -> threading.Thread:
+    """Let a process finish its teardown off the caller's path, then make sure it is gone.
+
+    The caller keeps draining the process's pipes; this only waits for the exit and
+    terminates (then kills) the process if it is still running after the grace period.
+
+    Args:
+        process: Process whose output is no longer needed
+        grace: Seconds to wait before terminating
+        on_exit: Optional callback receiving the exit code once the process is gone
+
+    Returns:
+        Started daemon thread doing the reaping
+    """
+
+    def reap() -> None:
+        try:
+            process.wait(timeout=grace)
+        except subprocess.TimeoutExpired:
+            process.terminate()
+            try:
+                process.wait(timeout=grace)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                with contextlib.suppress(OSError):
+                    process.wait()
+        if on_exit is not None:
+            on_exit(process.returncode)
+
+    thread = threading.Thread(target=reap, name=f"reap-{process.pid}", daemon=True)
+    thread.start()
+    return thread
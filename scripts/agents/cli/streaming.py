@@ -3,26 +3,30 @@
 from __future__ import annotations
 
 import os
+import queue
 import subprocess
+import threading
 import time
 from collections.abc import Callable
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import IO, TYPE_CHECKING, Any
 
 from loguru import logger
 
+from scripts.agents.cli.decision_stream import DecisionRecognizer
 from scripts.agents.cli.env_utils import get_unprivileged_env
 from scripts.agents.cli.exceptions import (
     AgentCommandNotFoundError,
     AgentExecutionError,
     AgentTimeoutError,
 )
+from scripts.agents.cli.lifecycle import DECISION, EXIT, FIRST_BYTE, FIRST_TOKEN, SPAWNED, LifecyclePublisher
 from scripts.agents.config import get_config
 
 if TYPE_CHECKING:
     pass
 
-from scripts.agents.cli.process_utils import handle_process_completion, start_streaming_process
+from scripts.agents.cli.process_utils import handle_process_completion, reap_in_background, start_streaming_process
 from scripts.agents.cli.streaming_loops import AgentConfigProtocol, run_streaming_loop
 
 
@@ -48,6 +52,8 @@ def execute_streaming(
         Tuple of (output, metadata)
     """
     if stdin_data is not None:
+        if agent_config is not None and agent_config.stop_on_decision:
+            return _execute_until_decision(cmd, stdin_data, cwd, agent_config, config)
         return _execute_with_stdin(cmd, stdin_data, cwd, agent_config, config)
     return _execute_with_streaming(cmd, stdin_data, cwd, agent_config, config, parse_stream_callback)
 
@@ -66,7 +72,7 @@ def _execute_with_stdin(
     # Run the process with communicate to provide stdin data
     start_time = time.time()
     try:
-        _validate_command(cmd)
+        validate_command(cmd)
 
         # Security review: Command validation already performed above (lines 329-337)
         # The cmd list is validated to be a list of strings with proper path checks
@@ -109,6 +115,159 @@ def _execute_with_stdin(
         raise AgentCommandNotFoundError(cmd[0]) from None
 
 
+def _write_stdin(process: subprocess.Popen[str], stdin_data: str) -> None:
+    """Feed stdin and close it (runs in a thread so stdout is read concurrently)."""
+    if process.stdin is None:
+        return
+    try:
+        process.stdin.write(stdin_data)
+        process.stdin.close()
+    except (BrokenPipeError, ValueError):
+        # Process exited early - its exit status is reported by the reader
+        pass
+
+
+def _drain(stream: IO[str] | None, sink: Callable[[str | None], None]) -> None:
+    """Forward lines of a pipe until EOF, then None (runs in a thread)."""
+    try:
+        if stream is not None:
+            for line in stream:
+                sink(line)
+    except (OSError, ValueError):
+        # Pipe closed under us - treated as EOF
+        pass
+    finally:
+        sink(None)
+
+
+class ProcessStreams:
+    """Output pipes of a process, drained by daemon threads from the start.
+
+    Neither side can block on a full pipe, and the process can keep writing (teardown output,
+    later turns) after a reader has returned.
+    """
+
+    def __init__(self, process: subprocess.Popen[str]) -> None:
+        """Start draining stdout (queued lines, None at EOF) and stderr (collected)."""
+        self.process = process
+        self.stdout_lines: queue.Queue[str | None] = queue.Queue()
+        self.stderr_lines: list[str | None] = []
+        self._stderr_reader = threading.Thread(target=_drain, args=(process.stderr, self.stderr_lines.append), daemon=True)
+        threading.Thread(target=_drain, args=(process.stdout, self.stdout_lines.put), daemon=True).start()
+        self._stderr_reader.start()
+
+    def stderr(self) -> str:
+        """Complete stderr (only once the process has exited)."""
+        self._stderr_reader.join()
+        return "".join(line for line in self.stderr_lines if line is not None)
+
+
+def read_stream(
+    streams: ProcessStreams,
+    cmd: list[str],
+    agent_config: AgentConfigProtocol,
+    lifecycle: LifecyclePublisher,
+    start_time: float,
+    until_result: bool = False,
+) -> tuple[list[str], DecisionRecognizer]:
+    """Read stream-json lines, publishing lifecycle events, until the answer is available.
+
+    Stops at the first of: EOF, a complete decision (agent_config.stop_on_decision) or, with
+    until_result, the result event ending the CLI's turn (processes kept for further turns).
+
+    Returns:
+        Tuple of (lines read, recognizer holding the decision and turn state)
+
+    Raises:
+        AgentTimeoutError: agent_config.timeout passed first (the caller owns the process)
+    """
+    recognizer = DecisionRecognizer()
+    output_lines: list[str] = []
+    while True:
+        remaining = agent_config.timeout - (time.time() - start_time) if agent_config.timeout else None
+        if remaining is not None and remaining <= 0:
+            raise AgentTimeoutError(agent_config.timeout or 0, cmd, time.time() - start_time)
+        try:
+            line = streams.stdout_lines.get(timeout=remaining)
+        except queue.Empty:
+            continue
+        if line is None:
+            break
+        lifecycle.publish(FIRST_BYTE)
+        output_lines.append(line)
+        decided = recognizer.feed(line)
+        if recognizer.saw_text:
+            lifecycle.publish(FIRST_TOKEN)
+        if decided:
+            lifecycle.publish(DECISION, recognizer.decision)
+            if agent_config.stop_on_decision:
+                break
+        if until_result and recognizer.turn_complete:
+            break
+    return output_lines, recognizer
+
+
+def _execute_until_decision(
+    cmd: list[str], stdin_data: str, cwd: Path | None, agent_config: AgentConfigProtocol, config: Any
+) -> tuple[str, dict[str, Any] | None]:
+    """Execute command with stdin, returning as soon as the output holds a moderator decision.
+
+    Reads stream-json lines as they arrive and feeds them to a DecisionRecognizer. Once the
+    final assistant message holds a complete ALLOW/BLOCK, the output read so far is returned
+    and the process finishes its teardown in the background (see reap_in_background).
+    Lifecycle events (see cli.lifecycle) go to agent_config.on_event; their timings are logged
+    and returned in the metadata.
+    Without a decision this behaves like _execute_with_stdin(): the process runs to exit.
+    """
+    validate_command(cmd)
+    start_time = time.time()
+    process = start_streaming_process(cmd, stdin_data, cwd, config)
+    lifecycle = LifecyclePublisher(process, agent_config.on_event)
+    lifecycle.publish(SPAWNED)
+
+    def publish_exit(returncode: int | None) -> None:
+        lifecycle.publish(EXIT, str(returncode))
+
+    streams = ProcessStreams(process)
+    threading.Thread(target=_write_stdin, args=(process, stdin_data), daemon=True).start()
+    try:
+        output_lines, recognizer = read_stream(streams, cmd, agent_config, lifecycle, start_time)
+    except BaseException:
+        process.kill()
+        reap_in_background(process, on_exit=publish_exit)
+        raise
+
+    output = "".join(output_lines)
+    duration = time.time() - start_time
+    if recognizer.decision is None:
+        # Ran to exit without a recognizable decision - report exactly as before
+        process.wait()
+        publish_exit(process.returncode)
+        if process.returncode != 0:
+            raise AgentExecutionError(process.returncode, output, streams.stderr(), cmd)
+        returncode = process.returncode
+    else:
+        returncode = process.poll()
+        reap_in_background(process, on_exit=publish_exit)
+
+    logger.info(
+        "agent_completed",
+        session_id=agent_config.session_id,
+        duration=duration,
+        exit_code=returncode,
+        early_decision=recognizer.decision,
+        lifecycle=lifecycle.timings,
+    )
+    metadata: dict[str, Any] = {
+        "session_id": agent_config.session_id,
+        "duration": duration,
+        "exit_code": returncode,
+        "early_decision": recognizer.decision,
+        "lifecycle": dict(lifecycle.timings),
+    }
+    return output, metadata
+
+
 def _execute_with_streaming(
     cmd: list[str],
     stdin_data: str | None,
@@ -131,7 +290,7 @@ def _execute_with_streaming(
         pass
 
 
-def _validate_command(cmd: list[str]) -> None:
+def validate_command(cmd: list[str]) -> None:
     """Validate command to prevent injection attacks."""
     if not isinstance(cmd, list) or not all(isinstance(arg, str) for arg in cmd):
         raise ValueError(f"Invalid command format: {cmd}")
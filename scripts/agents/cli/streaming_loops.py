@@ -9,6 +9,7 @@ from typing import Any, Protocol
 from loguru import logger
 
 from scripts.agents.cli.exceptions import AgentTimeoutError
+from scripts.agents.cli.lifecycle import EventListener
 from scripts.agents.cli.process_utils import read_streaming_line
 from scripts.agents.cli.streaming_utils import calculate_timeout
 from scripts.agents.cli.timer_utils import TimerDisplay
@@ -24,6 +25,8 @@ class AgentConfigProtocol(Protocol):
     session_id: str
     timeout: int | None
     enable_streaming: bool | None
+    stop_on_decision: bool
+    on_event: EventListener | None
 
 
 # Define a protocol for the provider interface to avoid circular imports
@@ -0,0 +1,482 @@
+"""Warm pool of pre-started agent CLI processes.
+
+Every moderator call used to spawn a fresh CLI process and pay Node startup plus CLI
+initialization before the first token. With agent.warm_pool.enabled, moderators (diff
+audits, completion and todo moderators) instead take a process that was started ahead of time
+in stream-json input mode and is waiting for its request. Pools are kept per profile - the
+provider command (model, tool set) and working directory, everything except the request - and
+topped up to agent.warm_pool.size in the background after each hand-out.
+
+Isolation policy (agent.warm_pool.isolation):
+    process  - one request per process, the CLI exits after answering (default)
+    session  - up to max_uses requests per process; later requests continue the CLI
+               conversation of earlier ones, so only use it where that is acceptable
+
+The pool lives in the moderator session daemon (scripts/agents/moderator_session_daemon.py),
+which outlives the hooks and executors sending it moderator requests (see
+moderator_runner and moderator_session_client.request_warm_run): processes are pre-started and
+refilled there, and each request is answered on one of them. Hooks exit after one validation
+and never keep a pool themselves. Idle processes are killed when the daemon stops. Hit/miss
+counters are added to a shared file after every request, so the hit rate can be inspected with:
+    ami-run -m scripts.agents.cli.warm_pool --stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import atexit
+import contextlib
+import fcntl
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from scripts.agents.cli.decision_stream import DecisionRecognizer
+from scripts.agents.cli.exceptions import AgentCommandNotFoundError, AgentExecutionError
+from scripts.agents.cli.lifecycle import EXIT, SPAWNED, LifecyclePublisher
+from scripts.agents.cli.process_utils import reap_in_background, start_streaming_process
+from scripts.agents.cli.streaming import ProcessStreams, read_stream
+from scripts.agents.cli.streaming_loops import AgentConfigProtocol
+from scripts.agents.config import get_config
+
+ISOLATION_PROCESS = "process"
+ISOLATION_SESSION = "session"
+
+# Defaults for agent.warm_pool in automation.yaml
+DEFAULT_SIZE = 2
+DEFAULT_ISOLATION = ISOLATION_PROCESS
+DEFAULT_MAX_USES = 10
+DEFAULT_STATS = "logs/warm-pool-stats.json"
+
+# Seconds a reused process may take to finish an answer returned early before it is retired
+FINISH_TURN_SECONDS = 30.0
+
+STAT_FIELDS = ("hits", "misses", "spawned", "recycled")
+
+# (working directory, *command) - everything that must match for a process to be reused
+Profile = tuple[str, ...]
+
+
+def request_text(instruction: str, stdin_data: str | None) -> str:
+    """Join the parts of a request as the CLI does for a piped prompt.
+
+    Args:
+        instruction: Prompt otherwise passed as the CLI's positional argument
+        stdin_data: Context otherwise piped to the CLI (precedes the prompt)
+
+    Returns:
+        Request text
+    """
+    return "\n".join(part for part in (stdin_data, instruction) if part)
+
+
+def user_message(instruction: str, stdin_data: str | None) -> str:
+    """Build the stream-json input line of one request.
+
+    Args:
+        instruction: Prompt otherwise passed as the CLI's positional argument
+        stdin_data: Context otherwise piped to the CLI (see request_text())
+
+    Returns:
+        JSON line for the CLI's stdin
+    """
+    text = request_text(instruction, stdin_data)
+    return json.dumps({"type": "user", "message": {"role": "user", "content": [{"type": "text", "text": text}]}}) + "\n"
+
+
+class WarmProcess:
+    """A pre-started CLI process waiting for stream-json input."""
+
+    def __init__(self, process: subprocess.Popen[str], profile: Profile) -> None:
+        """Initialize and start draining the process's output.
+
+        Args:
+            process: CLI process started with stdin open
+            profile: Pool profile the process belongs to
+        """
+        self.process = process
+        self.profile = profile
+        self.streams = ProcessStreams(process)
+        self.uses = 0
+        self.leased = False  # Handed out and expected back (session isolation)
+
+    @property
+    def alive(self) -> bool:
+        """Whether the process is still running."""
+        return self.process.poll() is None
+
+    def send(self, message: str, close: bool) -> None:
+        """Write a request, closing stdin after it when no further request will follow."""
+        if self.process.stdin is None:
+            return
+        try:
+            self.process.stdin.write(message)
+            self.process.stdin.flush()
+            if close:
+                self.process.stdin.close()
+        except (BrokenPipeError, ValueError):
+            # Process exited - its exit status is reported by the reader
+            pass
+
+    def retire(self, lifecycle: LifecyclePublisher | None = None) -> None:
+        """Let the process exit (stdin closed) and reap it in the background."""
+        with contextlib.suppress(OSError, ValueError):
+            if self.process.stdin is not None:
+                self.process.stdin.close()
+        on_exit = (lambda returncode: lifecycle.publish(EXIT, str(returncode))) if lifecycle is not None else None
+        reap_in_background(self.process, on_exit=on_exit)
+
+
+class WarmPool:
+    """Per-profile pools of pre-started CLI processes, refilled in the background."""
+
+    def __init__(
+        self,
+        size: int = DEFAULT_SIZE,
+        isolation: str = DEFAULT_ISOLATION,
+        max_uses: int = DEFAULT_MAX_USES,
+        stats_path: Path | None = None,
+    ) -> None:
+        """Initialize pool.
+
+        Args:
+            size: Idle processes kept per profile
+            isolation: ISOLATION_PROCESS or ISOLATION_SESSION
+            max_uses: Requests per process with ISOLATION_SESSION
+            stats_path: Shared counter file updated by flush_stats(), or None
+        """
+        if isolation not in {ISOLATION_PROCESS, ISOLATION_SESSION}:
+            raise ValueError(f"Unknown warm pool isolation: {isolation}")
+        self.size = size
+        self.max_uses = max(max_uses, 1) if isolation == ISOLATION_SESSION else 1
+        self.stats_path = stats_path
+        self.counters = dict.fromkeys(STAT_FIELDS, 0)
+        self._idle: dict[Profile, deque[WarmProcess]] = {}
+        self._leased: dict[Profile, int] = {}
+        self._spawn_args: dict[Profile, tuple[list[str], Path | None, Any]] = {}
+        self._refilling: set[Profile] = set()
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def _count(self, field: str) -> None:
+        """Increment an in-process counter."""
+        with self._lock:
+            self.counters[field] += 1
+
+    def _spawn(self, profile: Profile) -> WarmProcess:
+        """Start a process waiting for stream-json input."""
+        cmd, cwd, config = self._spawn_args[profile]
+        # Empty stdin data only requests a stdin pipe; requests are written later
+        process = start_streaming_process(cmd, "", cwd, config)
+        self._count("spawned")
+        return WarmProcess(process, profile)
+
+    def acquire(self, cmd: list[str], cwd: Path | None, config: Any = None) -> tuple[WarmProcess, bool]:
+        """Take an idle process of the profile, or start one if none is ready.
+
+        Args:
+            cmd: Warm command of the provider (no prompt, stream-json input)
+            cwd: Working directory
+            config: Configuration object for environment settings
+
+        Returns:
+            Tuple of (process, True if it was pre-started)
+
+        Raises:
+            AgentCommandNotFoundError: If the CLI is not installed
+        """
+        profile: Profile = (str(cwd or ""), *cmd)
+        warm: WarmProcess | None = None
+        with self._lock:
+            self._spawn_args[profile] = (cmd, cwd, config)
+            idle = self._idle.setdefault(profile, deque())
+            while idle and warm is None:
+                candidate = idle.popleft()
+                if candidate.alive:
+                    warm = candidate
+            self.counters["hits" if warm is not None else "misses"] += 1
+
+        hit = warm is not None
+        if warm is None:
+            warm = self._spawn(profile)
+        if warm.uses + 1 < self.max_uses:
+            # Comes back after this request - counts towards the profile's size
+            with self._lock:
+                warm.leased = True
+                self._leased[profile] = self._leased.get(profile, 0) + 1
+        self._refill(profile)
+        return warm, hit
+
+    def _refill(self, profile: Profile) -> None:
+        """Top the profile up to size in a background thread (one refill per profile at a time)."""
+        with self._lock:
+            if self._closed or profile in self._refilling:
+                return
+            self._refilling.add(profile)
+
+        def refill() -> None:
+            try:
+                while True:
+                    with self._lock:
+                        if self._closed or len(self._idle.setdefault(profile, deque())) + self._leased.get(profile, 0) >= self.size:
+                            return
+                    self._return(self._spawn(profile))
+            except (AgentCommandNotFoundError, OSError, ValueError) as e:
+                logger.warning("agent_warm_pool_spawn_error", command=profile[1], error=str(e))
+            finally:
+                with self._lock:
+                    self._refilling.discard(profile)
+
+        threading.Thread(target=refill, name="warm-pool-refill", daemon=True).start()
+
+    def _end_lease(self, warm: WarmProcess) -> None:
+        """Stop counting a handed-out process towards its profile's size."""
+        with self._lock:
+            if warm.leased:
+                warm.leased = False
+                self._leased[warm.profile] -= 1
+
+    def _return(self, warm: WarmProcess) -> None:
+        """Put a process back as idle, or retire it if the pool is full or closed."""
+        self._end_lease(warm)
+        with self._lock:
+            idle = self._idle.setdefault(warm.profile, deque())
+            if not self._closed and warm.alive and len(idle) < self.size:
+                idle.append(warm)
+                return
+        warm.retire()
+
+    def _recycle(self, warm: WarmProcess, lifecycle: LifecyclePublisher | None = None) -> None:
+        """Retire a used process and start its replacement."""
+        self._end_lease(warm)
+        self._count("recycled")
+        warm.retire(lifecycle)
+        self._refill(warm.profile)
+
+    def release(self, warm: WarmProcess, turn_complete: bool, lifecycle: LifecyclePublisher | None = None) -> None:
+        """Recycle a process after a request, per the isolation policy.
+
+        Args:
+            warm: Process handed out by acquire()
+            turn_complete: Whether its answer was read to the end (else it is finished in the background)
+            lifecycle: Publisher receiving the exit event if the process is retired
+        """
+        warm.uses += 1
+        if warm.uses >= self.max_uses or not warm.alive:
+            self._recycle(warm, lifecycle)
+        elif turn_complete:
+            self._return(warm)
+        else:
+            threading.Thread(target=self._finish_turn, args=(warm,), name="warm-pool-finish", daemon=True).start()
+
+    def _finish_turn(self, warm: WarmProcess) -> None:
+        """Read the rest of an answer returned early (decision), then return the process."""
+        recognizer = DecisionRecognizer()
+        deadline = time.monotonic() + FINISH_TURN_SECONDS
+        while not recognizer.turn_complete:
+            try:
+                line = warm.streams.stdout_lines.get(timeout=max(deadline - time.monotonic(), 0.0))
+            except queue.Empty:
+                line = None
+            if line is None:
+                self._recycle(warm)
+                return
+            recognizer.feed(line)
+        self._return(warm)
+
+    def run(self, cmd: list[str], message: str, cwd: Path | None, agent_config: AgentConfigProtocol, config: Any = None) -> tuple[str, dict[str, Any] | None]:
+        """Answer one request on a pooled process.
+
+        Behaves like a fresh stdin-fed run: output is the stream-json read until the answer is
+        complete (exit, or a decision with agent_config.stop_on_decision), and lifecycle events
+        go to agent_config.on_event (spawned carries "warm" or "cold" as detail).
+
+        Args:
+            cmd: Warm command of the provider
+            message: Request line from user_message()
+            cwd: Working directory
+            agent_config: Agent configuration
+            config: Configuration object for environment settings
+
+        Returns:
+            Tuple of (output, metadata)
+
+        Raises:
+            AgentTimeoutError: If agent_config.timeout passes first
+            AgentExecutionError: If the process exits with an error
+        """
+        start_time = time.time()
+        warm, hit = self.acquire(cmd, cwd, config)
+        lifecycle = LifecyclePublisher(warm.process, agent_config.on_event)
+        lifecycle.publish(SPAWNED, "warm" if hit else "cold")
+
+        reusable = warm.uses + 1 < self.max_uses
+        warm.send(message, close=not reusable)
+        try:
+            output_lines, recognizer = read_stream(warm.streams, cmd, agent_config, lifecycle, start_time, until_result=reusable)
+        except BaseException:
+            warm.process.kill()
+            self._recycle(warm, lifecycle)
+            raise
+
+        output = "".join(output_lines)
+        if recognizer.decision is None and not recognizer.turn_complete:
+            # Reached EOF - the process exited
+            warm.process.wait()
+            lifecycle.publish(EXIT, str(warm.process.returncode))
+            if warm.process.returncode != 0:
+                self._recycle(warm, lifecycle)
+                raise AgentExecutionError(warm.process.returncode, output, warm.streams.stderr(), cmd)
+        self.release(warm, recognizer.turn_complete, lifecycle)
+
+        duration = time.time() - start_time
+        logger.info(
+            "agent_completed",
+            session_id=agent_config.session_id,
+            duration=duration,
+            warm_pool="hit" if hit else "miss",
+            early_decision=recognizer.decision,
+            lifecycle=lifecycle.timings,
+        )
+        metadata: dict[str, Any] = {
+            "session_id": agent_config.session_id,
+            "duration": duration,
+            "exit_code": warm.process.poll(),
+            "early_decision": recognizer.decision,
+            "lifecycle": dict(lifecycle.timings),
+            "warm_pool": "hit" if hit else "miss",
+        }
+        return output, metadata
+
+    def stats(self) -> dict[str, float]:
+        """In-process counters and hit rate.
+
+        Returns:
+            Counter values plus hit_rate (hits / hand-outs) and idle process count
+        """
+        with self._lock:
+            result: dict[str, float] = dict(self.counters)
+            result["idle"] = sum(len(idle) for idle in self._idle.values())
+        handouts = result["hits"] + result["misses"]
+        result["hit_rate"] = round(result["hits"] / handouts, 3) if handouts else 0.0
+        return result
+
+    def flush_stats(self) -> None:
+        """Add the in-process counters to the shared stats file and reset them (failures only lose the counts)."""
+        with self._lock:
+            counters = dict(self.counters)
+            self.counters = dict.fromkeys(STAT_FIELDS, 0)
+        if self.stats_path is None or not any(counters.values()):
+            return
+        try:
+            self.stats_path.parent.mkdir(parents=True, exist_ok=True)
+            stats_fd = os.open(self.stats_path, os.O_RDWR | os.O_CREAT, 0o600)
+            with os.fdopen(stats_fd, "r+") as stats_file:
+                # Concurrent processes share the counters - serialize updates
+                fcntl.flock(stats_file.fileno(), fcntl.LOCK_EX)
+                content = stats_file.read()
+                stats = json.loads(content) if content else {}
+                for field, value in counters.items():
+                    stats[field] = int(stats.get(field, 0)) + value
+                stats_file.seek(0)
+                stats_file.truncate()
+                stats_file.write(json.dumps(stats))
+        except (OSError, ValueError) as e:
+            logger.warning("agent_warm_pool_stats_error", path=str(self.stats_path), error=str(e))
+
+    def shutdown(self) -> None:
+        """Kill idle processes, stop refilling and flush the counters."""
+        with self._lock:
+            self._closed = True
+            idle = [warm for processes in self._idle.values() for warm in processes]
+            self._idle.clear()
+        for warm in idle:
+            with contextlib.suppress(OSError):
+                warm.process.kill()
+        logger.info("agent_warm_pool_stats", **self.stats())
+        self.flush_stats()
+
+
+class _SharedPool:
+    """Process-wide pool state: the pool for the current configuration."""
+
+    pool: WarmPool | None = None
+    settings: tuple[int, str, int, Path] | None = None
+    lock = threading.Lock()
+
+
+def shutdown_warm_pool() -> None:
+    """Shut down the process-wide pool, if any (the next get_warm_pool() starts a new one)."""
+    with _SharedPool.lock:
+        pool, _SharedPool.pool, _SharedPool.settings = _SharedPool.pool, None, None
+    if pool is not None:
+        atexit.unregister(pool.shutdown)
+        pool.shutdown()
+
+
+def get_warm_pool() -> WarmPool | None:
+    """Get the process-wide warm pool configured in agent.warm_pool (used by the daemon).
+
+    A pool of an earlier configuration (config reloaded) is shut down and replaced.
+
+    Returns:
+        WarmPool, or None when disabled in config
+    """
+    config = get_config()
+    if not config.get("agent.warm_pool.enabled", False):
+        return None
+    settings = (
+        int(config.get("agent.warm_pool.size", DEFAULT_SIZE)),
+        str(config.get("agent.warm_pool.isolation", DEFAULT_ISOLATION)),
+        int(config.get("agent.warm_pool.max_uses", DEFAULT_MAX_USES)),
+        config.root / config.get("agent.warm_pool.stats", DEFAULT_STATS),
+    )
+    with _SharedPool.lock:
+        previous = _SharedPool.pool
+        if previous is not None and _SharedPool.settings == settings:
+            return previous
+        pool = WarmPool(*settings)
+        atexit.register(pool.shutdown)
+        _SharedPool.pool, _SharedPool.settings = pool, settings
+    if previous is not None:
+        atexit.unregister(previous.shutdown)
+        previous.shutdown()
+    return pool
+
+
+def main() -> int:
+    """Print the shared pool counters.
+
+    Returns:
+        Exit code (0=success)
+    """
+    parser = argparse.ArgumentParser(description="Agent CLI warm pool")
+    parser.add_argument("--stats", action="store_true", help="Print hit/miss/spawn/recycle counters and hit rate as JSON")
+    args = parser.parse_args()
+    if not args.stats:
+        parser.print_help()
+        return 1
+
+    config = get_config()
+    try:
+        stats = json.loads((config.root / config.get("agent.warm_pool.stats", DEFAULT_STATS)).read_text())
+    except (OSError, ValueError):
+        stats = {}
+    result: dict[str, float] = {field: int(stats.get(field, 0)) for field in STAT_FIELDS}
+    handouts = result["hits"] + result["misses"]
+    result["hit_rate"] = round(result["hits"] / handouts, 3) if handouts else 0.0
+    sys.stdout.write(json.dumps(result) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
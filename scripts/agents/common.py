@@ -5,11 +5,12 @@ consistent interfaces across all executor types.
 """
 
 import time
+from collections.abc import Generator
 from datetime import datetime
 from pathlib import Path
 from typing import Any, TypeVar
 
-from scripts.agents.core.base_executor import BaseExecutor
+from scripts.agents.core.base_executor import AgentOutput, AgentRun, BaseExecutor
 from scripts.agents.core.models import UnifiedExecutionAttempt, UnifiedExecutionResult
 from scripts.agents.core.utils import detect_language as core_detect_language
 from scripts.agents.core.utils import parse_completion_marker as base_parse_completion_marker
@@ -205,9 +206,9 @@ class GenericExecutor(BaseExecutor[TResult]):
         # Standard implementation using include patterns
         return any(file_path.match(pattern) for pattern in self.get_include_patterns())
 
-    def execute_single_item(self, item_path: Path, root_dir: Path | None = None, user_instruction: str | None = None) -> TResult:
-        """Execute a single item - to be implemented by subclasses"""
-        raise NotImplementedError("Subclasses must implement execute_single_item()")
+    def item_steps(self, item_path: Path, root_dir: Path | None = None, user_instruction: str | None = None) -> Generator[AgentRun, AgentOutput, TResult]:
+        """Steps of a single item - to be implemented by subclasses"""
+        raise NotImplementedError("Subclasses must implement item_steps()")
 
     def _create_attempt(
         self,
@@ -15,6 +15,15 @@ from base.scripts.env.paths import setup_imports
 ORCHESTRATOR_ROOT, MODULE_ROOT = setup_imports()
 
 
+def _file_signature(path: Path) -> tuple[int, int] | None:
+    """Get (mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
 class Config:
     """Automation configuration."""
 
@@ -31,6 +40,8 @@ class Config:
         """
         self.root = ORCHESTRATOR_ROOT
         self.config_file = config_file or self.root / "scripts/config/automation.yaml"
+        # Taken before reading so an edit during the read is picked up by the next reload check
+        self.signature = _file_signature(self.config_file)
         self._data = self._load()
 
     def _load(self) -> dict[str, Any]:
@@ -159,3 +170,23 @@ def get_config() -> Config:
     if _ConfigSingleton.instance is None:
         _ConfigSingleton.instance = Config()
     return _ConfigSingleton.instance
+
+
+def reload_config_if_changed() -> bool:
+    """Reload the global config if its file changed on disk since it was loaded.
+
+    For long-running processes (the hook server); short-lived ones just call get_config().
+
+    Returns:
+        True if the config was reloaded
+
+    Raises:
+        FileNotFoundError: If config file no longer exists
+        ValueError: If the changed config file is malformed or invalid (the old config is kept)
+        PermissionError: If config file cannot be read
+    """
+    instance = _ConfigSingleton.instance
+    if instance is None or _file_signature(instance.config_file) == instance.signature:
+        return False
+    _ConfigSingleton.instance = Config(instance.config_file)
+    return True
@@ -0,0 +1,110 @@
+"""Formatted moderator contexts shared by the hook processes of one transcript state.
+
+The malicious behavior, todo and completion validators all build moderator context from the
+same transcript, each in its own hook process (or hook server child). Formatted contexts are
+kept in a sidecar store next to the transcript (<transcript>.jsonl.context) together with the
+transcript size and mtime they were built from, so later hooks reuse them until the transcript
+changes. The store only ever holds contexts of the current transcript state, one per
+(todos, checkpoint) variant.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+from pathlib import Path
+
+CONTEXT_MEMO_SUFFIX = ".context"
+
+# Context variants kept per transcript state (todos x checkpoint)
+MAX_CONTEXT_VARIANTS = 4
+
+
+def variant_key(*parts: str) -> str:
+    """Hash the inputs besides the transcript that shape a context.
+
+    Args:
+        *parts: Canonical JSON of todos and checkpoint
+
+    Returns:
+        Hex sha256 digest (parts are length-prefixed so boundaries cannot shift)
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part.encode("utf-8")
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class ContextMemo:
+    """Sidecar store of formatted contexts for one transcript state."""
+
+    def __init__(self, transcript_path: Path, stat: os.stat_result) -> None:
+        """Initialize memo for a transcript (the store is read lazily).
+
+        Args:
+            transcript_path: Path to transcript JSONL file
+            stat: Transcript stat the contexts are built from
+        """
+        self.store_path = transcript_path.with_name(transcript_path.name + CONTEXT_MEMO_SUFFIX)
+        self.version = [stat.st_size, stat.st_mtime_ns]
+
+    def _load(self) -> dict[str, str]:
+        """Read contexts of the current transcript state (stale, missing or corrupt stores are empty)."""
+        try:
+            store = json.loads(self.store_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(store, dict) or store.get("version") != self.version or not isinstance(store.get("contexts"), dict):
+            return {}
+        return {key: text for key, text in store["contexts"].items() if isinstance(text, str)}
+
+    def get(self, key: str) -> str | None:
+        """Look up a context.
+
+        Args:
+            key: Key from variant_key()
+
+        Returns:
+            Formatted context, or None if not built for the current transcript state
+        """
+        return self._load().get(key)
+
+    def put(self, key: str, text: str) -> None:
+        """Store a context, dropping contexts of older transcript states.
+
+        Concurrent hooks may overwrite each other's entries; that only costs a rebuild.
+
+        Args:
+            key: Key from variant_key()
+            text: Formatted context
+
+        Raises:
+            OSError: If the store cannot be written
+        """
+        contexts = self._load()
+        contexts.pop(key, None)
+        contexts[key] = text
+        # Oldest variants first (insertion order)
+        contexts = dict(list(contexts.items())[-MAX_CONTEXT_VARIANTS:])
+        tmp_path = self.store_path.with_name(f"{self.store_path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(tmp_fd, "w") as tmp_file:
+                tmp_file.write(json.dumps({"version": self.version, "contexts": contexts}))
+            tmp_path.replace(self.store_path)
+        except OSError:
+            with contextlib.suppress(OSError):
+                tmp_path.unlink(missing_ok=True)
+            raise
+
+
+__all__ = [
+    "CONTEXT_MEMO_SUFFIX",
+    "MAX_CONTEXT_VARIANTS",
+    "ContextMemo",
+    "variant_key",
+]
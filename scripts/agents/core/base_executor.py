@@ -4,19 +4,24 @@ Security CRITICAL: CACHING IS FORBIDDEN in security-related tasks to ensure real
 This module provides a generic framework for orchestrating worker agents,
 moderator agents, and retry loops with timeout. Supports both sync and
 async parallel modes.
+
+An item's retry loop is written once, as steps (item_steps): a generator yielding the agent
+runs it needs and receiving their output. execute_single_item drives the steps with blocking
+runs; execute_single_item_async drives them on an event loop (cli.async_streaming), so one
+loop can run hundreds of items without a thread per agent.
 """
 
 import asyncio
 import fnmatch
 from abc import ABC, abstractmethod
+from collections.abc import Generator
 from pathlib import Path
-from typing import Any, TypeVar
+from typing import Any, NamedTuple, TypeVar, cast
 
 from loguru import logger
 
 from base.backend.utils.uuid_utils import uuid7
-from base.backend.workers.manager import WorkerPoolManager
-from base.backend.workers.types import PoolConfig, PoolType
+from scripts.agents.cli.config import AgentConfig
 from scripts.agents.cli.factory import get_agent_cli
 from scripts.agents.config import Config, get_config
 from scripts.agents.core.constants import COMMON_EXCLUDE_PATTERNS
@@ -25,6 +30,25 @@ from scripts.agents.core.utils import parse_completion_marker, parse_moderator_r
 
 T = TypeVar("T", bound=UnifiedExecutionResult)
 
+# Items run concurrently in parallel mode (executor.workers in automation.yaml)
+DEFAULT_WORKERS = 4
+
+# Items run concurrently by execute_items_async (executor.async_concurrency in automation.yaml)
+DEFAULT_ASYNC_CONCURRENCY = 200
+
+# Output and metadata of an agent run
+AgentOutput = tuple[str, dict[str, Any] | None]
+
+
+class AgentRun(NamedTuple):
+    """Agent run requested by an item's steps (arguments of run_print/run_print_async)."""
+
+    agent_config: AgentConfig
+    instruction: str | None = None
+    instruction_file: Path | None = None
+    stdin: str | None = None
+    cwd: Path | None = None
+
 
 class BaseExecutor[T: UnifiedExecutionResult](ABC):
     """Abstract base executor for LLM-based orchestration tasks."""
@@ -67,6 +91,18 @@ class BaseExecutor[T: UnifiedExecutionResult](ABC):
         return result
 
     @abstractmethod
+    def item_steps(self, item_path: Path, root_dir: Path | None = None, user_instruction: str | None = None) -> Generator[AgentRun, AgentOutput, T]:
+        """Steps of a single item with retry loop.
+
+        Args:
+            item_path: Path to the item to execute
+            root_dir: Root directory for codebase inspection (defaults to current directory)
+            user_instruction: Optional prepended instruction for the worker
+
+        Returns:
+            Generator yielding agent runs, sent their output, returning the execution result
+        """
+
     def execute_single_item(self, item_path: Path, root_dir: Path | None = None, user_instruction: str | None = None) -> T:
         """Execute a single item with retry loop.
 
@@ -78,6 +114,66 @@ class BaseExecutor[T: UnifiedExecutionResult](ABC):
         Returns:
             Execution result for the item
         """
+        return self.run_steps(self.item_steps(item_path, root_dir, user_instruction))
+
+    async def execute_single_item_async(self, item_path: Path, root_dir: Path | None = None, user_instruction: str | None = None) -> T:
+        """Execute a single item with retry loop on the running event loop.
+
+        Args:
+            item_path: Path to the item to execute
+            root_dir: Root directory for codebase inspection (defaults to current directory)
+            user_instruction: Optional prepended instruction for the worker
+
+        Returns:
+            Execution result for the item
+        """
+        return await self.run_steps_async(self.item_steps(item_path, root_dir, user_instruction))
+
+    def run_steps[R](self, steps: Generator[AgentRun, AgentOutput, R]) -> R:
+        """Drive steps with blocking agent runs (cli.run_print).
+
+        Agent errors are raised inside the steps at the yield, where their retry loop handles them.
+
+        Args:
+            steps: Generator yielding agent runs
+
+        Returns:
+            Value returned by the steps
+        """
+        try:
+            run = next(steps)
+            while True:
+                try:
+                    output = self.cli.run_print(**run._asdict())
+                except BaseException as e:
+                    run = steps.throw(e)
+                else:
+                    run = steps.send(output)
+        except StopIteration as stop:
+            return cast(R, stop.value)
+
+    async def run_steps_async[R](self, steps: Generator[AgentRun, AgentOutput, R]) -> R:
+        """Drive steps with agent runs on the running event loop (cli.run_print_async).
+
+        Agent errors are raised inside the steps at the yield, where their retry loop handles them.
+
+        Args:
+            steps: Generator yielding agent runs
+
+        Returns:
+            Value returned by the steps
+        """
+        try:
+            run = next(steps)
+            while True:
+                try:
+                    output = await self.cli.run_print_async(**run._asdict())
+                except BaseException as e:
+                    run = steps.throw(e)
+                else:
+                    run = steps.send(output)
+        except StopIteration as stop:
+            return cast(R, stop.value)
 
     def execute_items(
         self,
@@ -90,7 +186,7 @@ class BaseExecutor[T: UnifiedExecutionResult](ABC):
 
         Args:
             path: Path to item file OR directory containing items
-            parallel: Enable parallel execution (async mode)
+            parallel: Enable parallel execution (async mode, see _execute_async)
             root_dir: Root directory for codebase inspection (defaults to current directory)
             user_instruction: Optional prepended instruction for all workers
 
@@ -144,7 +240,7 @@ class BaseExecutor[T: UnifiedExecutionResult](ABC):
         return results
 
     async def _execute_async(self, path: Path, root_dir: Path | None = None, user_instruction: str | None = None) -> list[T]:
-        """Execute items in parallel (async mode).
+        """Execute items in parallel (async mode) on the asyncio engine, executor.workers at a time.
 
         Args:
             path: Path to item file OR directory containing items
@@ -154,70 +250,64 @@ class BaseExecutor[T: UnifiedExecutionResult](ABC):
         Returns:
             List of execution results
         """
+        workers = int(self.config.get("executor.workers", DEFAULT_WORKERS))
+        return await self.execute_items_async(path, root_dir, user_instruction, concurrency=workers)
+
+    async def execute_items_async(
+        self,
+        path: Path,
+        root_dir: Path | None = None,
+        user_instruction: str | None = None,
+        concurrency: int | None = None,
+    ) -> list[T]:
+        """Execute items concurrently on the running event loop (asyncio engine).
+
+        No thread is held per running item: agent processes are driven by the event loop (see
+        run_steps_async), so concurrency can be in the hundreds. Parallel mode runs here too,
+        bounded by executor.workers.
+
+        Args:
+            path: Path to item file OR directory containing items
+            root_dir: Root directory for codebase inspection (defaults to current directory)
+            user_instruction: Optional prepended instruction for all workers
+            concurrency: Items run at once (defaults to executor.async_concurrency)
+
+        Returns:
+            List of execution results, in item order
+        """
         item_files = self._find_item_files(path)
-        workers = self.config.get("executor.workers", 4)
+        limit = concurrency or int(self.config.get("executor.async_concurrency", DEFAULT_ASYNC_CONCURRENCY))
 
         self.logger.info(
             "execution_started",
             path=str(path),
             is_single_file=path.is_file(),
             item_count=len(item_files),
-            mode="async",
-            workers=workers,
+            mode="asyncio",
+            concurrency=limit,
             root_dir=str(root_dir) if root_dir else None,
             user_instruction=bool(user_instruction),
             session_id=self.session_id,
             executor_name=self.get_executor_name(),
         )
 
-        # Create thread pool for I/O-bound execution
-        pool_config = PoolConfig(
-            name="executor",
-            pool_type=PoolType.THREAD,
-            min_workers=1,
-            max_workers=workers,
-        )
+        semaphore = asyncio.Semaphore(limit)
 
-        manager = WorkerPoolManager()
-        pool = await manager.create_pool(pool_config)
+        async def run(item_file: Path) -> T:
+            async with semaphore:
+                result = await self.execute_single_item_async(item_file, root_dir, user_instruction)
+            self.logger.info(
+                "item_completed",
+                item=item_file.name,
+                status=result.status,
+                attempts=len(result.attempts),
+                duration=result.total_duration,
+                session_id=self.session_id,
+                executor_name=self.get_executor_name(),
+            )
+            return result
 
-        try:
-            # Submit all items
-            task_ids = []
-            for item_file in item_files:
-                task_id = await pool.submit(self.execute_single_item, item_file, root_dir, user_instruction)
-                task_ids.append(task_id)
-
-            # Collect results
-            results = []
-            for task_id in task_ids:
-                try:
-                    result = await pool.get_result(task_id, timeout=None)
-                    results.append(result)
-
-                    self.logger.info(
-                        "item_completed",
-                        item=result.item_path.name,
-                        status=result.status,
-                        attempts=len(result.attempts),
-                        duration=result.total_duration,
-                        session_id=self.session_id,
-                        executor_name=self.get_executor_name(),
-                    )
-                except Exception as e:
-                    self.logger.error(
-                        "item_result_retrieval_error",
-                        task_id=task_id,
-                        error=str(e),
-                        session_id=self.session_id,
-                        executor_name=self.get_executor_name(),
-                    )
-                    raise
-
-            return results
-
-        finally:
-            await pool.shutdown()
+        return list(await asyncio.gather(*(run(item_file) for item_file in item_files)))
 
     def _find_item_files(self, path: Path) -> list[Path]:
         """Find item file(s) from path using include/exclude patterns.
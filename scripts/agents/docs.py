@@ -7,12 +7,14 @@ Supports both sync (default) and async parallel modes.
 
 import re
 import time
+from collections.abc import Generator
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Literal
 
 from scripts.agents.cli.config import AgentConfigPresets
 from scripts.agents.common import GenericExecutor
+from scripts.agents.core.base_executor import AgentOutput, AgentRun
 from scripts.agents.core.models import UnifiedExecutionAttempt, UnifiedExecutionResult
 
 
@@ -59,8 +61,10 @@ class DocsExecutor(GenericExecutor[UnifiedExecutionResult]):
         )
         return result
 
-    def execute_single_item(self, item_path: Path, root_dir: Path | None = None, user_instruction: str | None = None) -> UnifiedExecutionResult:
-        """Execute a single item with documentation maintenance.
+    def item_steps(
+        self, item_path: Path, root_dir: Path | None = None, user_instruction: str | None = None
+    ) -> Generator[AgentRun, AgentOutput, UnifiedExecutionResult]:
+        """Steps of a single item with documentation maintenance.
 
         Args:
             item_path: Path to the item to process
@@ -68,10 +72,9 @@ class DocsExecutor(GenericExecutor[UnifiedExecutionResult]):
             user_instruction: Optional prepended instruction for the worker
 
         Returns:
-            Doc result for the item
+            Generator yielding the doc's agent runs, returning the doc result
         """
-        # Delegate to the original _execute_single_doc with alias
-        return self._execute_single_doc(item_path, root_dir, user_instruction)
+        return self._doc_steps(item_path, root_dir, user_instruction)
 
     def execute_docs(
         self,
@@ -95,6 +98,26 @@ class DocsExecutor(GenericExecutor[UnifiedExecutionResult]):
         # Since this DocsExecutor was initialized with UnifiedExecutionResult type, execute_items should return list[UnifiedExecutionResult]
         return self.execute_items(directory, parallel, root_dir, user_instruction)
 
+    async def execute_docs_async(
+        self,
+        directory: Path,
+        root_dir: Path | None = None,
+        user_instruction: str | None = None,
+        concurrency: int | None = None,
+    ) -> list[UnifiedExecutionResult]:
+        """Execute documentation maintenance for all .md files in directory concurrently on the running event loop.
+
+        Args:
+            directory: Directory containing .md documentation files
+            root_dir: Root directory for codebase inspection (defaults to current directory)
+            user_instruction: Optional prepended instruction for all docs workers
+            concurrency: Docs maintained at once (defaults to executor.async_concurrency)
+
+        Returns:
+            List of doc results
+        """
+        return await self.execute_items_async(directory, root_dir, user_instruction, concurrency)
+
     def _execute_single_doc(self, doc_file: Path, root_dir: Path | None = None, user_instruction: str | None = None) -> UnifiedExecutionResult:
         """Execute documentation maintenance for a single doc with retry loop.
 
@@ -106,6 +129,21 @@ class DocsExecutor(GenericExecutor[UnifiedExecutionResult]):
         Returns:
             Doc result
         """
+        return self.run_steps(self._doc_steps(doc_file, root_dir, user_instruction))
+
+    def _doc_steps(
+        self, doc_file: Path, root_dir: Path | None = None, user_instruction: str | None = None
+    ) -> Generator[AgentRun, AgentOutput, UnifiedExecutionResult]:
+        """Steps of documentation maintenance for a single doc with retry loop.
+
+        Args:
+            doc_file: Path to .md documentation file
+            root_dir: Root directory for codebase inspection (defaults to current directory)
+            user_instruction: Optional prepended instruction for the docs worker
+
+        Returns:
+            Generator yielding worker and moderator runs, returning the doc result
+        """
         start_time: float = time.time()
         attempts: list[UnifiedExecutionAttempt] = []
         timeout: int = self.config.get("docs.timeout_per_doc", 600)
@@ -153,7 +191,7 @@ class DocsExecutor(GenericExecutor[UnifiedExecutionResult]):
                 # Execute worker with streaming enabled
                 worker_config = AgentConfigPresets.task_worker(self.session_id)
                 worker_config.enable_streaming = True
-                worker_output, _ = self.cli.run_print(
+                worker_output, _ = yield AgentRun(
                     instruction=full_instruction,
                     stdin="",
                     agent_config=worker_config,
@@ -232,7 +270,7 @@ class DocsExecutor(GenericExecutor[UnifiedExecutionResult]):
                     # Moderator uses streaming too for consistency
                     moderator_config = AgentConfigPresets.task_moderator(self.session_id)
                     moderator_config.enable_streaming = True
-                    moderator_output, _ = self.cli.run_print(
+                    moderator_output, _ = yield AgentRun(
                         instruction=moderator_instruction,
                         stdin="",
                         agent_config=moderator_config,
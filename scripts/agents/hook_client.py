@@ -0,0 +1,200 @@
+"""Thin client forwarding Claude Code hook input to the resident hook server.
+
+Running a hook through scripts/agents/cli/hook_main.py starts a fresh interpreter that
+imports every validator and loads config and patterns before doing any work. This client only uses the standard library: it forwards the stdin JSON to the
+hook server (scripts/agents/hook_server.py) over a unix socket and relays the validator's
+output. When the server is not running - or its socket is not private to the current user
+(see user_socket) - the hook runs in-process exactly as before and a server is started in the
+background for the next hook (disable with AMI_HOOK_SERVER_AUTOSTART=0).
+
+Emitted into Claude settings by create_settings_file_from_hooks_config:
+    ami-run scripts/agents/hook_client.py --hook command-guard < hook_input.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import runpy
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Run as a script (ami-run scripts/agents/hook_client.py) - make scripts.agents importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from scripts.agents.user_socket import connect_user_socket, ensure_socket_dir, get_user_socket_path
+
+_ROOT = Path(__file__).resolve().parents[2]
+
+# Environment variables overriding the server socket path / disabling autostart
+HOOK_SOCKET_ENV_VAR = "AMI_HOOK_SERVER_SOCKET"
+AUTOSTART_ENV_VAR = "AMI_HOOK_SERVER_AUTOSTART"
+
+# A running server accepts immediately - anything slower means it is wedged or gone
+CONNECT_TIMEOUT_SECONDS = 1.0
+
+# Resource limits (DoS protection, same input limit as HookInput)
+MAX_HOOK_INPUT_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_RESPONSE_SIZE = 1024 * 1024  # 1MB
+
+# Another hook started a server this recently - do not start a second one
+SERVER_START_GRACE_SECONDS = 30
+
+
+def get_hook_socket_path() -> Path:
+    """Get the hook server socket path for the current user.
+
+    Returns:
+        $AMI_HOOK_SERVER_SOCKET if set, otherwise hook-server.sock in the per-user socket directory
+    """
+    return get_user_socket_path("hook-server.sock", HOOK_SOCKET_ENV_VAR)
+
+
+def get_start_marker_path(socket_path: Path) -> Path:
+    """Get the marker file written while a server is starting.
+
+    Args:
+        socket_path: Hook server socket path
+
+    Returns:
+        Path of <socket>.starting
+    """
+    return socket_path.with_name(socket_path.name + ".starting")
+
+
+def forward_hook(validator_name: str, data: str, socket_path: Path | None = None) -> str | None:
+    """Run a hook validator on the resident server.
+
+    Args:
+        validator_name: Validator name (e.g. command-guard)
+        data: Raw hook input JSON
+        socket_path: Socket to connect to (defaults to get_hook_socket_path())
+
+    Returns:
+        Validator output line, or None if the server is unavailable, untrusted or failed
+    """
+    sock = connect_user_socket(socket_path or get_hook_socket_path(), CONNECT_TIMEOUT_SECONDS)
+    if sock is None:
+        return None
+
+    try:
+        with sock:
+            # Validators may run a moderator for minutes - the hook timeout bounds the wait
+            sock.settimeout(None)
+            sock.sendall(json.dumps({"hook": validator_name, "input": data}).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as stream:
+                line = stream.readline(MAX_RESPONSE_SIZE + 1)
+        response = json.loads(line)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(response, dict) or not response.get("ok") or not isinstance(response.get("output"), str):
+        return None
+    return str(response["output"])
+
+
+def is_server_listening(socket_path: Path) -> bool:
+    """Check whether a hook server accepts connections on a socket.
+
+    Args:
+        socket_path: Hook server socket path
+
+    Returns:
+        True if a server is listening
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        probe.settimeout(CONNECT_TIMEOUT_SECONDS)
+        try:
+            probe.connect(str(socket_path))
+        except OSError:
+            return False
+    return True
+
+
+def start_server(socket_path: Path) -> bool:
+    """Start a hook server in the background unless one is already starting.
+
+    Args:
+        socket_path: Socket the server should listen on
+
+    Returns:
+        True if a server process was spawned (False while one is starting or if the socket
+        directory is not private to the current user)
+    """
+    marker = get_start_marker_path(socket_path)
+    try:
+        # The marker and the server's socket live in the private socket directory
+        ensure_socket_dir(socket_path)
+    except OSError:
+        return False
+    try:
+        if time.time() - marker.stat().st_mtime < SERVER_START_GRACE_SECONDS:
+            return False
+        marker.unlink()
+    except FileNotFoundError:
+        pass
+
+    try:
+        os.close(os.open(marker, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600))
+        subprocess.Popen(
+            [str(_ROOT / "scripts" / "ami-run"), "-m", "scripts.agents.hook_server", "--socket", str(socket_path)],
+            cwd=_ROOT,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        return False
+    return True
+
+
+def run_in_process(validator_name: str, data: str) -> int:
+    """Run the hook through the hook entry point (cli/hook_main.py) in this process.
+
+    Args:
+        validator_name: Validator name (e.g. command-guard)
+        data: Raw hook input JSON (already read from stdin)
+
+    Returns:
+        Exit code of the hook
+    """
+    main_path = _ROOT / "scripts" / "agents" / "cli" / "hook_main.py"
+    sys.argv = [str(main_path), "--hook", validator_name]
+    sys.stdin = io.StringIO(data)
+    try:
+        runpy.run_path(str(main_path), run_name="__main__")
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 1
+    return 0
+
+
+def main() -> int:
+    """Forward one hook invocation to the server, falling back to in-process execution.
+
+    Returns:
+        Exit code (0=success)
+    """
+    parser = argparse.ArgumentParser(description="Thin client for the resident hook server")
+    parser.add_argument("--hook", metavar="VALIDATOR", required=True, help="Hook validator name (see hooks.yaml)")
+    args = parser.parse_args()
+
+    data = sys.stdin.read(MAX_HOOK_INPUT_SIZE + 1)
+    socket_path = get_hook_socket_path()
+    output = forward_hook(args.hook, data, socket_path)
+    if output is not None:
+        sys.stdout.write(output + "\n")
+        sys.stdout.flush()
+        return 0
+
+    if os.environ.get(AUTOSTART_ENV_VAR, "1") != "0" and not is_server_listening(socket_path):
+        start_server(socket_path)
+    return run_in_process(args.hook, data)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""Resident hook server keeping validators, config and patterns warm.
+
+A hook run through scripts/agents/cli/hook_main.py pays for a fresh interpreter, the imports
+of its validator, and config/pattern loading on every tool call. This server imports the
+validators and loads config and pattern files once (automation.yaml and pattern files are
+re-parsed when their mtime or size changes); each hook request is then handled in a process
+forked from the warm server, so validators keep their per-process semantics (signals, module
+state) without the start-up cost.
+hooks.yaml is not read here - it only feeds the Claude settings file, which Claude Code loads
+at session start.
+
+Protocol: one JSON request line per connection, answered by one JSON response line:
+    {"hook": "command-guard", "input": "<raw hook input JSON>"}
+    {"ok": true, "output": "<validator output line>"} or {"ok": false, "error": "..."}
+
+Hooks reach the server through scripts/agents/hook_client.py, which starts it on demand.
+Run manually with:
+    ami-run -m scripts.agents.hook_server [--socket PATH] [--idle-timeout SECONDS]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import socketserver
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from scripts.agents.config import get_config, reload_config_if_changed
+from scripts.agents.hook_client import (
+    MAX_HOOK_INPUT_SIZE,
+    get_hook_socket_path,
+    get_start_marker_path,
+    is_server_listening,
+)
+from scripts.agents.tokenizer import get_encoding
+from scripts.agents.user_socket import ensure_socket_dir
+from scripts.agents.validation.pattern_registry import get_pattern_registry
+from scripts.agents.workflows.registry import HOOK_VALIDATORS, get_hook_validator
+
+# The server exits after this long without hook requests (agent sessions ended)
+IDLE_TIMEOUT_SECONDS = 60 * 60
+
+# Interval at which idle time is checked and finished children are reaped
+POLL_INTERVAL_SECONDS = 1.0
+
+# Request line: JSON-escaped hook input plus envelope
+MAX_REQUEST_SIZE = 2 * MAX_HOOK_INPUT_SIZE
+
+
+class HookServer(socketserver.ForkingUnixStreamServer):
+    """Unix socket server running each hook request in a fork of the warm process."""
+
+    def __init__(self, socket_path: Path, idle_timeout: float = IDLE_TIMEOUT_SECONDS) -> None:
+        """Bind the server socket.
+
+        Args:
+            socket_path: Unix socket path (created with owner-only permissions)
+            idle_timeout: Seconds without requests before the server exits
+        """
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.last_request = time.monotonic()
+        self.timeout = POLL_INTERVAL_SECONDS
+        super().__init__(str(socket_path), HookRequestHandler)
+
+    def server_bind(self) -> None:
+        """Bind the socket in the private socket directory and restrict it to the current user."""
+        ensure_socket_dir(self.socket_path)
+        super().server_bind()
+        self.socket_path.chmod(0o600)
+
+    def warm_up(self) -> None:
+        """Load config and pattern files, import and build every validator once and load the tokenizer before forking."""
+        get_pattern_registry(get_config().root).preload()
+        for validator_name in HOOK_VALIDATORS:
+            validator_class = get_hook_validator(validator_name)
+            if validator_class is not None:
+                validator_class()
+        try:
+            get_encoding()
+        except Exception as e:
+            # Only the response scanner needs it - it loads on demand in the forked child
+            logger.warning("hook_server_tokenizer_unavailable", error=str(e))
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        """Record activity, reload edited config and pattern files, then fork to handle the request."""
+        self.last_request = time.monotonic()
+        # Re-parse changed YAML here so children inherit it instead of each re-parsing it
+        try:
+            if reload_config_if_changed():
+                logger.info("hook_server_config_reloaded", config=str(get_config().config_file))
+        except (OSError, ValueError) as e:
+            # Half-written edit - keep serving with the last valid config
+            logger.warning("hook_server_config_reload_failed", error=str(e))
+        get_pattern_registry(get_config().root).preload()
+        super().process_request(request, client_address)
+
+    def serve_until_idle(self) -> None:
+        """Handle requests until none arrived for idle_timeout seconds."""
+        while time.monotonic() - self.last_request < self.idle_timeout:
+            self.handle_request()
+            self.collect_children()
+
+    def server_close(self) -> None:
+        """Close and remove the socket."""
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+class HookRequestHandler(socketserver.StreamRequestHandler):
+    """Handle one hook request (runs in the forked child)."""
+
+    def handle(self) -> None:
+        """Read request, run the validator and write the response line."""
+        line = self.rfile.readline(MAX_REQUEST_SIZE + 1)
+        try:
+            if len(line) > MAX_REQUEST_SIZE:
+                raise ValueError(f"Request too large (>{MAX_REQUEST_SIZE} bytes)")
+            request = json.loads(line)
+            if not isinstance(request, dict) or not isinstance(request.get("input"), str):
+                raise TypeError("Request must be a JSON object with an input string")
+            validator_class = get_hook_validator(str(request.get("hook")))
+            if validator_class is None:
+                raise ValueError(f"Unknown hook validator: {request.get('hook')}")
+            response: dict[str, Any] = {"ok": True, "output": validator_class().handle(request["input"])}
+        except (ValueError, TypeError) as e:
+            response = {"ok": False, "error": str(e)}
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+def main() -> int:
+    """Run the hook server until idle.
+
+    Returns:
+        Exit code (0=success)
+    """
+    parser = argparse.ArgumentParser(description="Resident hook server for Claude Code hooks")
+    parser.add_argument("--socket", type=Path, default=get_hook_socket_path(), help="Unix socket path")
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT_SECONDS, help="Seconds without requests before exiting")
+    args = parser.parse_args()
+
+    start_marker = get_start_marker_path(args.socket)
+    try:
+        ensure_socket_dir(args.socket)
+        if args.socket.exists():
+            if is_server_listening(args.socket):
+                logger.error("hook_server_start_failed", error=f"Hook server already running on {args.socket}")
+                return 1
+            args.socket.unlink()
+
+        with HookServer(args.socket, idle_timeout=args.idle_timeout) as server:
+            server.warm_up()
+            start_marker.unlink(missing_ok=True)
+            logger.info("hook_server_started", socket=str(args.socket), pid=os.getpid())
+            with contextlib.suppress(KeyboardInterrupt):
+                server.serve_until_idle()
+            logger.info("hook_server_stopped", socket=str(args.socket))
+    except PermissionError as e:
+        logger.error("hook_server_start_failed", error=str(e))
+        return 1
+    finally:
+        start_marker.unlink(missing_ok=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
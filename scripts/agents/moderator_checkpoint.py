@@ -0,0 +1,247 @@
+"""Validated-prefix checkpoints for incremental completion moderation.
+
+Long sessions hit Stop repeatedly, and every completion moderator run re-sends up to
+MAX_MODERATOR_MESSAGE_COUNT messages although an earlier run already validated most of
+them. After an ALLOW, a checkpoint is stored next to the transcript
+(<transcript>.jsonl.checkpoint) holding the digest of the last validated message (the
+anchor), the user's requests up to it and the moderator's explanations of what it
+validated. Later runs send the requests verbatim (the original request first - completion is
+judged against it), the explanations, and only the messages after the anchor.
+
+A checkpoint is only used while its anchor is still among the last messages of the
+transcript; otherwise the full context is built as before.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, TypedDict
+
+from scripts.agents.transcript import _parse_message_from_json, format_message_block, get_last_n_messages, iter_lines_reverse
+
+CHECKPOINT_SUFFIX = ".checkpoint"
+
+# Moderator explanations kept per session (oldest dropped first)
+MAX_CHECKPOINT_SUMMARIES = 5
+MAX_SUMMARY_CHARS = 600
+
+# User requests kept per session: the original request plus the most recent ones
+MAX_CHECKPOINT_REQUESTS = 10
+MAX_REQUEST_CHARS = 8000
+
+# User-type messages that are not requests (tool results, interruptions, hook feedback)
+_NON_REQUEST_PREFIXES = ("[Tool Result]", "[Request interrupted", "Stop hook feedback:", "# COMPLETION VALIDATION")
+
+
+class ModeratorCheckpoint(TypedDict):
+    """Last validated position of a transcript and what was validated up to it."""
+
+    anchor: str
+    requests: list[dict[str, str | None]]
+    summaries: list[str]
+    created: str
+
+
+def get_checkpoint_path(transcript_path: Path) -> Path:
+    """Get checkpoint sidecar path for a transcript.
+
+    Args:
+        transcript_path: Path to transcript JSONL file
+
+    Returns:
+        Path of <transcript>.jsonl.checkpoint
+    """
+    return transcript_path.with_name(transcript_path.name + CHECKPOINT_SUFFIX)
+
+
+def message_digest(msg: dict[str, str | None]) -> str:
+    """Digest a message as it appears in moderator context.
+
+    Args:
+        msg: Message dictionary with type/text/timestamp
+
+    Returns:
+        Hex digest of the formatted message block
+    """
+    return hashlib.blake2b(format_message_block(msg).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def read_checkpoint_anchor(transcript_path: Path) -> str | None:
+    """Get the anchor a checkpoint taken now would have.
+
+    Args:
+        transcript_path: Path to transcript JSONL file
+
+    Returns:
+        Digest of the last message, or None if the transcript has no messages or cannot be read
+    """
+    try:
+        messages = get_last_n_messages(transcript_path, 1)
+    except (OSError, UnicodeDecodeError):
+        return None
+    return message_digest(messages[-1]) if messages else None
+
+
+def load_checkpoint(transcript_path: Path) -> ModeratorCheckpoint | None:
+    """Load the checkpoint of a transcript.
+
+    Args:
+        transcript_path: Path to transcript JSONL file
+
+    Returns:
+        Checkpoint, or None if missing or malformed
+    """
+    try:
+        data: Any = json.loads(get_checkpoint_path(transcript_path).read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    anchor = data.get("anchor")
+    requests = data.get("requests")
+    summaries = data.get("summaries")
+    if not isinstance(anchor, str) or not isinstance(summaries, list) or not all(isinstance(s, str) for s in summaries):
+        return None
+    # Checkpoints without the user's requests cannot stand in for the validated prefix
+    if not isinstance(requests, list) or not all(isinstance(r, dict) and isinstance(r.get("text"), str) for r in requests):
+        return None
+    return ModeratorCheckpoint(anchor=anchor, requests=requests, summaries=summaries, created=str(data.get("created", "")))
+
+
+def _is_user_request(msg: dict[str, str | None]) -> bool:
+    """Check whether a parsed message is a request typed by the user."""
+    return msg.get("type") == "user" and not (msg.get("text") or "").startswith(_NON_REQUEST_PREFIXES)
+
+
+def _read_requests(transcript_path: Path, anchor: str, previous: ModeratorCheckpoint | None) -> list[dict[str, str | None]]:
+    """Read the user requests validated up to anchor.
+
+    Scans backwards from the anchor to the previous checkpoint's anchor (or the start of the
+    transcript) and appends the requests found there to the previous checkpoint's. The
+    original request is always kept, then the most recent ones.
+
+    Args:
+        transcript_path: Path to transcript JSONL file
+        anchor: Digest of the last validated message
+        previous: Checkpoint the validation started from
+
+    Returns:
+        Requests, oldest first
+    """
+    known = previous["requests"] if previous else []
+    if previous and previous["anchor"] == anchor:
+        return known
+
+    stop = previous["anchor"] if previous else None
+    found: list[dict[str, str | None]] = []
+    reached = False
+    try:
+        for line in iter_lines_reverse(transcript_path):
+            msg = _parse_message_from_json(line) if line else None
+            if msg is None:
+                continue
+            digest = message_digest(msg)
+            if not reached:
+                # Messages appended after the anchor were not validated
+                reached = digest == anchor
+                if not reached:
+                    continue
+            elif digest == stop:
+                break
+            if _is_user_request(msg):
+                found.append({"type": "user", "text": (msg.get("text") or "")[:MAX_REQUEST_CHARS], "timestamp": msg.get("timestamp")})
+    except (OSError, UnicodeDecodeError):
+        return known
+
+    requests = [*known, *reversed(found)]
+    if len(requests) > MAX_CHECKPOINT_REQUESTS:
+        requests = [requests[0], *requests[-(MAX_CHECKPOINT_REQUESTS - 1) :]]
+    return requests
+
+
+def save_checkpoint(transcript_path: Path, anchor: str, summary: str, previous: ModeratorCheckpoint | None = None) -> ModeratorCheckpoint:
+    """Record that messages up to anchor were validated.
+
+    Args:
+        transcript_path: Path to transcript JSONL file
+        anchor: Digest of the last message the moderator saw (see read_checkpoint_anchor)
+        summary: Moderator explanation of the ALLOW decision
+        previous: Checkpoint the validation started from (its summaries are carried over)
+
+    Returns:
+        Saved checkpoint (with the user's requests up to anchor, see _read_requests())
+
+    Raises:
+        OSError: If the checkpoint cannot be written
+    """
+    summaries = [*previous["summaries"], summary[:MAX_SUMMARY_CHARS]] if previous else [summary[:MAX_SUMMARY_CHARS]]
+    checkpoint = ModeratorCheckpoint(
+        anchor=anchor,
+        requests=_read_requests(transcript_path, anchor, previous),
+        summaries=summaries[-MAX_CHECKPOINT_SUMMARIES:],
+        created=datetime.now().isoformat(),
+    )
+
+    # Write-then-rename so concurrent hooks never read a partial checkpoint
+    checkpoint_path = get_checkpoint_path(transcript_path)
+    tmp_path = checkpoint_path.with_name(f"{checkpoint_path.name}.{os.getpid()}.tmp")
+    tmp_fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(tmp_fd, "w") as f:
+        json.dump(checkpoint, f)
+    tmp_path.replace(checkpoint_path)
+    return checkpoint
+
+
+def messages_since_checkpoint(messages: list[dict[str, str | None]], checkpoint: ModeratorCheckpoint) -> list[dict[str, str | None]] | None:
+    """Get the messages appended after a checkpoint's anchor.
+
+    Args:
+        messages: Last messages of the transcript, oldest first
+        checkpoint: Checkpoint to validate against the messages
+
+    Returns:
+        Messages after the anchor, or None if the anchor is not among the messages
+        or nothing was appended since
+    """
+    for i in range(len(messages) - 1, -1, -1):
+        if message_digest(messages[i]) == checkpoint["anchor"]:
+            return messages[i + 1 :] or None
+    return None
+
+
+def format_checkpoint_summary(checkpoint: ModeratorCheckpoint) -> str:
+    """Format checkpoint summaries as a moderator context section.
+
+    Args:
+        checkpoint: Checkpoint whose summaries are formatted
+
+    Returns:
+        Section placed before EXHIBIT A: the user's requests verbatim, then what was validated
+    """
+    requests = "".join(format_message_block(request) for request in checkpoint["requests"])
+    lines = "\n".join(f"- {summary}" for summary in checkpoint["summaries"])
+    return (
+        "# Previously Validated Work\n\n"
+        "Earlier messages of this conversation were already validated (ALLOW) and are not repeated below.\n"
+        "The user's requests from those messages, oldest first (the work must still satisfy them):\n\n"
+        f"{requests}"
+        f"Moderator explanations, oldest first:\n\n{lines}\n\n"
+    )
+
+
+__all__ = [
+    "CHECKPOINT_SUFFIX",
+    "MAX_CHECKPOINT_REQUESTS",
+    "ModeratorCheckpoint",
+    "format_checkpoint_summary",
+    "get_checkpoint_path",
+    "load_checkpoint",
+    "message_digest",
+    "messages_since_checkpoint",
+    "read_checkpoint_anchor",
+    "save_checkpoint",
+]
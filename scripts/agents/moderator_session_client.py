@@ -0,0 +1,162 @@
+"""Client for the moderator session daemon.
+
+Validators listed in agent.moderator.sessions.validators send their moderator requests to the
+daemon (scripts/agents/moderator_session_daemon.py), which answers them in a long-lived CLI
+session per validator instead of a fresh CLI process per request. Other moderators are
+answered on a pre-started process of the daemon's warm pool (see cli.warm_pool) when
+agent.warm_pool.enabled is set. Every call returns None when the daemon is not running or
+cannot answer, so callers fall back to a fresh process. Sockets not owned by the current user
+are ignored (see user_socket).
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+from scripts.agents.user_socket import connect_user_socket, get_user_socket_path
+
+# Environment variable overriding the daemon socket path
+SOCKET_ENV_VAR = "AMI_MODERATOR_SESSION_SOCKET"
+
+# A running daemon accepts immediately - anything slower means it is wedged or gone
+CONNECT_TIMEOUT_SECONDS = 1.0
+
+# Added to the moderator timeout while waiting for an answer (session restart, reset)
+ANSWER_GRACE_SECONDS = 30.0
+
+# Resource limits (DoS protection)
+MAX_REQUEST_SIZE = 16 * 1024 * 1024  # 16MB
+MAX_RESPONSE_SIZE = 16 * 1024 * 1024  # 16MB
+
+
+def get_socket_path() -> Path:
+    """Get the daemon socket path for the current user.
+
+    Returns:
+        $AMI_MODERATOR_SESSION_SOCKET if set, otherwise moderator-sessions.sock in the
+        per-user socket directory
+    """
+    return get_user_socket_path("moderator-sessions.sock", SOCKET_ENV_VAR)
+
+
+def _exchange(payload: dict[str, Any], timeout: int | None, socket_path: Path | None) -> tuple[str, dict[str, Any]] | None:
+    """Send one request to the daemon and read its answer.
+
+    Args:
+        payload: Request object
+        timeout: Seconds the answer may take (None = no limit)
+        socket_path: Socket to connect to (defaults to get_socket_path())
+
+    Returns:
+        Tuple of (output, metadata), or None if the daemon is unavailable, not owned by the
+        current user or failed
+    """
+    sock = connect_user_socket(socket_path or get_socket_path(), CONNECT_TIMEOUT_SECONDS)
+    if sock is None:
+        return None
+
+    try:
+        with sock:
+            sock.settimeout(timeout + ANSWER_GRACE_SECONDS if timeout else None)
+            sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as stream:
+                line = stream.readline(MAX_RESPONSE_SIZE + 1)
+        response = json.loads(line)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(response, dict) or not response.get("ok"):
+        return None
+    result = response.get("result")
+    if not isinstance(result, dict) or not isinstance(result.get("output"), str):
+        return None
+    metadata = result.get("metadata")
+    return result["output"], metadata if isinstance(metadata, dict) else {}
+
+
+def request_moderation(
+    moderator_name: str,
+    request: str,
+    model: str,
+    allowed_tools: list[str] | None,
+    cwd: Path | None,
+    timeout: int | None,
+    provider: str = "claude",
+    socket_path: Path | None = None,
+) -> tuple[str, dict[str, Any]] | None:
+    """Answer a moderator request in the daemon's session for the moderator.
+
+    Args:
+        moderator_name: Moderator name (e.g. todo_validator)
+        request: Request text (context followed by the moderator instruction)
+        model: Moderator model
+        allowed_tools: Allowed tools (None = all)
+        cwd: Working directory of the session
+        timeout: Seconds the answer may take (None = no limit)
+        provider: Provider name (see ProviderType)
+        socket_path: Socket to connect to (defaults to get_socket_path())
+
+    Returns:
+        Tuple of (output, metadata), or None if the daemon is unavailable, not owned by the
+        current user or failed
+    """
+    payload = {
+        "op": "moderate",
+        "moderator": moderator_name,
+        "request": request,
+        "model": model,
+        "allowed_tools": allowed_tools,
+        "cwd": str(cwd) if cwd else None,
+        "timeout": timeout,
+        "provider": provider,
+    }
+    return _exchange(payload, timeout, socket_path)
+
+
+def request_warm_run(
+    moderator_name: str,
+    request: str,
+    model: str,
+    allowed_tools: list[str] | None,
+    cwd: Path | None,
+    timeout: int | None,
+    provider: str = "claude",
+    socket_path: Path | None = None,
+) -> tuple[str, dict[str, Any]] | None:
+    """Answer a moderator request on a pre-started CLI process of the daemon's warm pool.
+
+    Args:
+        moderator_name: Moderator name (e.g. audit_diff, for logging)
+        request: Request text (context followed by the moderator instruction)
+        model: Moderator model
+        allowed_tools: Allowed tools (None = all)
+        cwd: Working directory of the process
+        timeout: Seconds the answer may take (None = no limit)
+        provider: Provider name (see ProviderType)
+        socket_path: Socket to connect to (defaults to get_socket_path())
+
+    Returns:
+        Tuple of (output, metadata), or None if the daemon is unavailable, has no warm pool,
+        is not owned by the current user or failed
+    """
+    payload = {
+        "op": "warm",
+        "moderator": moderator_name,
+        "request": request,
+        "model": model,
+        "allowed_tools": allowed_tools,
+        "cwd": str(cwd) if cwd else None,
+        "timeout": timeout,
+        "provider": provider,
+    }
+    return _exchange(payload, timeout, socket_path)
+
+
+__all__ = [
+    "SOCKET_ENV_VAR",
+    "get_socket_path",
+    "request_moderation",
+    "request_warm_run",
+]
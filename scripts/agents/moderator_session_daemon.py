@@ -0,0 +1,286 @@
+"""Moderator session daemon for high-frequency validators.
+
+Code-quality diff audits and the todo validator run a moderator on almost every Edit, each in
+a fresh CLI process. This daemon keeps one long-lived CLI session per validator (see
+cli.moderator_session) and answers their requests over a unix socket: the conversation is
+reset between requests, and a failed session is restarted by the supervisor. Sessions without
+requests for a while are stopped.
+
+With agent.warm_pool.enabled, the daemon also keeps the warm pool of pre-started CLI processes
+(see cli.warm_pool) for all other moderators: hook processes exit after one validation, so the
+pool is kept here and each request is answered on one of its processes. The socket lives in the per-user socket directory (see
+user_socket), so only the current user's validators reach the sessions.
+
+Protocol: one JSON request line per connection, answered by one JSON response line
+({"ok": true, "result": ...} or {"ok": false, "error": "..."}). Supported ops:
+    {"op": "moderate", "moderator": "todo_validator", "request": "...", "model": "...",
+     "allowed_tools": [...], "cwd": "/abs/dir", "timeout": 100, "provider": "claude"}
+    {"op": "warm", ...}  (fields as for moderate, answered on a warm pool process)
+    {"op": "stats"}
+    {"op": "ping"}
+
+Run with:
+    ami-run -m scripts.agents.moderator_session_daemon [--socket PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from scripts.agents.cli.base_provider import CLIProvider
+from scripts.agents.cli.config import AgentConfig
+from scripts.agents.cli.exceptions import AgentError
+from scripts.agents.cli.factory import get_agent_cli
+from scripts.agents.cli.moderator_session import DEFAULT_COOLDOWN_SECONDS, DEFAULT_MAX_FAILURES, DEFAULT_MAX_REQUESTS, SessionSupervisor
+from scripts.agents.cli.provider_type import ProviderType
+from scripts.agents.cli.warm_pool import get_warm_pool, shutdown_warm_pool, user_message
+from scripts.agents.config import get_config
+from scripts.agents.moderator_session_client import MAX_REQUEST_SIZE, get_socket_path
+from scripts.agents.user_socket import ensure_socket_dir
+
+# Idle sessions are checked this often
+POLL_INTERVAL_SECONDS = 10.0
+
+# Sessions without requests for this long are stopped (agent sessions ended)
+IDLE_TIMEOUT_SECONDS = 30 * 60
+
+
+class ModeratorSessionDaemon(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server answering moderator requests in supervised sessions."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        socket_path: Path,
+        supervisor: SessionSupervisor | None = None,
+        idle_timeout: float = IDLE_TIMEOUT_SECONDS,
+        poll_interval: float = POLL_INTERVAL_SECONDS,
+    ) -> None:
+        """Bind the daemon socket.
+
+        Args:
+            socket_path: Unix socket path (created with owner-only permissions)
+            supervisor: Session supervisor (defaults to one configured from agent.moderator.sessions)
+            idle_timeout: Seconds without requests before a session is stopped
+            poll_interval: Seconds between idle checks
+        """
+        self.socket_path = socket_path
+        self.supervisor = supervisor or _configured_supervisor()
+        self.idle_timeout = idle_timeout
+        self.poll_interval = poll_interval
+        self._stop_polling = threading.Event()
+        super().__init__(str(socket_path), ModeratorSessionRequestHandler)
+
+    def server_bind(self) -> None:
+        """Bind the socket in the private socket directory and restrict it to the current user."""
+        ensure_socket_dir(self.socket_path)
+        super().server_bind()
+        self.socket_path.chmod(0o600)
+
+    def dispatch(self, request: dict[str, Any]) -> Any:
+        """Execute one request.
+
+        Args:
+            request: Parsed request object
+
+        Returns:
+            Result value for the response
+
+        Raises:
+            ValueError: If the request is malformed or the warm pool is disabled
+            TypeError: If the provider has no session or warm pool support
+            AgentError: If the session or warm process cannot answer
+        """
+        op = request.get("op")
+        if op == "ping":
+            return "pong"
+        if op == "stats":
+            return self.supervisor.stats()
+        result: tuple[str, dict[str, Any] | None]
+        if op == "moderate":
+            cli, cwd, agent_config = _moderator(request, f"moderator-session-{request['moderator']}")
+            result = self.supervisor.moderate(str(request["moderator"]), cli, cwd, agent_config, str(request["request"]))
+        elif op == "warm":
+            result = self._run_warm(request)
+        else:
+            raise ValueError(f"Unknown op: {op}")
+        output, metadata = result
+        return {"output": output, "metadata": metadata}
+
+    def _run_warm(self, request: dict[str, Any]) -> tuple[str, dict[str, Any] | None]:
+        """Answer a moderator request on a pre-started process of the warm pool.
+
+        Args:
+            request: Parsed warm request
+
+        Returns:
+            Tuple of (output, metadata)
+
+        Raises:
+            ValueError: If the warm pool is disabled
+            TypeError: If the provider cannot run this config on a pre-started process
+            AgentError: If the process cannot answer
+        """
+        pool = get_warm_pool()
+        if pool is None:
+            raise ValueError("Warm pool disabled (agent.warm_pool.enabled)")
+        cli, cwd, agent_config = _moderator(request, f"warm-pool-{request['moderator']}", stop_on_decision=True)
+        cmd = cli._build_warm_command(cwd, agent_config)
+        if cmd is None:
+            raise TypeError(f"No warm pool support for this config: {request['moderator']}")
+        try:
+            return pool.run(cmd, user_message(str(request["request"]), None), cwd, agent_config)
+        finally:
+            # The daemon runs until stopped - keep the shared hit rate current
+            pool.flush_stats()
+
+    def _poll_loop(self) -> None:
+        """Background loop stopping idle sessions."""
+        while not self._stop_polling.wait(self.poll_interval):
+            self.supervisor.close_idle(self.idle_timeout)
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        """Serve requests with background idle checks.
+
+        Args:
+            poll_interval: Shutdown check interval passed to socketserver
+        """
+        poller = threading.Thread(target=self._poll_loop, name="moderator-session-poller", daemon=True)
+        poller.start()
+        try:
+            super().serve_forever(poll_interval)
+        finally:
+            self._stop_polling.set()
+
+    def server_close(self) -> None:
+        """Stop all sessions and warm processes, close and remove the socket."""
+        self.supervisor.close()
+        shutdown_warm_pool()
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+class ModeratorSessionRequestHandler(socketserver.StreamRequestHandler):
+    """Handle one JSON request line."""
+
+    server: ModeratorSessionDaemon
+
+    def handle(self) -> None:
+        """Read request, dispatch, and write the response line."""
+        line = self.rfile.readline(MAX_REQUEST_SIZE + 1)
+        try:
+            if len(line) > MAX_REQUEST_SIZE:
+                raise ValueError(f"Request too large (>{MAX_REQUEST_SIZE} bytes)")
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise TypeError("Request must be a JSON object")
+            response: dict[str, Any] = {"ok": True, "result": self.server.dispatch(request)}
+        except (AgentError, OSError, ValueError, TypeError, KeyError) as e:
+            response = {"ok": False, "error": str(e)}
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+def _moderator(request: dict[str, Any], session_id: str, stop_on_decision: bool = False) -> tuple[CLIProvider, Path | None, AgentConfig]:
+    """Provider, working directory and config of a moderator request.
+
+    Args:
+        request: Parsed moderate or warm request
+        session_id: Session ID of the runs answering it
+        stop_on_decision: Return as soon as the output holds a decision
+
+    Returns:
+        Tuple of (provider, working directory, moderator config with hooks disabled)
+
+    Raises:
+        KeyError: If the request has no model
+        ValueError: If the provider is unknown
+        TypeError: If the provider has no stream-json input support
+    """
+    timeout = request.get("timeout")
+    agent_config = AgentConfig(
+        model=str(request["model"]),
+        session_id=session_id,
+        provider=ProviderType(str(request.get("provider") or ProviderType.CLAUDE.value)),
+        allowed_tools=request.get("allowed_tools"),
+        enable_hooks=False,
+        enable_streaming=True,
+        timeout=int(timeout) if timeout else None,
+        stop_on_decision=stop_on_decision,
+    )
+    cli = get_agent_cli(agent_config)
+    if not isinstance(cli, CLIProvider):
+        raise TypeError(f"Provider has no session support: {agent_config.provider}")
+    cwd = Path(str(request["cwd"])) if request.get("cwd") else None
+    return cli, cwd, agent_config
+
+
+def _configured_supervisor() -> SessionSupervisor:
+    """Supervisor with the limits in agent.moderator.sessions."""
+    config = get_config()
+    return SessionSupervisor(
+        max_requests=int(config.get("agent.moderator.sessions.max_requests", DEFAULT_MAX_REQUESTS)),
+        max_failures=int(config.get("agent.moderator.sessions.max_failures", DEFAULT_MAX_FAILURES)),
+        cooldown=float(config.get("agent.moderator.sessions.cooldown", DEFAULT_COOLDOWN_SECONDS)),
+    )
+
+
+def _remove_stale_socket(socket_path: Path) -> None:
+    """Remove a leftover socket file unless another daemon is listening on it.
+
+    Args:
+        socket_path: Unix socket path
+
+    Raises:
+        RuntimeError: If a daemon is already running
+        PermissionError: If the socket directory is not private to the current user
+    """
+    ensure_socket_dir(socket_path)
+    if not socket_path.exists():
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(socket_path))
+        except OSError:
+            socket_path.unlink()
+            return
+    raise RuntimeError(f"Moderator session daemon already running on {socket_path}")
+
+
+def main() -> int:
+    """Run the moderator session daemon until interrupted.
+
+    Returns:
+        Exit code (0=success)
+    """
+    parser = argparse.ArgumentParser(description="Long-lived moderator sessions for high-frequency validators")
+    parser.add_argument("--socket", type=Path, default=get_socket_path(), help="Unix socket path")
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT_SECONDS, help="Seconds before an idle session is stopped")
+    args = parser.parse_args()
+
+    try:
+        _remove_stale_socket(args.socket)
+    except (RuntimeError, OSError) as e:
+        logger.error("moderator_session_daemon_start_failed", error=str(e))
+        return 1
+
+    with ModeratorSessionDaemon(args.socket, idle_timeout=args.idle_timeout) as server:
+        logger.info("moderator_session_daemon_started", socket=str(args.socket), pid=os.getpid())
+        with contextlib.suppress(KeyboardInterrupt):
+            server.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
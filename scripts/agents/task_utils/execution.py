@@ -1,6 +1,7 @@
 """Task execution utility functions extracted from tasks.py."""
 
 import time
+from collections.abc import Generator
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -9,6 +10,7 @@ from loguru import logger
 
 from scripts.agents.cli.config import AgentConfigPresets
 from scripts.agents.common import parse_moderator_result
+from scripts.agents.core.base_executor import AgentOutput, AgentRun
 from scripts.agents.core.models import UnifiedExecutionAttempt, UnifiedExecutionResult
 
 
@@ -74,9 +76,8 @@ def validate_with_moderator(
     attempt_num: int,
     session_id: str,
     prompts_dir: Path,
-    cli: Any,
-) -> tuple[dict[str, Any], str, dict[str, Any] | None]:
-    """Run moderator validation on worker output.
+) -> Generator[AgentRun, AgentOutput, tuple[dict[str, Any], str, dict[str, Any] | None]]:
+    """Run moderator validation on worker output (steps, see BaseExecutor.item_steps).
 
     Args:
         task_name: Task name
@@ -87,7 +88,6 @@ def validate_with_moderator(
         attempt_num: Current attempt number
         session_id: Session ID for context
         prompts_dir: Directory containing prompts
-        cli: CLI instance
 
     Returns:
         Tuple of (moderator_result dict, moderator_output text, moderator_metadata dict or None)
@@ -111,7 +111,7 @@ Validate if the task was completed correctly."""
 
     moderator_config = AgentConfigPresets.task_moderator(session_id)
     moderator_config.enable_streaming = True
-    moderator_output, moderator_metadata = cli.run_print(
+    moderator_output, moderator_metadata = yield AgentRun(
         instruction_file=moderator_prompt,
         stdin=validation_context,
         agent_config=moderator_config,
@@ -144,9 +144,8 @@ def execute_worker_attempt(
     attempt_num: int,
     session_id: str,
     prompts_dir: Path,
-    cli: Any,
-) -> tuple[str, dict[str, Any] | None]:
-    """Execute single worker attempt.
+) -> Generator[AgentRun, AgentOutput, AgentOutput]:
+    """Execute single worker attempt (steps, see BaseExecutor.item_steps).
 
     Args:
         task_name: Task name
@@ -158,7 +157,6 @@ def execute_worker_attempt(
         attempt_num: Current attempt number
         session_id: Session ID
         prompts_dir: Directory containing prompts
-        cli: CLI instance
 
     Returns:
         Tuple of (worker output text, execution metadata or None)
@@ -182,7 +180,7 @@ def execute_worker_attempt(
     worker_prompt = prompts_dir / "task_worker.txt"
     worker_config = AgentConfigPresets.task_worker(session_id)
     worker_config.enable_streaming = True
-    worker_output, worker_metadata = cli.run_print(
+    worker_output, worker_metadata = yield AgentRun(
         instruction_file=worker_prompt,
         stdin=worker_context,
         agent_config=worker_config,
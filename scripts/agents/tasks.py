@@ -6,10 +6,12 @@ and retry loops with timeout. Supports both sync (default) and async parallel mo
 
 import os
 import time
+from collections.abc import Generator
 from datetime import datetime
 from pathlib import Path
 
 from scripts.agents.common import GenericExecutor, parse_completion_marker
+from scripts.agents.core.base_executor import AgentOutput, AgentRun
 from scripts.agents.core.models import UnifiedExecutionAttempt, UnifiedExecutionResult
 from scripts.agents.task_utils.execution import execute_worker_attempt, handle_feedback_result, validate_with_moderator
 from scripts.agents.utils.file_locker import FileLockManager
@@ -86,8 +88,10 @@ class TaskExecutor(GenericExecutor[UnifiedExecutionResult]):
         )
         return exclude_result
 
-    def execute_single_item(self, item_path: Path, root_dir: Path | None = None, user_instruction: str | None = None) -> UnifiedExecutionResult:
-        """Execute a single item with retry loop.
+    def item_steps(
+        self, item_path: Path, root_dir: Path | None = None, user_instruction: str | None = None
+    ) -> Generator[AgentRun, AgentOutput, UnifiedExecutionResult]:
+        """Steps of a single item with retry loop.
 
         Args:
             item_path: Path to the item to execute
@@ -95,10 +99,9 @@ class TaskExecutor(GenericExecutor[UnifiedExecutionResult]):
             user_instruction: Optional prepended instruction for the worker
 
         Returns:
-            Task result for the item
+            Generator yielding the task's agent runs, returning the task result
         """
-        # Delegate to the original _execute_single_task with alias
-        return self._execute_single_task(item_path, root_dir, user_instruction)
+        return self._task_steps(item_path, root_dir, user_instruction)
 
     def _has_valid_extension(self, file_path: Path) -> bool:
         """Check if the file has a valid extension for this executor.
@@ -133,6 +136,26 @@ class TaskExecutor(GenericExecutor[UnifiedExecutionResult]):
         # Call the base class execute_items method which handles the orchestration
         return self.execute_items(path, parallel, root_dir, user_instruction)
 
+    async def execute_tasks_async(
+        self,
+        path: Path,
+        root_dir: Path | None = None,
+        user_instruction: str | None = None,
+        concurrency: int | None = None,
+    ) -> list[UnifiedExecutionResult]:
+        """Execute task file(s) concurrently on the running event loop.
+
+        Args:
+            path: Path to .md task file OR directory containing task files
+            root_dir: Root directory where tasks execute (defaults to current directory)
+            user_instruction: Optional prepended instruction for all tasks
+            concurrency: Tasks run at once (defaults to executor.async_concurrency)
+
+        Returns:
+            List of task results
+        """
+        return await self.execute_items_async(path, root_dir, user_instruction, concurrency)
+
     def _execute_single_task(self, task_file: Path, root_dir: Path | None = None, user_instruction: str | None = None) -> UnifiedExecutionResult:
         """Execute a single task with retry loop.
 
@@ -144,6 +167,21 @@ class TaskExecutor(GenericExecutor[UnifiedExecutionResult]):
         Returns:
             Task result
         """
+        return self.run_steps(self._task_steps(task_file, root_dir, user_instruction))
+
+    def _task_steps(
+        self, task_file: Path, root_dir: Path | None = None, user_instruction: str | None = None
+    ) -> Generator[AgentRun, AgentOutput, UnifiedExecutionResult]:
+        """Steps of a single task with retry loop.
+
+        Args:
+            task_file: Path to .md task file
+            root_dir: Root directory where tasks execute (defaults to current directory)
+            user_instruction: Optional prepended instruction
+
+        Returns:
+            Generator yielding worker and moderator runs, returning the task result
+        """
         start_time = time.time()
         attempts: list[UnifiedExecutionAttempt] = []
         timeout = self.config.get("tasks.timeout_per_task", 3600)
@@ -179,7 +217,7 @@ class TaskExecutor(GenericExecutor[UnifiedExecutionResult]):
                 attempt_start = time.time()
 
                 # Execute worker using imported utility function
-                worker_output, worker_metadata = execute_worker_attempt(
+                worker_output, worker_metadata = yield from execute_worker_attempt(
                     task_name,
                     task_content,
                     user_instruction,
@@ -189,7 +227,6 @@ class TaskExecutor(GenericExecutor[UnifiedExecutionResult]):
                     attempt_num,
                     self.session_id,
                     self.prompts_dir,
-                    self.cli,
                 )
 
                 attempt_duration = time.time() - attempt_start
@@ -237,8 +274,8 @@ class TaskExecutor(GenericExecutor[UnifiedExecutionResult]):
                         )
 
                     # Validate with moderator using imported utility function
-                    moderator_result, moderator_output, moderator_metadata = validate_with_moderator(
-                        task_name, task_content, worker_output, progress_file, root_dir, attempt_num, self.session_id, self.prompts_dir, self.cli
+                    moderator_result, moderator_output, moderator_metadata = yield from validate_with_moderator(
+                        task_name, task_content, worker_output, progress_file, root_dir, attempt_num, self.session_id, self.prompts_dir
                     )
 
                     attempts.append(
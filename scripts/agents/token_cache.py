@@ -0,0 +1,165 @@
+"""Content-hash keyed token-count cache for moderator context sizing.
+
+Moderator context is rebuilt from the last messages of a transcript on every hook, but
+earlier messages do not change between hooks. Token counts of formatted message blocks are
+kept in a process-wide LRU and persisted in a small sidecar store next to the transcript
+(<transcript>.jsonl.tokens), so each hook only tokenizes messages it has not seen before.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import os
+import struct
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+
+TOKEN_CACHE_SUFFIX = ".tokens"
+
+# Process-wide LRU size (formatted message blocks)
+MEMORY_CACHE_SIZE = 8192
+
+# Sidecar store layout: magic, then (content digest, token count) records appended in order.
+# The tokenizer name is mixed into the digest so counts of different tokenizers never collide.
+_STORE_MAGIC = b"AMITOK01"
+_STORE_RECORD = struct.Struct("<16sI")
+_DIGEST_SIZE = 16
+
+# Stores above this size are restarted instead of growing without bound
+MAX_STORE_BYTES = 4 * 1024 * 1024
+
+_memory_cache: OrderedDict[bytes, int] = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def content_key(text: str, tokenizer: str) -> bytes:
+    """Hash text for cache lookups.
+
+    Args:
+        text: Text whose token count is cached
+        tokenizer: Tokenizer name (part of the key)
+
+    Returns:
+        16-byte digest
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=_DIGEST_SIZE, person=tokenizer.encode("utf-8")[:16]).digest()
+
+
+def _remember(key: bytes, tokens: int) -> None:
+    """Insert into the process-wide LRU, evicting the least recently used entry."""
+    with _memory_lock:
+        _memory_cache[key] = tokens
+        _memory_cache.move_to_end(key)
+        if len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+
+def _recall(key: bytes) -> int | None:
+    """Look up the process-wide LRU, marking the entry as recently used."""
+    with _memory_lock:
+        tokens = _memory_cache.get(key)
+        if tokens is not None:
+            _memory_cache.move_to_end(key)
+        return tokens
+
+
+def clear_memory_cache() -> None:
+    """Drop all in-process token counts."""
+    with _memory_lock:
+        _memory_cache.clear()
+
+
+class TranscriptTokenCache:
+    """Token counter backed by the process LRU and the transcript's sidecar store."""
+
+    def __init__(self, transcript_path: Path, counter: Callable[[str], int], tokenizer: str = "gpt-4") -> None:
+        """Initialize cache for a transcript (the store is read lazily).
+
+        Args:
+            transcript_path: Path to transcript JSONL file
+            counter: Exact token counter used on cache misses
+            tokenizer: Tokenizer name (part of the content key)
+        """
+        self.store_path = transcript_path.with_name(transcript_path.name + TOKEN_CACHE_SUFFIX)
+        self.counter = counter
+        self.tokenizer = tokenizer
+        self.hits = 0
+        self.misses = 0
+        self._store_loaded = False
+        self._stored: dict[bytes, int] = {}
+        self._new_records: list[bytes] = []
+
+    def _load_store(self) -> None:
+        """Read the sidecar store (a missing or corrupt store counts as empty)."""
+        self._store_loaded = True
+        try:
+            data = self.store_path.read_bytes()
+        except OSError:
+            return
+        if not data.startswith(_STORE_MAGIC):
+            return
+        # A record cut short by an interrupted write is ignored
+        body_end = len(_STORE_MAGIC) + (len(data) - len(_STORE_MAGIC)) // _STORE_RECORD.size * _STORE_RECORD.size
+        self._stored = dict(_STORE_RECORD.iter_unpack(data[len(_STORE_MAGIC) : body_end]))
+
+    def count(self, text: str) -> int:
+        """Count tokens, tokenizing only text not seen before.
+
+        Args:
+            text: Text to count tokens for
+
+        Returns:
+            Token count
+        """
+        key = content_key(text, self.tokenizer)
+        tokens = _recall(key)
+        if tokens is None:
+            if not self._store_loaded:
+                self._load_store()
+            tokens = self._stored.get(key)
+        if tokens is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            tokens = self.counter(text)
+            self._stored[key] = tokens
+            self._new_records.append(_STORE_RECORD.pack(key, tokens))
+        _remember(key, tokens)
+        return tokens
+
+    def save(self) -> None:
+        """Append counts computed since the last save to the sidecar store.
+
+        Raises:
+            OSError: If the store cannot be written
+        """
+        if not self._new_records:
+            return
+        store_fd = os.open(self.store_path, os.O_RDWR | os.O_CREAT, 0o600)
+        with os.fdopen(store_fd, "r+b") as store_file:
+            # Concurrent hooks share the store - serialize writers
+            fcntl.flock(store_file.fileno(), fcntl.LOCK_EX)
+            size = store_file.seek(0, os.SEEK_END)
+            store_file.seek(0)
+            if size > MAX_STORE_BYTES or store_file.read(len(_STORE_MAGIC)) != _STORE_MAGIC:
+                store_file.seek(0)
+                store_file.truncate()
+                store_file.write(_STORE_MAGIC)
+            else:
+                # Re-align after a record cut short by an interrupted write
+                size -= (size - len(_STORE_MAGIC)) % _STORE_RECORD.size
+                store_file.truncate(size)
+            store_file.seek(0, os.SEEK_END)
+            store_file.write(b"".join(self._new_records))
+        self._new_records = []
+
+
+__all__ = [
+    "TOKEN_CACHE_SUFFIX",
+    "TranscriptTokenCache",
+    "clear_memory_cache",
+    "content_key",
+]
@@ -0,0 +1,123 @@
+"""Offline, load-once tokenizer for moderator context sizing.
+
+tiktoken downloads the BPE file on first use and builds the encoder in every process. Hooks
+run in fresh processes (and some nodes are air-gapped), so the encoding files are read from a
+local cache directory (tokenizer.cache_dir in automation.yaml, filled once with --prefetch)
+and the encoder is built at most once per process. The transcript daemon keeps it resident.
+
+Every token is at least one UTF-8 byte, so callers skip exact tokenization entirely when a
+text fits a token budget by byte length alone.
+
+Prefetch the encoding files (then copy the directory to air-gapped nodes):
+    ami-run -m scripts.agents.tokenizer --prefetch
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import math
+import os
+import sys
+from pathlib import Path
+
+import tiktoken
+
+from scripts.agents.config import get_config
+
+TOKENIZER_MODEL = "gpt-4"
+
+# Transcript contexts average ~3.7 bytes/token (log estimates only - budgets use exact counts)
+AVERAGE_BYTES_PER_TOKEN = 3.7
+
+
+def get_tiktoken_cache_dir() -> Path:
+    """Get the local directory holding tiktoken encoding files.
+
+    Returns:
+        Cache directory from tokenizer.cache_dir (defaults to <root>/.cache/tiktoken)
+    """
+    config = get_config()
+    return Path(config.get("tokenizer.cache_dir") or config.root / ".cache" / "tiktoken")
+
+
+@functools.lru_cache(maxsize=1)
+def get_encoding() -> tiktoken.Encoding:
+    """Load the tokenizer once per process from the local cache.
+
+    Returns:
+        tiktoken encoding for TOKENIZER_MODEL
+
+    Raises:
+        Exception: If the encoding files are neither cached nor downloadable
+    """
+    os.environ.setdefault("TIKTOKEN_CACHE_DIR", str(get_tiktoken_cache_dir()))
+    return tiktoken.encoding_for_model(TOKENIZER_MODEL)
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens in text using tiktoken (GPT-4 tokenizer).
+
+    Args:
+        text: Text to count tokens for
+
+    Returns:
+        Token count
+
+    Raises:
+        Exception: If tokenization fails
+    """
+    return len(get_encoding().encode(text))
+
+
+def estimate_tokens(byte_length: int) -> int:
+    """Estimate token count from UTF-8 length without tokenizing.
+
+    Args:
+        byte_length: UTF-8 length of the text
+
+    Returns:
+        Approximate token count
+    """
+    return math.ceil(byte_length / AVERAGE_BYTES_PER_TOKEN)
+
+
+def fits_budget_by_bytes(byte_length: int, max_tokens: int) -> bool:
+    """Check whether text certainly fits a token budget without tokenizing it.
+
+    Byte length is a hard upper bound on token count. There is no matching lower bound (one
+    token may span many bytes), so texts longer than the budget need exact tokenization.
+
+    Args:
+        byte_length: UTF-8 length of the text
+        max_tokens: Token budget
+
+    Returns:
+        True if the text fits, False if exact tokenization is needed
+    """
+    return byte_length <= max_tokens
+
+
+def main() -> int:
+    """Download the encoding files into the local cache.
+
+    Returns:
+        Exit code (0=success)
+    """
+    parser = argparse.ArgumentParser(description="Offline tokenizer cache for hooks")
+    parser.add_argument("--prefetch", action="store_true", help="Download encoding files into the local cache")
+    args = parser.parse_args()
+    if not args.prefetch:
+        parser.print_help()
+        return 1
+
+    cache_dir = get_tiktoken_cache_dir()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    os.environ["TIKTOKEN_CACHE_DIR"] = str(cache_dir)
+    count_tokens("prefetch")
+    sys.stdout.write(f"Tokenizer files cached in {cache_dir}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,11 +2,42 @@
 
 from __future__ import annotations
 
+import fcntl
 import json
+import os
 import re
+import struct
+import zlib
+from collections.abc import Callable, Iterator
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+
+    _fast_json_loads: Callable[[str], Any] | None = orjson.loads
+except ImportError:  # Optional faster JSON backend
+    _fast_json_loads = None
+
+# Block size for reverse (EOF-first) transcript reads
+TAIL_READ_BLOCK_SIZE = 64 * 1024
+
+# Sidecar offset index (<transcript>.jsonl.idx) layout:
+#   header: magic, indexed byte count, entry count, CRC32 of transcript head
+#   entries: (byte offset of message line, message type code), appended in order
+INDEX_SUFFIX = ".idx"
+_INDEX_MAGIC = b"AMITIDX1"
+_INDEX_HEADER = struct.Struct("<8sQQI")
+_INDEX_ENTRY = struct.Struct("<Qc")
+_INDEX_HEAD_CRC_BYTES = 4096
+_INDEX_TYPE_CODES = {"user": b"u", "assistant": b"a"}
+
+_SYSTEM_REMINDER_PATTERN = re.compile(r"<system-reminder>.*?</system-reminder>", re.DOTALL)
+
+# A line can only be a user/assistant record if it contains a matching "type" member.
+# Lines without one (summary, system, file-history-snapshot records) are skipped undecoded.
+_MESSAGE_TYPE_PATTERN = re.compile(r'"type"\s*:\s*"(?:user|assistant)"')
+
 
 def _strip_system_reminders(text: str) -> str:
     """Remove system-reminder tags and their content from text.
@@ -18,7 +49,23 @@ def _strip_system_reminders(text: str) -> str:
         Text with all system-reminder blocks removed
     """
     # Remove <system-reminder>...</system-reminder> blocks
-    return re.sub(r"<system-reminder>.*?</system-reminder>", "", text, flags=re.DOTALL)
+    if "<system-reminder>" not in text:
+        return text
+    return _SYSTEM_REMINDER_PATTERN.sub("", text)
+
+
+def _loads(line: str) -> Any:
+    """Decode a JSON line, using orjson when installed.
+
+    Raises:
+        json.JSONDecodeError: If line is not valid JSON
+    """
+    if _fast_json_loads is not None:
+        try:
+            return _fast_json_loads(line)
+        except ValueError:
+            pass  # orjson is stricter (e.g. lone surrogates, NaN) - let json decide
+    return json.loads(line)
 
 
 def _parse_content_list(content: list[Any]) -> str | None:
@@ -65,12 +112,12 @@ def _parse_message_from_json(line: str) -> dict[str, str | None] | None:
     Returns:
         Message dict with type/text/timestamp, or None if invalid
     """
-    # Early validation checks
-    if not line.strip():
+    # Early validation checks (cheap type prefilter before decoding)
+    if not _MESSAGE_TYPE_PATTERN.search(line):
         return None
 
     try:
-        msg_data = json.loads(line)
+        msg_data = _loads(line)
     except json.JSONDecodeError:
         return None
 
@@ -104,12 +151,242 @@ def _parse_message_from_json(line: str) -> dict[str, str | None] | None:
     return None
 
 
-def get_last_n_messages(transcript_path: Path, n: int) -> list[dict[str, str | None]]:
+def iter_lines_reverse(transcript_path: Path, block_size: int = TAIL_READ_BLOCK_SIZE) -> Iterator[str]:
+    """Yield transcript lines from EOF towards the start of the file.
+
+    Reads fixed-size blocks backwards so callers that only need the tail of a
+    large transcript stop reading as soon as they have enough lines.
+
+    Args:
+        transcript_path: Path to transcript JSONL file
+        block_size: Number of bytes to read per block
+
+    Yields:
+        Decoded lines, last line first (without trailing newline)
+    """
+    with transcript_path.open("rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b""
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + remainder).split(b"\n")
+            remainder = lines[0]
+            for raw_line in reversed(lines[1:]):
+                yield raw_line.decode("utf-8")
+        yield remainder.decode("utf-8")
+
+
+class TranscriptIndex:
+    """Sidecar byte-offset index over the messages of a transcript.
+
+    Maps message ordinal to the byte offset (and type) of its JSONL line so the
+    last N messages can be read with N seeks instead of a full parse. The index
+    is extended incrementally: only lines appended since the last refresh are
+    parsed. Only newline-terminated lines are indexed; a trailing partial line
+    is parsed on demand.
+    """
+
+    def __init__(self, transcript_path: Path, index_path: Path | None = None) -> None:
+        """Initialize index for a transcript.
+
+        Args:
+            transcript_path: Path to transcript JSONL file
+            index_path: Sidecar index path (defaults to <transcript>.idx)
+        """
+        self.transcript_path = transcript_path
+        self.index_path = index_path or transcript_path.with_name(transcript_path.name + INDEX_SUFFIX)
+        self.indexed_bytes = 0
+        self.entry_count = 0
+
+    @staticmethod
+    def _head_crc(transcript_file: Any, indexed_bytes: int) -> int:
+        """Checksum the indexed head of the transcript to detect replaced files."""
+        transcript_file.seek(0)
+        return zlib.crc32(transcript_file.read(min(indexed_bytes, _INDEX_HEAD_CRC_BYTES)))
+
+    def _load_header(self, index_file: Any, transcript_file: Any, transcript_size: int) -> None:
+        """Load header from index file, resetting the index if it is stale or corrupt."""
+        header = index_file.read(_INDEX_HEADER.size)
+        if len(header) == _INDEX_HEADER.size:
+            magic, indexed_bytes, entry_count, stored_crc = _INDEX_HEADER.unpack(header)
+            if magic == _INDEX_MAGIC and indexed_bytes <= transcript_size and stored_crc == self._head_crc(transcript_file, indexed_bytes):
+                self.indexed_bytes = indexed_bytes
+                self.entry_count = entry_count
+                # Drop entries written after the last committed header (interrupted refresh)
+                index_file.truncate(_INDEX_HEADER.size + entry_count * _INDEX_ENTRY.size)
+                return
+
+        self.indexed_bytes = 0
+        self.entry_count = 0
+        index_file.seek(0)
+        index_file.truncate()
+        index_file.write(_INDEX_HEADER.pack(_INDEX_MAGIC, 0, 0, self._head_crc(transcript_file, 0)))
+
+    def refresh(self) -> None:
+        """Extend the index with lines appended since the last refresh.
+
+        Raises:
+            FileNotFoundError: If transcript file doesn't exist
+            OSError: If the sidecar index cannot be read or written
+        """
+        if not self.transcript_path.exists():
+            raise FileNotFoundError(f"Transcript not found: {self.transcript_path}")
+
+        index_fd = os.open(self.index_path, os.O_RDWR | os.O_CREAT, 0o600)
+        with self.transcript_path.open("rb") as transcript_file, os.fdopen(index_fd, "r+b") as index_file:
+            # Concurrent hooks share the sidecar - serialize refreshes
+            fcntl.flock(index_file.fileno(), fcntl.LOCK_EX)
+            transcript_size = transcript_file.seek(0, os.SEEK_END)
+            self._load_header(index_file, transcript_file, transcript_size)
+
+            if transcript_size == self.indexed_bytes:
+                return
+
+            new_entries: list[bytes] = []
+            offset = self.indexed_bytes
+            transcript_file.seek(offset)
+            for raw_line in transcript_file:
+                if not raw_line.endswith(b"\n"):
+                    break  # Partial line still being written
+                msg = _parse_message_from_json(raw_line.decode("utf-8"))
+                if msg:
+                    new_entries.append(_INDEX_ENTRY.pack(offset, _INDEX_TYPE_CODES[str(msg["type"])]))
+                offset += len(raw_line)
+
+            index_file.seek(_INDEX_HEADER.size + self.entry_count * _INDEX_ENTRY.size)
+            index_file.write(b"".join(new_entries))
+            self.entry_count += len(new_entries)
+            self.indexed_bytes = offset
+
+            index_file.seek(0)
+            index_file.write(_INDEX_HEADER.pack(_INDEX_MAGIC, self.indexed_bytes, self.entry_count, self._head_crc(transcript_file, self.indexed_bytes)))
+
+    def _read_entries(self, start: int, stop: int) -> list[tuple[int, bytes]]:
+        """Read index entries in [start, stop)."""
+        if start >= stop:
+            return []
+        with self.index_path.open("rb") as index_file:
+            index_file.seek(_INDEX_HEADER.size + start * _INDEX_ENTRY.size)
+            data = index_file.read((stop - start) * _INDEX_ENTRY.size)
+        return list(_INDEX_ENTRY.iter_unpack(data))
+
+    def _read_messages(self, entries: list[tuple[int, bytes]]) -> list[dict[str, str | None]]:
+        """Parse the transcript lines referenced by index entries."""
+        messages: list[dict[str, str | None]] = []
+        with self.transcript_path.open("rb") as transcript_file:
+            for offset, _type_code in entries:
+                transcript_file.seek(offset)
+                msg = _parse_message_from_json(transcript_file.readline().decode("utf-8"))
+                if msg:
+                    messages.append(msg)
+        return messages
+
+    def _read_trailing_message(self) -> dict[str, str | None] | None:
+        """Parse the unterminated line after the indexed region, if any."""
+        with self.transcript_path.open("rb") as transcript_file:
+            transcript_file.seek(self.indexed_bytes)
+            trailing = transcript_file.read()
+        return _parse_message_from_json(trailing.decode("utf-8")) if trailing else None
+
+    def messages(self, start: int, stop: int) -> list[dict[str, str | None]]:
+        """Get indexed messages by ordinal (as of the last refresh).
+
+        Args:
+            start: Ordinal of the first message
+            stop: Ordinal after the last message
+
+        Returns:
+            List of message dictionaries in transcript order
+        """
+        return self._read_messages(self._read_entries(start, min(stop, self.entry_count)))
+
+    def messages_since(self, start: int) -> list[dict[str, str | None]]:
+        """Get all messages from an ordinal on (as of the last refresh).
+
+        Args:
+            start: Ordinal of the first message
+
+        Returns:
+            Indexed messages from start, followed by the unterminated trailing line if any
+        """
+        messages = self.messages(start, self.entry_count)
+        trailing = self._read_trailing_message()
+        if trailing:
+            messages.append(trailing)
+        return messages
+
+    @property
+    def message_count(self) -> int:
+        """Number of indexed messages (as of the last refresh)."""
+        return self.entry_count
+
+    def last_n(self, n: int) -> list[dict[str, str | None]]:
+        """Get last N messages using the index.
+
+        Args:
+            n: Number of messages to retrieve
+
+        Returns:
+            List of message dictionaries in transcript order
+        """
+        self.refresh()
+        trailing = self._read_trailing_message()
+        wanted = n - 1 if trailing else n
+        messages = self._read_messages(self._read_entries(max(0, self.entry_count - wanted), self.entry_count))
+        if trailing:
+            messages.append(trailing)
+        return messages[-n:]
+
+    def until_last_user(self) -> list[dict[str, str | None]]:
+        """Get all messages up to and including the last user message.
+
+        Returns:
+            List of message dictionaries in transcript order, empty if no user message
+        """
+        self.refresh()
+        trailing = self._read_trailing_message()
+        entries = self._read_entries(0, self.entry_count)
+        if trailing and trailing["type"] == "user":
+            return [*self._read_messages(entries), trailing]
+
+        user_code = _INDEX_TYPE_CODES["user"]
+        last_user = next((i for i in range(len(entries) - 1, -1, -1) if entries[i][1] == user_code), -1)
+        if last_user == -1:
+            return []
+        return self._read_messages(entries[: last_user + 1])
+
+
+def iter_messages(transcript_path: Path) -> Iterator[dict[str, str | None]]:
+    """Stream all messages of a transcript, oldest first.
+
+    Args:
+        transcript_path: Path to Claude Code transcript file (JSONL format)
+
+    Yields:
+        Message dictionaries (same shape as get_last_n_messages())
+
+    Raises:
+        FileNotFoundError: If transcript file doesn't exist
+    """
+    with transcript_path.open(encoding="utf-8") as f:
+        for line in f:
+            msg = _parse_message_from_json(line)
+            if msg:
+                yield msg
+
+
+def get_last_n_messages(transcript_path: Path, n: int, use_index: bool = False) -> list[dict[str, str | None]]:
     """Get last N messages from transcript.
 
+    Reads the transcript backwards from EOF and stops once N messages are found,
+    so the cost is proportional to the tail being returned, not the file size.
+
     Args:
         transcript_path: Path to Claude Code transcript file (JSONL format)
         n: Number of messages to retrieve
+        use_index: Maintain and use the sidecar offset index (<transcript>.idx)
 
     Returns:
         List of message dictionaries with:
@@ -127,20 +404,31 @@ def get_last_n_messages(transcript_path: Path, n: int) -> list[dict[str, str | N
     if n < 1:
         raise ValueError(f"n must be >= 1, got {n}")
 
+    if use_index:
+        try:
+            return TranscriptIndex(transcript_path).last_n(n)
+        except OSError:
+            # Sidecar not writable (read-only transcript dir) - fall back to tail scan
+            pass
+
     messages: list[dict[str, str | None]] = []
-    for line in transcript_path.read_text(encoding="utf-8").splitlines():
+    for line in iter_lines_reverse(transcript_path):
         msg = _parse_message_from_json(line)
         if msg:
             messages.append(msg)
+            if len(messages) == n:
+                break
 
-    return messages[-n:] if messages else []
+    messages.reverse()
+    return messages
 
 
-def get_messages_until_last_user(transcript_path: Path) -> list[dict[str, str | None]]:
+def get_messages_until_last_user(transcript_path: Path, use_index: bool = False) -> list[dict[str, str | None]]:
     """Get all messages up to and including the last user message.
 
     Args:
         transcript_path: Path to Claude Code transcript file (JSONL format)
+        use_index: Maintain and use the sidecar offset index (<transcript>.idx)
 
     Returns:
         List of messages from start of conversation through last user message.
@@ -152,20 +440,22 @@ def get_messages_until_last_user(transcript_path: Path) -> list[dict[str, str |
     if not transcript_path.exists():
         raise FileNotFoundError(f"Transcript not found: {transcript_path}")
 
-    messages: list[dict[str, str | None]] = []
-    last_user_index = -1
+    if use_index:
+        try:
+            return TranscriptIndex(transcript_path).until_last_user()
+        except OSError:
+            # Sidecar not writable (read-only transcript dir) - fall back to tail scan
+            pass
 
-    for line in transcript_path.read_text(encoding="utf-8").splitlines():
+    # Scan backwards: skip trailing non-user messages, then collect everything before
+    messages: list[dict[str, str | None]] = []
+    for line in iter_lines_reverse(transcript_path):
         msg = _parse_message_from_json(line)
-        if msg:
+        if msg and (messages or msg["type"] == "user"):
             messages.append(msg)
-            if msg["type"] == "user":
-                last_user_index = len(messages) - 1
-
-    if last_user_index == -1:
-        return []
 
-    return messages[: last_user_index + 1]
+    messages.reverse()
+    return messages
 
 
 def is_actual_user_message(line: str) -> bool:
@@ -205,6 +495,40 @@ def is_actual_user_message(line: str) -> bool:
     return False
 
 
+# Fixed wrapper around formatted messages.
+# The delimiter makes it clear this is DATA TO JUDGE, not a conversation to participate in
+_EXHIBIT_SEPARATOR = "=" * 70
+EXHIBIT_HEADER = f"""{_EXHIBIT_SEPARATOR}
+EXHIBIT A: CONVERSATION TRANSCRIPT FOR VALIDATION
+THIS IS ARCHIVED DATA - YOU ARE NOT A PARTICIPANT
+{_EXHIBIT_SEPARATOR}
+
+"""
+EXHIBIT_FOOTER = f"""{_EXHIBIT_SEPARATOR}
+END OF EXHIBIT A
+{_EXHIBIT_SEPARATOR}
+
+Output your validation decision based on the exhibit above:"""
+
+
+def format_message_block(msg: dict[str, str | None]) -> str:
+    """Format a single message as it appears inside the exhibit.
+
+    Blocks start with "<message" and end with a blank line, so a formatted
+    context is exactly EXHIBIT_HEADER + concatenated blocks + EXHIBIT_FOOTER.
+
+    Args:
+        msg: Message dictionary with type/text/timestamp
+
+    Returns:
+        Formatted message block
+    """
+    msg_type = msg.get("type", "unknown")
+    text = msg.get("text") or ""
+    timestamp = msg.get("timestamp", "unknown time")
+    return f'<message role="{msg_type}" timestamp="{timestamp}">\n{text}\n</message>\n\n'
+
+
 def format_messages_for_prompt(messages: list[dict[str, str | None]]) -> str:
     """Format messages as readable text for LLM analysis.
 
@@ -218,38 +542,19 @@ def format_messages_for_prompt(messages: list[dict[str, str | None]]) -> str:
     if not messages:
         return "No messages found."
 
-    lines: list[str] = []
-    for msg in messages:
-        msg_type = msg.get("type", "unknown")
-        text = msg.get("text") or ""
-        timestamp = msg.get("timestamp", "unknown time")
-
-        lines.append(f'<message role="{msg_type}" timestamp="{timestamp}">')
-        lines.append(text)
-        lines.append("</message>")
-        lines.append("")
-
-    message_content = "\n".join(lines)
-
     # Wrap with clear boundaries to prevent LLM role confusion
-    # The delimiter makes it clear this is DATA TO JUDGE, not a conversation to participate in
-    separator = "=" * 70
-    return f"""{separator}
-EXHIBIT A: CONVERSATION TRANSCRIPT FOR VALIDATION
-THIS IS ARCHIVED DATA - YOU ARE NOT A PARTICIPANT
-{separator}
-
-{message_content}
-{separator}
-END OF EXHIBIT A
-{separator}
-
-Output your validation decision based on the exhibit above:"""
+    return EXHIBIT_HEADER + "".join(format_message_block(msg) for msg in messages) + EXHIBIT_FOOTER
 
 
 __all__ = [
+    "EXHIBIT_FOOTER",
+    "EXHIBIT_HEADER",
+    "TranscriptIndex",
+    "format_message_block",
+    "format_messages_for_prompt",
     "get_last_n_messages",
     "get_messages_until_last_user",
-    "format_messages_for_prompt",
     "is_actual_user_message",
+    "iter_lines_reverse",
+    "iter_messages",
 ]
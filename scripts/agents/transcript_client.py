@@ -0,0 +1,102 @@
+"""Client for the shared transcript state daemon.
+
+Hook validators ask the daemon (scripts/agents/transcript_daemon.py) for message windows and
+formatted moderator contexts instead of re-parsing the transcript in every hook process. Every
+call returns None when the daemon is not running or does not answer in time, so callers fall
+back to reading the transcript themselves. Sockets not owned by the current user are ignored
+(see user_socket).
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+from scripts.agents.user_socket import connect_user_socket, get_user_socket_path
+
+# Environment variable overriding the daemon socket path
+SOCKET_ENV_VAR = "AMI_TRANSCRIPT_DAEMON_SOCKET"
+
+# Hooks fall back to local parsing if the daemon is slower than this
+CLIENT_TIMEOUT_SECONDS = 5.0
+
+# Resource limits (DoS protection)
+MAX_REQUEST_SIZE = 1024 * 1024  # 1MB
+MAX_RESPONSE_SIZE = 64 * 1024 * 1024  # 64MB
+
+
+def get_socket_path() -> Path:
+    """Get the daemon socket path for the current user.
+
+    Returns:
+        $AMI_TRANSCRIPT_DAEMON_SOCKET if set, otherwise transcript-daemon.sock in the
+        per-user socket directory
+    """
+    return get_user_socket_path("transcript-daemon.sock", SOCKET_ENV_VAR)
+
+
+def request_daemon(payload: dict[str, Any], socket_path: Path | None = None) -> Any | None:
+    """Send one request to the daemon and return its result.
+
+    Args:
+        payload: Request object (see transcript_daemon for supported ops)
+        socket_path: Socket to connect to (defaults to get_socket_path())
+
+    Returns:
+        Result value, or None if the daemon is unavailable, not owned by the current user or
+        reported an error
+    """
+    sock = connect_user_socket(socket_path or get_socket_path(), CLIENT_TIMEOUT_SECONDS)
+    if sock is None:
+        return None
+
+    try:
+        with sock:
+            sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as stream:
+                line = stream.readline(MAX_RESPONSE_SIZE + 1)
+        response = json.loads(line)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(response, dict) or not response.get("ok"):
+        return None
+    return response.get("result")
+
+
+def fetch_last_n_messages(transcript_path: Path, n: int) -> list[dict[str, str | None]] | None:
+    """Get the last N messages of a transcript from the daemon.
+
+    Args:
+        transcript_path: Path to transcript JSONL file
+        n: Number of messages to return
+
+    Returns:
+        Same result as get_last_n_messages(), or None if the daemon is unavailable
+    """
+    result = request_daemon({"op": "last_n", "path": str(Path(transcript_path).resolve()), "n": n})
+    return result if isinstance(result, list) else None
+
+
+def fetch_moderator_context(transcript_path: Path, todos: list[dict[str, Any]] | None = None) -> str | None:
+    """Get the formatted moderator context of a transcript from the daemon.
+
+    Args:
+        transcript_path: Path to transcript JSONL file
+        todos: Optional list of todo items to append to context
+
+    Returns:
+        Same result as prepare_moderator_context(), or None if the daemon is unavailable
+    """
+    result = request_daemon({"op": "moderator_context", "path": str(Path(transcript_path).resolve()), "todos": todos or []})
+    return result if isinstance(result, str) else None
+
+
+__all__ = [
+    "SOCKET_ENV_VAR",
+    "fetch_last_n_messages",
+    "fetch_moderator_context",
+    "get_socket_path",
+    "request_daemon",
+]
@@ -0,0 +1,356 @@
+"""Shared transcript state daemon for hook validators.
+
+One tool call fires several hook validators, each in its own process, and each one used to
+re-parse the same transcript. This daemon follows every transcript it is asked about, appends
+newly written lines to an in-memory parsed message list, and serves message windows and
+formatted moderator contexts over a unix socket. Per-request cost scales with the lines
+appended since the previous request, not with the transcript length. Between requests, the
+poll thread folds messages that left the moderator's raw window into the transcript's
+layered summaries (see transcript_summary).
+
+Protocol: one JSON request line per connection, answered by one JSON response line
+({"ok": true, "result": ...} or {"ok": false, "error": "..."}). Supported ops:
+    {"op": "last_n", "path": "/abs/t.jsonl", "n": 30}
+    {"op": "moderator_context", "path": "/abs/t.jsonl", "todos": [...]}
+    {"op": "ping"}
+
+Run with:
+    ami-run -m scripts.agents.transcript_daemon [--socket PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from scripts.agents.token_cache import TranscriptTokenCache
+from scripts.agents.tokenizer import count_tokens
+from scripts.agents.transcript import _parse_message_from_json
+from scripts.agents.transcript_client import MAX_REQUEST_SIZE, get_socket_path
+from scripts.agents.transcript_summary import TranscriptSummaryStore
+from scripts.agents.user_socket import ensure_socket_dir
+from scripts.agents.workflows.core import MAX_MODERATOR_MESSAGE_COUNT, MODERATOR_RAW_MESSAGE_COUNT, build_moderator_context
+
+# Followed transcripts are re-checked this often between requests
+POLL_INTERVAL_SECONDS = 1.0
+
+# Followers not requested for this long are dropped (session ended)
+IDLE_TIMEOUT_SECONDS = 30 * 60
+
+
+class TranscriptFollower:
+    """Parsed message list of one transcript, extended as lines are appended."""
+
+    def __init__(self, transcript_path: Path) -> None:
+        """Initialize follower (nothing is read until catch_up()).
+
+        Args:
+            transcript_path: Path to transcript JSONL file
+        """
+        self.transcript_path = transcript_path
+        self.lock = threading.Lock()
+        self.last_access = time.monotonic()
+        self._token_cache = TranscriptTokenCache(transcript_path, count_tokens)
+        self._summary_store = TranscriptSummaryStore(transcript_path)
+        self._reset()
+
+    def _reset(self) -> None:
+        """Forget all parsed state."""
+        self.messages: list[dict[str, str | None]] = []
+        self.offset = 0
+        self._trailing: dict[str, str | None] | None = None
+        self._identity: tuple[int, int] | None = None
+        self._stat_key: tuple[int, int] | None = None
+
+    def catch_up(self) -> None:
+        """Parse lines appended since the last call.
+
+        Resets when the transcript was replaced (new inode) or truncated. A final line without
+        trailing newline is parsed on its own and re-read once it is completed.
+
+        Raises:
+            OSError: If the transcript cannot be read
+        """
+        stat = self.transcript_path.stat()
+        identity = (stat.st_dev, stat.st_ino)
+        if identity != self._identity or stat.st_size < self.offset:
+            self._reset()
+            self._identity = identity
+
+        stat_key = (stat.st_size, stat.st_mtime_ns)
+        if stat_key == self._stat_key:
+            return
+
+        with self.transcript_path.open("rb") as transcript_file:
+            transcript_file.seek(self.offset)
+            data = transcript_file.read()
+
+        complete_end = data.rfind(b"\n") + 1
+        for raw_line in data[:complete_end].splitlines():
+            msg = _parse_message_from_json(raw_line.decode("utf-8"))
+            if msg:
+                self.messages.append(msg)
+        self.offset += complete_end
+
+        trailing = data[complete_end:]
+        self._trailing = _parse_message_from_json(trailing.decode("utf-8", errors="replace")) if trailing else None
+        self._stat_key = stat_key
+
+    def last_n(self, n: int) -> list[dict[str, str | None]]:
+        """Get the last N messages (same result as get_last_n_messages()).
+
+        Args:
+            n: Number of messages to return
+
+        Returns:
+            List of message dicts, oldest first
+        """
+        if n <= 0:
+            return []
+        if self._trailing is None:
+            return self.messages[-n:]
+        return [*self.messages[-(n - 1) :], self._trailing] if n > 1 else [self._trailing]
+
+    def summarize(self) -> None:
+        """Fold messages that left the moderator's raw window into the summary store."""
+        try:
+            if self._summary_store.update(len(self.messages), lambda start, stop: self.messages[start:stop], MODERATOR_RAW_MESSAGE_COUNT):
+                self._summary_store.save()
+        except OSError as e:
+            logger.warning("transcript_daemon_summary_failed", transcript=str(self.transcript_path), error=str(e))
+
+    def moderator_context(self, todos: list[dict[str, Any]] | None = None) -> str:
+        """Build moderator context (same result as prepare_moderator_context()).
+
+        Token counts of message blocks are cached (see TranscriptTokenCache), so only blocks
+        of newly appended messages are tokenized. Messages older than the raw window are
+        replaced by the summary store's section.
+
+        Args:
+            todos: Optional list of todo items to append to context
+
+        Returns:
+            Formatted conversation context string ready for moderator
+        """
+        messages = self.last_n(MAX_MODERATOR_MESSAGE_COUNT + 1)
+        summary_section = None
+        if len(messages) > MAX_MODERATOR_MESSAGE_COUNT:
+            self.summarize()
+            summarized = self._summary_store.summarized
+            if summarized:
+                # Raw messages start right after the last summarized one
+                messages = [*self.messages[summarized:], *([self._trailing] if self._trailing else [])]
+                summary_section = self._summary_store.format_section()
+        context = build_moderator_context(messages, todos, token_counter=self._token_cache.count, summary_section=summary_section)
+        try:
+            self._token_cache.save()
+        except OSError as e:
+            # Counts stay in memory - the context is served all the same
+            logger.warning("transcript_daemon_token_cache_save_failed", transcript=str(self.transcript_path), error=str(e))
+        return context
+
+
+class TranscriptStateDaemon(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server holding one TranscriptFollower per active transcript."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        socket_path: Path,
+        poll_interval: float = POLL_INTERVAL_SECONDS,
+        idle_timeout: float = IDLE_TIMEOUT_SECONDS,
+    ) -> None:
+        """Bind the daemon socket.
+
+        Args:
+            socket_path: Unix socket path (created with owner-only permissions)
+            poll_interval: Seconds between background transcript checks
+            idle_timeout: Seconds without requests before a transcript is dropped
+        """
+        self.socket_path = socket_path
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+        self.followers: dict[Path, TranscriptFollower] = {}
+        self._followers_lock = threading.Lock()
+        self._stop_polling = threading.Event()
+        super().__init__(str(socket_path), TranscriptRequestHandler)
+
+    def server_bind(self) -> None:
+        """Bind the socket in the private socket directory and restrict it to the current user."""
+        ensure_socket_dir(self.socket_path)
+        super().server_bind()
+        self.socket_path.chmod(0o600)
+
+    def get_follower(self, transcript_path: Path) -> TranscriptFollower:
+        """Get (or start) the follower for a transcript.
+
+        Args:
+            transcript_path: Absolute path to transcript JSONL file
+
+        Returns:
+            Follower for the transcript
+
+        Raises:
+            ValueError: If the path is not an absolute .jsonl path
+        """
+        if not transcript_path.is_absolute() or transcript_path.suffix != ".jsonl":
+            raise ValueError(f"Not an absolute transcript path: {transcript_path}")
+        with self._followers_lock:
+            follower = self.followers.get(transcript_path)
+            if follower is None:
+                follower = TranscriptFollower(transcript_path)
+                self.followers[transcript_path] = follower
+                logger.info("transcript_daemon_follow", transcript=str(transcript_path))
+            follower.last_access = time.monotonic()
+            return follower
+
+    def dispatch(self, request: dict[str, Any]) -> Any:
+        """Execute one request.
+
+        Args:
+            request: Parsed request object
+
+        Returns:
+            Result value for the response
+
+        Raises:
+            ValueError: If the request is malformed
+            OSError: If the transcript cannot be read
+        """
+        op = request.get("op")
+        if op == "ping":
+            return "pong"
+
+        follower = self.get_follower(Path(str(request.get("path", ""))))
+        with follower.lock:
+            follower.catch_up()
+            if op == "last_n":
+                return follower.last_n(int(request.get("n", 0)))
+            if op == "moderator_context":
+                return follower.moderator_context(request.get("todos") or None)
+        raise ValueError(f"Unknown op: {op}")
+
+    def poll_followers(self) -> None:
+        """Catch up all followers and drop idle or deleted transcripts."""
+        now = time.monotonic()
+        with self._followers_lock:
+            followers = list(self.followers.items())
+        for transcript_path, follower in followers:
+            with follower.lock:
+                try:
+                    if now - follower.last_access > self.idle_timeout:
+                        raise FileNotFoundError(transcript_path)
+                    follower.catch_up()
+                    follower.summarize()
+                    continue
+                except (OSError, ValueError):
+                    pass
+            with self._followers_lock:
+                self.followers.pop(transcript_path, None)
+            logger.info("transcript_daemon_unfollow", transcript=str(transcript_path))
+
+    def _poll_loop(self) -> None:
+        """Background loop keeping followers current between requests."""
+        while not self._stop_polling.wait(self.poll_interval):
+            self.poll_followers()
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        """Serve requests with background transcript polling.
+
+        Args:
+            poll_interval: Shutdown check interval passed to socketserver
+        """
+        poller = threading.Thread(target=self._poll_loop, name="transcript-poller", daemon=True)
+        poller.start()
+        try:
+            super().serve_forever(poll_interval)
+        finally:
+            self._stop_polling.set()
+
+    def server_close(self) -> None:
+        """Close and remove the socket."""
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+class TranscriptRequestHandler(socketserver.StreamRequestHandler):
+    """Handle one JSON request line."""
+
+    server: TranscriptStateDaemon
+
+    def handle(self) -> None:
+        """Read request, dispatch, and write the response line."""
+        line = self.rfile.readline(MAX_REQUEST_SIZE + 1)
+        try:
+            if len(line) > MAX_REQUEST_SIZE:
+                raise ValueError(f"Request too large (>{MAX_REQUEST_SIZE} bytes)")
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise TypeError("Request must be a JSON object")
+            response: dict[str, Any] = {"ok": True, "result": self.server.dispatch(request)}
+        except (OSError, ValueError, TypeError) as e:
+            response = {"ok": False, "error": str(e)}
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+def _remove_stale_socket(socket_path: Path) -> None:
+    """Remove a leftover socket file unless another daemon is listening on it.
+
+    Args:
+        socket_path: Unix socket path
+
+    Raises:
+        RuntimeError: If a daemon is already running
+        PermissionError: If the socket directory is not private to the current user
+    """
+    ensure_socket_dir(socket_path)
+    if not socket_path.exists():
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(socket_path))
+        except OSError:
+            socket_path.unlink()
+            return
+    raise RuntimeError(f"Transcript daemon already running on {socket_path}")
+
+
+def main() -> int:
+    """Run the transcript state daemon until interrupted.
+
+    Returns:
+        Exit code (0=success)
+    """
+    parser = argparse.ArgumentParser(description="Shared transcript state daemon for hook validators")
+    parser.add_argument("--socket", type=Path, default=get_socket_path(), help="Unix socket path")
+    parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL_SECONDS, help="Seconds between transcript checks")
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT_SECONDS, help="Seconds before an idle transcript is dropped")
+    args = parser.parse_args()
+
+    try:
+        _remove_stale_socket(args.socket)
+    except (RuntimeError, OSError) as e:
+        logger.error("transcript_daemon_start_failed", error=str(e))
+        return 1
+
+    with TranscriptStateDaemon(args.socket, poll_interval=args.poll_interval, idle_timeout=args.idle_timeout) as server:
+        logger.info("transcript_daemon_started", socket=str(args.socket), pid=os.getpid())
+        with contextlib.suppress(KeyboardInterrupt):
+            server.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""Layered summaries of transcript history older than the moderator's raw message window.
+
+Moderator context keeps at most MAX_MODERATOR_MESSAGE_COUNT raw messages, so on long tasks
+the early requirements used to fall out of the context entirely. Instead, messages older
+than the raw window are compacted into persisted summaries (<transcript>.jsonl.summary),
+built incrementally as the transcript grows:
+
+    segment  - SEGMENT_MESSAGES consecutive messages
+    chapter  - SEGMENTS_PER_CHAPTER folded segments
+    session  - all chapters beyond MAX_CHAPTERS, folded into one running summary
+
+Every level is capped in characters, so the summary section has a fixed maximum size no
+matter how long the session is. Summaries are extractive (user requests, tools used, last
+assistant reply) - no model call is needed, so the store can be updated inline by hooks or
+in the background by the transcript daemon.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypedDict
+
+SUMMARY_SUFFIX = ".summary"
+
+# Layer sizes (messages per segment, segments per chapter, chapters kept before folding)
+SEGMENT_MESSAGES = 20
+SEGMENTS_PER_CHAPTER = 5
+MAX_CHAPTERS = 4
+
+# Character caps per summary (the whole section stays below ~25K characters)
+SEGMENT_SUMMARY_CHARS = 1500
+CHAPTER_SUMMARY_CHARS = 3000
+SESSION_SUMMARY_CHARS = 6000
+
+# Per-message excerpt lengths in segment summaries
+USER_EXCERPT_CHARS = 300
+ASSISTANT_EXCERPT_CHARS = 200
+
+_STORE_VERSION = 1
+_TOOL_PATTERN = re.compile(r"^\[Tool: ([^\]]+)\].*$", re.MULTILINE)
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class SummaryEntry(TypedDict):
+    """Summary of the messages in [start, end)."""
+
+    start: int
+    end: int
+    text: str
+
+
+def _excerpt(text: str, limit: int) -> str:
+    """Collapse whitespace and cut text to limit characters."""
+    text = _WHITESPACE_PATTERN.sub(" ", text).strip()
+    return text if len(text) <= limit else text[: limit - 2].rstrip() + " …"
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Cut multi-line text to limit characters, keeping its first lines."""
+    return text if len(text) <= limit else text[: limit - 2].rstrip() + " …"
+
+
+def summarize_messages(messages: list[dict[str, str | None]], start: int) -> str:
+    """Summarize consecutive messages extractively.
+
+    Args:
+        messages: Messages to summarize, oldest first
+        start: Ordinal of the first message (for the heading)
+
+    Returns:
+        Segment summary (at most SEGMENT_SUMMARY_CHARS characters)
+    """
+    lines = [f"Messages {start + 1}-{start + len(messages)}:"]
+    tools: Counter[str] = Counter()
+    last_reply = ""
+    for msg in messages:
+        text = msg.get("text") or ""
+        if msg.get("type") == "user":
+            # Tool results are user records too - only actual requests are kept
+            if not text.startswith("[Tool Result]"):
+                lines.append(f"- User: {_excerpt(text, USER_EXCERPT_CHARS)}")
+            continue
+        tools.update(_TOOL_PATTERN.findall(text))
+        reply = _TOOL_PATTERN.sub("", text).strip()
+        if reply:
+            last_reply = reply
+    if tools:
+        lines.append("- Tools: " + ", ".join(f"{name} x{count}" for name, count in tools.most_common()))
+    if last_reply:
+        lines.append(f"- Assistant (last reply): {_excerpt(last_reply, ASSISTANT_EXCERPT_CHARS)}")
+    return _truncate("\n".join(lines), SEGMENT_SUMMARY_CHARS)
+
+
+def fold_summaries(entries: list[SummaryEntry], limit: int) -> SummaryEntry:
+    """Fold consecutive summaries into one, giving each an equal share of the limit.
+
+    Args:
+        entries: Summaries to fold, oldest first
+        limit: Character cap of the folded summary
+
+    Returns:
+        Summary covering all entries
+    """
+    share = limit // len(entries)
+    text = "\n".join(_truncate(entry["text"], share) for entry in entries)
+    return SummaryEntry(start=entries[0]["start"], end=entries[-1]["end"], text=_truncate(text, limit))
+
+
+class TranscriptSummaryStore:
+    """Persisted segment/chapter/session summaries of a transcript's older messages."""
+
+    def __init__(self, transcript_path: Path, summarize: Callable[[list[dict[str, str | None]], int], str] = summarize_messages) -> None:
+        """Initialize store for a transcript (the sidecar is read lazily).
+
+        Args:
+            transcript_path: Path to transcript JSONL file
+            summarize: Segment summarizer (messages, ordinal of the first message) -> text
+        """
+        self.store_path = transcript_path.with_name(transcript_path.name + SUMMARY_SUFFIX)
+        self.summarize = summarize
+        self.session: SummaryEntry | None = None
+        self.chapters: list[SummaryEntry] = []
+        self.segments: list[SummaryEntry] = []
+        self._loaded = False
+
+    @property
+    def summarized(self) -> int:
+        """Number of leading messages covered by the summaries."""
+        if self.segments:
+            return self.segments[-1]["end"]
+        if self.chapters:
+            return self.chapters[-1]["end"]
+        return self.session["end"] if self.session else 0
+
+    def load(self) -> None:
+        """Read the sidecar (a missing or unreadable store counts as empty)."""
+        self._loaded = True
+        try:
+            data: Any = json.loads(self.store_path.read_text())
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != _STORE_VERSION:
+            return
+        self.session = data.get("session")
+        self.chapters = data.get("chapters", [])
+        self.segments = data.get("segments", [])
+
+    def save(self) -> None:
+        """Write the sidecar.
+
+        Raises:
+            OSError: If the store cannot be written
+        """
+        data = {"version": _STORE_VERSION, "session": self.session, "chapters": self.chapters, "segments": self.segments}
+        # Write-then-rename so concurrent hooks never read a partial store
+        tmp_path = self.store_path.with_name(f"{self.store_path.name}.{os.getpid()}.tmp")
+        tmp_fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(tmp_fd, "w") as f:
+            json.dump(data, f)
+        tmp_path.replace(self.store_path)
+
+    def update(self, message_count: int, read_messages: Callable[[int, int], list[dict[str, str | None]]], keep_recent: int) -> bool:
+        """Summarize complete segments older than the last keep_recent messages.
+
+        Args:
+            message_count: Number of (complete) messages in the transcript
+            read_messages: Reader for messages in [start, stop)
+            keep_recent: Number of newest messages left unsummarized (at least)
+
+        Returns:
+            True if new summaries were added (call save() to persist them)
+        """
+        if not self._loaded:
+            self.load()
+        if self.summarized > message_count:
+            # Transcript was replaced or truncated - start over
+            self.session, self.chapters, self.segments = None, [], []
+
+        added = False
+        while self.summarized + SEGMENT_MESSAGES <= message_count - keep_recent:
+            start = self.summarized
+            messages = read_messages(start, start + SEGMENT_MESSAGES)
+            self.segments.append(SummaryEntry(start=start, end=start + SEGMENT_MESSAGES, text=self.summarize(messages, start)))
+            added = True
+
+            if len(self.segments) == SEGMENTS_PER_CHAPTER:
+                self.chapters.append(fold_summaries(self.segments, CHAPTER_SUMMARY_CHARS))
+                self.segments = []
+            if len(self.chapters) > MAX_CHAPTERS:
+                oldest = self.chapters.pop(0)
+                self.session = fold_summaries([self.session, oldest] if self.session else [oldest], SESSION_SUMMARY_CHARS)
+        return added
+
+    def format_section(self) -> str:
+        """Format all summaries as a moderator context section.
+
+        Returns:
+            Section placed before EXHIBIT A (empty if nothing is summarized)
+        """
+        entries = ([self.session] if self.session else []) + self.chapters + self.segments
+        if not entries:
+            return ""
+        body = "\n\n".join(entry["text"] for entry in entries)
+        return (
+            "# Earlier Conversation Summary\n\n"
+            f"Messages 1-{self.summarized} are summarized below (user requests, tools used, last assistant reply); "
+            "later messages are in EXHIBIT A.\n\n"
+            f"{body}\n\n"
+        )
+
+
+__all__ = [
+    "SUMMARY_SUFFIX",
+    "SummaryEntry",
+    "TranscriptSummaryStore",
+    "fold_summaries",
+    "summarize_messages",
+]
@@ -0,0 +1,147 @@
+"""Per-user unix sockets of the resident hook helpers.
+
+The transcript daemon, the hook server and the moderator session daemon answer hook
+validators over unix sockets, so whoever listens on a socket decides what the validators see
+and return. Sockets therefore live in a directory only the current user can enter
+($XDG_RUNTIME_DIR/ami or <tempdir>/ami-<uid>, mode 0700), and clients only trust a socket
+when its directory and the socket itself are owned by the current user and the listening
+process runs as the current user (SO_PEERCRED). Anything else counts as "no server" and
+callers fall back to running in-process.
+
+Standard library only: the hook client imports this before anything else.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import stat
+import struct
+import tempfile
+from pathlib import Path
+
+# Permissions of the socket directory (owner only)
+SOCKET_DIR_MODE = 0o700
+
+# struct ucred returned by SO_PEERCRED: pid, uid, gid
+_UCRED_FORMAT = "3i"
+
+
+def get_socket_dir() -> Path:
+    """Get the per-user directory holding the helper sockets.
+
+    Returns:
+        $XDG_RUNTIME_DIR/ami, or <tempdir>/ami-<uid> without XDG_RUNTIME_DIR
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "ami"
+    return Path(tempfile.gettempdir()) / f"ami-{os.getuid()}"
+
+
+def get_user_socket_path(name: str, env_var: str) -> Path:
+    """Get the socket path of a helper for the current user.
+
+    Args:
+        name: Socket file name (e.g. hook-server.sock)
+        env_var: Environment variable overriding the path
+
+    Returns:
+        $<env_var> if set, otherwise <name> in get_socket_dir()
+    """
+    override = os.environ.get(env_var)
+    if override:
+        return Path(override)
+    return get_socket_dir() / name
+
+
+def _is_private(path_stat: os.stat_result) -> bool:
+    """Check that a file is owned by the current user and not writable by anyone else."""
+    return path_stat.st_uid == os.getuid() and not path_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def ensure_socket_dir(socket_path: Path) -> None:
+    """Create the directory of a socket (mode 0700) and check that it is private.
+
+    Args:
+        socket_path: Socket a server is about to bind
+
+    Raises:
+        PermissionError: If the directory belongs to another user or is writable by others
+        OSError: If the directory cannot be created
+    """
+    socket_dir = socket_path.parent
+    socket_dir.mkdir(mode=SOCKET_DIR_MODE, parents=True, exist_ok=True)
+    dir_stat = socket_dir.lstat()
+    if not stat.S_ISDIR(dir_stat.st_mode) or not _is_private(dir_stat):
+        raise PermissionError(f"Socket directory is not private to uid {os.getuid()}: {socket_dir}")
+
+
+def is_trusted_socket(socket_path: Path) -> bool:
+    """Check that a socket and its directory are private to the current user.
+
+    Args:
+        socket_path: Socket path
+
+    Returns:
+        True if both belong to the current user and only the owner can write the directory
+    """
+    try:
+        dir_stat = socket_path.parent.lstat()
+        socket_stat = socket_path.lstat()
+    except OSError:
+        return False
+    return stat.S_ISDIR(dir_stat.st_mode) and _is_private(dir_stat) and stat.S_ISSOCK(socket_stat.st_mode) and socket_stat.st_uid == os.getuid()
+
+
+def get_peer_uid(sock: socket.socket) -> int | None:
+    """Get the user ID of the process at the other end of a connected unix socket.
+
+    Args:
+        sock: Connected AF_UNIX socket
+
+    Returns:
+        Peer uid, or None where SO_PEERCRED is not available
+    """
+    peercred = getattr(socket, "SO_PEERCRED", None)
+    if peercred is None:
+        return None
+    _pid, uid, _gid = struct.unpack(_UCRED_FORMAT, sock.getsockopt(socket.SOL_SOCKET, peercred, struct.calcsize(_UCRED_FORMAT)))
+    return int(uid)
+
+
+def connect_user_socket(socket_path: Path, timeout: float | None) -> socket.socket | None:
+    """Connect to a helper socket only if it belongs to the current user.
+
+    Args:
+        socket_path: Socket path
+        timeout: Connect timeout in seconds (None = blocking)
+
+    Returns:
+        Connected socket (caller closes it), or None if the socket is missing, untrusted or
+        not accepting connections
+    """
+    if not is_trusted_socket(socket_path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        if get_peer_uid(sock) != os.getuid():
+            sock.close()
+            return None
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+__all__ = [
+    "SOCKET_DIR_MODE",
+    "connect_user_socket",
+    "ensure_socket_dir",
+    "get_peer_uid",
+    "get_socket_dir",
+    "get_user_socket_path",
+    "is_trusted_socket",
+]
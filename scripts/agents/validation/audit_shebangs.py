@@ -27,7 +27,6 @@ import sys
 from pathlib import Path
 from typing import Any
 
-import yaml
 from loguru import logger
 
 # Root directory
@@ -36,6 +35,7 @@ ROOT = Path(__file__).resolve().parents[1]
 # Import config after setting up sys.path to avoid circular imports
 sys.path.insert(0, str(ROOT))
 from scripts.agents.config import get_config
+from scripts.agents.validation.pattern_registry import get_pattern_registry
 
 # Correct shebang patterns
 CORRECT_AMI_RUN_SHEBANG = '#!/usr/bin/env bash\n"""\'exec "$(dirname "$0")/ami-run" "$(dirname "$0")'
@@ -48,17 +48,8 @@ def _load_shebang_patterns() -> dict[str, Any]:
     Returns:
         Dictionary containing incorrect and security patterns
     """
-    config = get_config()
-    patterns_dir = config.root / "scripts/config/patterns"
-    patterns_file = patterns_dir / "shebang_patterns.yaml"
-
-    if not patterns_file.exists():
-        # Return empty dict if config doesn't exist
-        return {"incorrect_patterns": [], "security_patterns": []}
-
-    with patterns_file.open() as f:
-        result: dict[str, Any] = yaml.safe_load(f)
-        return result
+    # Empty dict if config doesn't exist
+    return get_pattern_registry(get_config().root).load("shebang_patterns.yaml")
 
 
 # Load patterns from config file
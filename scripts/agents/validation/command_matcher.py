@@ -0,0 +1,332 @@
+"""Compiled matcher for Bash command deny rules.
+
+CommandValidator used to run re.search for every rule in bash_commands.yaml, in order, on
+every call - cost grew linearly with the rule list. The matcher compiles the rules once and
+indexes each by a literal it requires:
+
+    word trigger - a word the rule needs at a word start (e.g. ``git`` in ``\\bgit\\b.*\\bpush\\b``),
+                   looked up against the prefixes of the command's words
+    char trigger - a literal character the rule needs (e.g. ``;`` or ``|``)
+    command rule - ``command: NAME`` rules match the command word of any simple command
+                   (``sudo`` in ``FOO=1 /usr/bin/sudo ls``), no regex involved
+
+The command text is tokenized once; only rules whose trigger occurs are confirmed with their
+regex, in list order, so the first matching rule still wins. Rules without an extractable
+trigger are always confirmed. Per-call cost depends on the command length, not on the number
+of rules.
+
+Benchmark against the sequential loop:
+    ami-run -m scripts.agents.validation.command_matcher --benchmark
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import shlex
+import sys
+import time
+from collections.abc import Callable, Sequence
+from typing import Any
+
+_WORD_PIECE = re.compile(r"\w+")
+_WORD_CHARS = re.compile(r"[A-Za-z0-9_]+")
+# Zero-width prefixes that do not consume text: ^, \b, lookbehinds and lookaheads
+_ZERO_WIDTH = re.compile(r"\^|\\b|\(\?<?[!=](?:\\.|\[(?:\\.|[^\]])*\]|[^()\\])*\)")
+# A negative lookbehind excluding word characters acts as a word boundary for a word literal
+_WORD_LOOKBEHIND = re.compile(r"\(\?<!\[[^\]]*\\w[^\]]*\]\)")
+_QUANTIFIERS = "?*{"
+_REGEX_META = ".^$*+?{}[]()|\\"
+# Tokens after which a command word follows: operators, backticks (command substitution)
+_SHELL_OPERATORS = frozenset({";", "&", "&&", "|", "||", "|&", ";;", "(", ")", "\n", "`"})
+_ASSIGNMENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*=")
+
+# Reserved words followed by a command ({ sudo id; }, if true; then sudo id; fi, ! sudo id)
+_COMMAND_KEYWORDS = frozenset({"!", "{", "if", "then", "else", "elif", "do", "while", "until"})
+# Reserved words followed by something other than a command (closers, loop variables, case words)
+_NON_COMMAND_KEYWORDS = frozenset({"}", "fi", "done", "esac", "for", "select", "case", "in", "function"})
+
+# Command tokens skipped when looking for the command word, with their options that take a
+# separate argument (env -u NAME sudo id)
+_COMMAND_PREFIXES: dict[str, frozenset[str]] = {
+    "env": frozenset({"-u", "--unset", "-C", "--chdir"}),
+    "command": frozenset(),
+    "exec": frozenset({"-a"}),
+    "nohup": frozenset(),
+    "time": frozenset({"-f", "--format", "-o", "--output"}),
+}
+# env options whose argument is itself a command line (env -S 'sudo id')
+_SPLIT_STRING_OPTIONS = frozenset({"-S", "--split-string"})
+
+# Command substitutions inside a quoted word ("$(sudo id)", "`sudo id`")
+_SUBSTITUTION = re.compile(r"`([^`]*)`|\$\(([^)]*)\)")
+
+# Benchmark parameters
+BENCHMARK_RULE_COUNTS = (40, 100, 300, 1000)
+BENCHMARK_ITERATIONS = 200
+BENCHMARK_COMMANDS = (
+    "ls -la /tmp",
+    "scripts/ami-run scripts/agents/cli/main.py --hook command-guard",
+    "git status --short",
+    "grep -rn TODO scripts/agents",
+)
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    """Check whether a pattern has a ``|`` outside groups and character classes."""
+    depth = 0
+    in_class = False
+    escaped = False
+    for char in pattern:
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+    return False
+
+
+def extract_trigger(pattern: str) -> tuple[str, str] | None:
+    """Find a literal that every match of a pattern must contain.
+
+    Args:
+        pattern: Regex pattern
+
+    Returns:
+        ("word", w) if a match needs w at the start of a word, ("char", c) if it needs the
+        literal character c, or None if no trigger can be derived safely
+    """
+    if pattern.startswith("(?") and not pattern.startswith(("(?<", "(?=", "(?!")):
+        # Inline flags (e.g. case-insensitive) change what a literal matches
+        return None
+    if _has_top_level_alternation(pattern):
+        return None
+
+    position = 0
+    at_word_start = False
+    while match := _ZERO_WIDTH.match(pattern, position):
+        at_word_start = at_word_start or match.group() == "\\b" or bool(_WORD_LOOKBEHIND.fullmatch(match.group()))
+        position = match.end()
+    rest = pattern[position:]
+
+    word = _WORD_CHARS.match(rest)
+    if at_word_start and word:
+        literal = word.group()
+        if rest[word.end() : word.end() + 1] in tuple(_QUANTIFIERS):
+            # Last character is optional (e.g. python3?)
+            literal = literal[:-1]
+        if literal:
+            return ("word", literal)
+
+    if rest.startswith("\\") and len(rest) > 1 and rest[1] in _REGEX_META:
+        char, end = rest[1], 2
+    elif rest and rest[0] not in _REGEX_META:
+        char, end = rest[0], 1
+    else:
+        return None
+    if rest[end : end + 1] in tuple(_QUANTIFIERS):
+        return None
+    return ("char", char)
+
+
+def _tokenize(command: str) -> list[str]:
+    """Split shell text into words and operators (whitespace words if quotes are unbalanced)."""
+    lexer = shlex.shlex(command, posix=True, punctuation_chars=True)
+    lexer.whitespace = " \t\r"
+    lexer.wordchars += "~-./=$:@%+,"
+    try:
+        return list(lexer)
+    except ValueError:
+        return command.split()
+
+
+def get_command_words(command: str) -> set[str]:
+    """Tokenize shell text and collect the command word of every simple command.
+
+    Follows operators, group braces and compound-command reserved words, backtick and $()
+    substitutions (also inside double quotes), ``!`` and the prefix commands in
+    _COMMAND_PREFIXES with their options. Aliases, functions, ``eval``/``sh -c`` strings and
+    commands named by variables are not resolved.
+
+    Args:
+        command: Shell command text
+
+    Returns:
+        Basenames of the commands run (e.g. {"git", "sudo"} for "git st && sudo ls")
+    """
+    words: set[str] = set()
+    expect_command = True
+    prefix_options: frozenset[str] | None = None  # Set while a prefix command awaits its command word
+    option_argument: str | None = None  # Prefix option whose argument comes next
+    for token in _tokenize(command):
+        for backticks, parens in _SUBSTITUTION.findall(token):
+            # Quoted word with a command substitution - its commands run too
+            words |= get_command_words(backticks or parens)
+        if option_argument is not None:
+            if option_argument in _SPLIT_STRING_OPTIONS:
+                # The argument is the command line itself
+                words |= get_command_words(token)
+                expect_command = False
+            option_argument = None
+        elif token in _SHELL_OPERATORS or (expect_command and token in _COMMAND_KEYWORDS):
+            expect_command, prefix_options = True, None
+        elif not expect_command or _ASSIGNMENT.match(token):
+            continue
+        elif token in _NON_COMMAND_KEYWORDS:
+            expect_command = False
+        elif prefix_options is not None and token.startswith("-"):
+            # Option of a prefix command (env -i sudo id)
+            if token in prefix_options or token in _SPLIT_STRING_OPTIONS:
+                option_argument = token
+        else:
+            name = os.path.basename(token)
+            words.add(name)
+            prefix_options = _COMMAND_PREFIXES.get(name)
+            expect_command = prefix_options is not None
+    return words
+
+
+class CommandMatcher:
+    """Bash deny rules compiled once and indexed by their trigger literals."""
+
+    def __init__(self, rules: Sequence[dict[str, Any]]) -> None:
+        """Compile and index rules.
+
+        Args:
+            rules: Rules in priority order, each with either ``pattern`` (regex) or
+                ``command`` (command word), plus ``message``
+
+        Raises:
+            re.error: If a pattern does not compile
+        """
+        self.rules = list(rules)
+        self._compiled: list[re.Pattern[str] | None] = []
+        self._word_index: dict[str, list[int]] = {}
+        self._char_index: dict[str, list[int]] = {}
+        self._command_index: dict[str, list[int]] = {}
+        self._always: list[int] = []
+        self.confirmations = 0
+
+        for index, rule in enumerate(self.rules):
+            if "command" in rule:
+                self._compiled.append(None)
+                self._command_index.setdefault(str(rule["command"]), []).append(index)
+                continue
+            pattern = str(rule.get("pattern", ""))
+            self._compiled.append(re.compile(pattern))
+            trigger = extract_trigger(pattern)
+            if trigger is None:
+                self._always.append(index)
+            elif trigger[0] == "word":
+                self._word_index.setdefault(trigger[1], []).append(index)
+            else:
+                self._char_index.setdefault(trigger[1], []).append(index)
+        self._word_lengths = sorted({len(word) for word in self._word_index})
+
+    def _candidates(self, command: str) -> tuple[set[int], set[int]]:
+        """Collect rules whose trigger occurs in the command.
+
+        Returns:
+            (regex rules to confirm, command rules already matched)
+        """
+        candidates = set(self._always)
+        for piece in set(_WORD_PIECE.findall(command)):
+            for length in self._word_lengths:
+                if length > len(piece):
+                    break
+                candidates.update(self._word_index.get(piece[:length], ()))
+        for char, indices in self._char_index.items():
+            if char in command:
+                candidates.update(indices)
+
+        matched_commands: set[int] = set()
+        if self._command_index:
+            for word in get_command_words(command):
+                matched_commands.update(self._command_index.get(word, ()))
+        return candidates, matched_commands
+
+    def match(self, command: str) -> dict[str, Any] | None:
+        """Find the first rule (in list order) matching a command.
+
+        Args:
+            command: Shell command text
+
+        Returns:
+            Matching rule, or None if no rule matches
+        """
+        candidates, matched_commands = self._candidates(command)
+        for index in sorted(candidates | matched_commands):
+            if index in matched_commands:
+                return self.rules[index]
+            compiled = self._compiled[index]
+            self.confirmations += 1
+            if compiled is not None and compiled.search(command):
+                return self.rules[index]
+        return None
+
+
+def match_sequential(rules: Sequence[dict[str, Any]], command: str) -> dict[str, Any] | None:
+    """Reference implementation: search every pattern rule in order.
+
+    Args:
+        rules: Pattern rules in priority order
+        command: Shell command text
+
+    Returns:
+        First matching rule, or None
+    """
+    for rule in rules:
+        if re.search(str(rule.get("pattern", "")), command):
+            return rule
+    return None
+
+
+def _synthetic_rules(count: int) -> list[dict[str, Any]]:
+    """Build count deny rules that never match the benchmark commands."""
+    return [{"pattern": rf"\bforbidden{i}\b", "message": f"rule {i}"} for i in range(count)]
+
+
+def _time_per_call(func: Callable[[str], object]) -> float:
+    """Average microseconds per call over the benchmark commands."""
+    start = time.perf_counter()
+    for _ in range(BENCHMARK_ITERATIONS):
+        for command in BENCHMARK_COMMANDS:
+            func(command)
+    return (time.perf_counter() - start) / (BENCHMARK_ITERATIONS * len(BENCHMARK_COMMANDS)) * 1_000_000
+
+
+def main() -> int:
+    """Benchmark the compiled matcher against the sequential loop.
+
+    Returns:
+        Exit code (0=success)
+    """
+    parser = argparse.ArgumentParser(description="Bash command deny-rule matcher")
+    parser.add_argument("--benchmark", action="store_true", help="Compare compiled and sequential matching as the rule count grows")
+    args = parser.parse_args()
+    if not args.benchmark:
+        parser.print_help()
+        return 1
+
+    sys.stdout.write(f"{'rules':>6} {'sequential us':>14} {'compiled us':>12}\n")
+    for count in BENCHMARK_RULE_COUNTS:
+        rules = _synthetic_rules(count)
+        matcher = CommandMatcher(rules)
+        sequential = _time_per_call(lambda command, rules=rules: match_sequential(rules, command))  # type: ignore[misc]
+        compiled = _time_per_call(matcher.match)
+        sys.stdout.write(f"{count:>6} {sequential:>14.1f} {compiled:>12.1f}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""Moderator payloads for LLM diff audits.
+
+validate_diff_llm used to send the complete OLD and NEW file for every edit - a one-line change
+in a 2,000-line module cost ~4,000 lines of moderator input, once per code-quality validator.
+Files within the context budget are still sent whole. Larger files get a scoped payload:
+
+    DIFF      - unified diff of the change
+    OLD/NEW   - the import block plus the complete enclosing scope of every changed line,
+                with line numbers; omitted lines are unchanged
+
+Enclosing scopes come from ``ast`` for Python (outermost function, or the method when the
+change is inside a class; module-level statements otherwise) and from indentation for other
+files or Python that does not parse (the enclosing top-level block, including its closing brace).
+"""
+
+from __future__ import annotations
+
+import ast
+import difflib
+import re
+from pathlib import Path
+
+# Files with at most this many lines (old + new) are sent whole
+DEFAULT_CONTEXT_BUDGET_LINES = 600
+
+# Unchanged lines around each diff hunk
+DIFF_CONTEXT_LINES = 3
+
+# Top-level import lines for non-Python files (JS/TS, C/C++, C#, Rust, Go, shell)
+_IMPORT_LINE = re.compile(r"^(?:import\b|from\s+\S+\s+import\b|#include\b|using\s|use\s|require\(|const\s+\w+\s*=\s*require\(|source\s|\.\s)")
+
+_FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+LineRange = tuple[int, int]
+
+
+def _changed_lines(old_lines: list[str], new_lines: list[str]) -> tuple[list[int], list[int]]:
+    """Get the 1-based line numbers touched by the change on each side.
+
+    Pure insertions (deletions) mark the neighbouring lines of the other side, so the scope the
+    new code lands in is always included.
+    """
+    old_changed: list[int] = []
+    new_changed: list[int] = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False).get_opcodes():
+        if tag == "equal":
+            continue
+        old_changed.extend(range(i1 + 1, i2 + 1) if i2 > i1 else (i1, i1 + 1))
+        new_changed.extend(range(j1 + 1, j2 + 1) if j2 > j1 else (j1, j1 + 1))
+    return old_changed, new_changed
+
+
+def _node_start(node: ast.stmt) -> int:
+    """First line of a statement, including decorators."""
+    decorators: list[ast.expr] = getattr(node, "decorator_list", [])
+    return min([node.lineno, *(decorator.lineno for decorator in decorators)])
+
+
+def _node_end(node: ast.stmt) -> int:
+    """Last line of a statement."""
+    return node.end_lineno or node.lineno
+
+
+def _containing(body: list[ast.stmt], line: int) -> ast.stmt | None:
+    """Statement of a body spanning a line."""
+    return next((node for node in body if _node_start(node) <= line <= _node_end(node)), None)
+
+
+def _python_ranges(content: str, changed: list[int]) -> list[LineRange] | None:
+    """Import block and enclosing scopes of changed lines, from the AST.
+
+    Returns:
+        Line ranges, or None if the content does not parse
+    """
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return None
+
+    ranges: list[LineRange] = []
+    for statement in tree.body:
+        is_import = isinstance(statement, ast.Import | ast.ImportFrom)
+        # `if TYPE_CHECKING:` and similar guarded import blocks
+        is_import_block = isinstance(statement, ast.If | ast.Try) and all(isinstance(child, ast.Import | ast.ImportFrom) for child in statement.body)
+        if is_import or is_import_block:
+            ranges.append((_node_start(statement), _node_end(statement)))
+
+    for line in changed:
+        node = _containing(tree.body, line)
+        if node is None:
+            # Blank line or comment between statements
+            ranges.append((line, line))
+            continue
+        # Narrow classes down to the method (or nested class) containing the line
+        while isinstance(node, ast.ClassDef) and isinstance(inner := _containing(node.body, line), (*_FUNCTION_NODES, ast.ClassDef)):
+            node = inner
+        ranges.append((_node_start(node), _node_end(node)))
+    return ranges
+
+
+def _indent(line: str) -> int:
+    """Indentation width of a line."""
+    return len(line) - len(line.lstrip())
+
+
+def _indentation_ranges(lines: list[str], changed: list[int]) -> list[LineRange]:
+    """Import lines and enclosing top-level blocks of changed lines, from indentation."""
+    ranges: list[LineRange] = [(number, number) for number, line in enumerate(lines, 1) if _IMPORT_LINE.match(line)]
+    for line in changed:
+        if not 1 <= line <= len(lines):
+            continue
+        # Up to the top-level line opening the block
+        start = line - 1
+        while start > 0 and (not lines[start].strip() or _indent(lines[start]) > 0):
+            start -= 1
+        # Down to the last indented line, plus a closing bracket at top level
+        end = line - 1
+        while end + 1 < len(lines):
+            following = lines[end + 1]
+            if following.strip() and _indent(following) == 0:
+                if following.lstrip()[0] in "}])":
+                    end += 1
+                break
+            end += 1
+        ranges.append((start + 1, end + 1))
+    return ranges
+
+
+def _merge(ranges: list[LineRange], line_count: int) -> list[LineRange]:
+    """Sort, clamp and merge overlapping or adjacent ranges."""
+    merged: list[LineRange] = []
+    for start, end in sorted(ranges):
+        first, last = max(start, 1), min(end, line_count)
+        if first > last:
+            continue
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def scoped_ranges(file_path: str | Path, content: str, changed: list[int]) -> list[LineRange]:
+    """Line ranges to send for one side of a change: import block plus enclosing scopes.
+
+    Args:
+        file_path: Path of the file (selects the Python AST or the indentation heuristic)
+        content: File content
+        changed: 1-based changed line numbers
+
+    Returns:
+        Sorted, merged, 1-based inclusive line ranges
+    """
+    lines = content.splitlines()
+    ranges = _python_ranges(content, changed) if str(file_path).endswith(".py") else None
+    if ranges is None:
+        ranges = _indentation_ranges(lines, changed)
+    return _merge(ranges, len(lines))
+
+
+def _render_excerpt(lines: list[str], ranges: list[LineRange]) -> str:
+    """Render line ranges with line numbers and omission markers."""
+    width = len(str(len(lines)))
+    rendered: list[str] = []
+    previous_end = 0
+    for start, end in ranges:
+        if start > previous_end + 1:
+            rendered.append(f"{'...':>{width}} | (lines {previous_end + 1}-{start - 1} unchanged, omitted)")
+        rendered.extend(f"{number:>{width}} | {lines[number - 1]}" for number in range(start, end + 1))
+        previous_end = end
+    if previous_end < len(lines):
+        rendered.append(f"{'...':>{width}} | (lines {previous_end + 1}-{len(lines)} unchanged, omitted)")
+    return "\n".join(rendered)
+
+
+def _full_context(file_path: str | Path, old_content: str, new_content: str) -> str:
+    """Payload with the complete old and new file."""
+    return f"""FILE: {file_path}
+
+## OLD CODE
+```
+{old_content}
+```
+
+## NEW CODE
+```
+{new_content}
+```
+"""
+
+
+def build_diff_context(
+    file_path: str | Path,
+    old_content: str,
+    new_content: str,
+    context_budget_lines: int = DEFAULT_CONTEXT_BUDGET_LINES,
+) -> str:
+    """Build the moderator input for a diff audit.
+
+    Args:
+        file_path: Path to file
+        old_content: Previous content
+        new_content: New content
+        context_budget_lines: Files with at most this many lines (old + new) are sent whole
+
+    Returns:
+        Full OLD/NEW payload within the budget (or when scoping would not shrink it),
+        otherwise unified diff plus import block and enclosing scopes of both sides
+    """
+    old_lines = old_content.splitlines()
+    new_lines = new_content.splitlines()
+    full = _full_context(file_path, old_content, new_content)
+    if len(old_lines) + len(new_lines) <= context_budget_lines or not old_lines:
+        return full
+
+    old_changed, new_changed = _changed_lines(old_lines, new_lines)
+    if not old_changed and not new_changed:
+        return full
+
+    diff = "\n".join(difflib.unified_diff(old_lines, new_lines, fromfile=str(file_path), tofile=str(file_path), n=DIFF_CONTEXT_LINES, lineterm=""))
+    old_ranges = scoped_ranges(file_path, old_content, old_changed)
+    new_ranges = scoped_ranges(file_path, new_content, new_changed)
+    scoped = f"""FILE: {file_path}
+
+Large file: OLD CODE and NEW CODE contain the import block and the complete enclosing scopes of every change
+(line-numbered). Omitted lines are unchanged ({len(old_lines)} lines before, {len(new_lines)} lines after the change).
+
+## DIFF
+```diff
+{diff}
+```
+
+## OLD CODE
+```
+{_render_excerpt(old_lines, old_ranges)}
+```
+
+## NEW CODE
+```
+{_render_excerpt(new_lines, new_ranges)}
+```
+"""
+    return scoped if len(scoped) < len(full) else full
@@ -12,9 +12,14 @@ from scripts.agents.cli.config import AgentConfigPresets
 from scripts.agents.cli.exceptions import AgentError, AgentExecutionError, AgentTimeoutError
 from scripts.agents.cli.factory import get_agent_cli
 from scripts.agents.config import get_config
+from scripts.agents.validation.diff_payload import DEFAULT_CONTEXT_BUDGET_LINES, build_diff_context
 from scripts.agents.validation.moderator_runner import run_moderator_with_retry
 from scripts.agents.validation.pattern_validators import validate_python_patterns
 from scripts.agents.validation.validation_utils import parse_code_fence_output
+from scripts.agents.validation.verdict_memo import get_verdict_memo, memo_key
+
+# Explicit moderator decision in audit output
+DECISION_MARKER = re.compile(r"\bALLOW\b|\bBLOCK:", re.IGNORECASE)
 
 
 def _parse_audit_decision(cleaned_output: str, original_output: str) -> tuple[bool, str]:
@@ -71,22 +76,17 @@ def validate_diff_llm(
     Raises:
         Exception: Non-AgentError exceptions are re-raised
     """
-    # Build diff context
-    diff_context = f"""FILE: {file_path}
-
-## OLD CODE
-```
-{old_content}
-```
-
-## NEW CODE
-```
-{new_content}
-```
-"""
-
     # Get configuration and paths
     config = get_config()
+
+    # Build diff context (whole files within the budget, diff plus enclosing scopes above it)
+    diff_context = build_diff_context(
+        file_path,
+        old_content,
+        new_content,
+        context_budget_lines=config.get("code_quality.context_budget_lines", DEFAULT_CONTEXT_BUDGET_LINES),
+    )
+
     prompts_dir = config.root / config.get("prompts.dir")
     audit_diff_template = prompts_dir / config.get("prompts.audit_diff")
     patterns_path = prompts_dir / patterns_file
@@ -104,6 +104,16 @@ def validate_diff_llm(
     audit_template = audit_diff_template.read_text()
     audit_prompt = audit_template.replace("{PATTERNS}", patterns_content)
 
+    audit_diff_config = AgentConfigPresets.audit_diff(session_id)
+    audit_diff_config.enable_streaming = True
+    moderator_name = f"code_quality_{patterns_file.replace('.txt', '')}"
+
+    # Reuse the verdict of an identical earlier audit (opt-in, code quality only)
+    verdict_memo = get_verdict_memo(moderator_name)
+    verdict_key = memo_key(audit_prompt, audit_diff_config.model, str(file_path), diff_context)
+    if verdict_memo is not None and (verdict := verdict_memo.get(verdict_key)) is not None:
+        return verdict
+
     # Write temporary prompt file
     with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as tmp:
         tmp.write(audit_prompt)
@@ -111,8 +121,6 @@ def validate_diff_llm(
 
     try:
         # Run LLM-based diff audit with retry on hang
-        audit_diff_config = AgentConfigPresets.audit_diff(session_id)
-        audit_diff_config.enable_streaming = True
         cli = get_agent_cli()
 
         # Create audit log for hang detection
@@ -128,7 +136,7 @@ def validate_diff_llm(
             stdin=diff_context,
             agent_config=audit_diff_config,
             audit_log_path=audit_log_path,
-            moderator_name=f"code_quality_{patterns_file.replace('.txt', '')}",
+            moderator_name=moderator_name,
             session_id=session_id,
             execution_id=execution_id,
             max_attempts=2,
@@ -139,7 +147,12 @@ def validate_diff_llm(
         cleaned_output = parse_code_fence_output(output)
 
         # Parse the decision from the output
-        return _parse_audit_decision(cleaned_output, output)
+        result = _parse_audit_decision(cleaned_output, output)
+
+        # Only explicit ALLOW/BLOCK decisions are memoized (not missing markers or moderator errors)
+        if verdict_memo is not None and DECISION_MARKER.search(cleaned_output):
+            verdict_memo.put(verdict_key, result)
+        return result
 
     except (AgentTimeoutError, AgentExecutionError) as e:
         # FAIL-CLOSED: On timeout or execution errors, BLOCK the edit
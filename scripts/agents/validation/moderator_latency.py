@@ -0,0 +1,181 @@
+"""Persisted per-moderator lifecycle latencies for hang detection and hedging.
+
+run_moderator_with_retry records the lifecycle event timings of its attempts (see
+cli.lifecycle) and launches a second (hedge) moderator when the first has produced no output
+by a percentile of the moderator's observed first_byte latency. Each hook runs in its own
+process, so samples are kept on disk, per moderator name and event:
+
+    {"malicious_behavior": {"first_byte": [0.8, 1.1, ...], "decision": [4.2, ...]}, ...}
+
+Only the newest max_samples of each series are kept. Inspect the distributions with:
+    ami-run -m scripts.agents.validation.moderator_latency --stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import fcntl
+import json
+import math
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from scripts.agents.config import get_config
+
+# Defaults for agent.moderator.hedging in automation.yaml
+DEFAULT_STORAGE = "logs/moderator-latency.json"
+DEFAULT_PERCENTILE = 95.0
+DEFAULT_MIN_SAMPLES = 20
+DEFAULT_MAX_SAMPLES = 200
+
+# Percentiles reported by --stats
+REPORTED_PERCENTILES = (50.0, 90.0, 95.0, 99.0)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile.
+
+    Args:
+        samples: Non-empty list of values
+        pct: Percentile in (0, 100]
+
+    Returns:
+        Smallest sample with at least pct percent of samples at or below it
+    """
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class LatencyStore:
+    """On-disk latency samples shared by all hook processes."""
+
+    def __init__(self, path: Path, max_samples: int = DEFAULT_MAX_SAMPLES) -> None:
+        """Initialize store.
+
+        Args:
+            path: JSON file holding the samples
+            max_samples: Newest samples kept per moderator and metric
+        """
+        self.path = path
+        self.max_samples = max_samples
+
+    def _read(self) -> dict[str, Any]:
+        """Read all samples (empty if missing or unreadable)."""
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("moderator_latency_read_error", path=str(self.path), error=str(e))
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def samples(self, moderator_name: str, metric: str) -> list[float]:
+        """Get recorded samples.
+
+        Args:
+            moderator_name: Moderator name (e.g. malicious_behavior)
+            metric: Lifecycle event name (e.g. first_byte, decision)
+
+        Returns:
+            Samples in seconds, oldest first
+        """
+        series = self._read().get(moderator_name, {}).get(metric, [])
+        return [float(value) for value in series] if isinstance(series, list) else []
+
+    def record(self, moderator_name: str, metric: str, seconds: float) -> None:
+        """Append a sample (failures only lose the sample).
+
+        Args:
+            moderator_name: Moderator name
+            metric: Lifecycle event name (e.g. first_byte, decision)
+            seconds: Observed latency
+        """
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            store_fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            with os.fdopen(store_fd, "r+") as store_file:
+                # Concurrent hooks append to the same file - serialize updates
+                fcntl.flock(store_file.fileno(), fcntl.LOCK_EX)
+                content = store_file.read()
+                data = json.loads(content) if content else {}
+                series = data.setdefault(moderator_name, {}).setdefault(metric, [])
+                series.append(round(seconds, 3))
+                del series[: -self.max_samples]
+                store_file.seek(0)
+                store_file.truncate()
+                store_file.write(json.dumps(data))
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning("moderator_latency_record_error", moderator=moderator_name, metric=metric, error=str(e))
+
+    def threshold(self, moderator_name: str, metric: str, pct: float, min_samples: int) -> float | None:
+        """Percentile of a moderator's latency, once enough samples exist.
+
+        Args:
+            moderator_name: Moderator name
+            metric: Lifecycle event name (e.g. first_byte, decision)
+            pct: Percentile in (0, 100]
+            min_samples: Samples required before the percentile is trusted
+
+        Returns:
+            Latency in seconds, or None with fewer than min_samples samples
+        """
+        series = self.samples(moderator_name, metric)
+        if len(series) < max(min_samples, 1):
+            return None
+        return percentile(series, pct)
+
+    def stats(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Summarize all distributions.
+
+        Returns:
+            {moderator: {metric: {"count": n, "p50": ..., "p90": ..., ...}}}
+        """
+        result: dict[str, dict[str, dict[str, float]]] = {}
+        for moderator_name, metrics in self._read().items():
+            for metric, series in metrics.items():
+                if not series:
+                    continue
+                summary: dict[str, float] = {"count": len(series)}
+                summary.update({f"p{pct:g}": percentile(series, pct) for pct in REPORTED_PERCENTILES})
+                result.setdefault(moderator_name, {})[metric] = summary
+        return result
+
+
+def get_latency_store() -> LatencyStore:
+    """Get the latency store configured in agent.moderator.hedging.
+
+    Returns:
+        LatencyStore
+    """
+    config = get_config()
+    return LatencyStore(
+        config.root / config.get("agent.moderator.hedging.storage", DEFAULT_STORAGE),
+        max_samples=int(config.get("agent.moderator.hedging.max_samples", DEFAULT_MAX_SAMPLES)),
+    )
+
+
+def main() -> int:
+    """Print latency percentiles per moderator.
+
+    Returns:
+        Exit code (0=success)
+    """
+    parser = argparse.ArgumentParser(description="Moderator latency distributions")
+    parser.add_argument("--stats", action="store_true", help="Print sample counts and percentiles as JSON")
+    args = parser.parse_args()
+    if not args.stats:
+        parser.print_help()
+        return 1
+
+    sys.stdout.write(json.dumps(get_latency_store().stats(), indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
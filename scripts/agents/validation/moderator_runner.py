@@ -1,35 +1,33 @@
 """Moderator execution with retry logic for handling hangs during startup or analysis."""
 
+import asyncio
 import contextlib
+import copy
+import queue
 import re
+import subprocess
+import threading
 import time
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 
 from loguru import logger
 
 from scripts.agents.cli.exceptions import AgentExecutionError, AgentTimeoutError
+from scripts.agents.cli.lifecycle import DECISION, FIRST_BYTE, FIRST_TOKEN, SPAWNED, AgentEvent
+from scripts.agents.cli.streaming_utils import load_instruction_with_replacements
+from scripts.agents.cli.warm_pool import request_text
+from scripts.agents.config import get_config
+from scripts.agents.moderator_session_client import request_moderation, request_warm_run
+from scripts.agents.validation.moderator_latency import DEFAULT_MIN_SAMPLES, DEFAULT_PERCENTILE, LatencyStore, get_latency_store
 from scripts.agents.validation.validation_utils import parse_code_fence_output
 
+# Default of agent.moderator.startup_hang_seconds: a silent attempt is restarted after this
+# long until enough first-output latency samples exist
+DEFAULT_STARTUP_HANG_SECONDS = 15.0
 
-def _check_first_output_in_audit_log(audit_log_path: Path) -> bool:
-    """Check if audit log contains first output marker.
-
-    Args:
-        audit_log_path: Path to audit log file
-
-    Returns:
-        True if first output marker found, False otherwise
-    """
-    if not audit_log_path or not audit_log_path.exists():
-        return False
-
-    try:
-        content = audit_log_path.read_text()
-        # Check for first output marker from agent CLI
-        return "=== FIRST OUTPUT:" in content
-    except Exception:
-        return False
+# Once they do, after this multiple of the observed first-output percentile
+STARTUP_HANG_MARGIN = 2.0
 
 
 def _check_decision_in_output(output: str) -> bool:
@@ -51,6 +49,376 @@ def _check_decision_in_output(output: str) -> bool:
     return bool(re.search(r"\b(ALLOW|BLOCK)\b", cleaned, re.IGNORECASE))
 
 
+class _ModeratorCall(NamedTuple):
+    """One moderator request and the names it is logged under."""
+
+    cli: Any
+    instruction_file: Path
+    stdin: str
+    agent_config: Any
+    audit_log_path: Path | None
+    moderator_name: str
+    session_id: str
+    execution_id: str
+
+
+class _ModeratorAttempt:
+    """One moderator run in a worker thread, observed through its lifecycle events."""
+
+    def __init__(self, label: str, agent_config: Any) -> None:
+        """Initialize attempt.
+
+        Args:
+            label: Attempt label for logging (primary, hedge, restart, retry)
+            agent_config: Moderator config (copied, so attempts do not share listeners)
+        """
+        self.label = label
+        self.config = copy.copy(agent_config)
+        self.config.on_event = self._on_event
+        self.started = time.monotonic()
+        self.timings: dict[str, float] = {}
+        self.finished_at: float | None = None
+        self.result: tuple[str, dict[str, Any] | None] | None = None
+        self.error: Exception | None = None
+        self._process: subprocess.Popen[str] | None = None
+        self._killed = False
+        self._lock = threading.Lock()
+
+    def _on_event(self, event: AgentEvent) -> None:
+        """Record event timings; a process spawned after the attempt lost is killed right away."""
+        self.timings[event.name] = event.elapsed
+        if event.name != SPAWNED or isinstance(event.process, asyncio.subprocess.Process):
+            # Moderator attempts run on the threaded path only
+            return
+        with self._lock:
+            self._process = event.process
+            killed = self._killed
+        if killed:
+            event.process.kill()
+
+    @property
+    def has_output(self) -> bool:
+        """Whether the CLI has written anything yet."""
+        return FIRST_BYTE in self.timings
+
+    def run(self, cli: Any, instruction_file: Path, stdin: str, audit_log_path: Path | None, finished: queue.Queue["_ModeratorAttempt"]) -> None:
+        """Run the moderator and report completion (runs in a thread)."""
+        try:
+            self.result = cli.run_print(instruction_file=instruction_file, stdin=stdin, agent_config=self.config, audit_log_path=audit_log_path)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished_at = time.monotonic()
+            finished.put(self)
+
+    def kill(self) -> None:
+        """Kill the attempt's process (hung attempts, losers, attempts past the deadline)."""
+        with self._lock:
+            self._killed = True
+            process = self._process
+        if process is not None and process.poll() is None:
+            with contextlib.suppress(OSError):
+                process.kill()
+
+    @property
+    def decided(self) -> bool:
+        """Whether the attempt finished with a decision."""
+        return self.result is not None and _check_decision_in_output(self.result[0])
+
+
+def _run_in_daemon(call: _ModeratorCall) -> tuple[str, dict[str, Any] | None] | None:
+    """Answer the request in the moderator session daemon, if enabled for this moderator.
+
+    Moderators listed in agent.moderator.sessions.validators are answered in their session;
+    others on a pre-started process of the daemon's warm pool with agent.warm_pool.enabled.
+
+    Returns:
+        Tuple of (output, metadata) holding a decision, or None to run a fresh process instead
+    """
+    agent_config = call.agent_config
+    config = get_config()
+    if agent_config.enable_hooks or not agent_config.enable_streaming:
+        return None
+    in_session = config.get("agent.moderator.sessions.enabled", False) and call.moderator_name in config.get("agent.moderator.sessions.validators", [])
+    if not in_session and not config.get("agent.warm_pool.enabled", False):
+        return None
+
+    started = time.time()
+    ask = request_moderation if in_session else request_warm_run
+    via = "session" if in_session else "warm_pool"
+    result = ask(
+        call.moderator_name,
+        request_text(load_instruction_with_replacements(call.instruction_file), call.stdin),
+        agent_config.model,
+        agent_config.allowed_tools,
+        call.instruction_file.parent,
+        agent_config.timeout,
+        provider=agent_config.provider.value,
+    )
+    if result is None or not _check_decision_in_output(result[0]):
+        logger.warning(f"{call.moderator_name}_{via}_unavailable", session_id=call.session_id, execution_id=call.execution_id, answered=result is not None)
+        return None
+    logger.info(f"{call.moderator_name}_{via}_success", session_id=call.session_id, execution_id=call.execution_id, elapsed=round(time.time() - started, 2))
+    output, metadata = result
+    metadata["session_id"] = agent_config.session_id
+    return output, metadata
+
+
+def _silence_threshold(store: LatencyStore, moderator_name: str, first_output_timeout: float, hedge: bool) -> float:
+    """Seconds without first output before a hedge is launched or a silent attempt restarted.
+
+    A hedge kills nothing, so it starts at the configured percentile of the moderator's observed
+    first-output latency. A restart kills the silent attempt, so it waits STARTUP_HANG_MARGIN
+    times that percentile, or agent.moderator.startup_hang_seconds until enough samples exist.
+
+    Args:
+        store: Latency samples
+        moderator_name: Moderator name
+        first_output_timeout: The validator's first_output_timeout (hedge threshold until enough
+            samples exist, lower bound of the restart threshold)
+        hedge: Whether silent attempts are hedged instead of restarted
+
+    Returns:
+        Threshold in seconds
+    """
+    config = get_config()
+    learned = store.threshold(
+        moderator_name,
+        FIRST_BYTE,
+        float(config.get("agent.moderator.hedging.percentile", DEFAULT_PERCENTILE)),
+        int(config.get("agent.moderator.hedging.min_samples", DEFAULT_MIN_SAMPLES)),
+    )
+    if hedge:
+        return learned if learned is not None else first_output_timeout
+    if learned is not None:
+        return max(first_output_timeout, learned * STARTUP_HANG_MARGIN)
+    return max(first_output_timeout, float(config.get("agent.moderator.startup_hang_seconds", DEFAULT_STARTUP_HANG_SECONDS)))
+
+
+class _MonitoredRun:
+    """Attempts of one event-monitored moderator request."""
+
+    def __init__(self, call: _ModeratorCall, max_attempts: int, attempt_timeout: int, threshold: float, hedge: bool) -> None:
+        """Initialize run (no attempt is started yet).
+
+        Args:
+            call: Moderator request
+            max_attempts: Attempts started in total at most
+            attempt_timeout: Timeout of each attempt in seconds
+            threshold: Seconds without first output before a hedge or restart
+            hedge: Hedge silent attempts instead of restarting them
+        """
+        self.call = call
+        self.max_attempts = max_attempts
+        self.attempt_timeout = attempt_timeout
+        self.threshold = threshold
+        self.hedge = hedge
+        self.attempts: list[_ModeratorAttempt] = []
+        self.started = time.monotonic()
+        self.deadline = self.started + attempt_timeout * max_attempts
+        self._finished: queue.Queue[_ModeratorAttempt] = queue.Queue()
+        # Attempts count as running until their completion was taken from the queue
+        self._reported: list[_ModeratorAttempt] = []
+
+    @property
+    def running(self) -> list[_ModeratorAttempt]:
+        """Attempts whose completion has not been taken from the queue yet."""
+        return [attempt for attempt in self.attempts if attempt not in self._reported]
+
+    def launch(self, label: str) -> None:
+        """Start an attempt in a worker thread.
+
+        Args:
+            label: Attempt label (primary, hedge, restart, retry)
+        """
+        call = self.call
+        attempt = _ModeratorAttempt(label, call.agent_config)
+        attempt.config.timeout = self.attempt_timeout
+        log_path = call.audit_log_path
+        if log_path is not None and self.attempts:
+            log_path = log_path.with_name(f"{log_path.stem}-{label}{len(self.attempts)}{log_path.suffix}")
+        self.attempts.append(attempt)
+        threading.Thread(target=attempt.run, args=(call.cli, call.instruction_file, call.stdin, log_path, self._finished), daemon=True).start()
+        logger.info(
+            f"{call.moderator_name}_attempt_starting",
+            session_id=call.session_id,
+            execution_id=f"{call.execution_id}-{label}",
+            attempt=len(self.attempts),
+            max_attempts=self.max_attempts,
+            first_output_threshold=round(self.threshold, 2),
+        )
+
+    def handle_silence(self, now: float) -> float | None:
+        """Hedge or restart once no running attempt has produced output by the threshold.
+
+        Args:
+            now: Current monotonic time
+
+        Returns:
+            Time until which to wait for a completion, or None if an attempt was just launched
+        """
+        running = self.running
+        if len(self.attempts) >= self.max_attempts or any(attempt.has_output for attempt in running):
+            return self.deadline
+        silent_since = max(attempt.started for attempt in running)
+        if now < silent_since + self.threshold:
+            return min(self.deadline, silent_since + self.threshold)
+
+        call = self.call
+        if self.hedge:
+            logger.warning(
+                f"{call.moderator_name}_hedge_launched", session_id=call.session_id, execution_id=call.execution_id, threshold=round(self.threshold, 2)
+            )
+            self.launch("hedge")
+        else:
+            for attempt in running:
+                attempt.kill()
+            logger.warning(
+                f"{call.moderator_name}_startup_hang_restarting", session_id=call.session_id, execution_id=call.execution_id, threshold=round(self.threshold, 2)
+            )
+            self.launch("restart")
+        return None
+
+    def wait(self, wait_until: float) -> _ModeratorAttempt | None:
+        """Take the next completion.
+
+        Args:
+            wait_until: Monotonic time to wait until
+
+        Returns:
+            The attempt if it finished with a decision, otherwise None
+
+        Raises:
+            Exception: The attempt's error, if it is not a hang (other attempts are killed)
+        """
+        try:
+            attempt = self._finished.get(timeout=max(0.0, wait_until - time.monotonic()))
+        except queue.Empty:
+            return None
+        self._reported.append(attempt)
+        if attempt.decided:
+            return attempt
+        if attempt.error is not None and not isinstance(attempt.error, AgentTimeoutError | AgentExecutionError):
+            # Not a hang - re-raise immediately
+            for other in self.attempts:
+                other.kill()
+            raise attempt.error
+        return None
+
+    def log_restart(self, attempt: _ModeratorAttempt) -> None:
+        """Log why a finished attempt without decision is retried."""
+        call = self.call
+        elapsed = round((attempt.finished_at or time.monotonic()) - attempt.started, 2)
+        if attempt.error is not None:
+            logger.warning(
+                f"{call.moderator_name}_timeout_restarting",
+                session_id=call.session_id,
+                execution_id=f"{call.execution_id}-{attempt.label}",
+                max_attempts=self.max_attempts,
+                error_type=type(attempt.error).__name__,
+                hang_type="analysis hang" if attempt.has_output else "startup hang",
+                has_first_output=attempt.has_output,
+                elapsed=elapsed,
+            )
+            return
+        output = attempt.result[0] if attempt.result else ""
+        logger.warning(
+            f"{call.moderator_name}_analysis_hang_restarting",
+            session_id=call.session_id,
+            execution_id=f"{call.execution_id}-{attempt.label}",
+            max_attempts=self.max_attempts,
+            reason="First output present but no decision - moderator hung during analysis",
+            output_preview=output[:500],
+            elapsed=elapsed,
+        )
+
+    def finish(self, store: LatencyStore, winner: _ModeratorAttempt | None) -> tuple[str, dict[str, Any] | None]:
+        """Kill the other attempts, record latencies and pick the result.
+
+        Args:
+            store: Latency samples
+            winner: First attempt with a decision, if any
+
+        Returns:
+            Tuple of (output, metadata) of the winner, or of the last finished attempt
+
+        Raises:
+            AgentTimeoutError: No attempt finished within the deadline
+            AgentError: The last attempt failed and no attempt produced output
+        """
+        call = self.call
+        for attempt in self.attempts:
+            if attempt is not winner:
+                attempt.kill()
+            if FIRST_BYTE in attempt.timings:
+                store.record(call.moderator_name, FIRST_BYTE, attempt.timings[FIRST_BYTE])
+
+        if winner is not None and winner.result is not None:
+            for event_name in (FIRST_TOKEN, DECISION):
+                if event_name in winner.timings:
+                    store.record(call.moderator_name, event_name, winner.timings[event_name])
+            logger.info(
+                f"{call.moderator_name}_attempt_success",
+                session_id=call.session_id,
+                execution_id=f"{call.execution_id}-{winner.label}",
+                attempts=len(self.attempts),
+                hedged=any(attempt.label == "hedge" for attempt in self.attempts),
+                elapsed=round((winner.finished_at or time.monotonic()) - winner.started, 2),
+                lifecycle=winner.timings,
+            )
+            return winner.result
+
+        completed = [attempt.result for attempt in sorted(self.attempts, key=lambda attempt: attempt.finished_at or 0.0) if attempt.result is not None]
+        if completed:
+            logger.error(
+                f"{call.moderator_name}_analysis_hang_exhausted", session_id=call.session_id, execution_id=call.execution_id, attempts=len(self.attempts)
+            )
+            return completed[-1]
+        last = self.attempts[-1]
+        if last.error is not None:
+            raise last.error
+        raise AgentTimeoutError(timeout=self.attempt_timeout * self.max_attempts, cmd=["claude", "--print"], duration=time.monotonic() - self.started)
+
+
+def _run_monitored(
+    call: _ModeratorCall, max_attempts: int, first_output_timeout: float, attempt_timeout: int, hedge: bool
+) -> tuple[str, dict[str, Any] | None]:
+    """Run moderator attempts in worker threads, reacting to lifecycle events as they happen.
+
+    When no running attempt has produced output (first_byte) by the threshold (see
+    _silence_threshold), a startup hang is assumed at once: the silent attempt is killed and
+    restarted, or with hedge=True left running while a hedge attempt starts next to it. An
+    attempt that finished without a decision (analysis hang, timeout after attempt_timeout) is
+    replaced by a retry. The first attempt with a decision wins and the others are killed; at
+    most max_attempts run in total. Event timings are recorded per moderator (see
+    moderator_latency).
+
+    Returns:
+        Tuple of (output, metadata) of the winning attempt, or of the last finished attempt
+        without a decision (parsing will fail-closed)
+
+    Raises:
+        AgentTimeoutError: No attempt finished within the deadline
+        AgentError: The last attempt failed and no attempt produced output
+    """
+    store = get_latency_store()
+    run = _MonitoredRun(call, max_attempts, attempt_timeout, _silence_threshold(store, call.moderator_name, first_output_timeout, hedge), hedge)
+    run.launch("primary")
+    winner: _ModeratorAttempt | None = None
+    while winner is None:
+        now = time.monotonic()
+        if now >= run.deadline or (not run.running and len(run.attempts) >= max_attempts):
+            break
+        if not run.running:
+            run.log_restart(run.attempts[-1])
+            run.launch("retry")
+            continue
+        wait_until = run.handle_silence(now)
+        if wait_until is not None:
+            winner = run.wait(wait_until)
+    return run.finish(store, winner)
+
+
 def run_moderator_with_retry(
     cli: Any,
     instruction_file: Path,
@@ -66,7 +434,7 @@ def run_moderator_with_retry(
     """Run moderator with automatic restart if hangs during startup or analysis.
 
     Monitors for TWO types of hangs:
-    1. **Startup hang**: No first output within first_output_timeout (default 3.5s)
+    1. **Startup hang**: No first output within the startup hang threshold
        - Claude never starts streaming
        - Process appears stuck before any output
 
@@ -77,6 +445,25 @@ def run_moderator_with_retry(
 
     If either hang detected, automatically restarts (up to max_attempts total).
 
+    With stream-json output (agent_config.enable_streaming), the CLI process publishes lifecycle
+    events (see cli.lifecycle): a startup hang is detected the moment the threshold passes
+    without output, and each attempt returns as soon as the final assistant message holds a
+    complete ALLOW/BLOCK decision (see cli.decision_stream). The threshold is twice the
+    moderator's observed first-output percentile, or agent.moderator.startup_hang_seconds
+    (default 15s) until enough samples exist; never less than first_output_timeout. Event
+    timings are recorded per moderator (see moderator_latency). An attempt that finishes
+    without a decision is retried.
+
+    Moderators listed in agent.moderator.sessions.validators are answered by the moderator
+    session daemon (a long-lived CLI session per validator) when it is running, and with
+    agent.warm_pool.enabled other moderators by a pre-started process of the daemon's warm
+    pool; without the daemon, or without a decision from it, a fresh process runs as described
+    above.
+
+    With agent.moderator.hedging.enabled, a silent attempt is not restarted but hedged: a
+    second attempt runs in parallel once no output has arrived by a percentile of the
+    moderator's observed first-output latency, and the first decision wins.
+
     Args:
         cli: Agent CLI instance
         instruction_file: Path to moderator prompt file
@@ -87,7 +474,8 @@ def run_moderator_with_retry(
         session_id: Session ID
         execution_id: Execution ID
         max_attempts: Maximum attempts (default 2: original + 1 restart)
-        first_output_timeout: Seconds to wait for first output (default 3.5s)
+        first_output_timeout: Minimum seconds to wait for first output before a restart, and
+            the hedge threshold until enough latency samples exist (default 3.5s)
 
     Returns:
         Tuple of (output, metadata)
@@ -96,8 +484,16 @@ def run_moderator_with_retry(
         AgentTimeoutError: All attempts hung without first output
         AgentError: Other execution errors
     """
+    # Decisions and lifecycle events come from stream-json output, so only streaming moderators are monitored by events
+    agent_config.stop_on_decision = bool(agent_config.enable_streaming)
+
+    call = _ModeratorCall(cli, instruction_file, stdin, agent_config, audit_log_path, moderator_name, session_id, execution_id)
+    daemon_result = _run_in_daemon(call)
+    if daemon_result is not None:
+        return daemon_result
+
     if not audit_log_path:
-        # No audit log - cannot monitor for first output, run directly
+        # No audit log - hang monitoring disabled, run directly
         result: tuple[str, dict[str, Any] | None] = cli.run_print(
             instruction_file=instruction_file,
             stdin=stdin,
@@ -110,13 +506,19 @@ def run_moderator_with_retry(
     original_timeout = agent_config.timeout
     hang_detection_timeout = max(int(first_output_timeout * 2), 15)  # At least 2x first_output_timeout, minimum 15s
 
+    if agent_config.stop_on_decision:
+        return _run_monitored(
+            call,
+            max_attempts,
+            first_output_timeout,
+            hang_detection_timeout,
+            hedge=bool(get_config().get("agent.moderator.hedging.enabled", False)),
+        )
+
+    # Without lifecycle events, hangs are only detected by the hang detection timeout
     for attempt in range(1, max_attempts + 1):
         attempt_execution_id = f"{execution_id}-attempt{attempt}"
 
-        # Clear audit log for this attempt
-        if audit_log_path.exists():
-            audit_log_path.unlink()
-
         logger.info(
             f"{moderator_name}_attempt_starting",
             session_id=session_id,
@@ -139,14 +541,9 @@ def run_moderator_with_retry(
                 agent_config=agent_config,
                 audit_log_path=audit_log_path,
             )
-
-            # Success - verify first output was produced and decision was made
-            has_first_output = _check_first_output_in_audit_log(audit_log_path)
-            has_decision = _check_decision_in_output(output)
             elapsed = time.time() - start_time
 
-            if has_first_output and has_decision:
-                # Complete success
+            if _check_decision_in_output(output):
                 logger.info(
                     f"{moderator_name}_attempt_success",
                     session_id=session_id,
@@ -157,38 +554,23 @@ def run_moderator_with_retry(
                 agent_config.timeout = original_timeout
                 return output, metadata
 
-            if has_first_output and not has_decision:
-                # Analysis hang: first output present but no decision
-                if attempt < max_attempts:
-                    # Kill hung process before retry
-                    with contextlib.suppress(Exception):
-                        cli.kill_current_process()
-
-                    logger.warning(
-                        f"{moderator_name}_analysis_hang_restarting",
-                        session_id=session_id,
-                        execution_id=attempt_execution_id,
-                        attempt=attempt,
-                        max_attempts=max_attempts,
-                        reason="First output present but no decision - moderator hung during analysis",
-                        output_preview=output[:500] if output else "",
-                        elapsed=elapsed,
-                    )
-                    continue  # Retry
-
-                # Last attempt - return output even without decision (parsing will fail-closed)
-                logger.error(
-                    f"{moderator_name}_analysis_hang_exhausted",
+            # Analysis hang: completed without a decision
+            if attempt < max_attempts:
+                logger.warning(
+                    f"{moderator_name}_analysis_hang_restarting",
                     session_id=session_id,
                     execution_id=attempt_execution_id,
                     attempt=attempt,
+                    max_attempts=max_attempts,
+                    reason="Moderator completed without a decision",
+                    output_preview=output[:500] if output else "",
+                    elapsed=elapsed,
                 )
-                agent_config.timeout = original_timeout
-                return output, metadata
+                continue  # Retry
 
-            # No first output but completed (shouldn't happen)
-            logger.warning(
-                f"{moderator_name}_no_first_output_but_completed",
+            # Last attempt - return output even without decision (parsing will fail-closed)
+            logger.error(
+                f"{moderator_name}_analysis_hang_exhausted",
                 session_id=session_id,
                 execution_id=attempt_execution_id,
                 attempt=attempt,
@@ -203,10 +585,6 @@ def run_moderator_with_retry(
                 with contextlib.suppress(Exception):
                     cli.kill_current_process()
 
-                # Check if first output was produced for logging
-                has_first_output = _check_first_output_in_audit_log(audit_log_path)
-                hang_type = "startup hang" if not has_first_output else "analysis hang"
-
                 logger.warning(
                     f"{moderator_name}_timeout_restarting",
                     session_id=session_id,
@@ -214,8 +592,6 @@ def run_moderator_with_retry(
                     attempt=attempt,
                     max_attempts=max_attempts,
                     error_type=type(e).__name__,
-                    hang_type=hang_type,
-                    has_first_output=has_first_output,
                     elapsed=time.time() - start_time,
                 )
 
@@ -0,0 +1,178 @@
+"""Compiled glob matcher answering "which path rules apply to this file" in one lookup.
+
+Exemption lists and per-pattern path_patterns used to be translated from glob to regex on
+every call and tested one by one, so checking N files against R rules cost N x R regex
+searches. PathMatcher compiles every glob once and indexes it by the literal part of its last
+component:
+
+    name index   - literal file name        (conftest.py, **/module_setup.py)
+    suffix index - "*.ext" file names        (*.md, scripts/**/*.py)
+    dir index    - literal directory name    (tests/, base/backend/workers/)
+
+A lookup splits the path once, collects the rules indexed under its name, suffixes and
+directories, and confirms only those with their compiled regex. Globs with no literal last
+component are always confirmed.
+
+Glob semantics (gitignore-style):
+    *        any characters within one path component
+    ?        one character within a component
+    [abc]    character class ([!abc] negates)
+    **       zero or more whole components
+    dir/     trailing slash: everything below a directory of that name
+
+Globs match the trailing components of a path, so the same rule works for absolute paths from
+hooks and repo-relative paths (e.g. ``scripts/**/*.py`` matches ``/repo/scripts/x/y.py``).
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+
+_GLOB_CHARS = frozenset("*?[")
+_SUFFIX_GLOB = re.compile(r"^\*(\.[^*?\[/]+)$")
+
+
+def _translate_component(component: str) -> str:
+    """Translate one glob path component (no slashes) to a regex."""
+    result = []
+    index = 0
+    while index < len(component):
+        char = component[index]
+        if char == "*":
+            result.append("[^/]*")
+        elif char == "?":
+            result.append("[^/]")
+        elif char == "[" and (end := component.find("]", index + 2)) != -1:
+            body = component[index + 1 : end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            result.append(f"[{body}]")
+            index = end
+        else:
+            result.append(re.escape(char))
+        index += 1
+    return "".join(result)
+
+
+def glob_to_regex(glob: str) -> str:
+    """Translate a gitignore-style glob to a regex matching a path's trailing components.
+
+    Args:
+        glob: Glob pattern (see module docstring)
+
+    Returns:
+        Regex for re.search against a "/"-separated path
+    """
+    directory = glob.endswith("/")
+    components = glob.strip("/").split("/")
+    parts = ["(?:^|/)"]
+    for position, component in enumerate(components):
+        last = position == len(components) - 1
+        if component == "**":
+            parts.append(".*" if last else "(?:[^/]+/)*")
+        else:
+            parts.append(_translate_component(component) + ("" if last else "/"))
+    parts.append("/" if directory else "$")
+    return "".join(parts)
+
+
+@functools.lru_cache(maxsize=512)
+def compile_glob(glob: str) -> re.Pattern[str]:
+    """Compile a glob once (for one-off checks outside a PathMatcher).
+
+    Args:
+        glob: Glob pattern
+
+    Returns:
+        Compiled regex for search against a path
+    """
+    return re.compile(glob_to_regex(glob))
+
+
+class PathMatcher[T]:
+    """Globs compiled once and indexed for single-lookup path matching.
+
+    Each glob carries a payload (e.g. a rule index); match() returns the payloads of all
+    globs matching a path, in the order the globs were added.
+    """
+
+    def __init__(self, rules: list[tuple[str, T]] | None = None) -> None:
+        """Compile globs.
+
+        Args:
+            rules: (glob, payload) pairs
+        """
+        self._payloads: list[T] = []
+        self._regexes: list[re.Pattern[str]] = []
+        self._name_index: dict[str, list[int]] = {}
+        self._suffix_index: dict[str, list[int]] = {}
+        self._dir_index: dict[str, list[int]] = {}
+        self._always: list[int] = []
+        for glob, payload in rules or []:
+            self.add(glob, payload)
+
+    def __len__(self) -> int:
+        """Number of globs."""
+        return len(self._payloads)
+
+    def add(self, glob: str, payload: T) -> None:
+        """Compile and index a glob.
+
+        Args:
+            glob: Glob pattern
+            payload: Value returned by match() when the glob matches
+        """
+        index = len(self._payloads)
+        self._payloads.append(payload)
+        self._regexes.append(compile_glob(glob))
+
+        last = glob.strip("/").rsplit("/", 1)[-1]
+        suffix = _SUFFIX_GLOB.match(last)
+        if glob.endswith("/") and not _GLOB_CHARS.intersection(last):
+            self._dir_index.setdefault(last, []).append(index)
+        elif glob.endswith("/"):
+            self._always.append(index)
+        elif not _GLOB_CHARS.intersection(last):
+            self._name_index.setdefault(last, []).append(index)
+        elif suffix:
+            self._suffix_index.setdefault(suffix.group(1), []).append(index)
+        else:
+            self._always.append(index)
+
+    def _candidates(self, path: str) -> set[int]:
+        """Collect globs whose indexed literal occurs in the path."""
+        *directories, name = path.split("/")
+        candidates = set(self._always)
+        candidates.update(self._name_index.get(name, ()))
+        if self._suffix_index:
+            dot = name.find(".")
+            while dot != -1:
+                candidates.update(self._suffix_index.get(name[dot:], ()))
+                dot = name.find(".", dot + 1)
+        if self._dir_index:
+            for directory in directories:
+                candidates.update(self._dir_index.get(directory, ()))
+        return candidates
+
+    def match(self, path: str) -> list[T]:
+        """Get the payloads of all globs matching a path.
+
+        Args:
+            path: File path ("/"-separated, absolute or relative)
+
+        Returns:
+            Payloads in the order their globs were added
+        """
+        return [self._payloads[index] for index in sorted(self._candidates(path)) if self._regexes[index].search(path)]
+
+    def matches(self, path: str) -> bool:
+        """Check whether any glob matches a path.
+
+        Args:
+            path: File path
+
+        Returns:
+            True if at least one glob matches
+        """
+        return any(self._regexes[index].search(path) for index in self._candidates(path))
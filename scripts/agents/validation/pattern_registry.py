@@ -0,0 +1,158 @@
+"""Registry of the YAML rule files under scripts/config/patterns.
+
+Validators used to re-open and re-parse their YAML file on every call (or cache it for the
+life of the process, so edits needed a restart of the resident hook server). The registry
+parses each file once, keeps compiled regexes and other derived objects next to the parsed
+data, and re-parses only when the file's (mtime, size) changes - one stat per lookup.
+
+Usage:
+    registry = get_pattern_registry(get_config().root)
+    markers = registry.load("completion_markers.yaml").get("completion_markers", [])
+    for regex, entry in registry.compiled("greeting_patterns.yaml", "greeting_patterns"):
+        ...
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TypeVar
+
+import yaml
+
+PATTERNS_SUBDIR = "scripts/config/patterns"
+
+T = TypeVar("T")
+
+
+@dataclass
+class _PatternFile:
+    """Parsed YAML file plus objects derived from it, valid for one file version."""
+
+    signature: tuple[int, int] | None
+    data: dict[str, Any]
+    derived: dict[str, Any] = field(default_factory=dict)
+
+
+class PatternRegistry:
+    """Parsed and compiled pattern files, reloaded when a file changes on disk."""
+
+    def __init__(self, patterns_dir: Path) -> None:
+        """Initialize registry.
+
+        Args:
+            patterns_dir: Directory containing the pattern YAML files
+        """
+        self.patterns_dir = patterns_dir
+        self._files: dict[str, _PatternFile] = {}
+        self.loads = 0
+
+    def _signature(self, path: Path) -> tuple[int, int] | None:
+        """Get (mtime_ns, size) of a file, or None if it does not exist."""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _file(self, filename: str) -> _PatternFile:
+        """Get the current version of a pattern file, parsing it if new or changed.
+
+        Raises:
+            yaml.YAMLError: If the YAML is malformed
+        """
+        path = self.patterns_dir / filename
+        signature = self._signature(path)
+        cached = self._files.get(filename)
+        if cached is not None and cached.signature == signature:
+            return cached
+
+        data: dict[str, Any] = {}
+        if signature is not None:
+            with path.open() as f:
+                data = yaml.safe_load(f) or {}
+            self.loads += 1
+        entry = _PatternFile(signature=signature, data=data)
+        self._files[filename] = entry
+        return entry
+
+    def load(self, filename: str) -> dict[str, Any]:
+        """Get the parsed contents of a pattern file.
+
+        Args:
+            filename: File name relative to the patterns directory (e.g. bash_commands.yaml)
+
+        Returns:
+            Parsed YAML mapping (empty if the file does not exist). Treat as read-only - it is
+            shared by all callers until the file changes.
+
+        Raises:
+            yaml.YAMLError: If the YAML is malformed
+        """
+        return self._file(filename).data
+
+    def derived(self, filename: str, name: str, build: Callable[[dict[str, Any]], T]) -> T:
+        """Get an object built from a pattern file, rebuilt only when the file changes.
+
+        Args:
+            filename: File name relative to the patterns directory
+            name: Cache key of the derived object within the file
+            build: Builds the object from the parsed YAML mapping
+
+        Returns:
+            Cached or freshly built object
+
+        Raises:
+            yaml.YAMLError: If the YAML is malformed
+        """
+        entry = self._file(filename)
+        if name not in entry.derived:
+            entry.derived[name] = build(entry.data)
+        result: T = entry.derived[name]
+        return result
+
+    def compiled(self, filename: str, key: str, flags: int = 0) -> list[tuple[re.Pattern[str], dict[str, Any]]]:
+        """Get the compiled ``pattern`` regexes of a list of rule entries.
+
+        Args:
+            filename: File name relative to the patterns directory
+            key: Top-level key holding the list of entries (each with a ``pattern`` field)
+            flags: Regex flags (e.g. re.IGNORECASE)
+
+        Returns:
+            (compiled regex, entry) pairs in file order
+
+        Raises:
+            yaml.YAMLError: If the YAML is malformed
+            re.error: If a pattern does not compile
+        """
+
+        def build(data: dict[str, Any]) -> list[tuple[re.Pattern[str], dict[str, Any]]]:
+            return [(re.compile(entry.get("pattern", ""), flags), entry) for entry in data.get(key) or []]
+
+        return self.derived(filename, f"compiled:{key}:{flags}", build)
+
+    def preload(self) -> None:
+        """Parse every pattern file now (used by long-lived processes at startup).
+
+        Raises:
+            yaml.YAMLError: If a file is malformed
+        """
+        for path in sorted(self.patterns_dir.glob("*.yaml")):
+            self._file(path.name)
+
+
+@functools.lru_cache(maxsize=4)
+def get_pattern_registry(root: Path) -> PatternRegistry:
+    """Get the shared pattern registry of an orchestrator root.
+
+    Args:
+        root: Orchestrator root (usually get_config().root)
+
+    Returns:
+        Registry over root/scripts/config/patterns
+    """
+    return PatternRegistry(root / PATTERNS_SUBDIR)
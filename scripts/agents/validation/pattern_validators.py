@@ -4,7 +4,52 @@ import re
 from pathlib import Path
 from typing import Any
 
-from scripts.agents.validation.validation_utils import count_pattern_occurrences, load_python_patterns
+from scripts.agents.config import get_config
+from scripts.agents.validation.path_matcher import PathMatcher, compile_glob
+from scripts.agents.validation.pattern_registry import get_pattern_registry
+from scripts.agents.validation.validation_utils import count_pattern_occurrences
+
+# Path rule kinds of python_fast.yaml patterns
+FILE_MATCH = "file_match"  # file_content pattern applies to the file
+EXEMPTION = "exemption"  # an exemption path_pattern covers the file
+
+
+def build_python_path_matcher(patterns: list[dict[str, Any]]) -> PathMatcher[tuple[str, int]]:
+    """Compile the file_match and exemption path_patterns globs of all patterns.
+
+    Args:
+        patterns: Pattern configurations from python_fast.yaml
+
+    Returns:
+        Matcher returning (FILE_MATCH or EXEMPTION, pattern index) for each glob matching a path
+    """
+    matcher: PathMatcher[tuple[str, int]] = PathMatcher()
+    for index, pattern_config in enumerate(patterns):
+        if pattern_config.get("file_match"):
+            matcher.add(pattern_config["file_match"], (FILE_MATCH, index))
+        for exemption in pattern_config.get("exemptions", []):
+            for path_pattern in exemption.get("path_patterns", []):
+                matcher.add(path_pattern, (EXEMPTION, index))
+    return matcher
+
+
+def load_python_rules() -> tuple[list[dict[str, Any]], PathMatcher[tuple[str, int]]]:
+    """Load python_fast.yaml patterns together with their compiled path matcher.
+
+    Both come from the same file version, so matcher indices always refer to the returned list.
+
+    Returns:
+        Tuple of (patterns, path matcher), rebuilt when the file changes
+
+    Raises:
+        yaml.YAMLError: If YAML is malformed
+    """
+
+    def build(data: dict[str, Any]) -> tuple[list[dict[str, Any]], PathMatcher[tuple[str, int]]]:
+        patterns: list[dict[str, Any]] = data.get("patterns", [])
+        return patterns, build_python_path_matcher(patterns)
+
+    return get_pattern_registry(get_config().root).derived("python_fast.yaml", "rules", build)
 
 
 def check_pattern_exemption(file_path: str, pattern_config: dict[str, Any]) -> bool:
@@ -17,31 +62,18 @@ def check_pattern_exemption(file_path: str, pattern_config: dict[str, Any]) -> b
     Returns:
         True if file is exempt from this pattern
     """
-    exemptions = pattern_config.get("exemptions", [])
-
-    for exemption in exemptions:
-        path_patterns = exemption.get("path_patterns", [])
-
-        # Check if file matches any exemption path pattern
-        for path_pattern in path_patterns:
-            # Convert glob pattern to regex
-            regex_pattern = path_pattern.replace("**", ".*").replace("*", "[^/]*")
-            if re.search(regex_pattern, file_path):
-                # File matches exemption path, now check pattern-specific rules
-                exemption.get("allowed_patterns", [])
-                exemption.get("allowed_pattern_regex")
-
-                # If there are specific allowed patterns, the pattern must match one
-                # This is handled by the caller (check_pattern_violation)
-                return True
-
-    return False
+    return any(
+        compile_glob(path_pattern).search(file_path)
+        for exemption in pattern_config.get("exemptions", [])
+        for path_pattern in exemption.get("path_patterns", [])
+    )
 
 
 def _check_file_content_violation(
     file_path: str,
     new_content: str,
     pattern_config: dict[str, Any],
+    file_matched: bool | None = None,
 ) -> tuple[bool, str]:
     """Check file content pattern violations (e.g., non-empty __init__.py).
 
@@ -49,37 +81,17 @@ def _check_file_content_violation(
         file_path: Path to file being checked
         new_content: New content
         pattern_config: Pattern configuration dictionary
+        file_matched: Whether file_match matches file_path, if already known from the path matcher
 
     Returns:
         Tuple of (is_violation, error_message). If no violation, error_message is empty.
     """
-    file_match = pattern_config.get("file_match", "")
     condition = pattern_config.get("condition")
 
-    # Check if file matches pattern
-    # Convert glob pattern to regex properly
-    # For **, we want to match zero or more directories followed by /
-
-    # For **/__init__.py -> (.*?/)?__init\.py (optional directory path)
-    # Replace ** patterns first before escaping
-    if "**" in file_match:
-        # Handle the case where ** appears at the start (meaning zero or more dirs)
-        if file_match.startswith("**/"):
-            pattern_suffix = file_match[3:]  # Get part after '**/'
-            # Create regex that optionally matches any directory path followed by the suffix
-            regex_pattern = f"^(.*?/)?{re.escape(pattern_suffix)}$"
-        else:
-            # More complex glob pattern, escape and convert
-            escaped_with_intermediate = file_match.replace("**", "__GLOB_DOUBLE_STAR__")
-            regex_pattern = re.escape(escaped_with_intermediate)
-            regex_pattern = regex_pattern.replace("__GLOB_DOUBLE_STAR__", ".*")
-            regex_pattern = regex_pattern.replace(r"\*", "[^/]*")
-            regex_pattern = f"^{regex_pattern}$"
-    else:
-        # No ** patterns, just handle * normally
-        regex_pattern = f"^{re.escape(file_match).replace(r'*', '[^/]*')}$"
-
-    if not re.search(regex_pattern, file_path):
+    # Check if file matches pattern (e.g. **/__init__.py)
+    if file_matched is None:
+        file_matched = bool(compile_glob(pattern_config.get("file_match", "")).search(file_path))
+    if not file_matched:
         return False, ""
 
     # Check condition
@@ -97,6 +109,7 @@ def _check_additions_violation(
     is_regex: bool,
     file_path: str,
     pattern_config: dict[str, Any],
+    path_exempt: bool | None = None,
 ) -> tuple[bool, str]:
     """Check for addition violations when allow_removal is True.
 
@@ -107,6 +120,7 @@ def _check_additions_violation(
         is_regex: Whether pattern is a regex
         file_path: Path to file being checked
         pattern_config: Pattern configuration dictionary
+        path_exempt: Whether an exemption path_pattern matches file_path, if already known
 
     Returns:
         Tuple of (is_violation, error_message)
@@ -119,7 +133,9 @@ def _check_additions_violation(
         return False, ""  # No addition detected
 
     # Addition detected - check exemptions
-    if check_pattern_exemption(file_path, pattern_config):
+    if path_exempt is None:
+        path_exempt = check_pattern_exemption(file_path, pattern_config)
+    if path_exempt:
         # File is in exemption path, check if pattern is allowed
         return _check_exemptions_for_pattern(pattern_str, new_content, pattern_config)
 
@@ -194,6 +210,7 @@ def _check_content_pattern_violation(
     old_content: str,
     new_content: str,
     pattern_config: dict[str, Any],
+    path_exempt: bool | None = None,
 ) -> tuple[bool, str]:
     """Check content pattern violations (e.g., relative path traversal, suppressions).
 
@@ -202,6 +219,7 @@ def _check_content_pattern_violation(
         old_content: Previous content
         new_content: New content
         pattern_config: Pattern configuration dictionary
+        path_exempt: Whether an exemption path_pattern matches file_path, if already known
 
     Returns:
         Tuple of (is_violation, error_message). If no violation, error_message is empty.
@@ -216,7 +234,7 @@ def _check_content_pattern_violation(
             continue
 
         if allow_removal:
-            violation_detected, error_msg = _check_additions_violation(pattern_str, old_content, new_content, is_regex, file_path, pattern_config)
+            violation_detected, error_msg = _check_additions_violation(pattern_str, old_content, new_content, is_regex, file_path, pattern_config, path_exempt)
             if violation_detected:
                 return True, error_msg
         else:
@@ -233,6 +251,7 @@ def check_pattern_violation(
     old_content: str,
     new_content: str,
     pattern_config: dict[str, Any],
+    path_rules: set[str] | None = None,
 ) -> tuple[bool, str]:
     """Check if a pattern violation exists in the content change.
 
@@ -241,16 +260,21 @@ def check_pattern_violation(
         old_content: Previous content
         new_content: New content
         pattern_config: Pattern configuration dictionary
+        path_rules: Path rules of this pattern matching file_path (FILE_MATCH, EXEMPTION), as
+            looked up by the python_fast.yaml path matcher; None to match the globs directly
 
     Returns:
         Tuple of (is_violation, error_message). If no violation, error_message is empty.
     """
     check_type = pattern_config.get("check_type")
 
+    file_matched = None if path_rules is None else FILE_MATCH in path_rules
+    path_exempt = None if path_rules is None else EXEMPTION in path_rules
+
     if check_type == "file_content":
-        return _check_file_content_violation(file_path, new_content, pattern_config)
+        return _check_file_content_violation(file_path, new_content, pattern_config, file_matched)
     if check_type == "content_pattern":
-        return _check_content_pattern_violation(file_path, old_content, new_content, pattern_config)
+        return _check_content_pattern_violation(file_path, old_content, new_content, pattern_config, path_exempt)
     # Unknown check type
     return False, ""
 
@@ -278,16 +302,22 @@ def validate_python_patterns(
     """
     file_path_str = str(file_path)
 
-    # Load patterns from YAML
-    patterns = load_python_patterns()
+    # Load patterns from YAML, with their path globs compiled into one matcher
+    patterns, path_matcher = load_python_rules()
+
+    # Path rules of every pattern that apply to this file, in one lookup
+    path_rules: dict[int, set[str]] = {}
+    for kind, index in path_matcher.match(file_path_str):
+        path_rules.setdefault(index, set()).add(kind)
 
     # Check each pattern
-    for pattern_config in patterns:
+    for index, pattern_config in enumerate(patterns):
         is_violation, error_msg = check_pattern_violation(
             file_path_str,
             old_content,
             new_content,
             pattern_config,
+            path_rules.get(index, set()),
         )
 
         if is_violation:
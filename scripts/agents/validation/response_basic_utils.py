@@ -1,34 +1,33 @@
 """Basic response validation utilities - message parsing and checks."""
 
+import functools
 import json
 import re
 from pathlib import Path
 from typing import Any
 
-import yaml
 from loguru import logger
 
 from scripts.agents.config import get_config
+from scripts.agents.transcript import iter_lines_reverse
 from scripts.agents.validation.core import HookResult
+from scripts.agents.validation.pattern_registry import get_pattern_registry
 
+# Response validation rules (prohibited, API limit and greeting patterns)
+RESPONSE_PATTERNS_FILE = "prohibited_communication_patterns.yaml"
 
-def _load_response_validation_patterns() -> dict[str, Any]:
-    """Load response validation patterns from YAML config.
 
-    Returns:
-        Dictionary containing prohibited patterns and other validation rules
-    """
-    config = get_config()
-    patterns_dir = config.root / "scripts/config/patterns"
-    patterns_file = patterns_dir / "prohibited_communication_patterns.yaml"
+def _response_patterns(key: str, flags: int = 0) -> list[tuple[re.Pattern[str], dict[str, Any]]]:
+    """Get compiled response validation patterns from YAML config.
 
-    if not patterns_file.exists():
-        # Return empty dict if config doesn't exist
-        return {"prohibited_patterns": []}
+    Args:
+        key: Rule list in the config (prohibited_patterns, api_limit_patterns, greeting_patterns)
+        flags: Regex flags
 
-    with patterns_file.open() as f:
-        result: dict[str, Any] = yaml.safe_load(f)
-        return result
+    Returns:
+        (compiled regex, rule) pairs in file order (empty if the config doesn't exist)
+    """
+    return get_pattern_registry(get_config().root).compiled(RESPONSE_PATTERNS_FILE, key, flags)
 
 
 def check_prohibited_patterns(last_message: str) -> HookResult | None:
@@ -40,16 +39,11 @@ def check_prohibited_patterns(last_message: str) -> HookResult | None:
     Returns:
         HookResult if prohibited pattern found, None otherwise
     """
-    # Load patterns from config
-    patterns_config = _load_response_validation_patterns()
-    prohibited_patterns = patterns_config.get("prohibited_patterns", [])
-
     # Apply communication rules
-    for pattern_config in prohibited_patterns:
-        pattern = pattern_config.get("pattern", "")
+    for regex, pattern_config in _response_patterns("prohibited_patterns", re.IGNORECASE):
         description = pattern_config.get("description", "")
 
-        if re.search(pattern, last_message, re.IGNORECASE):
+        if regex.search(last_message):
             return HookResult.block(
                 f"🚨 QUALITY VIOLATION - ADDITIONAL TOKENS INCURRED FOR MODERATION\n\n"
                 f"Hook: Stop\n"
@@ -73,44 +67,67 @@ def check_api_limit_messages(last_message: str) -> tuple[bool, HookResult | None
     Returns:
         Tuple of (is_api_limit_message, result_if_api_limit)
     """
-    # Load API limit patterns from config
-    patterns_config = _load_response_validation_patterns()
-    api_limit_patterns = patterns_config.get("api_limit_patterns", [])
-
-    # Extract patterns from config
-    limit_patterns = [pattern_config.get("pattern", "") for pattern_config in api_limit_patterns]
-
     # Check for API limit messages - allow without completion marker
-    for pattern in limit_patterns:
-        if re.search(pattern, last_message, re.IGNORECASE):
+    for regex, _ in _response_patterns("api_limit_patterns", re.IGNORECASE):
+        if regex.search(last_message):
             return True, HookResult.allow()
     return False, None
 
 
-def get_last_assistant_message(transcript_path: Path) -> str:
-    """Get last assistant message from transcript.
+def _last_assistant_text(msg: Any) -> str | None:
+    """Get the last text block of an assistant record.
 
     Args:
-        transcript_path: Path to transcript file
+        msg: Decoded transcript record
 
     Returns:
-        Last assistant message text
+        Text of the last text block, or None if the record is not an assistant record with text
+
+    Raises:
+        AttributeError: If the record is malformed
     """
-    last_text = ""
-    for line in transcript_path.read_text().splitlines():
+    if msg.get("type") != "assistant":
+        return None
+    last_text = None
+    for content in msg.get("message", {}).get("content", []):
+        if content.get("type") == "text":
+            last_text = content.get("text", "")
+    return last_text
+
+
+@functools.lru_cache(maxsize=32)
+def _get_last_assistant_message_memo(transcript_path: Path, size: int, mtime_ns: int) -> str:
+    """Scan transcript backwards for the last assistant text (memoized per file version)."""
+    for line in iter_lines_reverse(transcript_path):
+        # Cheap check before decoding - tool results and other records are skipped
+        if '"assistant"' not in line:
+            continue
         try:
-            msg = json.loads(line)
-            if msg.get("type") == "assistant":
-                # Extract text content
-                for content in msg.get("message", {}).get("content", []):
-                    if content.get("type") == "text":
-                        last_text = content.get("text", "")
+            last_text = _last_assistant_text(json.loads(line))
         except Exception as e:
             # Skip invalid lines
-
             logger.warning("transcript_parse_error", line=line[:100], error=str(e))
             continue
-    return last_text
+        if last_text is not None:
+            return last_text
+    return ""
+
+
+def get_last_assistant_message(transcript_path: Path) -> str:
+    """Get last assistant message from transcript.
+
+    Reads the transcript backwards and stops at the last assistant record containing
+    text. Results are memoized per (path, size, mtime) so the callers within one hook
+    (ResponseScanner and check_early_allow_conditions) share a single scan.
+
+    Args:
+        transcript_path: Path to transcript file
+
+    Returns:
+        Last assistant message text
+    """
+    stat = transcript_path.stat()
+    return _get_last_assistant_message_memo(transcript_path.resolve(), stat.st_size, stat.st_mtime_ns)
 
 
 def is_greeting_exchange(last_message: str) -> bool:
@@ -122,12 +139,5 @@ def is_greeting_exchange(last_message: str) -> bool:
     Returns:
         True if this appears to be a greeting exchange, False otherwise
     """
-    # Load greeting patterns from config
-    patterns_config = _load_response_validation_patterns()
-    greeting_patterns = patterns_config.get("greeting_patterns", [])
-
-    # Extract patterns from config
-    greeting_regexes = [pattern_config.get("pattern", "") for pattern_config in greeting_patterns]
-
     last_lower = last_message.lower().strip()
-    return any(re.search(pattern, last_lower) for pattern in greeting_regexes)
+    return any(regex.search(last_lower) for regex, _ in _response_patterns("greeting_patterns"))
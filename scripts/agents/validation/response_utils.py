@@ -17,11 +17,12 @@ from scripts.agents.cli.config import AgentConfigPresets
 from scripts.agents.cli.exceptions import AgentError, AgentExecutionError, AgentTimeoutError
 from scripts.agents.cli.factory import get_agent_cli
 from scripts.agents.config import get_config
+from scripts.agents.tokenizer import count_tokens
 from scripts.agents.validation.core import HookResult
 from scripts.agents.validation.moderator_runner import run_moderator_with_retry
 from scripts.agents.validation.response_basic_utils import get_last_assistant_message, is_greeting_exchange
 from scripts.agents.validation.validation_utils import parse_code_fence_output
-from scripts.agents.workflows.core import HookInput, count_tokens, prepare_moderator_context
+from scripts.agents.workflows.core import HookInput, get_moderator_context
 
 
 def check_early_allow_conditions(hook_input: HookInput) -> tuple[bool, HookResult | None]:
@@ -166,7 +167,7 @@ def load_moderator_context(session_id: str, execution_id: str, transcript_path:
 
         todos = scripts.agents.workflows.core.load_session_todos(session_id)
 
-        conversation_context = prepare_moderator_context(transcript_path, todos=todos)
+        conversation_context = get_moderator_context(transcript_path, todos=todos).text
         if not conversation_context:
             return None, HookResult.allow()
 
@@ -1,92 +1,84 @@
 """Basic validation utilities and helper functions."""
 
 import re
-from functools import lru_cache
 from typing import Any
 
-import yaml
-
 from scripts.agents.config import get_config
+from scripts.agents.validation.command_matcher import CommandMatcher
+from scripts.agents.validation.path_matcher import PathMatcher
+from scripts.agents.validation.pattern_registry import get_pattern_registry
 
 # Code fence parsing
 MIN_CODE_FENCE_LINES = 2  # Minimum lines for valid code fence (opening + closing)
 
 
-@lru_cache(maxsize=1)
 def load_python_patterns() -> list[dict[str, Any]]:
     """Load Python fast pattern validation rules from YAML.
 
     Returns:
-        List of pattern dictionaries from python_fast.yaml
+        List of pattern dictionaries from python_fast.yaml (empty if the file is missing)
 
     Raises:
-        FileNotFoundError: If python_fast.yaml doesn't exist
         yaml.YAMLError: If YAML is malformed
     """
-    config = get_config()
-    patterns_dir = config.root / "scripts/config/patterns"
-    patterns_file = patterns_dir / "python_fast.yaml"
-
-    if not patterns_file.exists():
-        # Fail-open if patterns file missing (don't block development)
-        return []
-
-    with patterns_file.open() as f:
-        data = yaml.safe_load(f)
-
-    result: list[dict[str, Any]] = data.get("patterns", [])
+    # Fail-open if patterns file missing (don't block development)
+    result: list[dict[str, Any]] = get_pattern_registry(get_config().root).load("python_fast.yaml").get("patterns", [])
     return result
 
 
-@lru_cache(maxsize=1)
 def load_bash_patterns() -> list[dict[str, str]]:
     """Load Bash command validation patterns from YAML.
 
     Returns:
-        List of pattern dictionaries from bash_commands.yaml
+        List of pattern dictionaries from bash_commands.yaml (empty if the file is missing)
 
     Raises:
-        FileNotFoundError: If bash_commands.yaml doesn't exist
         yaml.YAMLError: If YAML is malformed
     """
-    config = get_config()
-    patterns_dir = config.root / "scripts/config/patterns"
-    patterns_file = patterns_dir / "bash_commands.yaml"
+    # Fail-open if patterns file missing (don't block development)
+    result: list[dict[str, str]] = get_pattern_registry(get_config().root).load("bash_commands.yaml").get("deny_patterns", [])
+    return result
 
-    if not patterns_file.exists():
-        # Fail-open if patterns file missing (don't block development)
-        return []
 
-    with patterns_file.open() as f:
-        data = yaml.safe_load(f)
+def load_bash_matcher() -> CommandMatcher:
+    """Compile the Bash command validation patterns into a single matcher.
 
-    result: list[dict[str, str]] = data.get("deny_patterns", [])
-    return result
+    Returns:
+        CommandMatcher over bash_commands.yaml deny_patterns (in file order), rebuilt when the file changes
+
+    Raises:
+        yaml.YAMLError: If YAML is malformed
+        re.error: If a pattern does not compile
+    """
+    return get_pattern_registry(get_config().root).derived("bash_commands.yaml", "matcher", lambda data: CommandMatcher(data.get("deny_patterns", [])))
 
 
-@lru_cache(maxsize=1)
 def load_exemptions() -> set[str]:
     """Load file exemptions from YAML.
 
     Returns:
-        Set of file paths exempt from pattern checks
+        Set of file paths exempt from pattern checks (empty if the file is missing)
 
     Raises:
-        FileNotFoundError: If exemptions.yaml doesn't exist
         yaml.YAMLError: If YAML is malformed
     """
-    config = get_config()
-    patterns_dir = config.root / "scripts/config/patterns"
-    exemptions_file = patterns_dir / "exemptions.yaml"
+    # Fail-open if exemptions file missing (don't block development)
+    return get_pattern_registry(get_config().root).derived("exemptions.yaml", "exemptions", lambda data: set(data.get("pattern_check_exemptions", [])))
+
 
-    if not exemptions_file.exists():
-        # Fail-open if exemptions file missing (don't block development)
-        return set()
+def load_exemption_matcher() -> PathMatcher[str]:
+    """Compile the file exemption globs into a single path matcher.
 
-    with exemptions_file.open() as f:
-        data = yaml.safe_load(f)
+    Returns:
+        PathMatcher over exemptions.yaml pattern_check_exemptions (payload: the glob),
+        rebuilt when the file changes
 
-    return set(data.get("pattern_check_exemptions", []))
+    Raises:
+        yaml.YAMLError: If YAML is malformed
+    """
+    return get_pattern_registry(get_config().root).derived(
+        "exemptions.yaml", "matcher", lambda data: PathMatcher([(glob, glob) for glob in data.get("pattern_check_exemptions", [])])
+    )
 
 
 def parse_code_fence_output(output: str) -> str:
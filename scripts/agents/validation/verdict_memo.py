@@ -0,0 +1,222 @@
+"""Content-addressed memo of code-quality diff audit verdicts.
+
+An agent retrying an identical Edit after an unrelated block used to pay for the same LLM diff
+audit again. When code_quality.verdict_memo.enabled is set, ALLOW/BLOCK verdicts of the
+code-quality moderators are stored under sha256(audit prompt, model, file path, diff context)
+- exactly what the moderator is sent - and reused until they expire.
+
+Opt-in and non-security only: moderators in NEVER_MEMOIZED (malicious behavior, the audit
+engine) never get a memo - security decisions are always made fresh.
+
+Each hook runs in its own process, so entries and hit/miss counters live on disk:
+    <storage>/<key>.json   - one verdict per entry (TTL from its timestamp)
+    <storage>/stats.json   - hits, misses and stores across all processes
+
+Inspect the counters with:
+    ami-run -m scripts.agents.validation.verdict_memo --stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from scripts.agents.config import get_config
+
+# Moderators whose verdicts must never be reused (security paths, no-caching policy)
+NEVER_MEMOIZED = frozenset({"malicious_behavior", "audit"})
+
+# Defaults for code_quality.verdict_memo in automation.yaml
+DEFAULT_STORAGE = "logs/verdict-memo"
+DEFAULT_TTL_SECONDS = 3600
+DEFAULT_MAX_ENTRIES = 2000
+
+STATS_FILE = "stats.json"
+STAT_FIELDS = ("hits", "misses", "stores")
+
+
+def memo_key(*parts: str) -> str:
+    """Hash the inputs that determine a verdict.
+
+    Args:
+        *parts: Audit prompt, model, file path, diff context
+
+    Returns:
+        Hex sha256 digest (parts are length-prefixed so boundaries cannot shift)
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part.encode("utf-8")
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class VerdictMemo:
+    """On-disk verdict store with TTL, entry cap and shared hit/miss counters."""
+
+    def __init__(self, storage_dir: Path, ttl: float = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """Initialize memo.
+
+        Args:
+            storage_dir: Directory holding entries and counters
+            ttl: Seconds a verdict stays valid
+            max_entries: Oldest entries are evicted beyond this count
+        """
+        self.storage_dir = storage_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+    def _entry_path(self, key: str) -> Path:
+        """Path of an entry."""
+        return self.storage_dir / f"{key}.json"
+
+    def _bump(self, field: str) -> None:
+        """Increment a shared counter (failures only lose the count)."""
+        try:
+            self.storage_dir.mkdir(parents=True, exist_ok=True)
+            stats_fd = os.open(self.storage_dir / STATS_FILE, os.O_RDWR | os.O_CREAT, 0o600)
+            with os.fdopen(stats_fd, "r+") as stats_file:
+                # Concurrent hooks share the counters - serialize updates
+                fcntl.flock(stats_file.fileno(), fcntl.LOCK_EX)
+                content = stats_file.read()
+                stats = json.loads(content) if content else {}
+                stats[field] = int(stats.get(field, 0)) + 1
+                stats_file.seek(0)
+                stats_file.truncate()
+                stats_file.write(json.dumps(stats))
+        except (OSError, ValueError) as e:
+            logger.warning("verdict_memo_stats_error", field=field, error=str(e))
+
+    def get(self, key: str) -> tuple[bool, str] | None:
+        """Look up a verdict.
+
+        Args:
+            key: Key from memo_key()
+
+        Returns:
+            (is_valid, feedback_message), or None if missing or expired
+        """
+        path = self._entry_path(key)
+        try:
+            entry = json.loads(path.read_text())
+            verdict = (bool(entry["is_valid"]), str(entry["message"]))
+            expired = time.time() - float(entry["created"]) > self.ttl
+        except FileNotFoundError:
+            verdict, expired = None, True
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("verdict_memo_entry_invalid", key=key, error=str(e))
+            verdict, expired = None, True
+
+        if verdict is None or expired:
+            if verdict is not None:
+                path.unlink(missing_ok=True)
+            self._bump("misses")
+            return None
+        self._bump("hits")
+        logger.info("verdict_memo_hit", key=key[:16], is_valid=verdict[0])
+        return verdict
+
+    def put(self, key: str, verdict: tuple[bool, str]) -> None:
+        """Store a verdict, evicting the oldest entries beyond max_entries.
+
+        Args:
+            key: Key from memo_key()
+            verdict: (is_valid, feedback_message)
+        """
+        path = self._entry_path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.storage_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps({"created": time.time(), "is_valid": verdict[0], "message": verdict[1]}))
+            tmp_path.replace(path)
+            self._evict()
+        except OSError as e:
+            logger.warning("verdict_memo_store_error", key=key[:16], error=str(e))
+            with contextlib.suppress(OSError):
+                tmp_path.unlink(missing_ok=True)
+            return
+        self._bump("stores")
+
+    def _evict(self) -> None:
+        """Remove the oldest entries while above max_entries.
+
+        Raises:
+            OSError: If the storage directory cannot be listed
+        """
+        entries = [path for path in self.storage_dir.glob("*.json") if path.name != STATS_FILE]
+        if len(entries) <= self.max_entries:
+            return
+        mtimes: list[tuple[float, Path]] = []
+        for path in entries:
+            with contextlib.suppress(FileNotFoundError):
+                mtimes.append((path.stat().st_mtime, path))
+        for _, path in sorted(mtimes)[: len(mtimes) - self.max_entries]:
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> dict[str, int]:
+        """Read the shared counters and current entry count.
+
+        Returns:
+            Counter values (hits, misses, stores, entries)
+        """
+        try:
+            stats = json.loads((self.storage_dir / STATS_FILE).read_text())
+        except (OSError, ValueError):
+            stats = {}
+        result = {field: int(stats.get(field, 0)) for field in STAT_FIELDS}
+        result["entries"] = sum(1 for path in self.storage_dir.glob("*.json") if path.name != STATS_FILE) if self.storage_dir.exists() else 0
+        return result
+
+
+def get_verdict_memo(moderator_name: str) -> VerdictMemo | None:
+    """Get the verdict memo for a moderator, if enabled and allowed.
+
+    Args:
+        moderator_name: Moderator name (e.g. code_quality_patterns_core)
+
+    Returns:
+        VerdictMemo, or None when disabled in config or the moderator is in NEVER_MEMOIZED
+    """
+    if moderator_name in NEVER_MEMOIZED:
+        return None
+    config = get_config()
+    if not config.get("code_quality.verdict_memo.enabled", False):
+        return None
+    return VerdictMemo(
+        config.root / config.get("code_quality.verdict_memo.storage", DEFAULT_STORAGE),
+        ttl=float(config.get("code_quality.verdict_memo.ttl", DEFAULT_TTL_SECONDS)),
+        max_entries=int(config.get("code_quality.verdict_memo.max_entries", DEFAULT_MAX_ENTRIES)),
+    )
+
+
+def main() -> int:
+    """Print the memo counters.
+
+    Returns:
+        Exit code (0=success)
+    """
+    parser = argparse.ArgumentParser(description="Code-quality verdict memo")
+    parser.add_argument("--stats", action="store_true", help="Print hit/miss/store counters as JSON")
+    args = parser.parse_args()
+    if not args.stats:
+        parser.print_help()
+        return 1
+
+    config = get_config()
+    memo = VerdictMemo(config.root / config.get("code_quality.verdict_memo.storage", DEFAULT_STORAGE))
+    sys.stdout.write(json.dumps(memo.stats()) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Bash command validator checking commands against the patterns of bash_commands.yaml.
+
+Kept apart from security_validators so command-guard hooks import no moderator code.
+"""
+
+from typing import Any
+
+from scripts.agents.validation.validation_utils import load_bash_matcher
+from scripts.agents.workflows.core import HookInput, HookResult, HookValidator
+
+
+class CommandValidator(HookValidator):
+    """Validates Bash commands using patterns from YAML configuration."""
+
+    def _extract_strings(self, obj: Any) -> tuple[str, ...]:
+        """Recursively extract all string values from nested structures."""
+        strings = []
+        if isinstance(obj, str):
+            strings.append(obj)
+        elif isinstance(obj, dict):
+            for value in obj.values():
+                strings.extend(self._extract_strings(value))
+        elif isinstance(obj, list):
+            for item in obj:
+                strings.extend(self._extract_strings(item))
+        return tuple(strings)
+
+    def validate(self, hook_input: HookInput) -> HookResult:
+        """Validate bash command against patterns from bash_commands.yaml.
+
+        Args:
+            hook_input: Hook input
+
+        Returns:
+            Validation result
+        """
+        if hook_input.tool_name != "Bash":
+            return HookResult.allow()
+
+        # Handle null tool_input
+        if hook_input.tool_input is None:
+            return HookResult.allow()
+
+        # Patterns from YAML, compiled once per process
+        matcher = load_bash_matcher()
+
+        # SECURITY: Only validate the command field, not description/metadata
+        # Only "command" field is actually executed by bash tool.
+        # Checking all fields causes false positives when descriptions mention tools.
+        # Malicious code MUST be in command field to execute - checking description adds
+        # no security value since it's never passed to shell.
+        command = hook_input.tool_input.get("command", "")
+
+        # First matching rule (in file order) wins
+        rule = matcher.match(command)
+        if rule is not None:
+            message = rule.get("message", "Pattern violation detected")
+            matched = f"Command: {rule['command']}" if "command" in rule else f"Pattern: {rule.get('pattern', '')}"
+            return HookResult.deny(
+                f"🚨 QUALITY VIOLATION - ADDITIONAL TOKENS INCURRED FOR MODERATION\n\n"
+                f"Hook: PreToolUse (Bash)\n"
+                f"Validator: CommandValidator\n\n"
+                f"{message}\n"
+                f"{matched}"
+            )
+
+        return HookResult.allow()
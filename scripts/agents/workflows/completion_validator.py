@@ -12,9 +12,14 @@ from scripts.agents.cli.config import AgentConfigPresets
 from scripts.agents.cli.exceptions import AgentError, AgentExecutionError, AgentTimeoutError
 from scripts.agents.cli.factory import get_agent_cli
 from scripts.agents.config import get_config
+from scripts.agents.tokenizer import count_tokens
+from scripts.agents.moderator_checkpoint import ModeratorCheckpoint, load_checkpoint, read_checkpoint_anchor, save_checkpoint
 from scripts.agents.validation.moderator_runner import run_moderator_with_retry
 from scripts.agents.validation.validation_utils import parse_code_fence_output
-from scripts.agents.workflows.core import HookResult, count_tokens, load_session_todos, prepare_moderator_context
+from scripts.agents.workflows.core import HookResult, get_moderator_context, load_session_todos
+
+# Prefix of the system message returned for ALLOW decisions
+MODERATOR_ALLOW_PREFIX = "✅ MODERATOR: "
 
 
 class CompletionValidator:
@@ -57,8 +62,16 @@ class CompletionValidator:
                         f"Complete all tasks before claiming WORK DONE."
                     )
 
+        # Continue from the last validated checkpoint (anchor read before the context, so it never
+        # covers messages the moderator did not see)
+        checkpoint: ModeratorCheckpoint | None = None
+        anchor: str | None = None
+        if config.get("response_scanner.completion_checkpoints_enabled", True):
+            checkpoint = load_checkpoint(transcript_path)
+            anchor = read_checkpoint_anchor(transcript_path)
+
         # Load conversation context using internal method
-        conversation_context, error_result = self._load_moderator_context(session_id, execution_id, transcript_path, logger)
+        conversation_context, error_result = self._load_moderator_context(session_id, execution_id, transcript_path, logger, checkpoint)
         if error_result:
             return error_result
 
@@ -75,9 +88,18 @@ class CompletionValidator:
                 f"COMPLETION VALIDATION ERROR\n\nModerator prompt not found: {moderator_prompt}\n\nCannot validate completion without prompt."
             )
 
-        return self._run_completion_moderator(session_id, conversation_context, moderator_prompt, logger)
-
-    def _load_moderator_context(self, session_id: str, execution_id: str, transcript_path: Path, logger: Any) -> tuple[str | None, HookResult | None]:
+        result = self._run_completion_moderator(session_id, conversation_context, moderator_prompt, logger)
+        if anchor and result.decision == "allow" and result.system_message:
+            # Record the validated prefix (failures only lose the speedup)
+            try:
+                save_checkpoint(transcript_path, anchor, result.system_message.removeprefix(MODERATOR_ALLOW_PREFIX), checkpoint)
+            except OSError as e:
+                logger.warning("completion_moderator_checkpoint_failed", session_id=session_id, error=str(e))
+        return result
+
+    def _load_moderator_context(
+        self, session_id: str, execution_id: str, transcript_path: Path, logger: Any, checkpoint: ModeratorCheckpoint | None = None
+    ) -> tuple[str | None, HookResult | None]:
         """Load and validate conversation context for moderator with instance logger.
 
         Args:
@@ -85,6 +107,7 @@ class CompletionValidator:
             execution_id: Unique execution ID for this moderator run
             transcript_path: Path to transcript file
             logger: Logger instance
+            checkpoint: Optional validated-prefix checkpoint (only newer messages are sent)
 
         Returns:
             Tuple of (conversation_context, error_result). If error_result is not None, validation should return it.
@@ -95,7 +118,7 @@ class CompletionValidator:
 
             todos = load_session_todos(session_id)
 
-            conversation_context = prepare_moderator_context(transcript_path, todos=todos)
+            conversation_context = get_moderator_context(transcript_path, todos=todos, checkpoint=checkpoint).text
             if not conversation_context:
                 return None, HookResult.allow()
 
@@ -280,7 +303,7 @@ class CompletionValidator:
             if "BLOCK" in explanation.upper():
                 explanation = explanation[: explanation.upper().index("BLOCK")].strip()
 
-            system_message = f"✅ MODERATOR: {explanation}"
+            system_message = f"{MODERATOR_ALLOW_PREFIX}{explanation}"
 
             logger.info("completion_moderator_allow", session_id=session_id, explanation=explanation[:200])
             return HookResult(decision="allow", system_message=system_message)
@@ -5,14 +5,20 @@ Contains the fundamental data structures and base classes needed for hook valida
 
 import json
 import sys
+from collections.abc import Callable
 from pathlib import Path
-from typing import Any, Literal, cast
+from typing import Any, Literal, NamedTuple, cast
 
-import tiktoken
 from loguru import logger
 
 from scripts.agents.config import get_config
-from scripts.agents.transcript import format_messages_for_prompt, get_last_n_messages
+from scripts.agents.context_memo import ContextMemo, variant_key
+from scripts.agents.moderator_checkpoint import ModeratorCheckpoint, format_checkpoint_summary, messages_since_checkpoint
+from scripts.agents.token_cache import TranscriptTokenCache
+from scripts.agents.tokenizer import count_tokens, estimate_tokens, fits_budget_by_bytes
+from scripts.agents.transcript import EXHIBIT_FOOTER, EXHIBIT_HEADER, TranscriptIndex, format_message_block, get_last_n_messages
+from scripts.agents.transcript_client import fetch_moderator_context
+from scripts.agents.transcript_summary import SEGMENT_MESSAGES, TranscriptSummaryStore
 
 # Resource limits (DoS protection)
 MAX_HOOK_INPUT_SIZE = 10 * 1024 * 1024  # 10MB
@@ -25,26 +31,14 @@ MAX_MODERATOR_CONTEXT_TOKENS = 100_000  # Leave buffer for prompt + CLI input li
 # Even with token limit, high message count causes incorrect decisions
 MAX_MODERATOR_MESSAGE_COUNT = 100  # Hard cap on message count
 
+# Newest messages always sent raw once older ones are summarized (see transcript_summary).
+# Summaries advance a whole segment at a time, so raw messages never exceed the hard cap.
+MODERATOR_RAW_MESSAGE_COUNT = MAX_MODERATOR_MESSAGE_COUNT - SEGMENT_MESSAGES
+
 # Code fence parsing
 MIN_CODE_FENCE_LINES = 2  # Minimum lines for valid code fence (opening + closing)
 
 
-def count_tokens(text: str) -> int:
-    """Count tokens in text using tiktoken (GPT-4 tokenizer).
-
-    Args:
-        text: Text to count tokens for
-
-    Returns:
-        Token count
-
-    Raises:
-        Exception: If tokenization fails
-    """
-    encoding = tiktoken.encoding_for_model("gpt-4")
-    return len(encoding.encode(text))
-
-
 def load_session_todos(session_id: str) -> list[dict[str, Any]]:
     """Load todo list for a given session.
 
@@ -73,103 +67,268 @@ def load_session_todos(session_id: str) -> list[dict[str, Any]]:
         return []
 
 
-def prepare_moderator_context(
-    transcript_path: Path,
+def _format_todo_section(todos: list[dict[str, Any]]) -> str:
+    """Format todo list section appended to moderator context.
+
+    Args:
+        todos: List of todo items
+
+    Returns:
+        Formatted todo section
+    """
+    todo_section = "\n\n# Current Task List\n\n"
+    for i, todo in enumerate(todos, 1):
+        status = todo.get("status", "unknown")
+        content = todo.get("content", "Unknown task")
+        status_emoji = {"pending": "⏳", "in_progress": "🔄", "completed": "✅"}.get(status, "❓")
+        todo_section += f"{i}. [{status_emoji} {status}] {content}\n"
+    return todo_section
+
+
+def _fit_message_window(blocks: list[str], counter: Callable[[str], int], fixed_tokens: int = 0) -> tuple[int, int]:
+    """Find the largest window of newest message blocks fitting MAX_MODERATOR_CONTEXT_TOKENS.
+
+    Message blocks tokenize independently of their neighbours (each ends with a blank line and
+    the next starts with "<message"), so a window's token count is the EXHIBIT wrapper overhead
+    plus the sum of its per-message counts. Blocks are tokenized newest first and only until
+    the budget is exceeded.
+
+    Args:
+        blocks: Formatted message blocks, oldest first
+        counter: Token counter
+        fixed_tokens: Tokens of other context parts sent with every window (summary sections)
+
+    Returns:
+        Tuple of (number of newest blocks that fit, token count of that window)
+    """
+    tokens = counter(EXHIBIT_HEADER) + counter(EXHIBIT_FOOTER) + fixed_tokens
+    window = 0
+    for block in reversed(blocks):
+        block_tokens = counter(block)
+        if tokens + block_tokens > MAX_MODERATOR_CONTEXT_TOKENS:
+            break
+        tokens += block_tokens
+        window += 1
+    return window, tokens
+
+
+def build_moderator_context(
+    messages: list[dict[str, str | None]],
     todos: list[dict[str, Any]] | None = None,
+    token_counter: Callable[[str], int] | None = None,
+    summary_section: str | None = None,
 ) -> str:
-    """Prepare conversation context for moderator with token and message count limits.
+    """Build moderator context from the last messages of a transcript.
 
-    Gets LAST N messages from transcript and applies:
+    Applies:
     1. Hard cap at MAX_MODERATOR_MESSAGE_COUNT (100 messages)
-    2. Binary search truncation to fit within MAX_MODERATOR_CONTEXT_TOKENS (100K tokens)
+    2. Truncation to the longest message window fitting MAX_MODERATOR_CONTEXT_TOKENS (100K tokens)
 
     Message count limit is CRITICAL - moderator gives incorrect decisions above 100 messages
     even when token count is within limits.
 
-    This is the PRODUCTION function used by completion moderator hook.
-    Tests MUST use this function to ensure they test production behavior.
+    Contexts that fit the token budget by byte length alone are not tokenized; otherwise the
+    window is sized by _fit_message_window().
 
     Args:
-        transcript_path: Path to transcript JSONL file
+        messages: Last messages of the transcript (pass one more than the cap to detect capping)
         todos: Optional list of todo items to append to context
-        background_tasks: Optional list of background tasks to append to context
+        token_counter: Optional token counter (defaults to count_tokens)
+        summary_section: Optional summary of earlier messages (validated checkpoint or history
+            summaries), placed before the exhibit and counted against the token budget
 
     Returns:
         Formatted conversation context string ready for moderator
-
-    Raises:
-        Exception: If transcript extraction or formatting fails
     """
-
-    # Count total messages first
-    all_messages = get_last_n_messages(transcript_path, 99999)
-    if not all_messages:
+    if not messages:
         return ""
-
-    total_messages = len(all_messages)
+    counter = token_counter or count_tokens
 
     # CRITICAL: Apply message count hard cap FIRST (before token-based truncation)
     # Moderator gets confused with >100 messages and gives incorrect ALLOW decisions
-    if total_messages > MAX_MODERATOR_MESSAGE_COUNT:
-        all_messages = get_last_n_messages(transcript_path, MAX_MODERATOR_MESSAGE_COUNT)
+    if len(messages) > MAX_MODERATOR_MESSAGE_COUNT:
+        messages = messages[-MAX_MODERATOR_MESSAGE_COUNT:]
         logger.warning(
             "moderator_message_count_capped",
-            original_messages=total_messages,
             capped_messages=MAX_MODERATOR_MESSAGE_COUNT,
             reason="Moderator accuracy degrades above 100 messages",
         )
-        total_messages = MAX_MODERATOR_MESSAGE_COUNT
 
-    conversation_context = format_messages_for_prompt(all_messages)
-    token_count = count_tokens(conversation_context)
+    total_messages = len(messages)
+    blocks = [format_message_block(msg) for msg in messages]
+    summary_section = summary_section or ""
+    total_bytes = sum(len(part.encode("utf-8")) for part in (summary_section, EXHIBIT_HEADER, EXHIBIT_FOOTER, *blocks))
+
+    # Every token is at least one byte - a context within the budget in bytes needs no tokenizing
+    best_window = total_messages
+    if not fits_budget_by_bytes(total_bytes, MAX_MODERATOR_CONTEXT_TOKENS):
+        window, window_tokens = _fit_message_window(blocks, counter, counter(summary_section) if summary_section else 0)
+
+        # If transcript is too large, keep the largest window that fits (at least one message)
+        if window < total_messages:
+            best_window = max(1, window)
+
+            # Log warning about context truncation
+            logger.warning(
+                "moderator_context_truncated",
+                original_messages=total_messages,
+                truncated_messages=best_window,
+                original_tokens_estimate=estimate_tokens(total_bytes),
+                truncated_tokens=window_tokens,
+                max_tokens=MAX_MODERATOR_CONTEXT_TOKENS,
+            )
 
-    # If transcript is too large, use binary search to find how many messages fit
-    if token_count > MAX_MODERATOR_CONTEXT_TOKENS:
-        original_token_count = token_count
+    conversation_context = summary_section + EXHIBIT_HEADER + "".join(blocks[-best_window:]) + EXHIBIT_FOOTER
 
-        # Binary search to find appropriate window size
-        left_window = 1
-        right_window = total_messages
-        best_window = 1
+    # Append todo list if provided
+    if todos:
+        conversation_context += _format_todo_section(todos)
 
-        while left_window <= right_window:
-            mid_window = (left_window + right_window) // 2
-            test_messages = get_last_n_messages(transcript_path, mid_window)
-            test_context = format_messages_for_prompt(test_messages)
-            test_tokens = count_tokens(test_context)
+    return conversation_context
 
-            if test_tokens <= MAX_MODERATOR_CONTEXT_TOKENS:
-                best_window = mid_window
-                left_window = mid_window + 1
-            else:
-                right_window = mid_window - 1
 
-        messages = get_last_n_messages(transcript_path, best_window)
-        conversation_context = format_messages_for_prompt(messages)
-        truncated_token_count = count_tokens(conversation_context)
+def _summarize_older_messages(transcript_path: Path, messages: list[dict[str, str | None]]) -> tuple[list[dict[str, str | None]], str | None]:
+    """Replace messages older than the raw window with the transcript's layered summaries.
 
-        # Log warning about context truncation
-        logger.warning(
-            "moderator_context_truncated",
-            original_messages=total_messages,
-            truncated_messages=best_window,
-            original_tokens=original_token_count,
-            truncated_tokens=truncated_token_count,
-            max_tokens=MAX_MODERATOR_CONTEXT_TOKENS,
-        )
+    Summaries are extended incrementally (only segments that left the raw window since the
+    previous hook are summarized) and persisted next to the transcript.
 
-    # Append todo list if provided
-    if todos:
-        todo_section = "\n\n# Current Task List\n\n"
-        for i, todo in enumerate(todos, 1):
-            status = todo.get("status", "unknown")
-            content = todo.get("content", "Unknown task")
-            status_emoji = {"pending": "⏳", "in_progress": "🔄", "completed": "✅"}.get(status, "❓")
-            todo_section += f"{i}. [{status_emoji} {status}] {content}\n"
+    Args:
+        transcript_path: Path to transcript JSONL file
+        messages: Last MAX_MODERATOR_MESSAGE_COUNT + 1 messages of the transcript (sent as-is
+            when nothing is summarized)
 
-        conversation_context += todo_section
+    Returns:
+        Tuple of (messages not covered by summaries, summary section or None)
+    """
+    try:
+        index = TranscriptIndex(transcript_path)
+        index.refresh()
+        summary_store = TranscriptSummaryStore(transcript_path)
+        if summary_store.update(index.message_count, index.messages, MODERATOR_RAW_MESSAGE_COUNT):
+            summary_store.save()
+    except OSError as e:
+        # Sidecars not writable (read-only transcript dir) - fall back to truncation
+        logger.warning("moderator_summary_store_failed", transcript=str(transcript_path), error=str(e))
+        return messages, None
+
+    if not summary_store.summarized:
+        return messages, None
+    # Raw messages start right after the last summarized one, read from the same index snapshot
+    # the summaries were built from (messages may hold a trailing partial line or later appends)
+    return index.messages_since(summary_store.summarized), summary_store.format_section()
 
-    return conversation_context
+
+def prepare_moderator_context(
+    transcript_path: Path,
+    todos: list[dict[str, Any]] | None = None,
+    checkpoint: ModeratorCheckpoint | None = None,
+) -> str:
+    """Prepare conversation context for moderator with token and message count limits.
+
+    Asks the transcript state daemon first, which keeps the session's messages parsed in
+    memory. Without a running daemon, gets the LAST N messages from the transcript and
+    sizes them with build_moderator_context(), reusing token counts of messages sized by
+    earlier hooks (see TranscriptTokenCache).
+
+    With a checkpoint whose anchor is among the last messages, only the messages after
+    the anchor are sent, preceded by the checkpoint's summary of the validated prefix.
+    Otherwise, messages older than the raw window are sent as layered summaries (see
+    transcript_summary) instead of being dropped.
+
+    This is the PRODUCTION function used by completion moderator hook.
+    Tests MUST use this function to ensure they test production behavior.
+
+    Args:
+        transcript_path: Path to transcript JSONL file
+        todos: Optional list of todo items to append to context
+        checkpoint: Optional validated-prefix checkpoint of the transcript (see moderator_checkpoint)
+
+    Returns:
+        Formatted conversation context string ready for moderator
+
+    Raises:
+        Exception: If transcript extraction or formatting fails
+    """
+    if checkpoint is None:
+        context = fetch_moderator_context(transcript_path, todos)
+        if context is not None:
+            return context
+
+    # Read one message past the cap so capping can be detected without a full parse
+    messages = get_last_n_messages(transcript_path, MAX_MODERATOR_MESSAGE_COUNT + 1)
+
+    summary_section = None
+    if checkpoint is not None:
+        new_messages = messages_since_checkpoint(messages, checkpoint)
+        if new_messages is not None:
+            logger.info("moderator_context_from_checkpoint", skipped_messages=len(messages) - len(new_messages), new_messages=len(new_messages))
+            messages = new_messages
+            summary_section = format_checkpoint_summary(checkpoint)
+    if summary_section is None and len(messages) > MAX_MODERATOR_MESSAGE_COUNT:
+        messages, summary_section = _summarize_older_messages(transcript_path, messages)
+
+    # Only messages not sized by an earlier hook are tokenized
+    token_cache = TranscriptTokenCache(transcript_path, count_tokens)
+    context = build_moderator_context(messages, todos, token_counter=token_cache.count, summary_section=summary_section)
+    try:
+        token_cache.save()
+    except OSError as e:
+        logger.warning("moderator_token_cache_save_failed", transcript=str(transcript_path), error=str(e))
+    return context
+
+
+class ModeratorContext(NamedTuple):
+    """Formatted moderator context and its size."""
+
+    text: str
+    tokens: int  # Estimated from byte length (see estimate_tokens)
+
+
+def get_moderator_context(
+    transcript_path: Path,
+    todos: list[dict[str, Any]] | None = None,
+    checkpoint: ModeratorCheckpoint | None = None,
+) -> ModeratorContext:
+    """Get moderator context, shared by all validators of a transcript state.
+
+    The malicious behavior, todo and completion validators all build context from the same
+    transcript, each in its own hook process. Results of prepare_moderator_context() are kept
+    in the transcript's context memo (see context_memo) keyed by size, mtime, todos and
+    checkpoint, so the transcript is parsed, formatted and sized once per transcript state
+    instead of once per validator. Failures are not memoized.
+
+    Args:
+        transcript_path: Path to transcript JSONL file
+        todos: Optional list of todo items to append to context
+        checkpoint: Optional validated-prefix checkpoint of the transcript
+
+    Returns:
+        ModeratorContext with the formatted text and its estimated token count
+
+    Raises:
+        Exception: If transcript extraction or formatting fails
+    """
+    try:
+        stat = transcript_path.stat()
+    except OSError:
+        # Nothing to key on - let prepare_moderator_context() handle the missing transcript
+        text = prepare_moderator_context(transcript_path, todos=todos, checkpoint=checkpoint)
+        return ModeratorContext(text, estimate_tokens(len(text.encode("utf-8"))))
+
+    memo = ContextMemo(transcript_path, stat)
+    key = variant_key(json.dumps(todos, sort_keys=True), json.dumps(checkpoint, sort_keys=True))
+    stored = memo.get(key)
+    if stored is not None:
+        logger.debug("moderator_context_memo_hit", transcript=str(transcript_path))
+        return ModeratorContext(stored, estimate_tokens(len(stored.encode("utf-8"))))
+
+    text = prepare_moderator_context(transcript_path, todos=todos, checkpoint=checkpoint)
+    try:
+        memo.put(key, text)
+    except OSError as e:
+        logger.warning("moderator_context_memo_save_failed", transcript=str(transcript_path), error=str(e))
+    return ModeratorContext(text, estimate_tokens(len(text.encode("utf-8"))))
 
 
 class HookInput:
@@ -201,8 +360,22 @@ class HookInput:
             json.JSONDecodeError: If input not valid JSON
         """
         # Read with size limit
-        data_str = sys.stdin.read(MAX_HOOK_INPUT_SIZE + 1)
+        return cls.from_json(sys.stdin.read(MAX_HOOK_INPUT_SIZE + 1))
+
+    @classmethod
+    def from_json(cls, data_str: str) -> "HookInput":
+        """Parse hook input JSON (as sent by Claude Code on stdin).
 
+        Args:
+            data_str: Raw hook input
+
+        Returns:
+            Parsed HookInput
+
+        Raises:
+            ValueError: If input too large
+            json.JSONDecodeError: If input not valid JSON
+        """
         if len(data_str) > MAX_HOOK_INPUT_SIZE:
             raise ValueError(f"Hook input too large (>{MAX_HOOK_INPUT_SIZE} bytes)")
 
@@ -361,9 +534,25 @@ class HookValidator:
         Returns:
             Exit code (0=success)
         """
+        output = self.handle(sys.stdin.read(MAX_HOOK_INPUT_SIZE + 1))
+
+        # Output result to stdout for Claude Code
+        sys.stdout.write(output + "\n")
+        sys.stdout.flush()
+        return 0
+
+    def handle(self, data_str: str) -> str:
+        """Validate one raw hook input (shared by run() and the resident hook server).
+
+        Args:
+            data_str: Raw hook input JSON
+
+        Returns:
+            JSON output line for Claude Code (fails closed on errors)
+        """
         hook_input: HookInput | None = None
         try:
-            hook_input = HookInput.from_stdin()
+            hook_input = HookInput.from_json(data_str)
 
             # Log execution
             self.logger.info(
@@ -380,10 +569,6 @@ class HookValidator:
             # Set event type for correct JSON format
             result.event_type = cast(Literal["PreToolUse", "Stop", "SubagentStop"], hook_input.hook_event_name)
 
-            # Output result to stdout for Claude Code
-            sys.stdout.write(result.to_json() + "\n")
-            sys.stdout.flush()
-
             # Log result
             self.logger.info(
                 "hook_result",
@@ -392,7 +577,7 @@ class HookValidator:
                 reason=result.reason,
             )
 
-            return 0
+            return result.to_json()
 
         except json.JSONDecodeError as e:
             error_log_args: dict[str, Any] = {"error": str(e)}
@@ -405,9 +590,7 @@ class HookValidator:
                 reason=f"Hook input parsing failed: {e}",
                 event_type="Stop",  # Default to Stop format
             )
-            sys.stdout.write(result.to_json() + "\n")
-            sys.stdout.flush()
-            return 0
+            return result.to_json()
 
         except Exception as e:
             error_log_args_general: dict[str, Any] = {"error": str(e)}
@@ -422,6 +605,4 @@ class HookValidator:
                 reason=f"Hook execution failed: {e}",
                 event_type=cast(Literal["PreToolUse", "Stop", "SubagentStop"], event_type),
             )
-            sys.stdout.write(result.to_json() + "\n")
-            sys.stdout.flush()
-            return 0
+            return result.to_json()
@@ -0,0 +1,215 @@
+"""Composite PreToolUse pipeline running every matching validator in one hook process."""
+
+import multiprocessing
+import os
+import signal
+import time
+from multiprocessing.connection import Connection, wait
+from multiprocessing.process import BaseProcess
+from typing import cast
+
+from scripts.agents.validation.pattern_validators import validate_python_patterns
+from scripts.agents.validation.validation_utils import load_exemption_matcher
+from scripts.agents.workflows.command_validators import CommandValidator
+from scripts.agents.workflows.core import HookInput, HookResult, HookValidator
+from scripts.agents.workflows.quality_validators import CoreQualityValidator, PythonQualityValidator, ShebangValidator
+from scripts.agents.workflows.research_validators import ResearchValidator
+from scripts.agents.workflows.security_validators import MaliciousBehaviorValidator
+from scripts.agents.workflows.todo_validators import TodoValidatorHook
+
+# Longest single-moderator hook timeout (research-validator) - the pipeline hook's timeout in hooks.yaml is longer
+PIPELINE_TIMEOUT_SECONDS = 120
+
+# Grace period for a cancelled moderator (and its agent CLI subprocess) to exit before SIGKILL
+CANCEL_GRACE_SECONDS = 2.0
+
+
+class PythonPatternValidator(PythonQualityValidator):
+    """Validates Python edits against the YAML forbidden patterns (no LLM call)."""
+
+    def validate(self, hook_input: HookInput) -> HookResult:
+        """Validate Python code changes with validate_python_patterns.
+
+        Args:
+            hook_input: Hook input
+
+        Returns:
+            Validation result
+        """
+        if hook_input.tool_name not in ("Edit", "Write") or hook_input.tool_input is None or not hook_input.tool_input.get("file_path", "").endswith(".py"):
+            return HookResult.allow()
+
+        file_path = hook_input.tool_input.get("file_path", "")
+        if load_exemption_matcher().matches(file_path):
+            return HookResult.allow()
+
+        old_code, new_code = self._extract_old_new_code(hook_input)
+        is_valid, reason = validate_python_patterns(file_path, old_code, new_code)
+        if is_valid:
+            return HookResult.allow()
+        return HookResult.deny(
+            f"🚨 QUALITY VIOLATION - ADDITIONAL TOKENS INCURRED FOR MODERATION\n\n"
+            f"Hook: PreToolUse ({hook_input.tool_name})\n"
+            f"Validator: PythonPatternValidator\n\n"
+            f"{reason}"
+        )
+
+
+# Deterministic checks run first, in order, in the hook process (milliseconds each)
+DETERMINISTIC_VALIDATORS: tuple[tuple[type[HookValidator], frozenset[str]], ...] = (
+    (CommandValidator, frozenset({"Bash"})),
+    (PythonPatternValidator, frozenset({"Edit", "Write"})),
+    (ShebangValidator, frozenset({"Edit", "Write"})),
+)
+
+# LLM moderators run concurrently once every deterministic check allowed (tool matchers as in hooks.yaml)
+MODERATOR_VALIDATORS: tuple[tuple[type[HookValidator], frozenset[str]], ...] = (
+    (MaliciousBehaviorValidator, frozenset({"Write", "Edit", "Bash"})),
+    (ResearchValidator, frozenset({"Write", "Edit", "NotebookEdit"})),
+    (CoreQualityValidator, frozenset({"Edit", "Write"})),
+    (PythonQualityValidator, frozenset({"Edit", "Write"})),
+    (TodoValidatorHook, frozenset({"TodoWrite"})),
+)
+
+
+def _run_moderator(validator_class: type[HookValidator], hook_input: HookInput, conn: Connection) -> None:
+    """Run one moderator in a forked child and send its result to the pipeline.
+
+    The child leads its own process group, so cancelling it also stops the agent CLI
+    subprocess the moderator started.
+
+    Args:
+        validator_class: Moderator validator class
+        hook_input: Hook input
+        conn: Write end of the result pipe
+    """
+    os.setsid()
+    try:
+        result = validator_class().validate(hook_input)
+    except Exception as e:
+        # Fail closed - ZERO TOLERANCE (same as HookValidator.handle)
+        result = HookResult.deny(f"Hook execution failed: {validator_class.__name__}: {e}")
+    conn.send(result)
+    conn.close()
+
+
+def _cancel(process: BaseProcess) -> None:
+    """Terminate a moderator child and its process group.
+
+    Args:
+        process: Moderator child process
+    """
+    if process.pid is None:
+        return
+    for sig, grace in ((signal.SIGTERM, CANCEL_GRACE_SECONDS), (signal.SIGKILL, None)):
+        try:
+            os.killpg(process.pid, sig)
+        except (ProcessLookupError, PermissionError):
+            break
+        process.join(grace)
+        if not process.is_alive():
+            break
+
+
+def merge_denials(results: list[HookResult]) -> HookResult:
+    """Merge denials that arrived together into one result.
+
+    Args:
+        results: Deny results (at least one)
+
+    Returns:
+        Single deny result carrying every reason
+    """
+    if len(results) == 1:
+        return results[0]
+    reason = "\n\n---\n\n".join(result.reason or "" for result in results)
+    system_message = next((result.system_message for result in results if result.system_message), None)
+    return HookResult.deny(reason, system_message=system_message)
+
+
+class PreToolUsePipeline(HookValidator):
+    """Runs all validators matching a tool call and returns the first denial.
+
+    Claude Code runs the PreToolUse hooks of one tool call sequentially, each with its own
+    moderator call, so an Edit used to wait for the sum of four moderator latencies. The
+    pipeline runs the deterministic checks first, then every matching moderator in a
+    forked child at once, and cancels the remaining moderators on the first denial - edit
+    latency becomes the max() of the moderators instead of their sum().
+    """
+
+    def _run_moderators(self, validator_classes: list[type[HookValidator]], hook_input: HookInput) -> HookResult:
+        """Run moderators concurrently until all allow or the first one denies.
+
+        Args:
+            validator_classes: Moderator validator classes matching the tool
+            hook_input: Hook input
+
+        Returns:
+            Allow if every moderator allowed, otherwise the (merged) first denial
+        """
+        context = multiprocessing.get_context("fork")
+        pending: dict[Connection, tuple[type[HookValidator], BaseProcess]] = {}
+        try:
+            for validator_class in validator_classes:
+                recv_conn, send_conn = context.Pipe(duplex=False)
+                child: BaseProcess = context.Process(target=_run_moderator, args=(validator_class, hook_input, send_conn), name=validator_class.__name__)
+                child.start()
+                send_conn.close()
+                pending[recv_conn] = (validator_class, child)
+
+            deadline = time.monotonic() + PIPELINE_TIMEOUT_SECONDS
+            while pending:
+                ready = wait(list(pending), timeout=max(0.0, deadline - time.monotonic()))
+                if not ready:
+                    names = ", ".join(validator_class.__name__ for validator_class, _ in pending.values())
+                    self.logger.error("pretooluse_pipeline_timeout", session_id=hook_input.session_id, pending=names)
+                    # Fail closed - ZERO TOLERANCE
+                    return HookResult.deny(f"Hook execution failed: moderators timed out after {PIPELINE_TIMEOUT_SECONDS}s ({names})")
+
+                denials: list[HookResult] = []
+                for conn in cast(list[Connection], ready):
+                    validator_class, process = pending.pop(conn)
+                    try:
+                        result: HookResult = conn.recv()
+                    except EOFError:
+                        result = HookResult.deny(f"Hook execution failed: {validator_class.__name__} exited without a result")
+                    conn.close()
+                    process.join()
+                    self.logger.info(
+                        "pretooluse_pipeline_result", session_id=hook_input.session_id, validator=validator_class.__name__, decision=result.decision or "allow"
+                    )
+                    if result.decision == "deny":
+                        denials.append(result)
+                if denials:
+                    return merge_denials(denials)
+            return HookResult.allow()
+        finally:
+            for conn, (validator_class, process) in pending.items():
+                self.logger.info("pretooluse_pipeline_cancel", session_id=hook_input.session_id, validator=validator_class.__name__)
+                _cancel(process)
+                conn.close()
+
+    def validate(self, hook_input: HookInput) -> HookResult:
+        """Validate a tool call with every matching PreToolUse validator.
+
+        Args:
+            hook_input: Hook input
+
+        Returns:
+            Allow, or the first denial (cancelling the moderators still running)
+        """
+        tool_name = hook_input.tool_name or ""
+
+        for validator_class, tools in DETERMINISTIC_VALIDATORS:
+            if tool_name in tools:
+                result = validator_class().validate(hook_input)
+                if result.decision == "deny":
+                    return result
+
+        moderators = [validator_class for validator_class, tools in MODERATOR_VALIDATORS if tool_name in tools]
+        if not moderators:
+            return HookResult.allow()
+        if len(moderators) == 1:
+            # Nothing to overlap with - skip the fork
+            return moderators[0]().validate(hook_input)
+        return self._run_moderators(moderators, hook_input)
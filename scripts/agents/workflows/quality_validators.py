@@ -3,7 +3,7 @@
 from pathlib import Path
 
 from scripts.agents.validation.llm_validators import validate_diff_llm
-from scripts.agents.validation.validation_utils import load_exemptions
+from scripts.agents.validation.validation_utils import load_exemption_matcher
 from scripts.agents.workflows.core import HookInput, HookResult, HookValidator
 
 
@@ -72,15 +72,8 @@ class CoreQualityValidator(HookValidator):
         # Extract old/new code
         old_code, new_code = self._extract_old_new_code(hook_input)
 
-        # Load exemptions from YAML
-        exemptions = load_exemptions()
-
-        # Check if file is exempt from pattern checks
-        # Support both endswith (extensions) and contains (path patterns)
-        is_pattern_exempt = any(file_path.endswith(exempt) or exempt in file_path for exempt in exemptions)
-
-        # Skip validation for exempt files
-        if is_pattern_exempt:
+        # Skip validation for files exempt from pattern checks (exemptions.yaml globs)
+        if load_exemption_matcher().matches(file_path):
             return HookResult.allow()
 
         # Use shared validation logic with patterns_core.txt
@@ -167,15 +160,8 @@ class PythonQualityValidator(HookValidator):
         # Extract old/new code
         old_code, new_code = self._extract_old_new_code(hook_input)
 
-        # Load exemptions from YAML
-        exemptions = load_exemptions()
-
-        # Check if file is exempt from pattern checks
-        # Support both endswith (extensions) and contains (path patterns)
-        is_pattern_exempt = any(file_path.endswith(exempt) or exempt in file_path for exempt in exemptions)
-
-        # Skip validation for exempt files
-        if is_pattern_exempt:
+        # Skip validation for files exempt from pattern checks (exemptions.yaml globs)
+        if load_exemption_matcher().matches(file_path):
             return HookResult.allow()
 
         # Use shared validation logic with patterns_python.txt
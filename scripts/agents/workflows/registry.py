@@ -0,0 +1,44 @@
+"""Hook validator registry.
+
+Maps the validator names used in hooks.yaml (and ``--hook``) to "module:Class" paths. Shared
+by the CLI hook mode and the resident hook server. A class is imported on first lookup, so a
+hook only imports the module of the validator it runs (command-guard never loads the
+moderator runner, the warm pool or the LLM validators).
+"""
+
+import importlib
+
+from scripts.agents.workflows.core import HookValidator
+
+HOOK_VALIDATORS: dict[str, str] = {
+    "malicious-behavior": "scripts.agents.workflows.security_validators:MaliciousBehaviorValidator",
+    "command-guard": "scripts.agents.workflows.command_validators:CommandValidator",
+    "research-validator": "scripts.agents.workflows.research_validators:ResearchValidator",
+    "code-quality-core": "scripts.agents.workflows.quality_validators:CoreQualityValidator",
+    "code-quality-python": "scripts.agents.workflows.quality_validators:PythonQualityValidator",
+    "response-scanner": "scripts.agents.workflows.response_validators:ResponseScanner",
+    "shebang-check": "scripts.agents.workflows.quality_validators:ShebangValidator",
+    "todo-validator": "scripts.agents.workflows.todo_validators:TodoValidatorHook",
+    "pretooluse-pipeline": "scripts.agents.workflows.pipeline_validators:PreToolUsePipeline",
+}
+
+
+def get_hook_validator(validator_name: str) -> type[HookValidator] | None:
+    """Look up a hook validator class by name, importing its module on first use.
+
+    Args:
+        validator_name: Validator name (e.g. command-guard)
+
+    Returns:
+        Validator class, or None if the name is unknown
+
+    Raises:
+        ImportError: If the validator's module cannot be imported
+        AttributeError: If the module has no such class
+    """
+    path = HOOK_VALIDATORS.get(validator_name)
+    if path is None:
+        return None
+    module_name, _, class_name = path.partition(":")
+    validator_class: type[HookValidator] = getattr(importlib.import_module(module_name), class_name)
+    return validator_class
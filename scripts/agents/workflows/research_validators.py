@@ -12,6 +12,7 @@ from scripts.agents.cli.config import AgentConfigPresets
 from scripts.agents.cli.exceptions import AgentError, AgentExecutionError, AgentTimeoutError
 from scripts.agents.cli.factory import get_agent_cli
 from scripts.agents.transcript import format_messages_for_prompt, get_last_n_messages
+from scripts.agents.transcript_client import fetch_last_n_messages
 from scripts.agents.validation.validation_utils import parse_code_fence_output
 from scripts.agents.workflows.core import HookInput, HookResult, HookValidator
 
@@ -240,7 +241,9 @@ class ResearchValidator(HookValidator):
             # Get last N messages for research tool detection
             if hook_input.transcript_path is None:
                 return "", HookResult.allow()
-            messages = get_last_n_messages(hook_input.transcript_path, self.lookback_messages)
+            messages = fetch_last_n_messages(hook_input.transcript_path, self.lookback_messages)
+            if messages is None:
+                messages = get_last_n_messages(hook_input.transcript_path, self.lookback_messages)
             conversation_context = format_messages_for_prompt(messages)
             return conversation_context, None
         except Exception as e:
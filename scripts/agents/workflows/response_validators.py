@@ -3,10 +3,9 @@
 from pathlib import Path
 from typing import Any
 
-import yaml
-
 from scripts.agents.config import get_config
 from scripts.agents.validation.core import HookResult as ValidationHookResult
+from scripts.agents.validation.pattern_registry import get_pattern_registry
 from scripts.agents.validation.response_basic_utils import check_api_limit_messages, check_prohibited_patterns, get_last_assistant_message
 from scripts.agents.validation.response_utils import (
     check_early_allow_conditions,
@@ -21,17 +20,8 @@ def _load_completion_markers() -> list[str]:
     Returns:
         List of completion markers
     """
-    config = get_config()
-    patterns_dir = config.root / "scripts/config/patterns"
-    patterns_file = patterns_dir / "completion_markers.yaml"
-
-    if not patterns_file.exists():
-        # Return default markers if config doesn't exist
-        return ["WORK DONE", "FEEDBACK:"]
-
-    with patterns_file.open() as f:
-        data: dict[str, Any] = yaml.safe_load(f)
-
+    # Default markers if config doesn't exist (the registry returns an empty mapping)
+    data = get_pattern_registry(get_config().root).load("completion_markers.yaml")
     completion_markers = data.get("completion_markers", ["WORK DONE", "FEEDBACK:"])
     if completion_markers is None:
         return ["WORK DONE", "FEEDBACK:"]
@@ -1,7 +1,6 @@
-"""Security-related validators for malicious behavior and command validation."""
+"""Security-related validators for malicious behavior (the Bash command validator is in command_validators)."""
 
 import re
-from typing import Any
 
 from base.backend.utils.uuid_utils import uuid7
 from scripts.agents.cli.config import AgentConfigPresets
@@ -9,11 +8,8 @@ from scripts.agents.cli.exceptions import AgentError, AgentExecutionError, Agent
 from scripts.agents.cli.factory import get_agent_cli
 from scripts.agents.config import get_config
 from scripts.agents.validation.moderator_runner import run_moderator_with_retry
-from scripts.agents.validation.validation_utils import (
-    load_bash_patterns,
-    parse_code_fence_output,
-)
-from scripts.agents.workflows.core import HookInput, HookResult, HookValidator, prepare_moderator_context
+from scripts.agents.validation.validation_utils import parse_code_fence_output
+from scripts.agents.workflows.core import HookInput, HookResult, HookValidator, get_moderator_context
 
 
 class MaliciousBehaviorValidator(HookValidator):
@@ -24,6 +20,8 @@ class MaliciousBehaviorValidator(HookValidator):
     - Circumvent guardrails through file modification scripts
     - Create backdoors via /tmp or other temp locations
     - Automate git operations to skip validation
+
+    Verdicts are never memoized (malicious_behavior is in verdict_memo.NEVER_MEMOIZED).
     """
 
     def __init__(self, session_id: str | None = None) -> None:
@@ -62,7 +60,7 @@ class MaliciousBehaviorValidator(HookValidator):
         try:
             if hook_input.transcript_path is None:
                 return None, "transcript_path_missing"
-            context = prepare_moderator_context(hook_input.transcript_path)
+            context = get_moderator_context(hook_input.transcript_path).text
             return context, None
         except Exception as e:
             self.logger.error("malicious_behavior_context_error", session_id=hook_input.session_id, error=str(e))
@@ -213,61 +211,3 @@ class MaliciousBehaviorValidator(HookValidator):
                 f"Please retry the operation.",
                 system_message="⚠️ Security check error - operation blocked",
             )
-
-
-class CommandValidator(HookValidator):
-    """Validates Bash commands using patterns from YAML configuration."""
-
-    def _extract_strings(self, obj: Any) -> tuple[str, ...]:
-        """Recursively extract all string values from nested structures."""
-        strings = []
-        if isinstance(obj, str):
-            strings.append(obj)
-        elif isinstance(obj, dict):
-            for value in obj.values():
-                strings.extend(self._extract_strings(value))
-        elif isinstance(obj, list):
-            for item in obj:
-                strings.extend(self._extract_strings(item))
-        return tuple(strings)
-
-    def validate(self, hook_input: HookInput) -> HookResult:
-        """Validate bash command against patterns from bash_commands.yaml.
-
-        Args:
-            hook_input: Hook input
-
-        Returns:
-            Validation result
-        """
-        if hook_input.tool_name != "Bash":
-            return HookResult.allow()
-
-        # Handle null tool_input
-        if hook_input.tool_input is None:
-            return HookResult.allow()
-
-        # Load patterns from YAML
-        deny_patterns = load_bash_patterns()
-
-        # SECURITY: Only validate the command field, not description/metadata
-        # Only "command" field is actually executed by bash tool.
-        # Checking all fields causes false positives when descriptions mention tools.
-        # Malicious code MUST be in command field to execute - checking description adds
-        # no security value since it's never passed to shell.
-        command = hook_input.tool_input.get("command", "")
-
-        for pattern_config in deny_patterns:
-            pattern = pattern_config.get("pattern", "")
-            message = pattern_config.get("message", "Pattern violation detected")
-
-            if re.search(pattern, command):
-                return HookResult.deny(
-                    f"🚨 QUALITY VIOLATION - ADDITIONAL TOKENS INCURRED FOR MODERATION\n\n"
-                    f"Hook: PreToolUse (Bash)\n"
-                    f"Validator: CommandValidator\n\n"
-                    f"{message}\n"
-                    f"Pattern: {pattern}"
-                )
-
-        return HookResult.allow()
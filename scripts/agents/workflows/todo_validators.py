@@ -13,8 +13,8 @@ from scripts.agents.workflows.core import (
     HookInput,
     HookResult,
     HookValidator,
+    get_moderator_context,
     load_session_todos,
-    prepare_moderator_context,
 )
 
 
@@ -96,7 +96,7 @@ class TodoValidatorHook(HookValidator):
         try:
             if hook_input.transcript_path is None:
                 return None, HookResult.allow()
-            conversation_context = prepare_moderator_context(hook_input.transcript_path)
+            conversation_context = get_moderator_context(hook_input.transcript_path).text
             return conversation_context, None
         except Exception as e:
             self.logger.error("todo_validator_context_error", session_id=hook_input.session_id, error=str(e))
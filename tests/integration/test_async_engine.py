@@ -0,0 +1,212 @@
+"""asyncio agent execution engine.
+
+Runs fake CLIs on one event loop: a moderator deciding right away and then lingering in
+teardown, slow workers, failing and hanging processes, and an auditor answering PASS or FAIL.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from scripts.agents.audit import AuditEngine
+from scripts.agents.cli.async_streaming import execute_async
+from scripts.agents.cli.claude_cli import ClaudeAgentCLI
+from scripts.agents.cli.config import AgentConfig
+from scripts.agents.cli.exceptions import AgentExecutionError, AgentTimeoutError
+from scripts.agents.cli.lifecycle import AgentEvent
+from scripts.agents.docs import DocsExecutor
+from scripts.agents.tasks import TaskExecutor
+
+# Test constants
+FAILED_EXIT_CODE = 3
+CONCURRENT_AGENTS = 50
+WORKER_SECONDS = 0.5
+TEARDOWN_SECONDS = 3
+HANG_SECONDS = 30
+TWO_ATTEMPTS = 2
+EVENT_COUNT = 5
+PARALLEL_WORKERS = 2
+PARALLEL_DOCS = 6
+
+DECIDER = (
+    "import json, sys, time\n"
+    "text = sys.stdin.read()\n"
+    "content = [{'type': 'text', 'text': f'ALLOW: {text}'}]\n"
+    "print(json.dumps({'type': 'assistant', 'message': {'content': content, 'stop_reason': 'end_turn'}}), flush=True)\n"
+    "print(json.dumps({'type': 'result', 'subtype': 'success'}), flush=True)\n"
+    f"time.sleep({TEARDOWN_SECONDS})\n"
+)
+
+WORKER = f"import sys, time; sys.stdin.read(); time.sleep({WORKER_SECONDS}); print('WORK DONE')"
+
+AUDITOR = "import sys; print('FAIL: bad code' if 'bad' in sys.stdin.read() else 'PASS')"
+
+
+def _config(timeout: int = 60, stop_on_decision: bool = False, on_event: Any = None) -> AgentConfig:
+    """Agent config of a fake run."""
+    return AgentConfig(
+        model="test",
+        session_id="async-engine",
+        enable_hooks=False,
+        enable_streaming=True,
+        timeout=timeout,
+        stop_on_decision=stop_on_decision,
+        on_event=on_event,
+    )
+
+
+def _global_config() -> MagicMock:
+    """Global config whose lookups return defaults (processes run as the current user)."""
+    config = MagicMock()
+    config.get.side_effect = lambda key, default=None: default
+    return config
+
+
+class _FakeAuditCLI(ClaudeAgentCLI):
+    """Claude provider whose print command is the fake auditor."""
+
+    def _build_command(self, instruction: str, cwd: Path | None, config: AgentConfig) -> list[str]:
+        return [sys.executable, "-c", AUDITOR]
+
+
+class TestExecuteAsync:
+    """execute_async() with fake CLIs."""
+
+    @pytest.mark.asyncio
+    async def test_returns_at_decision(self) -> None:
+        """A moderator's decision is returned without waiting for its teardown."""
+        events: list[AgentEvent] = []
+        started = time.time()
+
+        output, metadata = await execute_async(
+            [sys.executable, "-c", DECIDER], "diff", None, _config(stop_on_decision=True, on_event=events.append), _global_config()
+        )
+
+        assert time.time() - started < TEARDOWN_SECONDS
+        assert "ALLOW: diff" in output
+        assert metadata is not None and metadata["early_decision"] == "ALLOW"
+        assert [event.name for event in events] == ["spawned", "first_byte", "first_token", "decision"]
+        assert isinstance(events[0].process, asyncio.subprocess.Process)
+
+        # The process finishes its teardown in the background
+        deadline = time.time() + HANG_SECONDS
+        while len(events) < EVENT_COUNT and time.time() < deadline:
+            await asyncio.sleep(0.05)
+        assert events[-1].name == "exit"
+        assert events[-1].detail == "0"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_agents_share_one_loop(self) -> None:
+        """Many agents run at once on one event loop - without a thread each."""
+        cmd = [sys.executable, "-c", WORKER]
+        started = time.time()
+
+        results = await asyncio.gather(*(execute_async(cmd, "task", None, _config(), _global_config()) for _ in range(CONCURRENT_AGENTS)))
+
+        assert all(output == "WORK DONE\n" for output, _ in results)
+        assert time.time() - started < CONCURRENT_AGENTS * WORKER_SECONDS / 2
+
+    @pytest.mark.asyncio
+    async def test_failed_process_raises(self) -> None:
+        """A non-zero exit is reported with its stderr."""
+        cmd = [sys.executable, "-c", f"import sys; print('no auth', file=sys.stderr); sys.exit({FAILED_EXIT_CODE})"]
+
+        with pytest.raises(AgentExecutionError) as exc_info:
+            await execute_async(cmd, None, None, _config(), _global_config())
+
+        assert exc_info.value.exit_code == FAILED_EXIT_CODE
+        assert "no auth" in exc_info.value.stderr
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_process(self) -> None:
+        """A run past its timeout raises and its process is killed."""
+        events: list[AgentEvent] = []
+        cmd = [sys.executable, "-c", f"import time; time.sleep({HANG_SECONDS})"]
+
+        with pytest.raises(AgentTimeoutError):
+            await execute_async(cmd, "", None, _config(timeout=1, on_event=events.append), _global_config())
+
+        process = events[0].process
+        assert isinstance(process, asyncio.subprocess.Process)
+        assert await asyncio.wait_for(process.wait(), TEARDOWN_SECONDS) != 0
+
+
+class TestExecutorEntryPoints:
+    """Async entry points of the executors."""
+
+    @pytest.mark.asyncio
+    async def test_audit_directory_async(self, tmp_path: Path) -> None:
+        """Files are audited concurrently and reported in file order."""
+        (tmp_path / "a.py").write_text("good = 1\n")
+        (tmp_path / "b.py").write_text("bad = 1\n")
+        with (
+            patch("scripts.agents.audit.get_agent_cli", return_value=_FakeAuditCLI()),
+            patch("scripts.agents.cli.process_utils.get_config", return_value=_global_config()),
+        ):
+            engine = AuditEngine()
+            results = await engine.audit_directory_async(tmp_path)
+
+        assert [(result.item_path.name, result.status) for result in results] == [("a.py", "completed"), ("b.py", "failed")]
+        assert any((tmp_path / "docs" / "audit").rglob("b.py.md"))
+
+    @pytest.mark.asyncio
+    async def test_docs_retry_loop_async(self, tmp_path: Path) -> None:
+        """The docs retry loop runs unchanged on the event loop: a failed validation is retried."""
+        doc = tmp_path / "guide.md"
+        doc.write_text("# Guide\n")
+        cli = MagicMock()
+        cli.run_print_async = AsyncMock(side_effect=[("UPDATED. WORK DONE", None), ("FAIL: stale", None), ("UPDATED. WORK DONE", None), ("PASS", None)])
+        with patch("scripts.agents.core.base_executor.get_agent_cli", return_value=cli):
+            executor = DocsExecutor()
+            results = await executor.execute_docs_async(tmp_path)
+
+        assert [result.status for result in results] == ["completed"]
+        assert len(results[0].attempts) == TWO_ATTEMPTS
+        assert "PREVIOUS ATTEMPT FAILED VALIDATION:\nstale" in cli.run_print_async.await_args_list[2].kwargs["instruction"]
+        cli.run_print.assert_not_called()
+
+    def test_parallel_mode_runs_on_event_loop(self, tmp_path: Path) -> None:
+        """execute_items(parallel=True) runs items on the event loop, executor.workers at a time."""
+        for i in range(PARALLEL_DOCS):
+            (tmp_path / f"task{i}.md").write_text(f"# Task {i}\n")
+        running = 0
+        peak = 0
+
+        async def run_print_async(**kwargs: Any) -> tuple[str, None]:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            return ("WORK DONE", None) if kwargs["agent_config"].enable_hooks else ("PASS", None)
+
+        cli = MagicMock()
+        cli.run_print_async = run_print_async
+        with patch("scripts.agents.core.base_executor.get_agent_cli", return_value=cli):
+            executor = TaskExecutor()
+            config = executor.config
+            executor.config = MagicMock()
+            executor.config.get.side_effect = lambda key, default=None: PARALLEL_WORKERS if key == "executor.workers" else config.get(key, default)
+            results = executor.execute_tasks(tmp_path, parallel=True)
+
+        assert [result.item_path.name for result in results] == [f"task{i}.md" for i in range(PARALLEL_DOCS)]
+        assert peak == PARALLEL_WORKERS
+        cli.run_print.assert_not_called()
+
+    def test_parallel_audit_runs_on_event_loop(self, tmp_path: Path) -> None:
+        """audit_directory(parallel=True) audits files on the event loop."""
+        (tmp_path / "a.py").write_text("good = 1\n")
+        (tmp_path / "b.py").write_text("bad = 1\n")
+        with (
+            patch("scripts.agents.audit.get_agent_cli", return_value=_FakeAuditCLI()),
+            patch("scripts.agents.cli.process_utils.get_config", return_value=_global_config()),
+            patch.object(_FakeAuditCLI, "run_print", side_effect=AssertionError("blocking run")),
+        ):
+            results = AuditEngine().audit_directory(tmp_path, parallel=True, max_workers=PARALLEL_WORKERS)
+
+        assert [(result.item_path.name, result.status) for result in results] == [("a.py", "completed"), ("b.py", "failed")]
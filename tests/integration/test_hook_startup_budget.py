@@ -0,0 +1,84 @@
+"""Import-time budget for hook invocations of the hook entry point.
+
+Claude Code starts a fresh interpreter for every hook, so import time is paid on every tool
+call. `hook_main.py --hook command-guard` must only import its own validator, never the CLI's
+executors, the text editor or the moderator machinery of the LLM-backed validators.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# Test constants
+ORCHESTRATOR_ROOT = Path(__file__).resolve().parents[2]
+HOOK_MAIN_PATH = ORCHESTRATOR_ROOT / "scripts" / "agents" / "cli" / "hook_main.py"
+
+# Cumulative time of all top-level imports (as reported by -X importtime, which inflates it)
+HOOK_IMPORT_BUDGET_SECONDS = 0.75
+
+# Modules a command-guard hook must never import (executors, editor, moderators)
+FORBIDDEN_MODULES = (
+    "scripts.agents.audit",
+    "scripts.agents.tasks",
+    "scripts.agents.docs",
+    "scripts.agents.sync",
+    "scripts.agents.cli.mode_handlers",
+    "scripts.cli_components.text_editor",
+    "scripts.agents.validation.llm_validators",
+    "scripts.agents.validation.moderator_runner",
+    "scripts.agents.cli.warm_pool",
+)
+
+
+def _run_hook_with_importtime(validator_name: str, hook_input: dict[str, object]) -> subprocess.CompletedProcess[str]:
+    """Run hook_main.py --hook under -X importtime."""
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", str(HOOK_MAIN_PATH), "--hook", validator_name],
+        input=json.dumps(hook_input),
+        capture_output=True,
+        text=True,
+        cwd=ORCHESTRATOR_ROOT,
+        timeout=60,
+        check=False,
+    )
+
+
+def _parse_importtime(stderr: str) -> dict[str, int]:
+    """Map each top-level imported module to its cumulative import time in microseconds."""
+    top_level: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented below their importer
+        if not name.startswith("  "):
+            top_level[name.strip()] = int(cumulative)
+    return top_level
+
+
+def _imported_modules(stderr: str) -> set[str]:
+    """All modules reported by -X importtime."""
+    return {line.split("|")[2].strip() for line in stderr.splitlines() if line.startswith("import time:") and "cumulative" not in line}
+
+
+class TestHookStartupBudget:
+    """Startup cost of `hook_main.py --hook command-guard`."""
+
+    def test_command_guard_within_import_budget(self) -> None:
+        """command-guard imports only what it needs, within the startup budget."""
+        hook_input = {"session_id": "budget", "hook_event_name": "PreToolUse", "tool_name": "Bash", "tool_input": {"command": "ls -la"}}
+
+        result = _run_hook_with_importtime("command-guard", hook_input)
+
+        assert result.returncode == 0, result.stderr[-2000:]
+        output = json.loads(result.stdout.strip().splitlines()[-1])
+        assert output["hookSpecificOutput"]["permissionDecision"] == "allow"
+
+        imported = _imported_modules(result.stderr)
+        assert not [module for module in FORBIDDEN_MODULES if module in imported]
+
+        top_level = _parse_importtime(result.stderr)
+        total_seconds = sum(top_level.values()) / 1_000_000
+        slowest = sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:5]
+        assert total_seconds <= HOOK_IMPORT_BUDGET_SECONDS, f"Hook imports took {total_seconds:.3f}s (slowest: {slowest})"
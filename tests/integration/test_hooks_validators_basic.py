@@ -5,8 +5,8 @@ import tempfile
 from pathlib import Path
 
 # Import the implemented hooks functionality
+from scripts.agents.workflows.command_validators import CommandValidator
 from scripts.agents.workflows.response_validators import ResponseScanner
-from scripts.agents.workflows.security_validators import CommandValidator
 
 
 class TestCommandValidator:
@@ -0,0 +1,93 @@
+"""Early return of stdin-fed moderator runs once the decision has streamed.
+
+Runs a fake CLI that emits stream-json events, then keeps running (like session teardown).
+"""
+
+import json
+import sys
+import time
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from scripts.agents.cli.config import AgentConfig
+from scripts.agents.cli.exceptions import AgentExecutionError
+from scripts.agents.cli.streaming import execute_streaming
+
+# Test constants
+TEARDOWN_SECONDS = 10
+EARLY_RETURN_SECONDS = 5
+FAILED_EXIT_CODE = 3
+
+
+def _fake_cli(events: list[dict[str, Any]], teardown: float = 0, exit_code: int = 0) -> list[str]:
+    """Command printing events (flushed one by one), then lingering and exiting."""
+    script = (
+        "import sys, time\n"
+        "sys.stdin.read()\n"
+        f"for line in {[json.dumps(event) for event in events]!r}:\n"
+        "    print(line, flush=True)\n"
+        f"time.sleep({teardown})\n"
+        "print('teardown done', file=sys.stderr)\n"
+        f"sys.exit({exit_code})\n"
+    )
+    return [sys.executable, "-c", script]
+
+
+def _assistant(text: str) -> dict[str, Any]:
+    """Final assistant message event."""
+    return {"type": "assistant", "message": {"content": [{"type": "text", "text": text}], "stop_reason": "end_turn"}}
+
+
+def _config(stop_on_decision: bool = True) -> AgentConfig:
+    """Moderator-like config."""
+    return AgentConfig(model="test", session_id="early-exit", enable_hooks=False, enable_streaming=True, timeout=60, stop_on_decision=stop_on_decision)
+
+
+def _config_without_unprivileged_user() -> MagicMock:
+    """Global config whose lookups return defaults (processes run as the current user)."""
+    config = MagicMock()
+    config.get.side_effect = lambda key, default=None: default
+    return config
+
+
+class TestEarlyDecisionExit:
+    """execute_streaming() with stop_on_decision."""
+
+    def test_returns_before_teardown(self) -> None:
+        """The decision is returned without waiting for the process to exit."""
+        events = [{"type": "system", "subtype": "init"}, _assistant("BLOCK: unverified completion claim")]
+
+        started = time.time()
+        output, metadata = execute_streaming(
+            _fake_cli(events, teardown=TEARDOWN_SECONDS), stdin_data="context", agent_config=_config(), config=_config_without_unprivileged_user()
+        )
+
+        assert time.time() - started < EARLY_RETURN_SECONDS
+        assert "BLOCK: unverified completion claim" in output
+        assert metadata is not None
+        assert metadata["early_decision"] == "BLOCK"
+        assert metadata["exit_code"] is None
+        assert {"spawned", "first_byte", "first_token", "decision"} <= set(metadata["lifecycle"])
+
+    def test_without_decision_runs_to_exit(self) -> None:
+        """Output without a well-formed decision is read until the process exits."""
+        events = [_assistant("I could not decide"), {"type": "result", "result": "I could not decide"}]
+
+        output, metadata = execute_streaming(_fake_cli(events), stdin_data="context", agent_config=_config(), config=_config_without_unprivileged_user())
+
+        assert '"type": "result"' in output
+        assert metadata is not None
+        assert metadata["early_decision"] is None
+        assert metadata["exit_code"] == 0
+
+    def test_failure_before_decision_raises(self) -> None:
+        """A non-zero exit without a decision is reported with stderr, as without early exit."""
+        with pytest.raises(AgentExecutionError) as exc_info:
+            execute_streaming(
+                _fake_cli([], exit_code=FAILED_EXIT_CODE), stdin_data="context", agent_config=_config(), config=_config_without_unprivileged_user()
+            )
+
+        assert exc_info.value.exit_code == FAILED_EXIT_CODE
+        assert "teardown done" in exc_info.value.stderr
@@ -0,0 +1,198 @@
+"""Long-lived moderator sessions over stream-json stdin.
+
+Runs a fake CLI that keeps a conversation: each request line is answered with an assistant
+event naming its pid and how many messages the conversation holds, then a result event.
+/clear empties the conversation; a request containing CRASH exits with an error.
+"""
+
+import json
+import sys
+import tempfile
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from scripts.agents.cli.claude_cli import ClaudeAgentCLI
+from scripts.agents.cli.config import AgentConfig
+from scripts.agents.cli.moderator_session import ModeratorSession, ModeratorSessionError, SessionSupervisor
+from scripts.agents.cli.warm_pool import WarmPool
+from scripts.agents.moderator_session_client import SOCKET_ENV_VAR, request_moderation, request_warm_run
+from scripts.agents.moderator_session_daemon import ModeratorSessionDaemon
+
+# Test constants
+FAILED_EXIT_CODE = 3
+
+FAKE_CLI = (
+    "import json, os, sys\n"
+    "history = []\n"
+    "for line in sys.stdin:\n"
+    "    text = json.loads(line)['message']['content'][0]['text']\n"
+    "    if text == '/clear':\n"
+    "        history.clear()\n"
+    "    else:\n"
+    "        if 'CRASH' in text:\n"
+    f"            sys.exit({FAILED_EXIT_CODE})\n"
+    "        history.append(text)\n"
+    "        answer = f'ALLOW: pid={os.getpid()} messages={len(history)}'\n"
+    "        content = [{'type': 'text', 'text': answer}]\n"
+    "        print(json.dumps({'type': 'assistant', 'message': {'content': content, 'stop_reason': 'end_turn'}}), flush=True)\n"
+    "    print(json.dumps({'type': 'result', 'subtype': 'success', 'is_error': False}), flush=True)\n"
+)
+
+
+class _FakeSessionCLI(ClaudeAgentCLI):
+    """Claude provider whose session command is the fake CLI."""
+
+    def _build_warm_command(self, cwd: Path | None, config: AgentConfig) -> list[str] | None:
+        return [sys.executable, "-c", FAKE_CLI]
+
+
+def _config() -> AgentConfig:
+    """Moderator-like config."""
+    return AgentConfig(model="test", session_id="moderator-session", enable_hooks=False, enable_streaming=True, timeout=30)
+
+
+def _answer(output: str) -> dict[str, str]:
+    """Fields of the fake CLI's answer (pid, messages)."""
+    event = json.loads(output.splitlines()[0])
+    text = str(event["message"]["content"][0]["text"])
+    return dict(field.split("=") for field in text.split()[1:])
+
+
+@pytest.fixture
+def global_config(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Global config whose lookups return defaults (processes run as the current user)."""
+    config = MagicMock()
+    config.get.side_effect = lambda key, default=None: default
+    monkeypatch.setattr("scripts.agents.cli.process_utils.get_config", lambda: config)
+
+
+@pytest.fixture
+def supervisor(global_config: None) -> Iterator[SessionSupervisor]:
+    """Supervisor stopped after the test."""
+    supervisor = SessionSupervisor(max_failures=2, cooldown=60)
+    yield supervisor
+    supervisor.close()
+
+
+class TestModeratorSession:
+    """ModeratorSession with the fake CLI."""
+
+    def test_context_reset_between_requests(self, global_config: None) -> None:
+        """Successive requests share the process but not the conversation."""
+        cli = _FakeSessionCLI()
+        session = ModeratorSession(cli, [sys.executable, "-c", FAKE_CLI], None, _config())
+        try:
+            first, _ = session.ask("first diff")
+            second, metadata = session.ask("second diff")
+        finally:
+            session.close()
+
+        assert _answer(first)["pid"] == _answer(second)["pid"]
+        assert _answer(second)["messages"] == "1"
+        assert metadata["moderator_session"] == {"requests": 2, "restarts": 0}
+
+    def test_process_replaced_after_max_requests(self, global_config: None) -> None:
+        """A new process takes over once max_requests were answered."""
+        session = ModeratorSession(_FakeSessionCLI(), [sys.executable, "-c", FAKE_CLI], None, _config(), max_requests=1)
+        try:
+            first, _ = session.ask("first diff")
+            second, _ = session.ask("second diff")
+        finally:
+            session.close()
+
+        assert _answer(first)["pid"] != _answer(second)["pid"]
+
+
+class TestSessionSupervisor:
+    """Restart and cooldown of failing sessions."""
+
+    def test_failed_session_restarted(self, supervisor: SessionSupervisor) -> None:
+        """A crash fails the request; the next request gets a restarted session."""
+        cli = _FakeSessionCLI()
+
+        with pytest.raises(ModeratorSessionError):
+            supervisor.moderate("todo_validator", cli, None, _config(), "CRASH")
+        output, metadata = supervisor.moderate("todo_validator", cli, None, _config(), "diff")
+
+        assert _answer(output)["messages"] == "1"
+        assert metadata["moderator_session"]["restarts"] == 1
+
+    def test_repeated_failures_cool_down(self, supervisor: SessionSupervisor) -> None:
+        """After max_failures consecutive failures the session stays down."""
+        cli = _FakeSessionCLI()
+        for _ in range(supervisor.max_failures):
+            with pytest.raises(ModeratorSessionError):
+                supervisor.moderate("todo_validator", cli, None, _config(), "CRASH")
+
+        with pytest.raises(ModeratorSessionError, match="cooling down"):
+            supervisor.moderate("todo_validator", cli, None, _config(), "diff")
+
+
+class TestModeratorSessionDaemon:
+    """Daemon and client over a unix socket."""
+
+    @pytest.fixture
+    def daemon(self, monkeypatch: pytest.MonkeyPatch, supervisor: SessionSupervisor) -> Iterator[ModeratorSessionDaemon]:
+        """Run a daemon with the fake provider on a short-path socket."""
+        monkeypatch.setattr("scripts.agents.moderator_session_daemon.get_agent_cli", lambda _config: _FakeSessionCLI())
+        with tempfile.TemporaryDirectory(prefix="ami") as socket_dir:
+            socket_path = Path(socket_dir) / "m.sock"
+            monkeypatch.setenv(SOCKET_ENV_VAR, str(socket_path))
+            server = ModeratorSessionDaemon(socket_path, supervisor=supervisor)
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                yield server
+            finally:
+                server.shutdown()
+                server.server_close()
+                thread.join()
+
+    def test_request_answered_in_session(self, daemon: ModeratorSessionDaemon) -> None:
+        """The client gets the session's output and metadata."""
+        result: Any = request_moderation("todo_validator", "diff", "test", ["WebSearch"], None, 30)
+
+        assert result is not None
+        output, metadata = result
+        assert output.startswith('{"type": "assistant"')
+        assert metadata["moderator_session"]["requests"] == 1
+
+    def test_client_returns_none_on_failure(self, daemon: ModeratorSessionDaemon) -> None:
+        """Session errors make the client fall back (None)."""
+        assert request_moderation("todo_validator", "CRASH", "test", None, None, 30) is None
+
+    def test_warm_request_answered_on_pool_process(self, daemon: ModeratorSessionDaemon, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Warm requests are answered on a process of the daemon's pool, returning at the decision."""
+        pool = WarmPool(size=0)
+        monkeypatch.setattr("scripts.agents.moderator_session_daemon.get_warm_pool", lambda: pool)
+        try:
+            result: Any = request_warm_run("audit_diff", "diff", "test", None, None, 30)
+        finally:
+            pool.shutdown()
+
+        assert result is not None
+        output, metadata = result
+        assert _answer(output)["messages"] == "1"
+        assert metadata["warm_pool"] == "miss"
+        assert metadata["early_decision"] == "ALLOW"
+
+    def test_warm_request_without_pool(self, daemon: ModeratorSessionDaemon, monkeypatch: pytest.MonkeyPatch) -> None:
+        """With the warm pool disabled the client falls back (None)."""
+        monkeypatch.setattr("scripts.agents.moderator_session_daemon.get_warm_pool", lambda: None)
+
+        assert request_warm_run("audit_diff", "diff", "test", None, None, 30) is None
+
+    def test_socket_in_shared_directory_ignored(self, daemon: ModeratorSessionDaemon) -> None:
+        """A socket in a directory others can write to is not trusted - the client falls back."""
+        daemon.socket_path.parent.chmod(0o777)
+
+        assert request_moderation("todo_validator", "diff", "test", None, None, 30) is None
+
+    def test_client_returns_none_without_daemon(self, tmp_path: Path) -> None:
+        """No socket - no daemon."""
+        assert request_moderation("todo_validator", "diff", "test", None, None, 30, socket_path=tmp_path / "missing.sock") is None
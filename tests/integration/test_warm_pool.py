@@ -0,0 +1,180 @@
+"""Warm pool of pre-started CLI processes.
+
+Runs a fake CLI that answers each stream-json request line with an assistant and a result
+event, naming its pid and how many requests it has answered, and exits at stdin EOF.
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from scripts.agents.cli import warm_pool
+from scripts.agents.cli.config import AgentConfig
+from scripts.agents.cli.exceptions import AgentExecutionError
+from scripts.agents.cli.warm_pool import (
+    ISOLATION_SESSION,
+    WarmPool,
+    get_warm_pool,
+    shutdown_warm_pool,
+    user_message,
+)
+
+# Test constants
+REFILL_WAIT_SECONDS = 5
+FAILED_EXIT_CODE = 3
+
+FAKE_CLI = (
+    "import json, os, sys\n"
+    "for count, line in enumerate(sys.stdin, 1):\n"
+    "    text = json.loads(line)['message']['content'][0]['text']\n"
+    "    answer = f'ALLOW: pid={os.getpid()} n={count} text={text}'\n"
+    "    content = [{'type': 'text', 'text': answer}]\n"
+    "    print(json.dumps({'type': 'assistant', 'message': {'content': content, 'stop_reason': 'end_turn'}}), flush=True)\n"
+    "    print(json.dumps({'type': 'result', 'subtype': 'success'}), flush=True)\n"
+)
+
+
+def _config(stop_on_decision: bool = True) -> AgentConfig:
+    """Moderator-like config."""
+    return AgentConfig(model="test", session_id="warm-pool", enable_hooks=False, enable_streaming=True, timeout=60, stop_on_decision=stop_on_decision)
+
+
+def _global_config() -> MagicMock:
+    """Global config whose lookups return defaults (processes run as the current user)."""
+    config = MagicMock()
+    config.get.side_effect = lambda key, default=None: default
+    return config
+
+
+def _answer(output: str) -> str:
+    """Answer text of the assistant event."""
+    event = json.loads(output.splitlines()[0])
+    return str(event["message"]["content"][0]["text"])
+
+
+def _wait_for_idle(pool: WarmPool, count: int) -> None:
+    """Wait until the background refill has started count idle processes."""
+    deadline = time.time() + REFILL_WAIT_SECONDS
+    while pool.stats()["idle"] < count and time.time() < deadline:
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def pools() -> Any:
+    """Track pools and shut them down after the test."""
+    created: list[WarmPool] = []
+    yield created
+    for pool in created:
+        pool.shutdown()
+
+
+class TestWarmPool:
+    """WarmPool.run() with a fake stream-json input CLI."""
+
+    def test_second_request_uses_prestarted_process(self, pools: list[WarmPool]) -> None:
+        """A miss starts a process and refills the pool; the next request is a hit on a fresh process."""
+        pool = WarmPool(size=1)
+        pools.append(pool)
+        cmd = [sys.executable, "-c", FAKE_CLI]
+
+        first, metadata = pool.run(cmd, user_message("Decide.", "context"), None, _config(), _global_config())
+        _wait_for_idle(pool, 1)
+        second, second_metadata = pool.run(cmd, user_message("Decide.", "context"), None, _config(), _global_config())
+
+        assert _answer(first).endswith("n=1 text=context\nDecide.")
+        assert _answer(second).split()[1] != _answer(first).split()[1]  # Process isolation: another pid
+        assert metadata is not None and metadata["warm_pool"] == "miss"
+        assert second_metadata is not None and second_metadata["warm_pool"] == "hit"
+        assert second_metadata["early_decision"] == "ALLOW"
+        assert {"spawned", "first_byte", "decision"} <= set(second_metadata["lifecycle"])
+        stats = pool.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+    def test_session_isolation_reuses_process(self, pools: list[WarmPool]) -> None:
+        """With session isolation, one process answers up to max_uses requests."""
+        pool = WarmPool(size=1, isolation=ISOLATION_SESSION, max_uses=2)
+        pools.append(pool)
+        cmd = [sys.executable, "-c", FAKE_CLI]
+
+        first, _ = pool.run(cmd, user_message("one", None), None, _config(stop_on_decision=False), _global_config())
+        _wait_for_idle(pool, 1)
+        second, _ = pool.run(cmd, user_message("two", None), None, _config(stop_on_decision=False), _global_config())
+
+        first_pid, second_pid = _answer(first).split()[1], _answer(second).split()[1]
+        assert first_pid == second_pid
+        assert "n=2 text=two" in _answer(second)
+        assert pool.stats()["recycled"] == 1
+
+    def test_failed_process_raises(self, pools: list[WarmPool]) -> None:
+        """A process exiting with an error is reported like a fresh run."""
+        pool = WarmPool(size=0)
+        pools.append(pool)
+        cmd = [sys.executable, "-c", f"import sys; sys.stdin.read(); print('no auth', file=sys.stderr); sys.exit({FAILED_EXIT_CODE})"]
+
+        with pytest.raises(AgentExecutionError) as exc_info:
+            pool.run(cmd, user_message("Decide.", None), None, _config(), _global_config())
+
+        assert exc_info.value.exit_code == FAILED_EXIT_CODE
+        assert "no auth" in exc_info.value.stderr
+
+    def test_stats_flushed_to_shared_file(self, tmp_path: Path) -> None:
+        """Counters are added to the stats file at shutdown."""
+        stats_path = tmp_path / "warm-pool-stats.json"
+        stats_path.write_text(json.dumps({"hits": 2, "misses": 1}))
+        pool = WarmPool(size=0, stats_path=stats_path)
+        pool.counters["hits"] = 1
+
+        pool.shutdown()
+
+        assert json.loads(stats_path.read_text()) == {"hits": 3, "misses": 1, "spawned": 0, "recycled": 0}
+
+
+@pytest.fixture
+def shared_pool(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Any:
+    """Fresh process-wide pool state with the warm pool enabled in config; yields the settings."""
+    monkeypatch.setattr(warm_pool._SharedPool, "pool", None)
+    monkeypatch.setattr(warm_pool._SharedPool, "settings", None)
+    settings: dict[str, Any] = {"agent.warm_pool.enabled": True, "agent.warm_pool.size": 0}
+    config = MagicMock(root=tmp_path)
+    config.get.side_effect = lambda key, default=None: settings.get(key, default)
+    with patch("scripts.agents.cli.warm_pool.get_config", return_value=config):
+        yield settings
+        shutdown_warm_pool()
+
+
+class TestSharedPool:
+    """Process-wide pool of get_warm_pool()."""
+
+    def test_reused_until_config_changes(self, shared_pool: dict[str, Any]) -> None:
+        """The same pool serves the process; a changed configuration shuts it down and replaces it."""
+        pool = get_warm_pool()
+        assert pool is not None
+        assert get_warm_pool() is pool
+
+        shared_pool["agent.warm_pool.max_uses"] = 1
+        replacement = get_warm_pool()
+
+        assert replacement is not None
+        assert replacement is not pool
+        assert pool._closed
+
+    def test_shutdown_replaces_pool(self, shared_pool: dict[str, Any]) -> None:
+        """A shut down pool (daemon stopping) is closed; the next lookup starts a new one."""
+        pool = get_warm_pool()
+        assert pool is not None
+
+        shutdown_warm_pool()
+
+        assert pool._closed
+        assert get_warm_pool() not in {None, pool}
+
+    def test_disabled_in_config(self, shared_pool: dict[str, Any]) -> None:
+        """Without agent.warm_pool.enabled there is no pool."""
+        shared_pool["agent.warm_pool.enabled"] = False
+
+        assert get_warm_pool() is None
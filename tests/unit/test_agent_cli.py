@@ -146,6 +146,13 @@ class TestClaudeAgentCLI:
         # Should be sorted
         assert result == sorted(result)
 
+    def test_run_print_without_instruction(self):
+        """run_print() raises when neither instruction nor instruction_file is given."""
+        with pytest.raises(ValueError) as exc_info:
+            ClaudeAgentCLI().run_print()
+
+        assert "instruction cannot be None" in str(exc_info.value)
+
     def test_load_instruction_from_file(self):
         """load_instruction_with_replacements() reads file."""
         with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
@@ -227,6 +227,22 @@ class TestCreateSettingsFile:
 
         result.unlink()
 
+    def test_server_hooks_use_hook_client(self, mock_hooks_file: Path) -> None:
+        """Hooks run through the resident-server client when hooks.server is enabled."""
+        config = Mock()
+        config.root = mock_hooks_file.parent
+        config.get.return_value = {"file": "hooks.yaml", "server": True}
+
+        result = create_settings_file_from_hooks_config(config)
+
+        with result.open() as f:
+            settings = json.load(f)
+
+        inner_hook = settings["hooks"]["PreToolUse"][0]["hooks"][0]
+        assert inner_hook["command"].endswith("scripts/agents/hook_client.py --hook bash-guard")
+
+        result.unlink()
+
     def test_raises_error_if_hooks_file_not_found(self) -> None:
         """Raises RuntimeError if hooks file doesn't exist."""
         config = Mock()
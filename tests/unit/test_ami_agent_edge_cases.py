@@ -11,10 +11,10 @@ from scripts.agents.cli.config import AgentConfig, AgentConfigPresets
 from scripts.agents.cli.config_service import ConfigService
 from scripts.agents.cli.exceptions import AgentError, AgentTimeoutError
 from scripts.agents.cli.factory import get_agent_cli
+from scripts.agents.cli.hook_mode import mode_hook
 from scripts.agents.cli.mode_handlers import (
     mode_audit,
     mode_docs,
-    mode_hook,
     mode_interactive_editor,
     mode_print,
     mode_query,
@@ -0,0 +1,112 @@
+"""Unit tests for the transcript corpus token analyzer."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+import scripts.agents.analyze_transcript_tokens as analyzer
+from scripts.agents.transcript import format_messages_for_prompt, get_last_n_messages
+
+# Test constants
+MESSAGE_COUNT = 12
+TRANSCRIPT_COUNT = 3
+
+
+class FakeEncoding:
+    """Encoding stand-in: one token per whitespace-separated word."""
+
+    def encode(self, text: str) -> list[str]:
+        return text.split()
+
+    def encode_batch(self, texts: list[str], num_threads: int = 1) -> list[list[str]]:
+        return [self.encode(text) for text in texts]
+
+
+def _write_transcript(path: Path, count: int) -> None:
+    """Write a transcript with alternating user/assistant messages."""
+    with path.open("w") as f:
+        for i in range(count):
+            msg_type = "user" if i % 2 == 0 else "assistant"
+            text = f"message {i} " + "word " * i
+            content: str | list[dict[str, str]] = text if msg_type == "user" else [{"type": "text", "text": text}]
+            f.write(json.dumps({"type": msg_type, "message": {"content": content}, "timestamp": "2025-01-01T00:00:00Z"}) + "\n")
+
+
+@pytest.fixture(autouse=True)
+def fake_encoding(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Use the whitespace tokenizer (additive across message blocks)."""
+    monkeypatch.setattr(analyzer, "get_encoding", FakeEncoding)
+    analyzer._wrapper_tokens.cache_clear()
+
+
+class TestAnalyzeTranscript:
+    """Tests for analyze_transcript() and analyze_corpus()."""
+
+    def test_batched_count_matches_full_context(self, tmp_path: Path) -> None:
+        """Summed per-message counts equal tokenizing the whole formatted transcript."""
+        transcript = tmp_path / "t.jsonl"
+        _write_transcript(transcript, MESSAGE_COUNT)
+
+        result = analyzer.analyze_transcript(transcript)
+
+        expected = len(format_messages_for_prompt(get_last_n_messages(transcript, MESSAGE_COUNT)).split())
+        assert result["tokens"] == expected
+        assert result["messages"] == MESSAGE_COUNT
+
+    def test_empty_transcript(self, tmp_path: Path) -> None:
+        """Transcripts without messages report zero tokens."""
+        transcript = tmp_path / "t.jsonl"
+        transcript.write_text("")
+
+        assert analyzer.analyze_transcript(transcript)["tokens"] == 0
+
+    def test_corpus_reports_failures(self, tmp_path: Path) -> None:
+        """Unreadable transcripts are reported as errors, not raised."""
+        paths = [tmp_path / f"t{i}.jsonl" for i in range(TRANSCRIPT_COUNT)]
+        for path in paths[:-1]:
+            _write_transcript(path, MESSAGE_COUNT)
+
+        results = list(analyzer.analyze_corpus(paths, workers=1))
+
+        assert [path for path, _, _ in results] == paths
+        assert all(analysis for _, analysis, _ in results[:-1])
+        assert results[-1][1] is None
+        assert results[-1][2]
+
+
+class TestResultWriter:
+    """Tests for streamed per-file output."""
+
+    def test_jsonl_and_csv_rows(self, tmp_path: Path) -> None:
+        """Successful and failed rows are written in both formats."""
+        analysis = analyzer.TranscriptAnalysis(name="a.jsonl", tokens=10, messages=2, moderator_tokens=10)
+        jsonl_out, csv_out = io.StringIO(), io.StringIO()
+        for output, output_format in ((jsonl_out, "jsonl"), (csv_out, "csv")):
+            writer = analyzer.ResultWriter(output, output_format)
+            writer.write(tmp_path / "a.jsonl", analysis, None)
+            writer.write(tmp_path / "b.jsonl", None, "boom")
+
+        rows = [json.loads(line) for line in jsonl_out.getvalue().splitlines()]
+        assert rows[0]["tokens"] == analysis["tokens"]
+        assert rows[1]["error"] == "boom"
+        csv_rows = list(csv.DictReader(io.StringIO(csv_out.getvalue())))
+        assert csv_rows[0]["tokens"] == str(analysis["tokens"])
+        assert csv_rows[1]["error"] == "boom"
+
+
+class TestStatistics:
+    """Tests for percentile and histogram helpers."""
+
+    def test_percentiles(self) -> None:
+        """Inclusive percentiles of 1..101 are the values themselves."""
+        values = list(range(1, 102))
+        assert analyzer.percentiles(values, points=(50, 90)) == {50: 51.0, 90: 91.0}
+
+    def test_histogram_buckets(self) -> None:
+        """Values land in the first bucket whose bound they do not exceed."""
+        assert analyzer.histogram([5, 10, 11, 500], buckets=(10, 100)) == [("<= 10", 2), ("<= 100", 1), ("> 100", 1)]
@@ -0,0 +1,44 @@
+"""Unit tests for incremental line splitting of chunked process output."""
+
+from scripts.agents.cli.async_streaming import LineSplitter
+
+
+class TestLineSplitter:
+    """Lines are complete regardless of where chunks end."""
+
+    def test_lines_across_chunks(self) -> None:
+        """A line split over several chunks is returned once complete."""
+        splitter = LineSplitter()
+
+        assert splitter.feed(b'{"type": "ass') == []
+        assert splitter.feed(b'istant"}\n{"type"') == ['{"type": "assistant"}\n']
+        assert splitter.feed(b': "result"}\n') == ['{"type": "result"}\n']
+        assert splitter.flush() == []
+
+    def test_several_lines_in_one_chunk(self) -> None:
+        """Every complete line of a chunk is returned, empty lines included."""
+        splitter = LineSplitter()
+
+        assert splitter.feed(b"one\n\ntwo\nthr") == ["one\n", "\n", "two\n"]
+        assert splitter.flush() == ["thr"]
+
+    def test_multibyte_character_split_between_chunks(self) -> None:
+        """A character whose bytes span two chunks is decoded intact."""
+        encoded = "ALLOW: Prüfung ✓\n".encode()
+        cut = encoded.index("✓".encode()) + 1
+        splitter = LineSplitter()
+
+        assert splitter.feed(encoded[:cut]) == []
+        assert splitter.feed(encoded[cut:]) == ["ALLOW: Prüfung ✓\n"]
+
+    def test_carriage_returns_and_line_separators_kept_inside_lines(self) -> None:
+        """Only newlines end lines (stream-json strings may hold other separators)."""
+        splitter = LineSplitter()
+
+        assert splitter.feed("a\rb\u2028c\r\n".encode()) == ["a\rb\u2028c\r\n"]
+
+    def test_invalid_bytes_replaced(self) -> None:
+        """Undecodable output does not fail the run."""
+        splitter = LineSplitter()
+
+        assert splitter.feed(b"bad \xff byte\n") == ["bad � byte\n"]
@@ -0,0 +1,165 @@
+"""Unit tests for the compiled Bash command matcher."""
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from scripts.agents.validation.command_matcher import CommandMatcher, extract_trigger, get_command_words, match_sequential
+
+# Test constants
+BASH_PATTERNS_PATH = Path(__file__).resolve().parents[2] / "scripts" / "config" / "patterns" / "bash_commands.yaml"
+SCALING_RULE_COUNTS = (40, 500)
+
+SAMPLE_COMMANDS = (
+    "ls -la",
+    "docker ps",
+    "python3 -c 'print(1)'",
+    "cat file.txt | python",
+    "python3 script.py",
+    "pip3 install requests",
+    "ami-uv sync",
+    "uv pip install x",
+    "scripts/ami-run -m pytest tests/",
+    "pytest tests/",
+    "/usr/bin/pytest -q",
+    "ami-ruff check",
+    "ruff check .",
+    "cat > out.txt",
+    "echo hi > out.txt",
+    "echo hi",
+    "tee log.txt",
+    "git commit --no-verify",
+    "git commit -m 'x'",
+    "git commit-tree abc",
+    "git log --oneline",
+    "git push origin main",
+    "git status && git reset --hard",
+    "  cd /tmp",
+    "abcd /tmp",
+    "git rm --cached file",
+    "sleep 1 &",
+    "make && make test",
+    "true; false",
+    "a || b",
+    "ls >> log",
+    "sed -i s/a/b/ f",
+    "awkward name",
+    "wget http://example.com",
+    "node index.js",
+    "kill -9 1",
+    "killall x",
+    "sudo ls",
+    "git update-index --chmod=+x f",
+    "chmod +x f",
+    "chown root f",
+    "ödocker run",
+    "",
+)
+
+
+def _load_bash_rules() -> list[dict[str, str]]:
+    """Load deny rules from the repository's bash_commands.yaml."""
+    with BASH_PATTERNS_PATH.open() as f:
+        rules: list[dict[str, str]] = yaml.safe_load(f)["deny_patterns"]
+    return rules
+
+
+class TestExtractTrigger:
+    """Trigger literal extraction from regex patterns."""
+
+    @pytest.mark.parametrize(
+        ("pattern", "expected"),
+        [
+            (r"\bdocker\b", ("word", "docker")),
+            (r"\bpython3?\b", ("word", "python")),
+            (r"(?<!ami-)\buv\s+", ("word", "uv")),
+            (r"(?<![/\w])pytest\s+", ("word", "pytest")),
+            (r"\|\s*python3?\b", ("char", "|")),
+            (r"&(?!&)", ("char", "&")),
+            (r"--no-verify", ("char", "-")),
+            (r"^\s*cd\b", None),
+            (r"cat|dog", None),
+            (r"(?i)\bsudo\b", None),
+            (r"a?b", None),
+        ],
+    )
+    def test_extract_trigger(self, pattern: str, expected: tuple[str, str] | None) -> None:
+        """Triggers are derived only where every match must contain them."""
+        assert extract_trigger(pattern) == expected
+
+
+class TestCommandMatcher:
+    """CommandMatcher behaves like the sequential re.search loop."""
+
+    @pytest.mark.parametrize("command", SAMPLE_COMMANDS)
+    def test_matches_sequential_loop(self, command: str) -> None:
+        """First matching rule equals the sequential loop's over bash_commands.yaml."""
+        rules = _load_bash_rules()
+
+        assert CommandMatcher(rules).match(command) == match_sequential(rules, command)
+
+    def test_first_rule_wins(self) -> None:
+        """Earlier rules win even when indexed under a different trigger."""
+        rules = [{"pattern": r";", "message": "first"}, {"pattern": r"\bgit\b", "message": "second"}]
+
+        result = CommandMatcher(rules).match("git status; ls")
+
+        assert result is not None
+        assert result["message"] == "first"
+
+    def test_command_rule_matches_command_word(self) -> None:
+        """command rules match command words, not arguments."""
+        matcher = CommandMatcher([{"command": "sudo", "message": "no sudo"}])
+
+        assert matcher.match("FOO=1 /usr/bin/sudo ls") is not None
+        assert matcher.match("ls && env sudo ls") is not None
+        assert matcher.match("grep sudo /etc/group") is None
+
+    def test_confirmations_constant_as_rules_grow(self) -> None:
+        """Regex evaluations per call do not grow with the number of non-matching rules."""
+        confirmations = []
+        for count in SCALING_RULE_COUNTS:
+            rules = [{"pattern": rf"\bforbidden{i}\b", "message": str(i)} for i in range(count)]
+            matcher = CommandMatcher(rules)
+            assert matcher.match("scripts/ami-run scripts/agents/cli/main.py --hook command-guard") is None
+            confirmations.append(matcher.confirmations)
+
+        assert confirmations == [0, 0]
+
+
+class TestGetCommandWords:
+    """Shell tokenization for command rules."""
+
+    def test_collects_command_words(self) -> None:
+        """Command words are taken from every simple command."""
+        assert get_command_words("FOO=1 git status && ls | /bin/grep x; exec sudo id") == {"git", "ls", "grep", "exec", "sudo"}
+
+    @pytest.mark.parametrize(
+        "command",
+        [
+            "{ sudo id; }",
+            "if true; then sudo id; fi",
+            "while true; do sudo id; done",
+            "echo `sudo id`",
+            'echo "$(sudo id)"',
+            "env -i sudo id",
+            "env -u HOME sudo id",
+            "env -S 'sudo id'",
+            "!sudo id",
+            "! sudo id",
+            "time -p sudo id",
+        ],
+    )
+    def test_command_word_in_compound_forms(self, command: str) -> None:
+        """Group braces, reserved words, substitutions, negation and prefix options are followed."""
+        assert "sudo" in get_command_words(command)
+
+    def test_keywords_and_arguments_are_not_command_words(self) -> None:
+        """Reserved words, loop variables and quoted text are not taken for commands."""
+        assert get_command_words("for sudo in a b; do echo $sudo; done") == {"echo"}
+        assert get_command_words('echo "a `id` b"') == {"echo", "id"}
+
+    def test_unbalanced_quotes_fall_back(self) -> None:
+        """Unbalanced quotes still yield the command word."""
+        assert "echo" in get_command_words("echo 'unterminated")
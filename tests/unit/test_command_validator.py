@@ -1,7 +1,7 @@
 """Unit tests for CommandValidator functionality."""
 
 # Import the implemented hooks functionality
-from scripts.agents.workflows.security_validators import CommandValidator
+from scripts.agents.workflows.command_validators import CommandValidator
 
 
 class TestCommandValidator:
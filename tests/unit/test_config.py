@@ -179,3 +179,27 @@ class TestConfig:
         assert config.root is not None
         assert isinstance(config.root, Path)
         assert config.root.is_absolute()
+
+    @pytest.mark.skipif(Config is None, reason="Config not implemented yet")
+    def test_reload_when_file_changes(self, temp_config_file, monkeypatch):
+        """reload_config_if_changed() re-reads an edited config file only."""
+        monkeypatch.setattr(config_module._ConfigSingleton, "instance", Config(config_file=temp_config_file))
+        assert not config_module.reload_config_if_changed()
+
+        temp_config_file.write_text(yaml.dump({"environment": "edited-and-longer"}))
+
+        assert config_module.reload_config_if_changed()
+        assert get_config().get("environment") == "edited-and-longer"
+        assert not config_module.reload_config_if_changed()
+
+    @pytest.mark.skipif(Config is None, reason="Config not implemented yet")
+    def test_reload_keeps_config_on_malformed_edit(self, temp_config_file, monkeypatch):
+        """A malformed edit raises and leaves the loaded config in place."""
+        config = Config(config_file=temp_config_file)
+        monkeypatch.setattr(config_module._ConfigSingleton, "instance", config)
+
+        temp_config_file.write_text("")
+
+        with pytest.raises(ValueError):
+            config_module.reload_config_if_changed()
+        assert get_config() is config
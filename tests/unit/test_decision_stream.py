@@ -0,0 +1,85 @@
+"""Unit tests for early-exit moderator decision recognition."""
+
+import json
+from typing import Any
+
+import pytest
+
+from scripts.agents.cli.decision_stream import DecisionRecognizer
+
+
+def _event(event_type: str, content: list[dict[str, Any]], stop_reason: str | None = None) -> str:
+    """Build one stream-json line."""
+    return json.dumps({"type": event_type, "message": {"content": content, "stop_reason": stop_reason}})
+
+
+def _text(text: str) -> dict[str, str]:
+    """Text content block."""
+    return {"type": "text", "text": text}
+
+
+class TestDecisionRecognizer:
+    """Decisions are recognized only when complete and final."""
+
+    @pytest.mark.parametrize(
+        ("text", "decision"),
+        [
+            ("ALLOW", "ALLOW"),
+            ("ALLOW: all tasks verified", "ALLOW"),
+            ("BLOCK: Todo claims tests pass but none were run", "BLOCK"),
+            ("```\nBLOCK: broadened exception handling\n```", "BLOCK"),
+            ("Checked the tool calls.\n\nALLOW", "ALLOW"),
+        ],
+    )
+    def test_well_formed_decision(self, text: str, decision: str) -> None:
+        """A final assistant message with a decision line ends the stream."""
+        recognizer = DecisionRecognizer()
+
+        assert recognizer.feed(_event("assistant", [_text(text)], "end_turn")) is True
+        assert recognizer.decision == decision
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "BLOCK:",
+            "BLOCK: ",
+            "I would allow this",
+            "The verdict is ALLOW",
+            "block: lower-case",
+        ],
+    )
+    def test_incomplete_or_inline_decision_waits(self, text: str) -> None:
+        """Reasonless BLOCK, inline mentions and lower-case decisions wait for process exit."""
+        recognizer = DecisionRecognizer()
+
+        assert recognizer.feed(_event("assistant", [_text(text)])) is False
+        assert recognizer.decision is None
+
+    def test_tool_turns_are_not_final(self) -> None:
+        """Assistant turns calling a tool never end the stream."""
+        recognizer = DecisionRecognizer()
+        tool_call = {"type": "tool_use", "name": "WebSearch", "input": {}}
+
+        assert recognizer.feed(_event("assistant", [_text("ALLOW"), tool_call])) is False
+        assert recognizer.feed(_event("assistant", [_text("ALLOW")], "tool_use")) is False
+        assert recognizer.feed(_event("assistant", [_text("BLOCK: unverified claim")], "end_turn")) is True
+
+    def test_other_events_ignored(self) -> None:
+        """System, user, result and non-JSON lines are skipped."""
+        recognizer = DecisionRecognizer()
+
+        assert recognizer.feed(json.dumps({"type": "system", "subtype": "init", "tools": ["ALLOW"]})) is False
+        assert recognizer.feed(_event("user", [_text("ALLOW")])) is False
+        assert recognizer.feed(json.dumps({"type": "result", "result": "ALLOW"})) is False
+        assert recognizer.feed('{"type": "assistant", "message": ') is False
+        assert recognizer.decision is None
+
+    def test_result_event_completes_turn(self) -> None:
+        """The result event marks the turn complete, also after the decision."""
+        recognizer = DecisionRecognizer()
+
+        assert recognizer.feed(_event("assistant", [_text("ALLOW")], "end_turn")) is True
+        assert recognizer.turn_complete is False
+        assert recognizer.feed(json.dumps({"type": "result", "subtype": "success"})) is True
+        assert recognizer.turn_complete is True
+        assert recognizer.decision == "ALLOW"
@@ -0,0 +1,75 @@
+"""Unit tests for LLM diff audit payloads."""
+
+from scripts.agents.validation.diff_payload import build_diff_context, scoped_ranges
+
+# Test constants
+SMALL_BUDGET = 20
+FILLER_FUNCTIONS = 40
+
+
+def _python_module(body_line: str) -> str:
+    """Build a module with imports, many filler functions and one class with a target method."""
+    filler = "".join(f"\n\ndef filler_{i}():\n    return {i}\n" for i in range(FILLER_FUNCTIONS))
+    return f'''import os
+from pathlib import Path
+{filler}
+
+class Target:
+    """Target class."""
+
+    limit = 3
+
+    def run(self):
+        value = os.getcwd()
+        {body_line}
+        return Path(value)
+
+    def other(self):
+        return None
+'''
+
+
+class TestBuildDiffContext:
+    """Full payloads within budget, scoped payloads above it."""
+
+    def test_small_file_sent_whole(self) -> None:
+        """Files within the budget keep the full OLD/NEW payload."""
+        payload = build_diff_context("a.py", "x = 1\n", "x = 2\n")
+
+        assert "## OLD CODE\n```\nx = 1\n\n```" in payload
+        assert "## DIFF" not in payload
+
+    def test_large_python_file_scoped_to_method(self) -> None:
+        """A one-line change sends the diff, imports and the enclosing method only."""
+        old = _python_module("value = value.strip()")
+        new = _python_module("value = value.upper()")
+
+        payload = build_diff_context("/repo/mod.py", old, new, context_budget_lines=SMALL_BUDGET)
+
+        assert "## DIFF" in payload
+        assert "-        value = value.strip()" in payload
+        assert "+        value = value.upper()" in payload
+        assert "| import os" in payload
+        assert "| from pathlib import Path" in payload
+        assert "|     def run(self):" in payload
+        assert "|         return Path(value)" in payload
+        assert "|     def other(self):" not in payload
+        assert "filler_" not in payload
+        assert "unchanged, omitted" in payload
+        assert len(payload) < len(old) + len(new)
+
+    def test_broken_python_uses_indentation(self) -> None:
+        """Python that does not parse falls back to the indentation heuristic."""
+        lines = ["import os", "", "def broken(:", "    a = 1", "    b = 2", "", "def other():", "    pass"]
+
+        ranges = scoped_ranges("x.py", "\n".join(lines), [4])
+
+        assert ranges == [(1, 1), (3, 6)]
+
+    def test_brace_language_includes_closing_brace(self) -> None:
+        """Non-Python files use indentation and keep the block's closing brace."""
+        lines = ['#include "a.h"', "", "int f() {", "  return 1;", "}", "", "int g() {", "  return 2;", "}"]
+
+        ranges = scoped_ranges("x.c", "\n".join(lines), [4])
+
+        assert ranges == [(1, 1), (3, 5)]
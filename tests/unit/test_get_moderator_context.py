@@ -0,0 +1,138 @@
+"""Unit tests for the moderator context memo shared by hook processes (get_moderator_context())."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import scripts.agents.workflows.core as core_module
+from scripts.agents.context_memo import CONTEXT_MEMO_SUFFIX, MAX_CONTEXT_VARIANTS, ContextMemo
+from scripts.agents.moderator_checkpoint import ModeratorCheckpoint
+from scripts.agents.transcript_client import SOCKET_ENV_VAR
+from scripts.agents.workflows.core import get_moderator_context, prepare_moderator_context
+
+# Test constants
+MESSAGE_COUNT = 20
+TWO_BUILDS = 2
+
+
+def _write_transcript(path: Path, count: int) -> None:
+    """Write a transcript with alternating user/assistant messages."""
+    with path.open("w") as f:
+        for i in range(count):
+            msg_type = "user" if i % 2 == 0 else "assistant"
+            text = f"message {i} "
+            content: str | list[dict[str, str]] = text if msg_type == "user" else [{"type": "text", "text": text}]
+            f.write(json.dumps({"type": msg_type, "message": {"content": content}, "timestamp": "2025-01-01T00:00:00Z"}) + "\n")
+
+
+@pytest.fixture(autouse=True)
+def no_daemon(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Compute contexts locally even if a transcript daemon is running."""
+    monkeypatch.setenv(SOCKET_ENV_VAR, str(tmp_path / "missing.sock"))
+
+
+@pytest.fixture
+def builds(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    """Record every context build behind the memo."""
+    calls: list[Path] = []
+    prepare = core_module.prepare_moderator_context
+
+    def counting_prepare(transcript_path: Path, todos: list[dict[str, Any]] | None = None, checkpoint: ModeratorCheckpoint | None = None) -> str:
+        calls.append(transcript_path)
+        return prepare(transcript_path, todos=todos, checkpoint=checkpoint)
+
+    monkeypatch.setattr(core_module, "prepare_moderator_context", counting_prepare)
+    return calls
+
+
+class TestGetModeratorContext:
+    """Tests for get_moderator_context()."""
+
+    def test_hooks_share_one_build(self, tmp_path: Path, builds: list[Path]) -> None:
+        """Requests for an unchanged transcript reuse the stored context (nothing is kept in-process)."""
+        transcript = tmp_path / "t.jsonl"
+        _write_transcript(transcript, MESSAGE_COUNT)
+
+        first = get_moderator_context(transcript)
+        second = get_moderator_context(transcript)
+
+        assert first == second
+        assert first.text == prepare_moderator_context(transcript)
+        assert first.tokens > 0
+        assert len(builds) == 1
+        assert transcript.with_name(transcript.name + CONTEXT_MEMO_SUFFIX).exists()
+
+    def test_transcript_change_rebuilds(self, tmp_path: Path, builds: list[Path]) -> None:
+        """Appending to the transcript invalidates the stored context."""
+        transcript = tmp_path / "t.jsonl"
+        _write_transcript(transcript, MESSAGE_COUNT)
+        get_moderator_context(transcript)
+
+        _write_transcript(transcript, MESSAGE_COUNT + 1)
+
+        assert f"message {MESSAGE_COUNT} " in get_moderator_context(transcript).text
+        assert len(builds) == TWO_BUILDS
+
+    def test_todos_are_part_of_key(self, tmp_path: Path, builds: list[Path]) -> None:
+        """Different todo lists get their own context."""
+        transcript = tmp_path / "t.jsonl"
+        _write_transcript(transcript, MESSAGE_COUNT)
+        todos = [{"content": "Ship memo", "status": "in_progress", "activeForm": "Shipping memo"}]
+
+        plain = get_moderator_context(transcript)
+        with_todos = get_moderator_context(transcript, todos=todos)
+
+        assert "Ship memo" not in plain.text
+        assert "Ship memo" in with_todos.text
+        assert get_moderator_context(transcript, todos=[dict(reversed(todos[0].items()))]) == with_todos
+        assert get_moderator_context(transcript) == plain
+        assert len(builds) == TWO_BUILDS
+
+    def test_unwritable_store_still_returns_context(self, tmp_path: Path, builds: list[Path]) -> None:
+        """A store that cannot be written only costs rebuilds."""
+        transcript = tmp_path / "t.jsonl"
+        _write_transcript(transcript, MESSAGE_COUNT)
+        transcript.with_name(transcript.name + CONTEXT_MEMO_SUFFIX).mkdir()
+
+        assert get_moderator_context(transcript).text == get_moderator_context(transcript).text
+        assert len(builds) == TWO_BUILDS
+
+
+class TestContextMemo:
+    """Tests for the sidecar store."""
+
+    def test_variants_capped_oldest_first(self, tmp_path: Path) -> None:
+        """Only the newest variants of a transcript state are kept."""
+        transcript = tmp_path / "t.jsonl"
+        transcript.write_text("")
+        memo = ContextMemo(transcript, transcript.stat())
+        keys = [f"k{i}" for i in range(MAX_CONTEXT_VARIANTS + 1)]
+        for key in keys:
+            memo.put(key, key)
+
+        assert memo.get(keys[0]) is None
+        assert all(memo.get(key) == key for key in keys[1:])
+
+    def test_corrupt_store_is_empty(self, tmp_path: Path) -> None:
+        """An unreadable store counts as empty and is replaced on the next put."""
+        transcript = tmp_path / "t.jsonl"
+        transcript.write_text("")
+        transcript.with_name(transcript.name + CONTEXT_MEMO_SUFFIX).write_text("{not json")
+        memo = ContextMemo(transcript, transcript.stat())
+
+        assert memo.get("k") is None
+        memo.put("k", "context")
+        assert memo.get("k") == "context"
+
+    def test_store_private(self, tmp_path: Path) -> None:
+        """Contexts quote the conversation - the store is readable by its owner only."""
+        transcript = tmp_path / "t.jsonl"
+        transcript.write_text("")
+        ContextMemo(transcript, transcript.stat()).put("k", "context")
+
+        assert os.stat(transcript.with_name(transcript.name + CONTEXT_MEMO_SUFFIX)).st_mode & 0o077 == 0
@@ -0,0 +1,108 @@
+"""Unit tests for the resident hook server and its thin client."""
+
+from __future__ import annotations
+
+import json
+import socket
+import tempfile
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+import scripts.agents.user_socket as user_socket_module
+import scripts.agents.workflows.registry as registry_module
+from scripts.agents.hook_client import forward_hook, is_server_listening
+from scripts.agents.hook_server import HookServer
+from scripts.agents.workflows.core import HookInput, HookResult, HookValidator
+
+# Test constants
+HOOK_NAME = "test-deny"
+OTHER_UID = 1_000_000
+SOCKET_MODE = 0o600
+
+# The test server runs in a thread; forked request handlers never touch the test's threads
+pytestmark = pytest.mark.filterwarnings("ignore:This process .* is multi-threaded:DeprecationWarning")
+
+
+class DenyingValidator(HookValidator):
+    """Denies every tool call, naming the tool."""
+
+    def validate(self, hook_input: HookInput) -> HookResult:
+        """Deny with the tool name as reason."""
+        return HookResult.deny(f"denied {hook_input.tool_name}")
+
+
+def _hook_input(tool_name: str) -> str:
+    """Build a PreToolUse hook input line."""
+    return json.dumps({"session_id": "s1", "hook_event_name": "PreToolUse", "tool_name": tool_name, "tool_input": {}})
+
+
+@pytest.fixture
+def socket_path() -> Iterator[Path]:
+    """Short socket path (unix socket paths are limited to ~100 characters)."""
+    with tempfile.TemporaryDirectory(prefix="ami") as socket_dir:
+        yield Path(socket_dir) / "h.sock"
+
+
+@pytest.fixture
+def server(socket_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[HookServer]:
+    """Run a hook server with a test validator registered."""
+    monkeypatch.setitem(registry_module.HOOK_VALIDATORS, HOOK_NAME, f"{__name__}:DenyingValidator")
+    hook_server = HookServer(socket_path)
+    thread = threading.Thread(target=hook_server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield hook_server
+    finally:
+        hook_server.shutdown()
+        hook_server.server_close()
+        thread.join()
+
+
+class TestHookServer:
+    """Tests for forwarding hooks to the resident server."""
+
+    def test_relays_validator_output(self, server: HookServer, socket_path: Path) -> None:
+        """Output matches running the validator in-process."""
+        output = forward_hook(HOOK_NAME, _hook_input("Bash"), socket_path)
+
+        assert output == DenyingValidator().handle(_hook_input("Bash"))
+        assert "denied Bash" in output
+
+    def test_unknown_hook_falls_back(self, server: HookServer, socket_path: Path) -> None:
+        """Unknown validators are reported as failures, so the client runs in-process."""
+        assert forward_hook("no-such-hook", _hook_input("Bash"), socket_path) is None
+
+    def test_socket_removed_on_close(self, socket_path: Path) -> None:
+        """Closing the server removes its socket."""
+        hook_server = HookServer(socket_path)
+        assert socket_path.stat().st_mode & 0o777 == SOCKET_MODE
+
+        hook_server.server_close()
+
+        assert not socket_path.exists()
+
+    def test_no_server(self, socket_path: Path) -> None:
+        """Without a server the client reports unavailable."""
+        assert forward_hook(HOOK_NAME, _hook_input("Bash"), socket_path) is None
+        assert not is_server_listening(socket_path)
+
+    def test_server_of_another_user_ignored(self, socket_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A server running as another user is not trusted, so the client runs in-process."""
+        monkeypatch.setattr(user_socket_module, "get_peer_uid", lambda _sock: OTHER_UID)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+            listener.bind(str(socket_path))
+            listener.listen()
+
+            assert forward_hook(HOOK_NAME, _hook_input("Bash"), socket_path) is None
+
+    def test_shared_socket_directory_refused(self, tmp_path: Path) -> None:
+        """The server does not bind in a directory other users can write to."""
+        shared = tmp_path / "shared"
+        shared.mkdir()
+        shared.chmod(0o777)
+
+        with pytest.raises(PermissionError):
+            HookServer(shared / "h.sock")
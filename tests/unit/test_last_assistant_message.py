@@ -0,0 +1,75 @@
+"""Unit tests for get_last_assistant_message()."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from scripts.agents.validation.response_basic_utils import _get_last_assistant_message_memo, get_last_assistant_message
+
+# Test constants
+MESSAGE_COUNT = 50
+
+
+def _assistant_line(*texts: str) -> str:
+    """Build an assistant record with one text block per text (plus a tool_use block)."""
+    content = [{"type": "text", "text": text} for text in texts]
+    content.append({"type": "tool_use", "name": "Read", "input": {}})
+    return json.dumps({"type": "assistant", "message": {"role": "assistant", "content": content}}) + "\n"
+
+
+def _user_line(text: str) -> str:
+    """Build a user record."""
+    return json.dumps({"type": "user", "message": {"role": "user", "content": text}}) + "\n"
+
+
+def _forward_reference(transcript_path: Path) -> str:
+    """Full forward scan (previous implementation)."""
+    last_text = ""
+    for line in transcript_path.read_text().splitlines():
+        msg = json.loads(line)
+        if msg.get("type") == "assistant":
+            for content in msg.get("message", {}).get("content", []):
+                if content.get("type") == "text":
+                    last_text = content.get("text", "")
+    return last_text
+
+
+class TestGetLastAssistantMessage:
+    """Tests for the reverse scan and its memo."""
+
+    def test_matches_forward_scan(self, tmp_path: Path) -> None:
+        """Trailing tool-only and user records are skipped; the last text block wins."""
+        transcript = tmp_path / "t.jsonl"
+        with transcript.open("w") as f:
+            for i in range(MESSAGE_COUNT):
+                f.write(_user_line(f"question {i} mentions assistant"))
+                f.write(_assistant_line(f"first {i}", f"answer {i}"))
+            f.write(_assistant_line())
+            f.write(_user_line("tool result"))
+
+        assert get_last_assistant_message(transcript) == _forward_reference(transcript) == f"answer {MESSAGE_COUNT - 1}"
+
+    def test_no_assistant_text(self, tmp_path: Path) -> None:
+        """Transcripts without assistant text return an empty string."""
+        transcript = tmp_path / "t.jsonl"
+        transcript.write_text(_user_line("hello") + "not json\n")
+
+        assert get_last_assistant_message(transcript) == ""
+
+    def test_memo_invalidated_on_append(self, tmp_path: Path) -> None:
+        """Unchanged transcripts hit the memo; appended ones are rescanned."""
+        transcript = tmp_path / "t.jsonl"
+        transcript.write_text(_assistant_line("old"))
+        _get_last_assistant_message_memo.cache_clear()
+
+        assert get_last_assistant_message(transcript) == "old"
+        assert get_last_assistant_message(transcript) == "old"
+        assert _get_last_assistant_message_memo.cache_info().hits == 1
+
+        with transcript.open("a") as f:
+            f.write(_assistant_line("new"))
+        stat = transcript.stat()
+        os.utime(transcript, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        assert get_last_assistant_message(transcript) == "new"
@@ -0,0 +1,147 @@
+"""Unit tests for validated-prefix moderator checkpoints."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+import scripts.agents.workflows.core as core_module
+from scripts.agents.moderator_checkpoint import (
+    MAX_CHECKPOINT_REQUESTS,
+    MAX_CHECKPOINT_SUMMARIES,
+    format_checkpoint_summary,
+    get_checkpoint_path,
+    load_checkpoint,
+    read_checkpoint_anchor,
+    save_checkpoint,
+)
+from scripts.agents.token_cache import clear_memory_cache
+from scripts.agents.transcript import format_messages_for_prompt, get_last_n_messages
+from scripts.agents.transcript_client import SOCKET_ENV_VAR
+from scripts.agents.workflows.core import prepare_moderator_context
+
+# Test constants
+MESSAGE_COUNT = 20
+NEW_MESSAGE_COUNT = 3
+
+
+def _append_messages(path: Path, start: int, count: int) -> None:
+    """Append alternating user/assistant messages."""
+    with path.open("a") as f:
+        for i in range(start, start + count):
+            msg_type = "user" if i % 2 == 0 else "assistant"
+            content: str | list[dict[str, str]] = f"message {i}" if msg_type == "user" else [{"type": "text", "text": f"message {i}"}]
+            f.write(json.dumps({"type": msg_type, "message": {"content": content}, "timestamp": f"2025-01-01T00:00:{i:02d}Z"}) + "\n")
+
+
+@pytest.fixture(autouse=True)
+def local_context(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Compute contexts locally with one token per character."""
+    monkeypatch.setenv(SOCKET_ENV_VAR, str(tmp_path / "missing.sock"))
+    monkeypatch.setattr(core_module, "count_tokens", len)
+    clear_memory_cache()
+
+
+class TestCheckpointStore:
+    """Tests for saving and loading checkpoints."""
+
+    def test_round_trip_keeps_recent_summaries(self, tmp_path: Path) -> None:
+        """Summaries accumulate across checkpoints, oldest dropped first."""
+        transcript = tmp_path / "t.jsonl"
+        _append_messages(transcript, 0, MESSAGE_COUNT)
+        anchor = read_checkpoint_anchor(transcript)
+        assert anchor
+
+        checkpoint = None
+        for i in range(MAX_CHECKPOINT_SUMMARIES + 2):
+            checkpoint = save_checkpoint(transcript, anchor, f"validated {i}", checkpoint)
+
+        loaded = load_checkpoint(transcript)
+        assert loaded == checkpoint
+        assert loaded["summaries"][0] == "validated 2"
+        assert len(loaded["summaries"]) == MAX_CHECKPOINT_SUMMARIES
+
+    def test_missing_or_malformed(self, tmp_path: Path) -> None:
+        """Unusable checkpoints and transcripts load as None."""
+        transcript = tmp_path / "t.jsonl"
+        assert load_checkpoint(transcript) is None
+        assert read_checkpoint_anchor(transcript) is None
+
+        get_checkpoint_path(transcript).write_text(json.dumps({"anchor": 1, "summaries": []}))
+        assert load_checkpoint(transcript) is None
+
+    def test_checkpoint_without_requests_ignored(self, tmp_path: Path) -> None:
+        """Checkpoints that do not carry the user's requests are not used."""
+        transcript = tmp_path / "t.jsonl"
+        _append_messages(transcript, 0, MESSAGE_COUNT)
+        get_checkpoint_path(transcript).write_text(json.dumps({"anchor": read_checkpoint_anchor(transcript), "summaries": ["validated"]}))
+
+        assert load_checkpoint(transcript) is None
+
+    def test_requests_up_to_anchor(self, tmp_path: Path) -> None:
+        """The user's requests up to the anchor are stored, tool results and later messages are not."""
+        transcript = tmp_path / "t.jsonl"
+        _append_messages(transcript, 0, NEW_MESSAGE_COUNT)
+        with transcript.open("a") as f:
+            tool_result = [{"type": "tool_result", "content": "ok"}]
+            f.write(json.dumps({"type": "user", "message": {"content": tool_result}, "timestamp": "2025-01-01T00:01:00Z"}) + "\n")
+        anchor = read_checkpoint_anchor(transcript)
+        assert anchor
+        _append_messages(transcript, NEW_MESSAGE_COUNT, NEW_MESSAGE_COUNT)
+
+        checkpoint = save_checkpoint(transcript, anchor, "validated")
+
+        assert [r["text"] for r in checkpoint["requests"]] == ["message 0", "message 2"]
+
+    def test_original_request_survives_chained_checkpoints(self, tmp_path: Path) -> None:
+        """The first request is kept however many checkpoints follow."""
+        transcript = tmp_path / "t.jsonl"
+        checkpoint = None
+        for start in range(0, MESSAGE_COUNT * 2, 2):
+            _append_messages(transcript, start, 2)
+            anchor = read_checkpoint_anchor(transcript)
+            assert anchor
+            checkpoint = save_checkpoint(transcript, anchor, f"validated {start}", checkpoint)
+
+        assert checkpoint
+        texts = [r["text"] for r in checkpoint["requests"]]
+        assert len(texts) == MAX_CHECKPOINT_REQUESTS
+        assert texts[0] == "message 0"
+        assert texts[-1] == f"message {MESSAGE_COUNT * 2 - 2}"
+
+
+class TestIncrementalContext:
+    """Tests for prepare_moderator_context() with a checkpoint."""
+
+    def test_only_new_messages_sent(self, tmp_path: Path) -> None:
+        """Messages after the anchor follow the summary of the validated prefix."""
+        transcript = tmp_path / "t.jsonl"
+        _append_messages(transcript, 0, MESSAGE_COUNT)
+        anchor = read_checkpoint_anchor(transcript)
+        assert anchor
+        checkpoint = save_checkpoint(transcript, anchor, "All tests pass")
+        _append_messages(transcript, MESSAGE_COUNT, NEW_MESSAGE_COUNT)
+
+        context = prepare_moderator_context(transcript, checkpoint=checkpoint)
+
+        new_messages = get_last_n_messages(transcript, NEW_MESSAGE_COUNT)
+        assert context == format_checkpoint_summary(checkpoint) + format_messages_for_prompt(new_messages)
+        assert "All tests pass" in context
+        assert "message 0\n" in context
+        assert f"message {MESSAGE_COUNT - 1}" not in context
+
+    def test_unusable_checkpoint_sends_full_context(self, tmp_path: Path) -> None:
+        """Unknown anchors and checkpoints without new messages fall back to the full context."""
+        transcript = tmp_path / "t.jsonl"
+        _append_messages(transcript, 0, MESSAGE_COUNT)
+        anchor = read_checkpoint_anchor(transcript)
+        assert anchor
+        full_context = prepare_moderator_context(transcript)
+
+        unchanged = save_checkpoint(transcript, anchor, "All tests pass")
+        stale = save_checkpoint(transcript, "0" * 32, "Rewritten history")
+
+        assert prepare_moderator_context(transcript, checkpoint=unchanged) == full_context
+        assert prepare_moderator_context(transcript, checkpoint=stale) == full_context
@@ -0,0 +1,310 @@
+"""Unit tests for event-driven moderator runs, hedging and the latency store."""
+
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from scripts.agents.cli.config import AgentConfig
+from scripts.agents.cli.lifecycle import DECISION, FIRST_BYTE, SPAWNED, AgentEvent, LifecyclePublisher
+from scripts.agents.validation.moderator_latency import LatencyStore, percentile
+from scripts.agents.validation.moderator_runner import DEFAULT_STARTUP_HANG_SECONDS, STARTUP_HANG_MARGIN, _silence_threshold, run_moderator_with_retry
+
+# Test constants
+MAX_SAMPLES = 3
+MIN_SAMPLES = 2
+FIRST_OUTPUT_TIMEOUT = 0.05
+FAST_RETURN_SECONDS = 5
+LEARNED_FIRST_BYTE = 2.0
+FIRST_BYTE_FLOOR = 10.0
+RETRIED_ATTEMPTS = 2
+NO_DECISION_OUTPUT = '{"type": "assistant", "message": {"content": [{"type": "text", "text": "Still thinking"}]}}\n'
+DECISION_OUTPUT = '{"type": "assistant", "message": {"content": [{"type": "text", "text": "ALLOW"}]}}\n'
+
+
+class TestLatencyStore:
+    """Persisted latency samples."""
+
+    def test_percentile_nearest_rank(self) -> None:
+        """Nearest-rank percentiles of a small series."""
+        samples = [5.0, 1.0, 3.0, 2.0, 4.0]
+
+        assert percentile(samples, 50) == 3.0
+        assert percentile(samples, 95) == 5.0
+        assert percentile(samples, 1) == 1.0
+
+    def test_keeps_newest_samples_per_moderator(self, tmp_path: Path) -> None:
+        """Series are capped and kept apart per moderator and event."""
+        store = LatencyStore(tmp_path / "latency.json", max_samples=MAX_SAMPLES)
+        for seconds in (1.0, 2.0, 3.0, 4.0):
+            store.record("todo_validator", FIRST_BYTE, seconds)
+        store.record("malicious_behavior", DECISION, 9.0)
+
+        assert store.samples("todo_validator", FIRST_BYTE) == [2.0, 3.0, 4.0]
+        assert store.samples("todo_validator", DECISION) == []
+        assert LatencyStore(tmp_path / "latency.json").samples("malicious_behavior", DECISION) == [9.0]
+
+    def test_threshold_needs_min_samples(self, tmp_path: Path) -> None:
+        """No learned threshold until enough samples exist."""
+        store = LatencyStore(tmp_path / "latency.json")
+        store.record("todo_validator", FIRST_BYTE, 1.0)
+
+        assert store.threshold("todo_validator", FIRST_BYTE, 95, MIN_SAMPLES) is None
+        store.record("todo_validator", FIRST_BYTE, 2.0)
+        assert store.threshold("todo_validator", FIRST_BYTE, 95, MIN_SAMPLES) == 2.0
+
+
+class TestLifecyclePublisher:
+    """Lifecycle event publishing."""
+
+    def test_each_event_published_once(self) -> None:
+        """Repeated events are dropped; listener errors never propagate."""
+        events: list[AgentEvent] = []
+
+        def listener(event: AgentEvent) -> None:
+            events.append(event)
+            raise RuntimeError("listener bug")
+
+        publisher = LifecyclePublisher(MagicMock(), listener)
+        publisher.publish(SPAWNED)
+        publisher.publish(FIRST_BYTE)
+        publisher.publish(FIRST_BYTE)
+
+        assert [event.name for event in events] == [SPAWNED, FIRST_BYTE]
+        assert set(publisher.timings) == {SPAWNED, FIRST_BYTE}
+
+
+class _FakeCLI:
+    """CLI whose first run never produces output and whose later runs decide immediately."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.processes: list[MagicMock] = []
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def run_print(self, agent_config: Any, **_kwargs: Any) -> tuple[str, dict[str, Any] | None]:
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        process = MagicMock()
+        process.poll.return_value = None
+        self.processes.append(process)
+        lifecycle = LifecyclePublisher(process, agent_config.on_event)
+        lifecycle.publish(SPAWNED)
+        if call == 1:
+            # Hung before any output until the test ends
+            self.release.wait(FAST_RETURN_SECONDS * 2)
+            return "", None
+        lifecycle.publish(FIRST_BYTE)
+        lifecycle.publish(DECISION, "ALLOW")
+        return DECISION_OUTPUT, {"attempt": call}
+
+
+def _settings(tmp_path: Path, **settings: Any) -> Any:
+    """Config returning the given settings (defaults otherwise)."""
+    config = MagicMock(root=tmp_path)
+    config.get.side_effect = lambda key, default=None: settings.get(key, default)
+    return config
+
+
+@pytest.fixture
+def hedging(tmp_path: Path) -> Any:
+    """Enable hedging with a latency store under tmp_path."""
+    config = _settings(tmp_path, **{"agent.moderator.hedging.enabled": True, "agent.moderator.hedging.min_samples": 50})
+    with (
+        patch("scripts.agents.validation.moderator_runner.get_config", return_value=config),
+        patch("scripts.agents.validation.moderator_latency.get_config", return_value=config),
+    ):
+        yield config
+
+
+@pytest.fixture
+def no_hedging(tmp_path: Path) -> Any:
+    """Hedging disabled, silent attempts restarted after first_output_timeout, latency store under tmp_path."""
+    config = _settings(tmp_path, **{"agent.moderator.startup_hang_seconds": FIRST_OUTPUT_TIMEOUT})
+    with (
+        patch("scripts.agents.validation.moderator_runner.get_config", return_value=config),
+        patch("scripts.agents.validation.moderator_latency.get_config", return_value=config),
+    ):
+        yield config
+
+
+def _run(cli: Any, tmp_path: Path, enable_streaming: bool = True) -> tuple[str, dict[str, Any] | None]:
+    """Run a moderator through run_moderator_with_retry."""
+    return run_moderator_with_retry(
+        cli=cli,
+        instruction_file=tmp_path / "prompt.txt",
+        stdin="context",
+        agent_config=AgentConfig(model="test", session_id="session", enable_hooks=False, enable_streaming=enable_streaming),
+        audit_log_path=tmp_path / "audit.log",
+        moderator_name="todo_validator",
+        session_id="session",
+        execution_id="exec",
+        first_output_timeout=FIRST_OUTPUT_TIMEOUT,
+    )
+
+
+class TestMonitoredRun:
+    """run_moderator_with_retry() driven by lifecycle events."""
+
+    def test_startup_hang_restarted_without_waiting_for_timeout(self, tmp_path: Path, no_hedging: Any) -> None:
+        """A silent attempt is killed as soon as the startup hang threshold passes; the restart's decision is returned."""
+        cli = _FakeCLI()
+
+        started = time.time()
+        try:
+            output, metadata = _run(cli, tmp_path)
+        finally:
+            cli.release.set()
+
+        assert time.time() - started < FAST_RETURN_SECONDS
+        assert output == DECISION_OUTPUT
+        assert metadata == {"attempt": 2}
+        assert cli.processes[0].kill.called
+
+        store = LatencyStore(tmp_path / "logs" / "moderator-latency.json")
+        assert len(store.samples("todo_validator", FIRST_BYTE)) == 1
+        assert len(store.samples("todo_validator", DECISION)) == 1
+
+    def test_hedge_wins_when_primary_is_silent(self, tmp_path: Path, hedging: Any) -> None:
+        """With hedging, the silent primary keeps running until the hedge decides, then is killed."""
+        cli = _FakeCLI()
+
+        try:
+            output, metadata = _run(cli, tmp_path)
+        finally:
+            cli.release.set()
+
+        assert output == DECISION_OUTPUT
+        assert metadata == {"attempt": 2}
+        assert cli.processes[0].kill.call_count == 1
+        assert not cli.processes[1].kill.called
+
+    def test_finished_without_decision_retried(self, tmp_path: Path, no_hedging: Any) -> None:
+        """An attempt that ends without a decision is replaced by a retry."""
+        cli = MagicMock()
+        cli.run_print.side_effect = [(NO_DECISION_OUTPUT, None), (DECISION_OUTPUT, {"attempt": 2})]
+
+        output, metadata = _run(cli, tmp_path)
+
+        assert output == DECISION_OUTPUT
+        assert metadata == {"attempt": 2}
+        assert cli.run_print.call_count == RETRIED_ATTEMPTS
+
+    def test_non_streaming_runs_sequentially(self, tmp_path: Path, hedging: Any) -> None:
+        """Moderators without stream-json output have no events and keep the blocking runner."""
+        cli = MagicMock()
+        cli.run_print.return_value = ("ALLOW", None)
+
+        output, _ = _run(cli, tmp_path, enable_streaming=False)
+
+        assert output == "ALLOW"
+        assert cli.run_print.call_count == 1
+        assert not (tmp_path / "logs" / "moderator-latency.json").exists()
+
+
+class TestSilenceThreshold:
+    """Startup hang and hedge thresholds."""
+
+    def test_restart_waits_for_configured_default(self, tmp_path: Path) -> None:
+        """Without enough samples a silent attempt is restarted after startup_hang_seconds, not first_output_timeout."""
+        with patch("scripts.agents.validation.moderator_runner.get_config", return_value=_settings(tmp_path)):
+            store = LatencyStore(tmp_path / "latency.json")
+
+            assert _silence_threshold(store, "todo_validator", FIRST_OUTPUT_TIMEOUT, hedge=False) == DEFAULT_STARTUP_HANG_SECONDS
+            assert _silence_threshold(store, "todo_validator", FIRST_OUTPUT_TIMEOUT, hedge=True) == FIRST_OUTPUT_TIMEOUT
+
+    def test_learned_from_latency_store(self, tmp_path: Path) -> None:
+        """With enough samples, restarts wait a margin above the observed percentile; hedges start at it."""
+        config = _settings(tmp_path, **{"agent.moderator.hedging.min_samples": MIN_SAMPLES})
+        with patch("scripts.agents.validation.moderator_runner.get_config", return_value=config):
+            store = LatencyStore(tmp_path / "latency.json")
+            for _ in range(MIN_SAMPLES):
+                store.record("todo_validator", FIRST_BYTE, LEARNED_FIRST_BYTE)
+
+            assert _silence_threshold(store, "todo_validator", FIRST_OUTPUT_TIMEOUT, hedge=False) == LEARNED_FIRST_BYTE * STARTUP_HANG_MARGIN
+            assert _silence_threshold(store, "todo_validator", FIRST_OUTPUT_TIMEOUT, hedge=True) == LEARNED_FIRST_BYTE
+            assert _silence_threshold(store, "todo_validator", FIRST_BYTE_FLOOR, hedge=False) == FIRST_BYTE_FLOOR
+
+
+class TestSessionRun:
+    """run_moderator_with_retry() with moderator sessions enabled."""
+
+    @pytest.fixture
+    def sessions(self, tmp_path: Path) -> Any:
+        """Enable sessions for todo_validator."""
+        (tmp_path / "prompt.txt").write_text("Decide.")
+        config = _settings(tmp_path, **{"agent.moderator.sessions.enabled": True, "agent.moderator.sessions.validators": ["todo_validator"]})
+        with (
+            patch("scripts.agents.validation.moderator_runner.get_config", return_value=config),
+            patch("scripts.agents.validation.moderator_latency.get_config", return_value=config),
+        ):
+            yield config
+
+    def test_session_answer_skips_fresh_process(self, tmp_path: Path, sessions: Any) -> None:
+        """A session decision is returned without running the CLI."""
+        cli = MagicMock()
+        with patch("scripts.agents.validation.moderator_runner.request_moderation", return_value=(DECISION_OUTPUT, {})) as request:
+            output, metadata = _run(cli, tmp_path)
+
+        assert output == DECISION_OUTPUT
+        assert metadata == {"session_id": "session"}
+        assert request.call_args.args[1] == "context\nDecide."
+        cli.run_print.assert_not_called()
+
+    def test_unavailable_session_falls_back(self, tmp_path: Path, sessions: Any) -> None:
+        """Without the daemon, a fresh process answers."""
+        cli = _FakeCLI()
+        cli.calls = 1  # Answer right away
+        with patch("scripts.agents.validation.moderator_runner.request_moderation", return_value=None):
+            output, _ = _run(cli, tmp_path)
+
+        assert output == DECISION_OUTPUT
+        assert cli.calls == 2
+
+
+class TestWarmPoolRun:
+    """run_moderator_with_retry() with the daemon's warm pool enabled."""
+
+    @pytest.fixture
+    def warm_pool(self, tmp_path: Path) -> Any:
+        """Enable the warm pool; sessions only for another validator."""
+        (tmp_path / "prompt.txt").write_text("Decide.")
+        config = _settings(
+            tmp_path,
+            **{"agent.warm_pool.enabled": True, "agent.moderator.sessions.enabled": True, "agent.moderator.sessions.validators": ["audit_diff"]},
+        )
+        with (
+            patch("scripts.agents.validation.moderator_runner.get_config", return_value=config),
+            patch("scripts.agents.validation.moderator_latency.get_config", return_value=config),
+        ):
+            yield config
+
+    def test_warm_answer_skips_fresh_process(self, tmp_path: Path, warm_pool: Any) -> None:
+        """A moderator without a session is answered by a pre-started process of the daemon."""
+        cli = MagicMock()
+        with (
+            patch("scripts.agents.validation.moderator_runner.request_warm_run", return_value=(DECISION_OUTPUT, {})) as request,
+            patch("scripts.agents.validation.moderator_runner.request_moderation") as session_request,
+        ):
+            output, metadata = _run(cli, tmp_path)
+
+        assert output == DECISION_OUTPUT
+        assert metadata == {"session_id": "session"}
+        assert request.call_args.args[:2] == ("todo_validator", "context\nDecide.")
+        session_request.assert_not_called()
+        cli.run_print.assert_not_called()
+
+    def test_unavailable_pool_falls_back(self, tmp_path: Path, warm_pool: Any) -> None:
+        """Without the daemon, a fresh process answers."""
+        cli = _FakeCLI()
+        cli.calls = 1  # Answer right away
+        with patch("scripts.agents.validation.moderator_runner.request_warm_run", return_value=None):
+            output, _ = _run(cli, tmp_path)
+
+        assert output == DECISION_OUTPUT
+        assert cli.calls == 2
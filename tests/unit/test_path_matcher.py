@@ -0,0 +1,89 @@
+"""Unit tests for the compiled glob path matcher."""
+
+import re
+
+import pytest
+
+from scripts.agents.validation.path_matcher import PathMatcher, glob_to_regex
+
+# Test constants
+EXEMPTION_GLOBS = (
+    "scripts/automation/hooks.py",
+    "scripts/config/patterns/*.yaml",
+    "base/backend/workers/",
+    "*.md",
+    "tests/",
+    "conftest.py",
+    "**/module_setup.py",
+    "scripts/**/*.py",
+    "src/[!_]*.py",
+    "**/build-?",
+)
+SAMPLE_PATHS = (
+    "/repo/scripts/automation/hooks.py",
+    "/repo/other/automation/hooks.py",
+    "/repo/scripts/config/patterns/bash_commands.yaml",
+    "/repo/scripts/config/patterns/nested/x.yaml",
+    "/repo/base/backend/workers/pool.py",
+    "/repo/base/backend/workers.py",
+    "/repo/README.md",
+    "/repo/docs/guide.md.bak",
+    "/repo/tests/unit/test_x.py",
+    "/repo/attests/x.py",
+    "/repo/conftest.py",
+    "/repo/my_conftest.py",
+    "module_setup.py",
+    "/repo/scripts/agents/cli/main.py",
+    "/repo/src/app.py",
+    "/repo/src/_private.py",
+    "/repo/build-1",
+    "/repo/build-10",
+)
+
+
+class TestGlobToRegex:
+    """gitignore-style glob translation."""
+
+    @pytest.mark.parametrize(
+        ("glob", "path", "expected"),
+        [
+            ("**/__init__.py", "__init__.py", True),
+            ("**/__init__.py", "/repo/pkg/__init__.py", True),
+            ("**/__init__.py", "/repo/pkg/not__init__.py", False),
+            ("*.md", "/repo/docs/a.md", True),
+            ("*.md", "/repo/a.md/b.py", False),
+            ("scripts/**/*.py", "/repo/scripts/x.py", True),
+            ("scripts/**/*.py", "/repo/scripts/a/b/c.py", True),
+            ("scripts/**/*.py", "/repo/myscripts/x.py", False),
+            ("tests/", "/repo/tests/x.py", True),
+            ("tests/", "/repo/tests", False),
+            ("conftest.py", "/repo/myconftest.py", False),
+        ],
+    )
+    def test_glob_semantics(self, glob: str, path: str, expected: bool) -> None:
+        """Globs match whole trailing components; * never crosses /."""
+        assert bool(re.search(glob_to_regex(glob), path)) is expected
+
+
+class TestPathMatcher:
+    """PathMatcher agrees with testing every glob one by one."""
+
+    @pytest.mark.parametrize("path", SAMPLE_PATHS)
+    def test_matches_brute_force(self, path: str) -> None:
+        """Indexed lookup returns exactly the globs a full scan would."""
+        matcher = PathMatcher([(glob, glob) for glob in EXEMPTION_GLOBS])
+
+        expected = [glob for glob in EXEMPTION_GLOBS if re.search(glob_to_regex(glob), path)]
+
+        assert matcher.match(path) == expected
+        assert matcher.matches(path) is bool(expected)
+
+    def test_payloads_in_insertion_order(self) -> None:
+        """Payloads of several matching globs come back in the order they were added."""
+        matcher: PathMatcher[int] = PathMatcher()
+        matcher.add("*.py", 0)
+        matcher.add("tests/", 1)
+        matcher.add("**/test_x.py", 2)
+
+        assert matcher.match("/repo/tests/test_x.py") == [0, 1, 2]
+        assert len(matcher) == 3
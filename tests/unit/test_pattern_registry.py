@@ -0,0 +1,75 @@
+"""Unit tests for the hot-reloading pattern registry."""
+
+import os
+import re
+from pathlib import Path
+
+from scripts.agents.validation.pattern_registry import PatternRegistry
+
+
+def _write(path: Path, content: str, mtime_ns: int) -> None:
+    """Write a pattern file with an explicit mtime (so reloads do not depend on timer resolution)."""
+    path.write_text(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestPatternRegistry:
+    """PatternRegistry parses once and reloads on change."""
+
+    def test_parses_once_while_unchanged(self, tmp_path: Path) -> None:
+        """Repeated lookups reuse the parsed file."""
+        _write(tmp_path / "rules.yaml", "rules:\n  - pattern: 'a+'\n", 1_000_000_000)
+        registry = PatternRegistry(tmp_path)
+
+        first = registry.load("rules.yaml")
+        second = registry.load("rules.yaml")
+
+        assert first is second
+        assert registry.loads == 1
+
+    def test_reloads_when_file_changes(self, tmp_path: Path) -> None:
+        """Edited files are re-parsed and derived objects rebuilt."""
+        path = tmp_path / "rules.yaml"
+        _write(path, "rules:\n  - pattern: 'old'\n", 1_000_000_000)
+        registry = PatternRegistry(tmp_path)
+        old_rules = registry.compiled("rules.yaml", "rules")
+
+        _write(path, "rules:\n  - pattern: 'new'\n", 2_000_000_000)
+        new_rules = registry.compiled("rules.yaml", "rules")
+
+        assert old_rules[0][0].pattern == "old"
+        assert new_rules[0][0].pattern == "new"
+        assert registry.loads == 2
+
+    def test_compiled_applies_flags(self, tmp_path: Path) -> None:
+        """Compiled regexes carry the requested flags and are cached per flag set."""
+        _write(tmp_path / "rules.yaml", "rules:\n  - pattern: 'quota'\n    description: q\n", 1_000_000_000)
+        registry = PatternRegistry(tmp_path)
+
+        rules = registry.compiled("rules.yaml", "rules", re.IGNORECASE)
+
+        assert rules[0][0].search("QUOTA exceeded")
+        assert rules[0][1]["description"] == "q"
+        assert registry.compiled("rules.yaml", "rules", re.IGNORECASE) is rules
+        assert not registry.compiled("rules.yaml", "rules")[0][0].search("QUOTA")
+
+    def test_missing_file_is_empty(self, tmp_path: Path) -> None:
+        """Missing files load as an empty mapping and are picked up once created."""
+        registry = PatternRegistry(tmp_path)
+
+        assert registry.load("missing.yaml") == {}
+        assert registry.compiled("missing.yaml", "rules") == []
+
+        _write(tmp_path / "missing.yaml", "rules: []\n", 1_000_000_000)
+        assert registry.load("missing.yaml") == {"rules": []}
+
+    def test_preload_parses_every_file(self, tmp_path: Path) -> None:
+        """preload parses each YAML file in the directory once."""
+        for index, name in enumerate(("a.yaml", "b.yaml")):
+            _write(tmp_path / name, "key: 1\n", 1_000_000_000 + index)
+        registry = PatternRegistry(tmp_path)
+
+        registry.preload()
+        registry.preload()
+
+        assert registry.loads == 2
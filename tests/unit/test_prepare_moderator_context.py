@@ -0,0 +1,115 @@
+"""Unit tests for moderator context sizing in prepare_moderator_context()."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+import scripts.agents.workflows.core as core_module
+from scripts.agents.token_cache import clear_memory_cache
+from scripts.agents.transcript import EXHIBIT_HEADER, format_messages_for_prompt, get_last_n_messages
+from scripts.agents.transcript_client import SOCKET_ENV_VAR
+from scripts.agents.workflows.core import prepare_moderator_context
+
+# Test constants
+MESSAGE_COUNT = 20
+OVER_CAP_COUNT = 105
+UNLIMITED_TOKENS = 10**9
+
+
+def _write_transcript(path: Path, count: int) -> None:
+    """Write a transcript with alternating user/assistant messages of growing size."""
+    with path.open("w") as f:
+        for i in range(count):
+            msg_type = "user" if i % 2 == 0 else "assistant"
+            text = f"message {i} " + "word " * i
+            content: str | list[dict[str, str]] = text if msg_type == "user" else [{"type": "text", "text": text}]
+            f.write(json.dumps({"type": msg_type, "message": {"content": content}, "timestamp": "2025-01-01T00:00:00Z"}) + "\n")
+
+
+def _reference_context(path: Path, max_tokens: int) -> str:
+    """Reference sizing: largest tail window whose formatted context fits the budget."""
+    messages = get_last_n_messages(path, core_module.MAX_MODERATOR_MESSAGE_COUNT)
+    for window in range(len(messages), 0, -1):
+        context = format_messages_for_prompt(messages[-window:])
+        if len(context) <= max_tokens:
+            return context
+    return format_messages_for_prompt(messages[-1:])
+
+
+@pytest.fixture(autouse=True)
+def no_daemon(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Compute contexts locally even if a transcript daemon is running."""
+    monkeypatch.setenv(SOCKET_ENV_VAR, str(tmp_path / "missing.sock"))
+
+
+@pytest.fixture
+def char_tokens(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Count one token per character (additive across message blocks)."""
+    monkeypatch.setattr(core_module, "count_tokens", len)
+    clear_memory_cache()
+
+
+class TestPrepareModeratorContextSizing:
+    """Tests for single-pass window sizing."""
+
+    def test_fits_without_truncation(self, tmp_path: Path, char_tokens: None) -> None:
+        """Small transcripts are returned in full."""
+        transcript = tmp_path / "t.jsonl"
+        _write_transcript(transcript, MESSAGE_COUNT)
+
+        assert prepare_moderator_context(transcript) == format_messages_for_prompt(get_last_n_messages(transcript, MESSAGE_COUNT))
+
+    @pytest.mark.parametrize("max_tokens", [1, 600, 1500, 3000])
+    def test_truncated_window_matches_reference(self, tmp_path: Path, char_tokens: None, monkeypatch: pytest.MonkeyPatch, max_tokens: int) -> None:
+        """Truncated context is the largest fitting window (never fewer than one message)."""
+        transcript = tmp_path / "t.jsonl"
+        _write_transcript(transcript, MESSAGE_COUNT)
+        monkeypatch.setattr(core_module, "MAX_MODERATOR_CONTEXT_TOKENS", max_tokens)
+
+        assert prepare_moderator_context(transcript) == _reference_context(transcript, max_tokens)
+
+    def test_message_count_cap(self, tmp_path: Path, char_tokens: None, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Transcripts above the message cap send older messages as summaries, never more raw messages than the cap."""
+        transcript = tmp_path / "t.jsonl"
+        _write_transcript(transcript, OVER_CAP_COUNT)
+        monkeypatch.setattr(core_module, "MAX_MODERATOR_CONTEXT_TOKENS", UNLIMITED_TOKENS)
+
+        context = prepare_moderator_context(transcript)
+
+        summary, exhibit = context.split(EXHIBIT_HEADER)
+        assert core_module.MODERATOR_RAW_MESSAGE_COUNT <= exhibit.count("<message role=") <= core_module.MAX_MODERATOR_MESSAGE_COUNT
+        assert f"message {OVER_CAP_COUNT - 1} " in exhibit
+        assert "message 4 " not in exhibit
+        assert "User: message 0" in summary
+
+    def test_small_context_not_tokenized(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Contexts within the budget in bytes are returned without tokenizing."""
+        transcript = tmp_path / "t.jsonl"
+        _write_transcript(transcript, MESSAGE_COUNT)
+
+        def fail_tokenize(text: str) -> int:
+            raise AssertionError("tokenizer called")
+
+        monkeypatch.setattr(core_module, "count_tokens", fail_tokenize)
+
+        assert prepare_moderator_context(transcript) == format_messages_for_prompt(get_last_n_messages(transcript, MESSAGE_COUNT))
+
+    def test_dense_blocks_sized_by_token_count(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Blocks far longer in bytes than in tokens are kept - the window is sized by exact counts."""
+        transcript = tmp_path / "t.jsonl"
+        _write_transcript(transcript, MESSAGE_COUNT)
+        monkeypatch.setattr(core_module, "count_tokens", lambda text: 1)
+        monkeypatch.setattr(core_module, "MAX_MODERATOR_CONTEXT_TOKENS", MESSAGE_COUNT + 2)
+        clear_memory_cache()
+
+        assert prepare_moderator_context(transcript) == format_messages_for_prompt(get_last_n_messages(transcript, MESSAGE_COUNT))
+
+    def test_empty_transcript(self, tmp_path: Path) -> None:
+        """Empty transcript yields empty context."""
+        transcript = tmp_path / "t.jsonl"
+        transcript.write_text("")
+
+        assert prepare_moderator_context(transcript) == ""
@@ -0,0 +1,139 @@
+"""Unit tests for the composite PreToolUse validation pipeline."""
+
+from __future__ import annotations
+
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+import scripts.agents.workflows.pipeline_validators as pipeline_module
+from scripts.agents.workflows.core import HookInput, HookResult, HookValidator
+from scripts.agents.workflows.pipeline_validators import PreToolUsePipeline, merge_denials
+
+# Test constants
+SLOW_SECONDS = 30
+FAST_RETURN_SECONDS = 10
+TOOLS = frozenset({"Edit"})
+
+
+def _hook_input(tmp_path: Path) -> HookInput:
+    """Build an Edit hook input whose session_id carries the test's scratch directory."""
+    return HookInput(session_id=str(tmp_path), hook_event_name="PreToolUse", tool_name="Edit", tool_input={"file_path": "a.txt"}, transcript_path=None)
+
+
+class SlowAllowValidator(HookValidator):
+    """Starts a long-running subprocess (like an agent CLI call), then allows."""
+
+    def validate(self, hook_input: HookInput) -> HookResult:
+        """Record the subprocess pid and wait for it."""
+        process = subprocess.Popen(["sleep", str(SLOW_SECONDS)])
+        (Path(hook_input.session_id) / "slow.pid").write_text(str(process.pid))
+        process.wait()
+        return HookResult.allow()
+
+
+class FastAllowValidator(HookValidator):
+    """Allows immediately."""
+
+    def validate(self, hook_input: HookInput) -> HookResult:
+        """Allow."""
+        return HookResult.allow()
+
+
+class DenyValidator(HookValidator):
+    """Denies after the slow validator started its subprocess."""
+
+    def validate(self, hook_input: HookInput) -> HookResult:
+        """Deny once slow.pid exists."""
+        pid_file = Path(hook_input.session_id) / "slow.pid"
+        while not pid_file.exists():
+            time.sleep(0.01)
+        return HookResult.deny("denied by moderator")
+
+
+class RecordingValidator(HookValidator):
+    """Records that it ran, then allows."""
+
+    def validate(self, hook_input: HookInput) -> HookResult:
+        """Touch ran.marker."""
+        (Path(hook_input.session_id) / "ran.marker").touch()
+        return HookResult.allow()
+
+
+class DeterministicDenyValidator(HookValidator):
+    """Denies without a moderator call."""
+
+    def validate(self, hook_input: HookInput) -> HookResult:
+        """Deny."""
+        return HookResult.deny("denied by pattern")
+
+
+def _configure(monkeypatch: pytest.MonkeyPatch, deterministic: list[type[HookValidator]], moderators: list[type[HookValidator]]) -> None:
+    """Replace the pipeline's validator tables."""
+    monkeypatch.setattr(pipeline_module, "DETERMINISTIC_VALIDATORS", tuple((cls, TOOLS) for cls in deterministic))
+    monkeypatch.setattr(pipeline_module, "MODERATOR_VALIDATORS", tuple((cls, TOOLS) for cls in moderators))
+
+
+def _is_running(pid: int) -> bool:
+    """Check whether a process exists and is not a zombie."""
+    try:
+        return Path(f"/proc/{pid}/stat").read_text().split()[2] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+class TestPreToolUsePipeline:
+    """Tests for PreToolUsePipeline.validate()."""
+
+    def test_first_deny_cancels_running_moderators(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A denial returns at once and kills the slow moderator's subprocess."""
+        _configure(monkeypatch, [], [SlowAllowValidator, DenyValidator])
+
+        start = time.monotonic()
+        result = PreToolUsePipeline().validate(_hook_input(tmp_path))
+
+        assert time.monotonic() - start < FAST_RETURN_SECONDS
+        assert result.decision == "deny"
+        assert result.reason == "denied by moderator"
+        slow_pid = int((tmp_path / "slow.pid").read_text())
+        deadline = time.monotonic() + FAST_RETURN_SECONDS
+        while _is_running(slow_pid) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert not _is_running(slow_pid)
+
+    def test_all_allow(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Moderators that all allow produce one allow."""
+        _configure(monkeypatch, [FastAllowValidator], [FastAllowValidator, RecordingValidator])
+
+        assert PreToolUsePipeline().validate(_hook_input(tmp_path)).decision == "allow"
+        assert (tmp_path / "ran.marker").exists()
+
+    def test_deterministic_deny_skips_moderators(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Deterministic denials return before any moderator starts."""
+        _configure(monkeypatch, [DeterministicDenyValidator], [RecordingValidator, FastAllowValidator])
+
+        result = PreToolUsePipeline().validate(_hook_input(tmp_path))
+
+        assert result.reason == "denied by pattern"
+        assert not (tmp_path / "ran.marker").exists()
+
+    def test_unmatched_tool_allows(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Tools no validator matches are allowed."""
+        _configure(monkeypatch, [DeterministicDenyValidator], [RecordingValidator])
+        hook_input = _hook_input(tmp_path)
+        hook_input.tool_name = "Read"
+
+        assert PreToolUsePipeline().validate(hook_input).decision == "allow"
+
+
+def test_merge_denials() -> None:
+    """Simultaneous denials keep every reason."""
+    merged = merge_denials([HookResult.deny("first"), HookResult.deny("second", system_message="blocked")])
+
+    assert merged.decision == "deny"
+    assert merged.reason is not None
+    assert "first" in merged.reason
+    assert "second" in merged.reason
+    assert merged.system_message == "blocked"
@@ -0,0 +1,124 @@
+"""Unit tests for the content-hash keyed token-count cache."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+import scripts.agents.token_cache as token_cache_module
+import scripts.agents.workflows.core as core_module
+from scripts.agents.token_cache import TOKEN_CACHE_SUFFIX, TranscriptTokenCache, clear_memory_cache
+from scripts.agents.transcript_client import SOCKET_ENV_VAR
+from scripts.agents.workflows.core import prepare_moderator_context
+
+# Test constants
+MESSAGE_COUNT = 20
+WRAPPER_TEXTS = 2  # EXHIBIT header and footer
+TOKEN_BUDGET = 1000
+
+
+class CountingTokenizer:
+    """One token per character (or per chars_per_token characters), recording every tokenized text."""
+
+    def __init__(self, chars_per_token: int = 1) -> None:
+        self.chars_per_token = chars_per_token
+        self.calls: list[str] = []
+
+    def __call__(self, text: str) -> int:
+        self.calls.append(text)
+        return max(1, len(text) // self.chars_per_token)
+
+
+def _append_messages(path: Path, start: int, count: int) -> None:
+    """Append alternating user/assistant messages."""
+    with path.open("a") as f:
+        for i in range(start, start + count):
+            msg_type = "user" if i % 2 == 0 else "assistant"
+            content: str | list[dict[str, str]] = f"message {i}" if msg_type == "user" else [{"type": "text", "text": f"message {i}"}]
+            f.write(json.dumps({"type": msg_type, "message": {"content": content}, "timestamp": "2025-01-01T00:00:00Z"}) + "\n")
+
+
+@pytest.fixture(autouse=True)
+def fresh_memory_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Start every test with an empty process LRU and no transcript daemon."""
+    monkeypatch.setenv(SOCKET_ENV_VAR, str(tmp_path / "missing.sock"))
+    clear_memory_cache()
+
+
+class TestTranscriptTokenCache:
+    """Tests for TranscriptTokenCache."""
+
+    def test_store_survives_process_cache(self, tmp_path: Path) -> None:
+        """Counts saved to the sidecar are reused after the process LRU is cleared."""
+        transcript = tmp_path / "t.jsonl"
+        tokenizer = CountingTokenizer()
+        cache = TranscriptTokenCache(transcript, tokenizer)
+        assert cache.count("hello") == len("hello")
+        cache.save()
+        assert (tmp_path / f"t.jsonl{TOKEN_CACHE_SUFFIX}").exists()
+
+        clear_memory_cache()
+        reloaded = TranscriptTokenCache(transcript, tokenizer)
+        assert reloaded.count("hello") == len("hello")
+        assert tokenizer.calls == ["hello"]
+        assert reloaded.hits == 1
+
+    def test_partial_record_ignored(self, tmp_path: Path) -> None:
+        """A record cut short by an interrupted write is dropped and overwritten."""
+        transcript = tmp_path / "t.jsonl"
+        tokenizer = CountingTokenizer()
+        cache = TranscriptTokenCache(transcript, tokenizer)
+        cache.count("first")
+        cache.save()
+        with cache.store_path.open("ab") as f:
+            f.write(b"\x01\x02\x03")
+
+        clear_memory_cache()
+        cache = TranscriptTokenCache(transcript, tokenizer)
+        cache.count("first")
+        cache.count("second")
+        cache.save()
+
+        clear_memory_cache()
+        cache = TranscriptTokenCache(transcript, tokenizer)
+        assert cache.count("second") == len("second")
+        assert tokenizer.calls == ["first", "second"]
+
+    def test_memory_lru_evicts_oldest(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """The process LRU keeps only the most recently used entries."""
+        monkeypatch.setattr(token_cache_module, "MEMORY_CACHE_SIZE", 2)
+        tokenizer = CountingTokenizer()
+        for text in ("a", "b", "c"):
+            TranscriptTokenCache(tmp_path / "t.jsonl", tokenizer).count(text)
+
+        cache = TranscriptTokenCache(tmp_path / "t.jsonl", tokenizer)
+        cache.count("c")
+        cache.count("a")
+        assert tokenizer.calls == ["a", "b", "c", "a"]
+
+
+class TestModeratorContextTokenCache:
+    """Tests for cached sizing in prepare_moderator_context()."""
+
+    def test_only_new_messages_tokenized(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A later hook tokenizes only messages appended since the previous one."""
+        # Over the budget in bytes (so blocks are tokenized) but within it in tokens
+        tokenizer = CountingTokenizer(chars_per_token=4)
+        monkeypatch.setattr(core_module, "count_tokens", tokenizer)
+        monkeypatch.setattr(core_module, "MAX_MODERATOR_CONTEXT_TOKENS", TOKEN_BUDGET)
+        transcript = tmp_path / "t.jsonl"
+        _append_messages(transcript, 0, MESSAGE_COUNT)
+        first_context = prepare_moderator_context(transcript)
+        assert len(first_context) > TOKEN_BUDGET
+        assert len(tokenizer.calls) == MESSAGE_COUNT + WRAPPER_TEXTS
+
+        clear_memory_cache()  # Next hook runs in a fresh process
+        tokenizer.calls.clear()
+        _append_messages(transcript, MESSAGE_COUNT, 1)
+        second_context = prepare_moderator_context(transcript)
+
+        assert len(tokenizer.calls) == 1
+        assert "message 20" in tokenizer.calls[0]
+        assert second_context.startswith(first_context[: first_context.index("</message>")])
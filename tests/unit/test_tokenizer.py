@@ -0,0 +1,61 @@
+"""Unit tests for the offline, load-once tokenizer."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+import scripts.agents.tokenizer as tokenizer_module
+from scripts.agents.tokenizer import AVERAGE_BYTES_PER_TOKEN, count_tokens, estimate_tokens, fits_budget_by_bytes
+
+# Test constants
+BUDGET = 1000
+WORD_COUNT = 3
+
+
+class FakeEncoding:
+    """Encoding stand-in splitting on whitespace."""
+
+    def encode(self, text: str) -> list[str]:
+        return text.split()
+
+
+class TestGetEncoding:
+    """Tests for get_encoding()."""
+
+    def test_encoding_loaded_once_from_local_cache(self, tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+        """The encoder is built once per process with the local cache directory."""
+        loads: list[str] = []
+
+        def fake_encoding_for_model(model: str) -> FakeEncoding:
+            loads.append(model)
+            return FakeEncoding()
+
+        monkeypatch.delenv("TIKTOKEN_CACHE_DIR", raising=False)
+        monkeypatch.setattr(tokenizer_module, "get_tiktoken_cache_dir", lambda: tmp_path)
+        monkeypatch.setattr(tokenizer_module.tiktoken, "encoding_for_model", fake_encoding_for_model)
+        tokenizer_module.get_encoding.cache_clear()
+        try:
+            assert count_tokens("one two three") == WORD_COUNT
+            assert count_tokens("four") == 1
+            assert loads == [tokenizer_module.TOKENIZER_MODEL]
+            assert tokenizer_module.os.environ["TIKTOKEN_CACHE_DIR"] == str(tmp_path)
+        finally:
+            tokenizer_module.get_encoding.cache_clear()
+
+
+class TestByteLengthBounds:
+    """Tests for the byte-length estimator."""
+
+    def test_within_budget_by_bytes(self) -> None:
+        """Byte length at or under the budget always fits."""
+        assert fits_budget_by_bytes(BUDGET, BUDGET)
+
+    def test_needs_exact_count_over_budget(self) -> None:
+        """Longer texts are never judged by bytes - one token may span many bytes."""
+        assert not fits_budget_by_bytes(BUDGET + 1, BUDGET)
+
+    def test_estimate_uses_average_ratio(self) -> None:
+        """Estimate rounds up bytes divided by the average ratio."""
+        assert estimate_tokens(int(AVERAGE_BYTES_PER_TOKEN * BUDGET)) == BUDGET
@@ -0,0 +1,190 @@
+"""Unit tests for the shared transcript state daemon and its client."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+import scripts.agents.workflows.core as core_module
+from scripts.agents.token_cache import clear_memory_cache
+from scripts.agents.transcript import get_last_n_messages
+from scripts.agents.transcript_client import SOCKET_ENV_VAR, fetch_last_n_messages, fetch_moderator_context
+from scripts.agents.transcript_daemon import TranscriptFollower, TranscriptStateDaemon
+from scripts.agents.workflows.core import MAX_MODERATOR_MESSAGE_COUNT, build_moderator_context, prepare_moderator_context
+
+# Test constants
+MESSAGE_COUNT = 30
+LAST_N = 7
+LONG_MESSAGE_COUNT = 250
+
+
+def _message_line(msg_type: str, text: str) -> str:
+    """Build a real-format transcript line."""
+    content: str | list[dict[str, str]] = text if msg_type == "user" else [{"type": "text", "text": text}]
+    return json.dumps({"type": msg_type, "message": {"role": msg_type, "content": content}, "timestamp": "2025-01-01T00:00:00Z"}) + "\n"
+
+
+def _append_messages(path: Path, start: int, count: int) -> None:
+    """Append alternating user/assistant messages and noise records."""
+    with path.open("a") as f:
+        for i in range(start, start + count):
+            f.write(_message_line("user" if i % 2 == 0 else "assistant", f"message {i}"))
+            f.write(json.dumps({"type": "summary", "summary": "noise"}) + "\n")
+
+
+@pytest.fixture
+def char_tokens(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Count one token per character."""
+    monkeypatch.setattr(core_module, "count_tokens", len)
+    monkeypatch.setattr("scripts.agents.transcript_daemon.count_tokens", len)
+    clear_memory_cache()
+
+
+@pytest.fixture
+def daemon(monkeypatch: pytest.MonkeyPatch) -> Iterator[TranscriptStateDaemon]:
+    """Run a daemon on a short-path socket and point the client at it."""
+    with tempfile.TemporaryDirectory(prefix="ami") as socket_dir:
+        socket_path = Path(socket_dir) / "d.sock"
+        monkeypatch.setenv(SOCKET_ENV_VAR, str(socket_path))
+        server = TranscriptStateDaemon(socket_path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield server
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+
+class TestTranscriptFollower:
+    """Tests for TranscriptFollower."""
+
+    def test_follows_appends(self, tmp_path: Path) -> None:
+        """Appended lines extend the parsed list incrementally."""
+        transcript = tmp_path / "t.jsonl"
+        _append_messages(transcript, 0, MESSAGE_COUNT)
+        follower = TranscriptFollower(transcript)
+        follower.catch_up()
+        offset = follower.offset
+        assert follower.last_n(LAST_N) == get_last_n_messages(transcript, LAST_N)
+
+        _append_messages(transcript, MESSAGE_COUNT, 3)
+        follower.catch_up()
+        assert follower.offset > offset
+        assert len(follower.messages) == MESSAGE_COUNT + 3
+        assert follower.last_n(LAST_N) == get_last_n_messages(transcript, LAST_N)
+
+    def test_unterminated_line_completed_later(self, tmp_path: Path) -> None:
+        """A partially written final line is re-read once completed."""
+        transcript = tmp_path / "t.jsonl"
+        _append_messages(transcript, 0, MESSAGE_COUNT)
+        line = _message_line("assistant", "late")
+        with transcript.open("a") as f:
+            f.write(line[:10])
+        follower = TranscriptFollower(transcript)
+        follower.catch_up()
+        assert follower.last_n(LAST_N) == get_last_n_messages(transcript, LAST_N)
+
+        with transcript.open("a") as f:
+            f.write(line[10:])
+        follower.catch_up()
+        assert follower.last_n(1)[0]["text"] == "late"
+        assert follower.last_n(LAST_N) == get_last_n_messages(transcript, LAST_N)
+
+    def test_resets_when_transcript_replaced(self, tmp_path: Path) -> None:
+        """A truncated or rewritten transcript is parsed from scratch."""
+        transcript = tmp_path / "t.jsonl"
+        _append_messages(transcript, 0, MESSAGE_COUNT)
+        follower = TranscriptFollower(transcript)
+        follower.catch_up()
+
+        transcript.write_text(_message_line("user", "fresh start"))
+        follower.catch_up()
+        assert [msg["text"] for msg in follower.last_n(LAST_N)] == ["fresh start"]
+
+    def test_moderator_context_matches_build(self, tmp_path: Path, char_tokens: None) -> None:
+        """Cached token counts give the same context as a fresh build."""
+        transcript = tmp_path / "t.jsonl"
+        _append_messages(transcript, 0, MESSAGE_COUNT)
+        follower = TranscriptFollower(transcript)
+        follower.catch_up()
+        follower.moderator_context()
+
+        _append_messages(transcript, MESSAGE_COUNT, 2)
+        follower.catch_up()
+        expected = build_moderator_context(get_last_n_messages(transcript, MAX_MODERATOR_MESSAGE_COUNT + 1))
+        assert follower.moderator_context() == expected
+
+    def test_context_served_when_token_cache_save_fails(self, tmp_path: Path, char_tokens: None, monkeypatch: pytest.MonkeyPatch) -> None:
+        """An unwritable token cache store does not fail the request (same as the in-process path)."""
+        transcript = tmp_path / "t.jsonl"
+        _append_messages(transcript, 0, MESSAGE_COUNT)
+        follower = TranscriptFollower(transcript)
+        follower.catch_up()
+
+        def fail_save() -> None:
+            raise PermissionError("read-only store")
+
+        monkeypatch.setattr(follower._token_cache, "save", fail_save)
+
+        assert follower.moderator_context() == build_moderator_context(get_last_n_messages(transcript, MAX_MODERATOR_MESSAGE_COUNT + 1))
+
+    def test_summarized_context_matches_local(self, tmp_path: Path, char_tokens: None, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Long transcripts get the same summaries and raw window as a local build."""
+        monkeypatch.setenv(SOCKET_ENV_VAR, str(tmp_path / "missing.sock"))
+        transcript = tmp_path / "t.jsonl"
+        _append_messages(transcript, 0, LONG_MESSAGE_COUNT)
+        follower = TranscriptFollower(transcript)
+        follower.catch_up()
+
+        context = follower.moderator_context()
+
+        assert "# Earlier Conversation Summary" in context
+        assert context == prepare_moderator_context(transcript)
+
+
+class TestTranscriptDaemon:
+    """Tests for the socket server and client fallback."""
+
+    def test_client_returns_none_without_daemon(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Without a daemon the client reports unavailability."""
+        transcript = tmp_path / "t.jsonl"
+        _append_messages(transcript, 0, MESSAGE_COUNT)
+        monkeypatch.setenv(SOCKET_ENV_VAR, str(tmp_path / "missing.sock"))
+
+        assert fetch_last_n_messages(transcript, LAST_N) is None
+        assert fetch_moderator_context(transcript) is None
+
+    def test_served_results_match_local(self, tmp_path: Path, char_tokens: None, daemon: TranscriptStateDaemon) -> None:
+        """Daemon windows and contexts match local computation."""
+        transcript = tmp_path / "t.jsonl"
+        _append_messages(transcript, 0, MESSAGE_COUNT)
+        todos = [{"status": "pending", "content": "Write tests"}]
+
+        assert fetch_last_n_messages(transcript, LAST_N) == get_last_n_messages(transcript, LAST_N)
+        expected = build_moderator_context(get_last_n_messages(transcript, MAX_MODERATOR_MESSAGE_COUNT + 1), todos)
+        assert prepare_moderator_context(transcript, todos=todos) == expected
+        assert transcript.resolve() in daemon.followers
+
+    def test_rejects_non_transcript_paths(self, tmp_path: Path, daemon: TranscriptStateDaemon) -> None:
+        """Only absolute .jsonl paths are served."""
+        other = tmp_path / "secret.txt"
+        other.write_text("x")
+
+        assert fetch_last_n_messages(other, LAST_N) is None
+        assert not daemon.followers
+
+    def test_daemon_of_another_user_ignored(self, tmp_path: Path, daemon: TranscriptStateDaemon, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A daemon socket owned by someone else is never asked."""
+        transcript = tmp_path / "t.jsonl"
+        _append_messages(transcript, 0, MESSAGE_COUNT)
+        monkeypatch.setattr("scripts.agents.user_socket.get_peer_uid", lambda _sock: -1)
+
+        assert fetch_last_n_messages(transcript, LAST_N) is None
+        assert not daemon.followers
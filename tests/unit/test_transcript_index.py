@@ -0,0 +1,131 @@
+"""Unit tests for tail-seeking transcript reads and the sidecar offset index."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from scripts.agents.transcript import (
+    INDEX_SUFFIX,
+    TranscriptIndex,
+    _parse_message_from_json,
+    get_last_n_messages,
+    get_messages_until_last_user,
+    iter_lines_reverse,
+)
+
+# Test constants
+MESSAGE_COUNT = 50
+LAST_N = 7
+SMALL_BLOCK_SIZE = 37
+
+
+def _message_line(msg_type: str, text: str) -> str:
+    """Build a real-format transcript line."""
+    content: str | list[dict[str, str]] = text if msg_type == "user" else [{"type": "text", "text": text}]
+    return json.dumps({"type": msg_type, "message": {"role": msg_type, "content": content}, "timestamp": "2025-01-01T00:00:00Z"}) + "\n"
+
+
+def _write_transcript(path: Path, count: int) -> None:
+    """Write a transcript with alternating user/assistant messages and noise records."""
+    with path.open("w") as f:
+        for i in range(count):
+            f.write(_message_line("user" if i % 2 == 0 else "assistant", f"message {i} ü"))
+            f.write(json.dumps({"type": "summary", "summary": "noise"}) + "\n")
+
+
+def _forward_parse(path: Path) -> list[dict[str, str | None]]:
+    """Reference implementation: parse every line forward."""
+    messages = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        msg = _parse_message_from_json(line)
+        if msg:
+            messages.append(msg)
+    return messages
+
+
+class TestReverseReader:
+    """Tests for iter_lines_reverse()."""
+
+    def test_small_blocks_match_forward_lines(self, tmp_path: Path) -> None:
+        """Lines spanning block boundaries are reassembled correctly."""
+        transcript = tmp_path / "t.jsonl"
+        _write_transcript(transcript, MESSAGE_COUNT)
+
+        reversed_lines = list(iter_lines_reverse(transcript, block_size=SMALL_BLOCK_SIZE))
+        forward_lines = transcript.read_text(encoding="utf-8").split("\n")
+        assert reversed_lines == list(reversed(forward_lines))
+
+    def test_last_n_matches_forward_parse(self, tmp_path: Path) -> None:
+        """Tail scan returns the same messages as a full forward parse."""
+        transcript = tmp_path / "t.jsonl"
+        _write_transcript(transcript, MESSAGE_COUNT)
+
+        assert get_last_n_messages(transcript, LAST_N) == _forward_parse(transcript)[-LAST_N:]
+
+    def test_until_last_user_matches_forward_parse(self, tmp_path: Path) -> None:
+        """Reverse scan drops only the trailing non-user messages."""
+        transcript = tmp_path / "t.jsonl"
+        _write_transcript(transcript, MESSAGE_COUNT)
+
+        expected = _forward_parse(transcript)[:-1]  # Last message is assistant
+        assert get_messages_until_last_user(transcript) == expected
+
+
+class TestTranscriptIndex:
+    """Tests for TranscriptIndex sidecar."""
+
+    def test_index_last_n_matches_scan(self, tmp_path: Path) -> None:
+        """Indexed lookups return the same messages as the tail scan."""
+        transcript = tmp_path / "t.jsonl"
+        _write_transcript(transcript, MESSAGE_COUNT)
+
+        assert get_last_n_messages(transcript, LAST_N, use_index=True) == get_last_n_messages(transcript, LAST_N)
+        assert (tmp_path / f"t.jsonl{INDEX_SUFFIX}").exists()
+
+    def test_index_extends_incrementally(self, tmp_path: Path) -> None:
+        """Appended lines are indexed without re-reading the indexed prefix."""
+        transcript = tmp_path / "t.jsonl"
+        _write_transcript(transcript, MESSAGE_COUNT)
+        index = TranscriptIndex(transcript)
+        index.refresh()
+        indexed_bytes = index.indexed_bytes
+        assert index.message_count == MESSAGE_COUNT
+
+        with transcript.open("a") as f:
+            f.write(_message_line("user", "appended"))
+
+        reloaded = TranscriptIndex(transcript)
+        reloaded.refresh()
+        assert reloaded.message_count == MESSAGE_COUNT + 1
+        assert reloaded.indexed_bytes > indexed_bytes
+        assert reloaded.last_n(1)[0]["text"] == "appended"
+
+    def test_index_includes_unterminated_trailing_line(self, tmp_path: Path) -> None:
+        """A complete message without trailing newline is still returned."""
+        transcript = tmp_path / "t.jsonl"
+        _write_transcript(transcript, MESSAGE_COUNT)
+        with transcript.open("a") as f:
+            f.write(_message_line("assistant", "no newline").rstrip("\n"))
+
+        result = get_last_n_messages(transcript, 2, use_index=True)
+        assert result == get_last_n_messages(transcript, 2)
+        assert result[-1]["text"] == "no newline"
+
+    def test_index_rebuilds_when_transcript_replaced(self, tmp_path: Path) -> None:
+        """A rewritten transcript invalidates the stale sidecar."""
+        transcript = tmp_path / "t.jsonl"
+        _write_transcript(transcript, MESSAGE_COUNT)
+        get_last_n_messages(transcript, LAST_N, use_index=True)
+
+        transcript.write_text(_message_line("user", "fresh start"))
+        assert get_last_n_messages(transcript, LAST_N, use_index=True) == [
+            {"type": "user", "text": "fresh start", "timestamp": "2025-01-01T00:00:00Z"},
+        ]
+
+    def test_index_until_last_user(self, tmp_path: Path) -> None:
+        """Indexed until-last-user matches the scan."""
+        transcript = tmp_path / "t.jsonl"
+        _write_transcript(transcript, MESSAGE_COUNT)
+
+        assert get_messages_until_last_user(transcript, use_index=True) == get_messages_until_last_user(transcript)
@@ -0,0 +1,40 @@
+"""Unit tests for the type prefilter and JSON backend of the transcript line parser."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+import scripts.agents.transcript as transcript_module
+from scripts.agents.transcript import _parse_message_from_json
+
+
+class TestTypePrefilter:
+    """Tests for the cheap top-level type check before decoding."""
+
+    def test_non_message_records_skipped_without_decoding(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Summary/system records never reach the JSON decoder."""
+
+        def fail_decode(line: str) -> None:
+            raise AssertionError("decoded")
+
+        monkeypatch.setattr(transcript_module, "_loads", fail_decode)
+
+        assert _parse_message_from_json(json.dumps({"type": "summary", "summary": "user assistant"})) is None
+        assert _parse_message_from_json(json.dumps({"type": "system", "content": '"type": "user"'})) is None
+
+    def test_compact_and_spaced_separators_accepted(self) -> None:
+        """Both json.dumps and compact separators pass the prefilter."""
+        record = {"type": "user", "message": {"content": "hi"}, "timestamp": "t"}
+        expected = {"type": "user", "text": "hi", "timestamp": "t"}
+
+        assert _parse_message_from_json(json.dumps(record)) == expected
+        assert _parse_message_from_json(json.dumps(record, separators=(",", ":"))) == expected
+
+    def test_decoder_matches_stdlib_json(self) -> None:
+        """Lines the fast backend rejects are decoded exactly as json would."""
+        line = '{"type": "user", "message": {"content": "lone \\ud800 surrogate"}, "timestamp": "t"}'
+
+        assert transcript_module._loads(line) == json.loads(line)
+        assert _parse_message_from_json('{"type": "user", "message": {"content": "trunc') is None
@@ -0,0 +1,149 @@
+"""Unit tests for layered transcript summaries."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+import scripts.agents.transcript_summary as summary_module
+import scripts.agents.workflows.core as core_module
+from scripts.agents.transcript import EXHIBIT_HEADER, TranscriptIndex
+from scripts.agents.transcript_client import SOCKET_ENV_VAR
+from scripts.agents.transcript_summary import SUMMARY_SUFFIX, TranscriptSummaryStore, summarize_messages
+
+# Test constants
+KEEP_RECENT = 10
+SEGMENT_MESSAGES = 4
+SEGMENTS_PER_CHAPTER = 2
+MAX_CHAPTERS = 2
+
+
+def _append_messages(path: Path, start: int, count: int) -> None:
+    """Append user requests, assistant tool calls and tool results."""
+    with path.open("a") as f:
+        for i in range(start, start + count):
+            if i % 2 == 0:
+                record = {"type": "user", "message": {"content": f"request {i}"}}
+            else:
+                content = [{"type": "text", "text": f"reply {i}"}, {"type": "tool_use", "name": "Read", "input": {}}]
+                record = {"type": "assistant", "message": {"content": content}}
+            f.write(json.dumps(record) + "\n")
+
+
+@pytest.fixture
+def small_layers(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Use tiny segments and chapters so folding happens with few messages."""
+    monkeypatch.setattr(summary_module, "SEGMENT_MESSAGES", SEGMENT_MESSAGES)
+    monkeypatch.setattr(summary_module, "SEGMENTS_PER_CHAPTER", SEGMENTS_PER_CHAPTER)
+    monkeypatch.setattr(summary_module, "MAX_CHAPTERS", MAX_CHAPTERS)
+
+
+def _update(transcript: Path, store: TranscriptSummaryStore) -> bool:
+    """Update a store from the transcript's offset index."""
+    index = TranscriptIndex(transcript)
+    index.refresh()
+    return store.update(index.message_count, index.messages, KEEP_RECENT)
+
+
+class TestSummarizeMessages:
+    """Tests for the extractive segment summarizer."""
+
+    def test_keeps_requests_tools_and_last_reply(self) -> None:
+        """User requests are kept, tool results skipped, tool calls counted."""
+        messages: list[dict[str, str | None]] = [
+            {"type": "user", "text": "Add   a\nlogin page"},
+            {"type": "assistant", "text": "[Tool: Read] {}\n\n[Tool: Edit] {}"},
+            {"type": "user", "text": "[Tool Result]\nok"},
+            {"type": "assistant", "text": "Done.\n\n[Tool: Read] {}"},
+        ]
+
+        summary = summarize_messages(messages, 10)
+
+        assert summary.splitlines() == [
+            "Messages 11-14:",
+            "- User: Add a login page",
+            "- Tools: Read x2, Edit x1",
+            "- Assistant (last reply): Done.",
+        ]
+
+
+class TestTranscriptSummaryStore:
+    """Tests for incremental, layered summarization."""
+
+    def test_layers_cover_all_older_messages(self, tmp_path: Path, small_layers: None) -> None:
+        """Segments fold into chapters and chapters into the session summary."""
+        transcript = tmp_path / "t.jsonl"
+        _append_messages(transcript, 0, 60)
+        store = TranscriptSummaryStore(transcript)
+
+        assert _update(transcript, store)
+
+        # 60 messages, 10 kept raw: 12 segments -> 6 chapters -> 2 kept, 4 folded into the session
+        assert store.summarized == 12 * SEGMENT_MESSAGES
+        assert store.session is not None
+        assert (store.session["start"], store.session["end"]) == (0, 32)
+        assert len(store.chapters) == MAX_CHAPTERS
+        assert not store.segments
+        assert "request 0" in store.format_section()
+
+    def test_incremental_and_persisted(self, tmp_path: Path, small_layers: None) -> None:
+        """Only new segments are summarized; the store is reloaded from its sidecar."""
+        transcript = tmp_path / "t.jsonl"
+        _append_messages(transcript, 0, 20)
+        store = TranscriptSummaryStore(transcript)
+        _update(transcript, store)
+        store.save()
+        assert (tmp_path / f"t.jsonl{SUMMARY_SUFFIX}").exists()
+
+        summarized: list[int] = []
+
+        def recording_summarizer(messages: list[dict[str, str | None]], start: int) -> str:
+            summarized.append(start)
+            return summarize_messages(messages, start)
+
+        _append_messages(transcript, 20, SEGMENT_MESSAGES)
+        reloaded = TranscriptSummaryStore(transcript, summarize=recording_summarizer)
+        assert _update(transcript, reloaded)
+        assert summarized == [store.summarized]
+        assert not _update(transcript, reloaded)
+
+    def test_moderator_context_keeps_early_requests(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Long transcripts keep their first request in the moderator context."""
+        monkeypatch.setenv(SOCKET_ENV_VAR, str(tmp_path / "missing.sock"))
+        transcript = tmp_path / "t.jsonl"
+        _append_messages(transcript, 0, 300)
+
+        summary, exhibit = core_module.prepare_moderator_context(transcript).split(EXHIBIT_HEADER)
+
+        assert "request 0" in summary
+        assert exhibit.count("<message role=") <= core_module.MAX_MODERATOR_MESSAGE_COUNT
+        assert "reply 299" in exhibit
+
+    def test_moderator_context_starts_after_last_summarized_message(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A trailing partial line does not shift the raw window past an unsummarized message."""
+        monkeypatch.setenv(SOCKET_ENV_VAR, str(tmp_path / "missing.sock"))
+        transcript = tmp_path / "t.jsonl"
+        _append_messages(transcript, 0, 300)
+        with transcript.open("a") as f:
+            f.write(json.dumps({"type": "user", "message": {"content": "request 300"}}))
+
+        _summary, exhibit = core_module.prepare_moderator_context(transcript).split(EXHIBIT_HEADER)
+
+        summarized = TranscriptSummaryStore(transcript)
+        summarized.load()
+        assert f"request {summarized.summarized}" in exhibit
+        assert f"reply {summarized.summarized - 1}" not in exhibit
+        assert "request 300" in exhibit
+
+    def test_moderator_context_with_everything_summarized(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Summaries covering every message leave no raw messages (not the whole window)."""
+        monkeypatch.setenv(SOCKET_ENV_VAR, str(tmp_path / "missing.sock"))
+        monkeypatch.setattr(core_module, "MODERATOR_RAW_MESSAGE_COUNT", 0)
+        transcript = tmp_path / "t.jsonl"
+        _append_messages(transcript, 0, 300)
+
+        context = core_module.prepare_moderator_context(transcript)
+
+        assert "<message role=" not in context
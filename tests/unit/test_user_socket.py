@@ -0,0 +1,123 @@
+"""Unit tests for the per-user helper socket checks."""
+
+from __future__ import annotations
+
+import os
+import socket
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from scripts.agents import user_socket
+from scripts.agents.user_socket import connect_user_socket, ensure_socket_dir, get_user_socket_path, is_trusted_socket
+
+# Test constants
+ENV_VAR = "AMI_TEST_SOCKET"
+OTHER_UID = os.getuid() + 1
+
+
+@pytest.fixture
+def socket_dir() -> Iterator[Path]:
+    """Private directory with a short path (unix socket paths are length-limited)."""
+    with tempfile.TemporaryDirectory(prefix="ami") as directory:
+        yield Path(directory)
+
+
+@pytest.fixture
+def listener(socket_dir: Path) -> Iterator[Path]:
+    """Listening socket owned by the current user."""
+    socket_path = socket_dir / "s.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(socket_path))
+        server.listen()
+        yield socket_path
+
+
+class TestSocketPath:
+    """Tests for get_user_socket_path()."""
+
+    def test_override(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """The environment variable wins."""
+        monkeypatch.setenv(ENV_VAR, "/custom/path.sock")
+
+        assert get_user_socket_path("s.sock", ENV_VAR) == Path("/custom/path.sock")
+
+    def test_private_directory_without_xdg_runtime_dir(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Without XDG_RUNTIME_DIR the socket goes into a per-user directory, not the shared temp dir."""
+        monkeypatch.delenv(ENV_VAR, raising=False)
+        monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+
+        path = get_user_socket_path("s.sock", ENV_VAR)
+
+        assert path.parent == Path(tempfile.gettempdir()) / f"ami-{os.getuid()}"
+
+
+class TestSocketDirectory:
+    """Tests for ensure_socket_dir()."""
+
+    def test_created_owner_only(self, tmp_path: Path) -> None:
+        """A missing directory is created with mode 0700."""
+        socket_path = tmp_path / "sockets" / "s.sock"
+
+        ensure_socket_dir(socket_path)
+
+        assert socket_path.parent.stat().st_mode & 0o777 == user_socket.SOCKET_DIR_MODE
+
+    def test_shared_directory_rejected(self, tmp_path: Path) -> None:
+        """A directory others can write to is refused."""
+        shared = tmp_path / "shared"
+        shared.mkdir()
+        shared.chmod(0o777)
+
+        with pytest.raises(PermissionError):
+            ensure_socket_dir(shared / "s.sock")
+
+    def test_foreign_directory_rejected(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A directory owned by another user is refused."""
+        monkeypatch.setattr(user_socket.os, "getuid", lambda: OTHER_UID)
+
+        with pytest.raises(PermissionError):
+            ensure_socket_dir(tmp_path / "s.sock")
+
+
+class TestConnect:
+    """Tests for connect_user_socket()."""
+
+    def test_own_server_accepted(self, listener: Path) -> None:
+        """A socket of the current user's server is connected."""
+        sock = connect_user_socket(listener, 1.0)
+
+        assert sock is not None
+        sock.close()
+
+    def test_missing_socket(self, socket_dir: Path) -> None:
+        """No socket - no connection."""
+        assert connect_user_socket(socket_dir / "missing.sock", 1.0) is None
+
+    def test_socket_in_shared_directory_ignored(self, listener: Path) -> None:
+        """A socket in a directory others can write to is not trusted."""
+        listener.parent.chmod(0o777)
+
+        assert not is_trusted_socket(listener)
+        assert connect_user_socket(listener, 1.0) is None
+
+    def test_foreign_socket_ignored(self, listener: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A socket owned by another user is not trusted."""
+        monkeypatch.setattr(user_socket.os, "getuid", lambda: OTHER_UID)
+
+        assert connect_user_socket(listener, 1.0) is None
+
+    def test_foreign_peer_ignored(self, listener: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A server process running as another user is not trusted."""
+        monkeypatch.setattr(user_socket, "get_peer_uid", lambda _sock: OTHER_UID)
+
+        assert connect_user_socket(listener, 1.0) is None
+
+    def test_peer_uid(self, listener: Path) -> None:
+        """SO_PEERCRED reports the server's user."""
+        sock = connect_user_socket(listener, 1.0)
+        assert sock is not None
+        with sock:
+            assert user_socket.get_peer_uid(sock) in {os.getuid(), None}
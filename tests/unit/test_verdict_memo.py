@@ -0,0 +1,95 @@
+"""Unit tests for the code-quality verdict memo."""
+
+import json
+import os
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from scripts.agents.validation.verdict_memo import NEVER_MEMOIZED, VerdictMemo, get_verdict_memo, memo_key
+
+# Test constants
+MAX_ENTRIES = 2
+EXPIRED_SECONDS = 10
+
+
+class TestMemoKey:
+    """Content-addressed keys."""
+
+    def test_key_depends_on_every_part(self) -> None:
+        """Changing any input changes the key."""
+        base = memo_key("prompt", "model", "a.py", "diff")
+
+        assert memo_key("prompt", "model", "a.py", "diff") == base
+        assert memo_key("prompt", "other-model", "a.py", "diff") != base
+        assert memo_key("prompt", "model", "b.py", "diff") != base
+        assert memo_key("prompt", "model", "a.py", "diff!") != base
+
+    def test_part_boundaries_are_unambiguous(self) -> None:
+        """Moving text across part boundaries changes the key."""
+        assert memo_key("ab", "c") != memo_key("a", "bc")
+
+
+class TestVerdictMemo:
+    """Storage, expiry, eviction and counters."""
+
+    def test_round_trip_counts_hits_and_misses(self, tmp_path: Path) -> None:
+        """Stored verdicts are returned and counted."""
+        memo = VerdictMemo(tmp_path)
+
+        assert memo.get("k") is None
+        memo.put("k", (False, "BLOCK: reason"))
+
+        assert memo.get("k") == (False, "BLOCK: reason")
+        assert memo.stats() == {"hits": 1, "misses": 1, "stores": 1, "entries": 1}
+
+    def test_expired_verdict_is_a_miss(self, tmp_path: Path) -> None:
+        """Entries older than the TTL are dropped."""
+        memo = VerdictMemo(tmp_path, ttl=1)
+        entry = tmp_path / "k.json"
+        entry.write_text(json.dumps({"created": time.time() - EXPIRED_SECONDS, "is_valid": True, "message": "Quality check passed"}))
+
+        assert memo.get("k") is None
+        assert not entry.exists()
+
+    def test_oldest_entries_evicted(self, tmp_path: Path) -> None:
+        """Entries beyond max_entries are evicted oldest first."""
+        memo = VerdictMemo(tmp_path, max_entries=MAX_ENTRIES)
+        for index, key in enumerate(("a", "b", "c")):
+            memo.put(key, (True, "ok"))
+            os.utime(tmp_path / f"{key}.json", (1_000_000 + index, 1_000_000 + index))
+
+        memo.put("d", (True, "ok"))
+
+        assert sorted(path.stem for path in tmp_path.glob("*.json") if path.name != "stats.json") == ["c", "d"]
+
+
+class TestGetVerdictMemo:
+    """Opt-in configuration and security exclusions."""
+
+    def test_disabled_by_default(self, tmp_path: Path) -> None:
+        """No memo unless enabled in config."""
+        config = MagicMock(root=tmp_path)
+        config.get.side_effect = lambda key, default=None: default
+        with patch("scripts.agents.validation.verdict_memo.get_config", return_value=config):
+            assert get_verdict_memo("code_quality_patterns_core") is None
+
+    def test_enabled(self, tmp_path: Path) -> None:
+        """Enabled in config - memo under the configured storage directory."""
+        config = MagicMock(root=tmp_path)
+        config.get.side_effect = lambda key, default=None: True if key == "code_quality.verdict_memo.enabled" else default
+        with patch("scripts.agents.validation.verdict_memo.get_config", return_value=config):
+            memo = get_verdict_memo("code_quality_patterns_core")
+
+        assert memo is not None
+        assert memo.storage_dir == tmp_path / "logs" / "verdict-memo"
+
+    def test_security_moderators_never_memoized(self, tmp_path: Path) -> None:
+        """Malicious-behavior and audit moderators get no memo even when enabled."""
+        config = MagicMock(root=tmp_path)
+        config.get.side_effect = lambda key, default=None: True if key == "code_quality.verdict_memo.enabled" else default
+        with patch("scripts.agents.validation.verdict_memo.get_config", return_value=config):
+            assert get_verdict_memo("malicious_behavior") is None
+            assert get_verdict_memo("audit") is None
+
+        assert {"malicious_behavior", "audit"} <= NEVER_MEMOIZED